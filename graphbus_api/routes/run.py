@@ -90,7 +90,7 @@ def start_runtime(req: RunRequest):
 
 
 @router.post("/{session_id}/call", response_model=CallResponse)
-def call_method(session_id: str, req: CallRequest):
+async def call_method(session_id: str, req: CallRequest):
     """
     Call a @schema_method on a running agent node.
 
@@ -102,8 +102,11 @@ def call_method(session_id: str, req: CallRequest):
     if not session:
         raise HTTPException(status_code=404, detail=f"Session {session_id!r} not found")
 
+    # call_method_async awaits coroutine methods on the event loop and offloads
+    # sync ones to the executor's bounded pool, so a slow node only holds a
+    # pool worker and never serialises calls to other nodes in the session.
     try:
-        result = session.executor.call_method(req.node, req.method, **req.kwargs)
+        result = await session.executor.call_method_async(req.node, req.method, **req.kwargs)
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
@@ -111,7 +114,7 @@ def call_method(session_id: str, req: CallRequest):
 
 
 @router.post("/{session_id}/publish", status_code=204)
-def publish_event(session_id: str, req: PublishRequest):
+async def publish_event(session_id: str, req: PublishRequest):
     """
     Publish an event to the message bus, triggering any @subscribe handlers.
     """
@@ -120,7 +123,7 @@ def publish_event(session_id: str, req: PublishRequest):
         raise HTTPException(status_code=404, detail=f"Session {session_id!r} not found")
 
     try:
-        session.executor.publish(req.topic, req.payload)
+        await session.executor.publish_async(req.topic, req.payload)
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
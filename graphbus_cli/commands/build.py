@@ -8,6 +8,7 @@ from pathlib import Path
 from rich.table import Table
 
 from graphbus_core.build.builder import build_project
+from graphbus_core.codec import STORAGE_FORMATS
 from graphbus_core.config import BuildConfig, LLMConfig, SafetyConfig
 from graphbus_core.constants import DEFAULT_LLM_MODEL
 from graphbus_cli.utils.output import (
@@ -92,6 +93,17 @@ from graphbus_cli.utils.websocket import (
     type=str,
     help='User intent/goal for agent negotiation (e.g., "optimize performance", "improve error handling")'
 )
+@click.option(
+    '--artifact-format',
+    type=click.Choice(STORAGE_FORMATS),
+    default='json',
+    help='Write graph/agents/topics as JSON or compressed binary (readers detect either)'
+)
+@click.option(
+    '--chrome-trace',
+    type=click.Path(file_okay=True, dir_okay=False),
+    help='Write a Chrome trace timeline of agent orchestration (open in ui.perfetto.dev)'
+)
 def build(
     agents_dir: str,
     output_dir: str,
@@ -105,7 +117,9 @@ def build(
     convergence_threshold: int,
     protected_files: tuple,
     arbiter_agent: str,
-    intent: str
+    intent: str,
+    artifact_format: str,
+    chrome_trace: str
 ):
     """
     Build agent graphs from source directory.
@@ -120,10 +134,12 @@ def build(
       graphbus build agents/ -o build/          # Custom output directory
       graphbus build agents/ --validate         # Validate after build
       graphbus build agents/ -v                 # Verbose output
+      graphbus build agents/ --artifact-format binary  # Compressed artifacts
       graphbus build agents/ --enable-agents    # Build with LLM agent orchestration
       graphbus build agents/ --enable-agents --intent "optimize performance"
       graphbus build agents/ --enable-agents --arbiter-agent CoreAgent
       graphbus build agents/ --enable-agents --llm-model claude-sonnet-4 --max-negotiation-rounds 5
+      graphbus build agents/ --enable-agents --chrome-trace build.trace.json  # Phase timeline
 
     \b
     Output:
@@ -251,7 +267,9 @@ def build(
             output_dir=str(output_path),
             llm_config=llm_config,
             safety_config=safety_config,
-            user_intent=intent
+            user_intent=intent,
+            artifact_format=artifact_format,
+            chrome_trace=chrome_trace
         )
 
         # Run build project (this handles all the steps)
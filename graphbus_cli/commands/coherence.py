@@ -11,6 +11,7 @@ import networkx as nx
 from networkx.readwrite import json_graph
 import json
 
+from graphbus_core import codec
 from graphbus_core.runtime.coherence import CoherenceTracker
 from graphbus_cli.utils.output import (
     console, print_success, print_error, print_warning, print_info, print_json
@@ -40,9 +41,8 @@ def check(coherence_dir: str, graph_dir: str):
         graph = None
         graph_file = Path(graph_dir) / 'graph.json'
         if graph_file.exists():
-            with open(graph_file, 'r') as f:
-                graph_data = json.load(f)
-                graph = json_graph.node_link_graph(graph_data)
+            graph_data = codec.load(graph_file)
+            graph = json_graph.node_link_graph(graph_data)
 
         tracker = CoherenceTracker(storage_path=coherence_dir, graph=graph)
 
@@ -111,9 +111,8 @@ def report(coherence_dir: str, graph_dir: str, format: str, output: str):
         graph = None
         graph_file = Path(graph_dir) / 'graph.json'
         if graph_file.exists():
-            with open(graph_file, 'r') as f:
-                graph_data = json.load(f)
-                graph = json_graph.node_link_graph(graph_data)
+            graph_data = codec.load(graph_file)
+            graph = json_graph.node_link_graph(graph_data)
 
         tracker = CoherenceTracker(storage_path=coherence_dir, graph=graph)
 
@@ -190,9 +189,8 @@ def drift(coherence_dir: str, graph_dir: str, time_window: int):
         graph = None
         graph_file = Path(graph_dir) / 'graph.json'
         if graph_file.exists():
-            with open(graph_file, 'r') as f:
-                graph_data = json.load(f)
-                graph = json_graph.node_link_graph(graph_data)
+            graph_data = codec.load(graph_file)
+            graph = json_graph.node_link_graph(graph_data)
 
         tracker = CoherenceTracker(storage_path=coherence_dir, graph=graph)
 
@@ -258,9 +256,8 @@ def visualize(coherence_dir: str, graph_dir: str, output: str):
         graph = None
         graph_file = Path(graph_dir) / 'graph.json'
         if graph_file.exists():
-            with open(graph_file, 'r') as f:
-                graph_data = json.load(f)
-                graph = json_graph.node_link_graph(graph_data)
+            graph_data = codec.load(graph_file)
+            graph = json_graph.node_link_graph(graph_data)
 
         if not graph:
             print_error("No dependency graph found")
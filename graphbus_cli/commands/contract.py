@@ -11,6 +11,7 @@ from rich.table import Table
 from rich.panel import Panel
 from rich import print as rprint
 
+from graphbus_core import codec
 from graphbus_core.runtime.contracts import ContractManager, Contract
 from graphbus_cli.utils.output import (
     console, print_success, print_error, print_warning, print_info,
@@ -288,9 +289,8 @@ def impact(contract_spec: str, contracts_dir: str, graph_dir: str):
         import networkx as nx
         from networkx.readwrite import json_graph
 
-        with open(graph_file, 'r') as f:
-            graph_data = json.load(f)
-            graph = json_graph.node_link_graph(graph_data)
+        graph_data = codec.load(graph_file)
+        graph = json_graph.node_link_graph(graph_data)
 
         manager = ContractManager(storage_path=contracts_dir, graph=graph)
 
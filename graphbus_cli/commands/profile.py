@@ -3,6 +3,7 @@ Profile command - Profile performance of agent graphs
 """
 
 import click
+import os
 import time
 import sys
 from pathlib import Path
@@ -11,6 +12,8 @@ from rich.table import Table
 from graphbus_core.runtime.executor import RuntimeExecutor
 from graphbus_core.config import RuntimeConfig
 from graphbus_core.runtime.profiler import PerformanceProfiler
+from graphbus_core.runtime.chrome_trace import ChromeTraceRecorder
+from graphbus_core.runtime.memory_profiler import format_bytes
 from graphbus_cli.utils.output import (
     console, print_success, print_error, print_info,
     print_header, print_separator
@@ -29,27 +32,55 @@ from graphbus_cli.utils.errors import RuntimeError as CLIRuntimeError
 @click.option(
     '--output',
     type=click.Path(file_okay=True, dir_okay=False),
-    help='Save report to file (supports .txt, .html, .json)'
+    help='Save report to file (supports .txt, .html, .json, .folded, .trace.json)'
+)
+@click.option(
+    '--format', 'output_format',
+    type=click.Choice(['text', 'json', 'html', 'folded', 'chrome-trace']),
+    help='Report format (default: from the --output extension)'
 )
 @click.option(
     '--threshold',
     type=float,
     default=100.0,
-    help='Bottleneck threshold in milliseconds (default: 100ms)'
+    help='Bottleneck threshold on p99 latency in milliseconds (default: 100ms)'
 )
 @click.option(
     '--no-message-bus',
     is_flag=True,
     help='Disable message bus'
 )
-def profile(artifacts_dir: str, duration: int, output: str, threshold: float, no_message_bus: bool):
+@click.option(
+    '--sample',
+    is_flag=True,
+    help='Sample handler stacks for flame graphs'
+)
+@click.option(
+    '--sample-interval',
+    type=float,
+    default=10.0,
+    help='Milliseconds between stack samples (default: 10ms)'
+)
+@click.option(
+    '--memory',
+    is_flag=True,
+    help='Attribute allocations to handlers with tracemalloc'
+)
+@click.option(
+    '--memory-rate',
+    type=click.FloatRange(0.0, 1.0),
+    default=0.1,
+    help='Fraction of calls measured by --memory (default: 0.1)'
+)
+def profile(artifacts_dir: str, duration: int, output: str, output_format: str, threshold: float,
+            no_message_bus: bool, sample: bool, sample_interval: float, memory: bool, memory_rate: float):
     """
     Profile performance of agent graph.
 
     \b
     Runs the agent graph with performance profiling enabled and generates
     a report showing:
-      - Method execution times
+      - Method execution times and latency percentiles (p50/p90/p99/p999)
       - Call frequencies
       - Performance bottlenecks
       - Event routing statistics
@@ -59,23 +90,37 @@ def profile(artifacts_dir: str, duration: int, output: str, threshold: float, no
       graphbus profile .graphbus                    # Profile for 60 seconds
       graphbus profile .graphbus --duration 30      # Profile for 30 seconds
       graphbus profile .graphbus --output report.txt  # Save report to file
-      graphbus profile .graphbus --threshold 50     # Flag methods >50ms
+      graphbus profile .graphbus --threshold 50     # Flag methods with p99 >50ms
+      graphbus profile .graphbus --sample --output stacks.folded  # Sampled flame graph
+      graphbus profile .graphbus --format chrome-trace   # Timeline for ui.perfetto.dev
+      graphbus profile .graphbus --memory --memory-rate 0.05  # Allocations per handler
 
     \b
     Output Formats:
       .txt  - Plain text report
       .html - Interactive HTML flame graph with charts
       .json - JSON export for external tools
+      .folded - Collapsed stacks (flamegraph.pl, speedscope); needs --sample
+      .trace.json - Chrome trace timeline of calls, publishes and handler
+                    deliveries per thread (Perfetto, chrome://tracing)
 
     \b
     Tips:
       - Start interactive REPL and call methods to generate activity
       - Use --duration to control profiling time
       - Use --threshold to tune bottleneck detection
+      - Use --sample to see where time goes inside handlers; raise
+        --sample-interval to lower overhead
+      - Use --memory to find handlers that allocate or retain memory;
+        lower --memory-rate if snapshots slow the run down
     """
     artifacts_path = Path(artifacts_dir).resolve()
     executor = None
     profiler = PerformanceProfiler()
+    output_format = output_format or _format_from_path(output)
+    if output_format == 'chrome-trace' and not output:
+        output = 'profile.trace.json'
+    recorder = ChromeTraceRecorder(process_name="graphbus runtime") if output_format == 'chrome-trace' else None
 
     try:
         # Add parent directory to Python path
@@ -102,7 +147,15 @@ def profile(artifacts_dir: str, duration: int, output: str, threshold: float, no
             executor.initialize_nodes()
             executor.setup_message_bus()
 
+            # Timeline needs causal spans from the tracer
+            if recorder is not None:
+                recorder.attach(executor.setup_tracing())
+
             # Enable profiler
+            if sample:
+                profiler.enable_sampling(executor.inflight.current_calls, interval=sample_interval / 1000.0)
+            if memory:
+                profiler.enable_memory_profiling(sample_rate=memory_rate)
             profiler.enable()
 
             # Wrap executor methods with profiling
@@ -147,7 +200,7 @@ def profile(artifacts_dir: str, duration: int, output: str, threshold: float, no
 
         # Save to file if requested
         if output:
-            _save_profile_report(profiler, output, threshold)
+            _save_profile_report(profiler, output, threshold, output_format, recorder)
 
         # Stop runtime
         if executor:
@@ -170,6 +223,64 @@ def profile(artifacts_dir: str, duration: int, output: str, threshold: float, no
         raise CLIRuntimeError(f"Profiling error: {str(e)}")
 
 
+@click.command('profile-dump')
+@click.argument('pid', type=int)
+@click.option(
+    '--dir', 'dump_dir',
+    type=click.Path(file_okay=False, dir_okay=True),
+    default='.graphbus/profiles',
+    help='Directory the runtime writes dumps to (default: .graphbus/profiles)'
+)
+@click.option(
+    '--timeout',
+    type=float,
+    default=10.0,
+    help='Seconds to wait for the dump files (default: 10)'
+)
+def profile_dump(pid: int, dump_dir: str, timeout: float):
+    """
+    Dump the continuous profile of a running runtime.
+
+    \b
+    Sends SIGUSR2 to a runtime started with --continuous-profile; it writes
+    its profiling ring (per-method latency histograms, topic rates and
+    resource samples for the last N minutes) as JSON and as a Chrome trace.
+
+    \b
+    Examples:
+      graphbus profile-dump 4242
+      graphbus profile-dump 4242 --dir .graphbus/profiles
+    """
+    from graphbus_core.runtime.continuous import DUMP_SIGNAL
+
+    if DUMP_SIGNAL is None:
+        raise CLIRuntimeError("profile-dump needs SIGUSR2, which this platform does not have")
+
+    directory = Path(dump_dir)
+    pattern = f"graphbus-profile-{pid}-*.json"
+    before = set(directory.glob(pattern)) if directory.exists() else set()
+
+    try:
+        os.kill(pid, DUMP_SIGNAL)
+    except ProcessLookupError:
+        raise CLIRuntimeError(f"No process with pid {pid}")
+    except PermissionError:
+        raise CLIRuntimeError(f"Not allowed to signal pid {pid}")
+
+    print_info(f"Requested profile dump from pid {pid}")
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        new = sorted(set(directory.glob(pattern)) - before) if directory.exists() else []
+        if len(new) >= 2:
+            for path in new:
+                print_success(f"Wrote {path}")
+            print_info("Open the .trace.json file in https://ui.perfetto.dev")
+            return
+        time.sleep(0.2)
+    print_error(f"No dump appeared in {directory} within {timeout:g}s "
+                f"(was the runtime started with --continuous-profile, and is --dir its dump directory?)")
+
+
 def _wrap_executor_with_profiler(executor: RuntimeExecutor, profiler: PerformanceProfiler) -> None:
     """Wrap executor methods to enable profiling"""
     original_call_method = executor.call_method
@@ -184,6 +295,17 @@ def _wrap_executor_with_profiler(executor: RuntimeExecutor, profiler: Performanc
 
     executor.call_method = profiled_call_method
 
+    # Event handlers bypass call_method; measure their allocations at delivery
+    memory_profiler = profiler.memory_profiler
+    if memory_profiler is not None and executor.router is not None:
+        original_route = executor.router.route_event_to_node
+
+        def profiled_route(node, handler_name: str, event):
+            with memory_profiler.track(node.name, handler_name):
+                original_route(node, handler_name, event)
+
+        executor.router.route_event_to_node = profiled_route
+
 
 def _display_profile_report(profiler: PerformanceProfiler, threshold: float) -> None:
     """Display profile report in terminal"""
@@ -210,13 +332,15 @@ def _display_profile_report(profiler: PerformanceProfiler, threshold: float) ->
         table.add_column("Total Time", justify="right")
         table.add_column("Calls", justify="right")
         table.add_column("Avg Time", justify="right")
+        table.add_column("P99", justify="right")
 
         for profile in top_time:
             table.add_row(
                 f"{profile.agent_name}.{profile.method_name}",
                 f"{profile.total_time:.3f}s",
                 str(profile.call_count),
-                f"{profile.avg_time*1000:.1f}ms"
+                f"{profile.avg_time*1000:.1f}ms",
+                f"{profile.percentile(0.99)*1000:.1f}ms"
             )
 
         console.print(table)
@@ -244,13 +368,94 @@ def _display_profile_report(profiler: PerformanceProfiler, threshold: float) ->
         console.print(table)
         console.print()
 
+    # Latency percentiles
+    latency = profiler.get_latency_percentiles()
+    if latency['methods']:
+        print_header("Latency Percentiles")
+
+        table = Table(show_header=True, header_style="bold cyan")
+        table.add_column("Method", style="cyan")
+        for key in ("P50", "P90", "P99", "P999", "Max"):
+            table.add_column(key, justify="right")
+        table.add_column(f"P99 (last {latency['window_seconds']:.0f}s)", justify="right")
+
+        ranked = sorted(latency['methods'].items(), key=lambda x: x[1]['all']['p99'], reverse=True)
+        for name, stats in ranked[:10]:
+            overall, recent = stats['all'], stats['window']
+            table.add_row(
+                name,
+                *(f"{overall[key]*1000:.1f}ms" for key in ("p50", "p90", "p99", "p999", "max")),
+                f"{recent['p99']*1000:.1f}ms" if recent['count'] else "-"
+            )
+
+        console.print(table)
+        console.print()
+
+    # Sampled handler time
+    sampler = profiler.stack_sampler
+    if sampler is not None and sampler.samples:
+        sampler_stats = sampler.stats()
+        print_header("Sampled Time by Handler")
+
+        table = Table(show_header=True, header_style="bold cyan")
+        table.add_column("Handler", style="cyan")
+        table.add_column("Samples", justify="right")
+        table.add_column("Share", justify="right")
+
+        for name, samples in list(sampler.attribution().items())[:10]:
+            table.add_row(name, str(samples), f"{samples / sampler_stats['samples'] * 100:.1f}%")
+
+        console.print(table)
+        console.print(
+            f"[dim]{sampler_stats['samples']} samples, "
+            f"{sampler_stats['effective_interval']*1000:.1f}ms effective interval, "
+            f"{sampler_stats['overhead']*100:.1f}% sampler overhead[/dim]"
+        )
+        console.print()
+
+    # Allocations per handler
+    memory = summary.get('memory')
+    if memory and memory['handlers']:
+        print_header("Allocations by Handler")
+
+        table = Table(show_header=True, header_style="bold cyan")
+        table.add_column("Handler", style="cyan")
+        table.add_column("Sampled", justify="right")
+        table.add_column("Avg Retained", justify="right")
+        table.add_column("Avg Peak", justify="right")
+        table.add_column("Max Peak", justify="right")
+        table.add_column("Net Total", justify="right")
+
+        for name, stats in list(memory['handlers'].items())[:10]:
+            table.add_row(
+                name,
+                str(stats['sampled_calls']),
+                format_bytes(stats['avg_allocated']),
+                format_bytes(stats['avg_peak']),
+                format_bytes(stats['peak_bytes']),
+                format_bytes(stats['net_bytes'])
+            )
+
+        console.print(table)
+        for node, sites in memory['top_sites'].items():
+            if sites:
+                console.print(f"[cyan]Top call sites for {node}:[/cyan]")
+                for site in sites[:5]:
+                    console.print(f"  {site['site']}  [dim]{format_bytes(site['bytes'])}[/dim]")
+        console.print(
+            f"[dim]{memory['sampled_calls']} of {memory['calls']} calls sampled "
+            f"at rate {memory['sample_rate']:g}[/dim]"
+        )
+        console.print()
+
     # Bottlenecks
     bottlenecks = profiler.get_bottlenecks(threshold)
     if bottlenecks:
-        print_header(f"⚠ Potential Bottlenecks (>{threshold}ms average)")
+        print_header(f"⚠ Potential Bottlenecks (>{threshold}ms p99)")
 
         table = Table(show_header=True, header_style="bold yellow")
         table.add_column("Method", style="yellow")
+        table.add_column("P99", justify="right")
         table.add_column("Avg Time", justify="right")
         table.add_column("Max Time", justify="right")
         table.add_column("Calls", justify="right")
@@ -258,6 +463,7 @@ def _display_profile_report(profiler: PerformanceProfiler, threshold: float) ->
         for profile in bottlenecks:
             table.add_row(
                 f"{profile.agent_name}.{profile.method_name}",
+                f"{profile.percentile(0.99)*1000:.1f}ms",
                 f"{profile.avg_time*1000:.1f}ms",
                 f"{profile.max_time*1000:.1f}ms",
                 str(profile.call_count)
@@ -270,17 +476,40 @@ def _display_profile_report(profiler: PerformanceProfiler, threshold: float) ->
         console.print()
 
 
-def _save_profile_report(profiler: PerformanceProfiler, output_path: str, threshold: float) -> None:
+def _format_from_path(output_path: str) -> str:
+    """Report format implied by an output file name"""
+    if not output_path:
+        return None
+    name = output_path.lower()
+    if name.endswith('.trace.json'):
+        return 'chrome-trace'
+    return {
+        '.txt': 'text', '.json': 'json', '.html': 'html', '.folded': 'folded', '.collapsed': 'folded'
+    }.get(Path(name).suffix)
+
+
+def _save_profile_report(profiler: PerformanceProfiler, output_path: str, threshold: float,
+                         output_format: str = None, recorder: ChromeTraceRecorder = None) -> None:
     """Save profile report to file"""
     output = Path(output_path)
-
-    if output.suffix == '.txt':
+    output_format = output_format or _format_from_path(output_path)
+
+    if output_format == 'chrome-trace':
+        # Chrome Trace Event timeline
+        if recorder is None:
+            print_error("Chrome trace needs tracing from the start of the run (use --format chrome-trace)")
+            return
+        recorder.write(output)
+        print_success(f"Chrome trace saved to {output} ({len(recorder)} events)")
+        print_info("Open it in https://ui.perfetto.dev or chrome://tracing")
+
+    elif output_format == 'text':
         # Plain text report
         report = profiler.generate_report()
         output.write_text(report)
         print_success(f"Report saved to {output}")
 
-    elif output.suffix == '.json':
+    elif output_format == 'json':
         # JSON export
         import json
 
@@ -294,7 +523,8 @@ def _save_profile_report(profiler: PerformanceProfiler, output_path: str, thresh
                     'call_count': p.call_count,
                     'avg_time': p.avg_time,
                     'min_time': p.min_time,
-                    'max_time': p.max_time
+                    'max_time': p.max_time,
+                    **_percentile_fields(p)
                 }
                 for p in profiler.get_top_methods_by_time(50)
             ],
@@ -304,7 +534,8 @@ def _save_profile_report(profiler: PerformanceProfiler, output_path: str, thresh
                     'method': p.method_name,
                     'avg_time': p.avg_time,
                     'max_time': p.max_time,
-                    'call_count': p.call_count
+                    'call_count': p.call_count,
+                    **_percentile_fields(p)
                 }
                 for p in profiler.get_slowest_methods(50)
             ],
@@ -314,22 +545,40 @@ def _save_profile_report(profiler: PerformanceProfiler, output_path: str, thresh
                     'method': p.method_name,
                     'avg_time': p.avg_time,
                     'max_time': p.max_time,
-                    'call_count': p.call_count
+                    'call_count': p.call_count,
+                    **_percentile_fields(p)
                 }
                 for p in profiler.get_bottlenecks(threshold)
-            ]
+            ],
+            'latency': profiler.get_latency_percentiles(),
+            'collapsed_stacks': profiler.get_collapsed_stacks()
         }
 
         output.write_text(json.dumps(data, indent=2))
         print_success(f"JSON report saved to {output}")
 
-    elif output.suffix == '.html':
+    elif output_format == 'html':
         # HTML flame graph report
         html = profiler.generate_flame_graph_html()
         output.write_text(html)
         print_success(f"HTML flame graph saved to {output}")
         print_info(f"Open {output} in your browser to view the interactive report")
 
+    elif output_format == 'folded':
+        # Collapsed stacks for external flame graph tools
+        if profiler.stack_sampler is None:
+            print_error("Collapsed stacks need stack sampling (use --sample)")
+            return
+        profiler.stack_sampler.write_collapsed(output)
+        print_success(f"Collapsed stacks saved to {output}")
+        print_info(f"Render with: flamegraph.pl {output} > flame.svg (or open in speedscope)")
+
     else:
         print_error(f"Unsupported output format: {output.suffix}")
-        print_info("Supported formats: .txt, .json")
+        print_info("Supported formats: .txt, .json, .html, .folded, .trace.json")
+
+
+def _percentile_fields(profile) -> dict:
+    """p50/p90/p99/p999 of a method profile for JSON export"""
+    stats = profile.percentiles()
+    return {key: stats[key] for key in ('p50', 'p90', 'p99', 'p999')}
@@ -14,7 +14,7 @@ from rich.layout import Layout
 from graphbus_core.runtime.executor import run_runtime, RuntimeExecutor
 from graphbus_core.config import RuntimeConfig
 from graphbus_cli.utils.output import (
-    console, print_success, print_error, print_info,
+    console, print_success, print_error, print_info, print_warning,
     print_header, print_separator
 )
 from graphbus_cli.utils.errors import RuntimeError as CLIRuntimeError
@@ -72,9 +72,15 @@ from graphbus_cli.utils.errors import RuntimeError as CLIRuntimeError
     type=int,
     help='Enable Prometheus metrics on specified port (e.g., 9090)'
 )
+@click.option(
+    '--continuous-profile',
+    type=float,
+    metavar='MINUTES',
+    help='Keep the last N minutes of latency/rate/resource data; dump with graphbus profile-dump <pid>'
+)
 def run(artifacts_dir: str, no_message_bus: bool, interactive: bool, verbose: bool, stats_interval: int,
         persist_state: bool, restore_state: bool, watch: bool, enable_health_monitoring: bool, debug: bool,
-        metrics_port: int):
+        metrics_port: int, continuous_profile: float):
     """
     Run agent graph from build artifacts.
 
@@ -91,6 +97,7 @@ def run(artifacts_dir: str, no_message_bus: bool, interactive: bool, verbose: bo
       graphbus run .graphbus --enable-health-monitoring  # Monitor agent health
       graphbus run build/ -v                        # Verbose runtime logging
       graphbus run .graphbus --no-message-bus       # Disable event routing
+      graphbus run .graphbus --continuous-profile 15  # Keep 15 min of profile data
 
     \b
     Phase 1 Features:
@@ -132,6 +139,10 @@ def run(artifacts_dir: str, no_message_bus: bool, interactive: bool, verbose: bo
             artifacts_dir=str(artifacts_path),
             enable_message_bus=not no_message_bus
         )
+        if continuous_profile:
+            config.continuous_profiling = True
+            config.continuous_profile_minutes = continuous_profile
+            config.continuous_profile_dir = str(artifacts_path / "profiles")
 
         # Start runtime with Phase 1 features
         enable_hot_reload = watch
@@ -152,16 +163,14 @@ def run(artifacts_dir: str, no_message_bus: bool, interactive: bool, verbose: bo
             try:
                 from graphbus_core.runtime.monitoring import PrometheusMetrics, MetricsServer
 
-                metrics = PrometheusMetrics()
+                # The bus, router and call_method feed it from here on
+                metrics = executor.setup_metrics(PrometheusMetrics())
                 metrics_server = MetricsServer(metrics, port=metrics_port)
                 metrics_server.start()
 
                 console.print()
                 print_success(f"Metrics server started on port {metrics_port}")
                 print_info(f"Metrics: http://localhost:{metrics_port}/metrics")
-
-                # Attach metrics to executor for collection
-                executor.metrics = metrics
             except ImportError:
                 print_warning("Metrics support requires additional dependencies")
             except Exception as e:
@@ -203,16 +212,18 @@ def run(artifacts_dir: str, no_message_bus: bool, interactive: bool, verbose: bo
             console.print("  [dim]→ Press Ctrl+C to stop[/dim]")
             console.print()
 
-            # Set up signal handler for graceful shutdown
+            # Set up signal handler for graceful shutdown.  SIGTERM is what
+            # orchestrators send on a rolling restart, so it drains too.
             def signal_handler(sig, frame):
                 console.print()
                 print_info("Shutting down runtime...")
                 if executor:
-                    executor.stop()
+                    _print_drain_report(executor.stop())
                 print_success("Runtime stopped")
                 sys.exit(0)
 
             signal.signal(signal.SIGINT, signal_handler)
+            signal.signal(signal.SIGTERM, signal_handler)
 
             # Keep running
             signal.pause()
@@ -221,7 +232,7 @@ def run(artifacts_dir: str, no_message_bus: bool, interactive: bool, verbose: bo
         console.print()
         print_info("Shutting down runtime...")
         if executor:
-            executor.stop()
+            _print_drain_report(executor.stop())
         print_success("Runtime stopped")
     except Exception as e:
         console.print()
@@ -230,6 +241,24 @@ def run(artifacts_dir: str, no_message_bus: bool, interactive: bool, verbose: bo
         raise CLIRuntimeError(f"Runtime error: {str(e)}")
 
 
+def _print_drain_report(report: dict) -> None:
+    """Summarise what RuntimeExecutor.stop() drained"""
+    if not isinstance(report, dict) or not report:
+        return
+
+    completed = report["completed_during_drain"]
+    if completed:
+        print_info(f"Drained {completed} in-flight operation(s) in {report['drain_seconds']:.2f}s")
+    if not report["drained"]:
+        abandoned = report["abandoned"]
+        print_warning(
+            f"Drain timed out: {abandoned['active']} operation(s) still running, "
+            f"{abandoned['pending']} queued"
+        )
+    if report["states_saved"] is not None:
+        print_info(f"Saved state for {report['states_saved']} node(s)")
+
+
 def _display_runtime_status(executor: RuntimeExecutor, verbose: bool,
                             state_enabled: bool = False, hot_reload_enabled: bool = False,
                             health_monitoring_enabled: bool = False, debug_enabled: bool = False):
@@ -20,6 +20,7 @@ from rich.prompt import Prompt
 from rich.live import Live
 from rich.text import Text
 
+from graphbus_core import codec
 from graphbus_cli.utils.output import (
     console, print_success, print_error, print_info, print_header
 )
@@ -78,8 +79,7 @@ def _load_agents(artifacts_dir: Path) -> list:
     if not agents_json.exists():
         return []
     try:
-        with open(agents_json) as f:
-            data = json.load(f)
+        data = codec.load(agents_json)
         return data if isinstance(data, list) else data.get("agents", [])
     except Exception:
         return []
@@ -6,7 +6,8 @@ import click
 from pathlib import Path
 from rich.table import Table
 
-from graphbus_core.runtime.state import StateManager
+from graphbus_core.codec import STORAGE_FORMATS
+from graphbus_core.runtime.state import StateManager, STATE_BACKENDS, convert_state_store
 from graphbus_cli.utils.output import (
     console, print_success, print_error, print_info,
     print_header
@@ -28,6 +29,7 @@ def state():
       graphbus state show HelloService # Show state for specific agent
       graphbus state clear HelloService # Clear state for specific agent
       graphbus state clear-all         # Clear all saved states
+      graphbus state convert --to sqlite # Move states into a SQLite database
     """
     pass
 
@@ -150,3 +152,54 @@ def clear_all(state_dir: str):
         state_file.unlink()
 
     print_success(f"Cleared {len(state_files)} state file(s)")
+
+
+@state.command()
+@click.option(
+    '--state-dir',
+    type=click.Path(file_okay=False, dir_okay=True),
+    default='.graphbus/state',
+    help='State directory location'
+)
+@click.option(
+    '--from', 'source',
+    type=click.Choice(sorted(STATE_BACKENDS)),
+    default='json',
+    help='Backend to read states from'
+)
+@click.option(
+    '--to', 'target',
+    type=click.Choice(sorted(STATE_BACKENDS)),
+    default='sqlite',
+    help='Backend to write states to'
+)
+@click.option(
+    '--format', 'storage_format',
+    type=click.Choice(STORAGE_FORMATS),
+    default='json',
+    help='Write converted states as JSON or compressed binary'
+)
+def convert(state_dir: str, source: str, target: str, storage_format: str):
+    """
+    Convert saved states between storage backends.
+
+    \b
+    The source states are left in place; run with
+    RuntimeConfig(state_backend=...) set to the target backend, then
+    remove the old files once satisfied.
+    """
+    state_path = Path(state_dir).resolve()
+
+    if not state_path.exists():
+        print_info(f"No state directory found at: {str(state_path)}")
+        return
+
+    try:
+        count = convert_state_store(
+            str(state_path), source=source, target=target, storage_format=storage_format
+        )
+    except (ValueError, OSError) as e:
+        print_error(f"Failed to convert states: {str(e)}")
+        raise SystemExit(1)
+
+    print_success(f"Converted {count} state(s) from {source} to {target}")
@@ -37,6 +37,7 @@ def cli(ctx):
       ingest    - Convert any existing codebase into GraphBus agents
       generate  - Generate agent boilerplate code
       profile   - Profile runtime performance
+      profile-dump - Dump a running runtime's continuous profile
       dashboard - Launch web-based visualization dashboard
 
     \b
@@ -95,7 +96,7 @@ from graphbus_cli.commands.state import state
 from graphbus_cli.commands.negotiate import negotiate
 from graphbus_cli.commands.init import init, list_templates_cmd
 from graphbus_cli.commands.generate import generate
-from graphbus_cli.commands.profile import profile
+from graphbus_cli.commands.profile import profile, profile_dump
 from graphbus_cli.commands.dashboard import dashboard
 from graphbus_cli.commands.docker import docker
 from graphbus_cli.commands.k8s import k8s
@@ -122,6 +123,7 @@ cli.add_command(init)
 cli.add_command(list_templates_cmd)
 cli.add_command(generate)
 cli.add_command(profile)
+cli.add_command(profile_dump)
 cli.add_command(dashboard)
 cli.add_command(docker)
 cli.add_command(k8s)
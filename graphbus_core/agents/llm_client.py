@@ -27,6 +27,7 @@ from graphbus_core.constants import (
     SPICYCHAI_BASE_URL,
 )
 from graphbus_core.exceptions import LLMResponseError
+from graphbus_core.runtime.chrome_trace import trace_phase
 
 # Suppress LiteLLM verbose logging by default
 litellm.set_verbose = False
@@ -90,6 +91,9 @@ class LLMClient:
             self._api_key = api_key
             self._base_url = base_url or os.getenv("OPENAI_API_BASE")
 
+        # Optional ChromeTraceRecorder; each completion becomes a timeline slice
+        self.trace_recorder = None
+
     def _base_kwargs(self, messages: list) -> dict:
         """Build the common LiteLLM completion kwargs shared by all call paths.
 
@@ -118,7 +122,9 @@ class LLMClient:
             messages.append({"role": "system", "content": system})
         messages.append({"role": "user", "content": prompt})
 
-        resp = litellm.completion(**self._base_kwargs(messages))
+        with trace_phase(self.trace_recorder, "llm.generate", "llm",
+                         model=self.model, prompt_chars=len(prompt)):
+            resp = litellm.completion(**self._base_kwargs(messages))
         return resp.choices[0].message.content or ""
 
     def generate_with_tool(
@@ -146,7 +152,9 @@ class LLMClient:
         kwargs["tools"] = [tool_def]
         kwargs["tool_choice"] = {"type": "function", "function": {"name": tool_name}}
 
-        resp = litellm.completion(**kwargs)
+        with trace_phase(self.trace_recorder, f"llm.generate_with_tool {tool_name}", "llm",
+                         model=self.model, prompt_chars=len(prompt)):
+            resp = litellm.completion(**kwargs)
         tool_calls = resp.choices[0].message.tool_calls
         if tool_calls:
             return json.loads(tool_calls[0].function.arguments)
@@ -8,6 +8,7 @@ from dataclasses import dataclass, field
 from typing import List
 from pathlib import Path
 
+from graphbus_core import codec
 from graphbus_core.model.agent_def import AgentDefinition
 from graphbus_core.model.graph import AgentGraph
 from graphbus_core.model.topic import Topic, Subscription
@@ -33,27 +34,35 @@ class BuildArtifacts:
     modified_files: List[str] = field(default_factory=list)
     output_dir: str = ".graphbus"
     success: bool = True  # Build success flag
+    storage_format: str = "json"  # "json" or "binary" for graph/agents/topics
 
     def save(self, output_dir: str | None = None) -> None:
         """
-        Save artifacts to disk as JSON files.
+        Save artifacts to disk.
+
+        graph.json, agents.json and topics.json are written in
+        ``storage_format``; the remaining files (summary, negotiation history,
+        modified files) are always plain JSON for humans and tooling.
 
         Args:
             output_dir: Directory to write artifacts (defaults to self.output_dir)
         """
         output_dir = output_dir or self.output_dir
         os.makedirs(output_dir, exist_ok=True)
+        storage_format = codec.validate_format(self.storage_format)
 
         # Save graph
         graph_path = os.path.join(output_dir, "graph.json")
-        self.graph.to_json(graph_path)
+        if storage_format == "json":
+            self.graph.to_json(graph_path)
+        else:
+            codec.dump(self.graph.to_dict(), graph_path, storage_format)
         print(f"Saved graph to {graph_path}")
 
         # Save agents
         agents_path = os.path.join(output_dir, "agents.json")
         agents_data = [agent.to_dict() for agent in self.agents]
-        with open(agents_path, "w") as f:
-            json.dump(agents_data, f, indent=2)
+        codec.dump(agents_data, agents_path, storage_format)
         print(f"Saved {len(self.agents)} agents to {agents_path}")
 
         # Save topics and subscriptions
@@ -62,8 +71,7 @@ class BuildArtifacts:
             "topics": [{"name": topic.name} for topic in self.topics],
             "subscriptions": [sub.to_dict() for sub in self.subscriptions]
         }
-        with open(topics_path, "w") as f:
-            json.dump(topics_data, f, indent=2)
+        codec.dump(topics_data, topics_path, storage_format)
         print(f"Saved topics to {topics_path}")
 
         # Save negotiations history
@@ -116,8 +124,7 @@ class BuildArtifacts:
 
         # Load agents
         agents_path = os.path.join(artifacts_dir, "agents.json")
-        with open(agents_path, "r") as f:
-            agents_data = json.load(f)
+        agents_data = codec.load(agents_path)
         agents = [AgentDefinition.from_dict(data) for data in agents_data]
 
         # Load topics
@@ -125,8 +132,7 @@ class BuildArtifacts:
         topics = []
         subscriptions = []
         if os.path.exists(topics_path):
-            with open(topics_path, "r") as f:
-                topics_data = json.load(f)
+            topics_data = codec.load(topics_path)
             topics = [Topic(t["name"]) for t in topics_data.get("topics", [])]
             subscriptions = [Subscription.from_dict(s) for s in topics_data.get("subscriptions", [])]
 
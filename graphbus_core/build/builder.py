@@ -106,7 +106,10 @@ def build_project(config: BuildConfig, enable_agents: bool = False) -> BuildArti
 
     # Stage 3.5: Extract and register contracts
     print("[3.5/5] Extracting API contracts...")
-    contract_manager = ContractManager(storage_path=f"{config.output_dir}/contracts")
+    contract_manager = ContractManager(
+        storage_path=f"{config.output_dir}/contracts",
+        storage_format=config.artifact_format
+    )
     contracts_extracted = 0
     for (class_obj, _, _), agent_def in zip(discovered_classes, agent_definitions):
         contract_info = extract_contract_from_agent(class_obj, agent_def)
@@ -172,7 +175,13 @@ def build_project(config: BuildConfig, enable_agents: bool = False) -> BuildArti
                 safety_config=config.safety_config,
                 user_intent=config.user_intent
             )
-            modified_files = orchestrator.run()
+            recorder = orchestrator.enable_chrome_trace() if config.chrome_trace else None
+            try:
+                modified_files = orchestrator.run()
+            finally:
+                if recorder is not None:
+                    recorder.write(config.chrome_trace)
+                    print(f"Chrome trace written to {config.chrome_trace} (open in ui.perfetto.dev)")
             negotiations = orchestrator.negotiation_engine.get_all_commits()
 
     # Collect topics and subscriptions
@@ -191,7 +200,8 @@ def build_project(config: BuildConfig, enable_agents: bool = False) -> BuildArti
         subscriptions=subscriptions,
         negotiations=negotiations,
         modified_files=modified_files,
-        output_dir=config.output_dir
+        output_dir=config.output_dir,
+        storage_format=config.artifact_format
     )
 
     # Save artifacts
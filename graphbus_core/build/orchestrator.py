@@ -2,6 +2,7 @@
 Agent orchestrator - activates agents and runs negotiation
 """
 
+import functools
 import logging
 from typing import Dict, List, Optional
 from graphbus_core.model.agent_def import AgentDefinition
@@ -26,10 +27,31 @@ from graphbus_core.exceptions import (
     GitWorkflowError
 )
 from graphbus_core.utils import format_exception_for_user
+from graphbus_core.runtime.chrome_trace import ChromeTraceRecorder, trace_phase
 
 
 logger = logging.getLogger(__name__)
 
+
+def _timeline(phase: str, per_round: bool = True):
+    """Record the decorated orchestrator phase on its Chrome trace timeline, if any."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            recorder = getattr(self, "trace_recorder", None)
+            if recorder is None:
+                return method(self, *args, **kwargs)
+            if per_round:
+                round_num = self.negotiation_engine.current_round + 1
+                context = trace_phase(recorder, f"{phase} round {round_num}", round=round_num)
+            else:
+                context = trace_phase(recorder, phase)
+            with context:
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
 class AgentOrchestrator:
     """
     Orchestrates agent activation and multi-round negotiation in Build Mode.
@@ -88,6 +110,21 @@ class AgentOrchestrator:
         self.git_workflow = GitWorkflowManager(project_root=project_root)
         self.session = session
         self.pr_feedback_context = None  # Will be populated if previous PR found
+        self.trace_recorder: Optional[ChromeTraceRecorder] = None  # Build timeline (see enable_chrome_trace)
+
+    def enable_chrome_trace(self, recorder: Optional[ChromeTraceRecorder] = None) -> ChromeTraceRecorder:
+        """
+        Record build phases and LLM calls as a Chrome trace timeline.
+
+        Args:
+            recorder: Recorder to add to (a new one if omitted)
+
+        Returns:
+            The recorder; write it with ``recorder.write(path)`` after :meth:`run`
+        """
+        self.trace_recorder = recorder or ChromeTraceRecorder(process_name="graphbus build")
+        self.llm_client.trace_recorder = self.trace_recorder
+        return self.trace_recorder
 
     def _broadcast_message(self, agent: str, message: str, level: str = "info"):
         """
@@ -116,6 +153,7 @@ class AgentOrchestrator:
             # Silently fail - don't interrupt orchestration if WebSocket fails
             pass
 
+    @_timeline("activate agents", per_round=False)
     def activate_agents(self) -> None:
         """
         Activate all agents (instantiate LLM agents).
@@ -141,6 +179,7 @@ class AgentOrchestrator:
         if self.user_intent:
             logger.info(f"[Orchestrator] All agents aware of user intent: \"{self.user_intent}\"")
 
+    @_timeline("analysis", per_round=False)
     def run_analysis_phase(self) -> None:
         """
         Each agent analyzes its own code.
@@ -280,6 +319,7 @@ class AgentOrchestrator:
             logger.info("[Orchestrator] No clarifying questions needed")
             return []
 
+    @_timeline("proposal")
     def run_proposal_phase(self) -> None:
         """
         Each agent proposes improvements in PARALLEL (not sequential).
@@ -307,6 +347,7 @@ class AgentOrchestrator:
         # Update counts
         self.negotiation_engine.proposal_counts = async_engine.proposal_counts
 
+    @_timeline("reconciliation")
     def run_reconciliation_phase(self) -> dict:
         """
         Arbiter reconciles all proposals holistically before individual evaluations.
@@ -381,6 +422,7 @@ class AgentOrchestrator:
             logger.info(f"[Orchestrator] Warning: Reconciliation failed: {e}")
             return {}
 
+    @_timeline("evaluation")
     def run_negotiation_round(self) -> List[CommitRecord]:
         """
         Run one round of negotiation:
@@ -412,6 +454,7 @@ class AgentOrchestrator:
         logger.info(f"[Orchestrator] Round {self.negotiation_engine.current_round}: {len(commits)} commits created")
         return commits
 
+    @_timeline("commit")
     def apply_code_changes(self, commits: List[CommitRecord]) -> List[str]:
         """
         Apply code changes from commits.
@@ -508,6 +551,7 @@ class AgentOrchestrator:
                 for suggestion in validation['suggestions']:
                     logger.info(f"    - {suggestion}")
 
+    @_timeline("negotiation", per_round=False)
     def run(self) -> List[str]:
         """
         Run the full multi-round agent orchestration:
@@ -0,0 +1,215 @@
+"""
+Storage codec for GraphBus files
+
+Everything GraphBus persists (build artifacts, agent state, contracts,
+coherence history) is JSON by default.  The ``"binary"`` storage format
+writes the same documents with a compact codec plus compression, behind a
+short magic header:
+
+    GBC1 | codec byte | compression byte | payload
+
+Readers never need to be told which format a file uses: :func:`loads`
+checks for the header and falls back to plain JSON, so binary and JSON
+files can sit side by side under their usual ``.json`` names.
+
+Codecs:     ``j`` compact JSON, ``m`` msgpack (if installed)
+Compression: ``n`` none, ``z`` zlib, ``s`` zstd (if ``zstandard`` is installed)
+"""
+
+import json
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+__all__ = [
+    "MAGIC",
+    "STORAGE_FORMATS",
+    "validate_format",
+    "is_binary",
+    "dumps",
+    "loads",
+    "pack_text",
+    "unpack_text",
+    "dump",
+    "load",
+]
+
+MAGIC = b"GBC1"
+HEADER_SIZE = len(MAGIC) + 2
+
+STORAGE_FORMATS = ("json", "binary")
+
+CODEC_JSON = b"j"
+CODEC_MSGPACK = b"m"
+
+COMPRESSION_NONE = b"n"
+COMPRESSION_ZLIB = b"z"
+COMPRESSION_ZSTD = b"s"
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def validate_format(storage_format: str) -> str:
+    """
+    Check a storage format name.
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if storage_format not in STORAGE_FORMATS:
+        raise ValueError(
+            f"Unknown storage format: {storage_format}. Must be one of {list(STORAGE_FORMATS)}"
+        )
+    return storage_format
+
+
+def is_binary(data: Union[bytes, str]) -> bool:
+    """Whether ``data`` starts with the binary storage header."""
+    return isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:len(MAGIC)]) == MAGIC
+
+
+def _compress(payload: bytes) -> tuple:
+    if zstandard is not None:
+        return COMPRESSION_ZSTD, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+    return COMPRESSION_ZLIB, zlib.compress(payload, ZLIB_LEVEL)
+
+
+def _decompress(compression: bytes, payload: bytes) -> bytes:
+    if compression == COMPRESSION_NONE:
+        return payload
+    if compression == COMPRESSION_ZLIB:
+        try:
+            return zlib.decompress(payload)
+        except zlib.error as e:
+            raise ValueError(f"Corrupt zlib payload: {e}")
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise ValueError("Data is zstd-compressed but the 'zstandard' package is not installed")
+        try:
+            return zstandard.ZstdDecompressor().decompress(payload)
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Corrupt zstd payload: {e}")
+    raise ValueError(f"Unknown compression byte: {compression!r}")
+
+
+def _frame(codec: bytes, payload: bytes) -> bytes:
+    compression, compressed = _compress(payload)
+    return MAGIC + codec + compression + compressed
+
+
+def _unframe(data: bytes) -> tuple:
+    data = bytes(data)
+    if len(data) < HEADER_SIZE:
+        raise ValueError("Truncated binary header")
+    codec = data[4:5]
+    return codec, _decompress(data[5:6], data[HEADER_SIZE:])
+
+
+def dumps(obj: Any, storage_format: str = "json") -> bytes:
+    """
+    Serialize ``obj`` for storage.
+
+    Args:
+        obj: JSON-compatible object
+        storage_format: ``"json"`` (indented, human-readable) or ``"binary"``
+
+    Returns:
+        Encoded bytes
+    """
+    if validate_format(storage_format) == "json":
+        return json.dumps(obj, indent=2).encode("utf-8")
+    if msgpack is not None:
+        return _frame(CODEC_MSGPACK, msgpack.packb(obj, use_bin_type=True))
+    return _frame(CODEC_JSON, json.dumps(obj, separators=(",", ":")).encode("utf-8"))
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Deserialize stored data, detecting the format from the header.
+
+    Raises:
+        ValueError: If the data is corrupt (``json.JSONDecodeError`` for bad JSON)
+    """
+    if not is_binary(data):
+        return json.loads(data)
+
+    codec, payload = _unframe(data)
+    if codec == CODEC_JSON:
+        return json.loads(payload)
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise ValueError("Data is msgpack-encoded but the 'msgpack' package is not installed")
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    raise ValueError(f"Unknown codec byte: {codec!r}")
+
+
+def pack_text(text: str) -> bytes:
+    """
+    Compress an already-serialized JSON document.
+
+    Used where the JSON text itself matters (e.g. state checkpoints, whose
+    byte-level layout is reused for delta compaction), so the payload stays
+    JSON and only compression is added.
+    """
+    return _frame(CODEC_JSON, text.encode("utf-8"))
+
+
+def unpack_text(data: Union[bytes, str]) -> str:
+    """
+    Return the JSON text of stored data, decompressing it if needed.
+
+    Raises:
+        ValueError: If the data is corrupt
+    """
+    if isinstance(data, str):
+        return data
+    if not is_binary(data):
+        return bytes(data).decode("utf-8")
+
+    codec, payload = _unframe(data)
+    if codec != CODEC_JSON:
+        return json.dumps(loads(data), separators=(",", ":"))
+    return payload.decode("utf-8")
+
+
+def dump(obj: Any, path: Union[str, Path], storage_format: str = "json") -> None:
+    """Write ``obj`` to ``path`` atomically in the given storage format."""
+    write_bytes_atomic(path, dumps(obj, storage_format))
+
+
+def load(path: Union[str, Path]) -> Any:
+    """Read a file written as JSON or in the binary storage format."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def write_bytes_atomic(path: Union[str, Path], data: bytes, fsync: bool = False) -> None:
+    """Write ``data`` to ``path`` via a temp file and rename."""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -71,6 +71,8 @@ class BuildConfig:
     enable_human_in_loop: bool = False  # Pause for human approval
     parallel_agents: bool = False  # Run agents in parallel when possible (future)
     enable_validation: bool = False  # Enable contract validation during build
+    artifact_format: str = "json"  # "json" or "binary" (compressed graph/agents/topics/contracts)
+    chrome_trace: str | None = None  # Write a Chrome trace timeline of agent orchestration here
 
 
 @dataclass
@@ -83,4 +85,31 @@ class RuntimeConfig:
     enable_message_bus: bool = True  # Enable static pub/sub routing
     enable_validation: bool = False  # Enable contract validation at runtime
     log_level: str = "INFO"
+    async_max_workers: int = 16  # Thread pool size for call_method_async/publish_async offload
+    async_node_concurrency: int = 4  # Max concurrent async calls in flight per node
+    drain_timeout: float = 30.0  # Seconds stop() waits for in-flight calls/events
+    bulkheads: dict[str, dict[str, Any]] = field(default_factory=dict)  # "Node" or "Node.method" -> @bulkhead kwargs
+    circuit_breakers: dict[str, dict[str, Any]] = field(default_factory=dict)  # "Node", "Node.method", "*" or "*.*" -> @circuit_breaker kwargs
+    state_backend: str = "json"  # State storage: "json" (one file per node) or "sqlite" (single WAL database)
+    state_write_behind: bool = True  # Queue state checkpoints and write them from a background thread
+    state_flush_interval: float = 1.0  # Max seconds a queued checkpoint waits before being written
+    state_delta_checkpoints: bool = False  # Append top-level key diffs, compacting into periodic full snapshots
+    scheduler_tick: float = 0.1  # Timing-wheel resolution (seconds) for @every/@cron jobs
+    storage_format: str = "json"  # "json" or "binary" (compressed) for state and coherence files
+    coherence_capacity: int = 10000  # Interactions kept by the coherence tracker (oldest overwritten)
+    checkpoint_dir: str = ".graphbus/checkpoints"  # Where coordinated checkpoints are written
+    checkpoint_retention: int = 5  # Coordinated checkpoints to keep (0 = all)
+    checkpoint_timeout: float = 10.0  # Max seconds a checkpoint waits for in-flight work to finish
+    history_max_entries: int | None = 1000  # Resident NodeMemory history entries per node (None = unbounded)
+    history_spill_dir: str | None = None  # Spill evicted history to <dir>/<node>.jsonl (None = drop it)
+    enable_tracing: bool = False  # Record causal spans for publishes, deliveries and method calls
+    trace_slowest: int = 100  # Slowest completed traces kept by the tracer
+    continuous_profiling: bool = False  # Keep a fixed-memory ring of recent latency, rates and resources
+    continuous_profile_minutes: float = 10.0  # History kept by the continuous profiling ring
+    continuous_profile_dir: str = ".graphbus/profiles"  # Where SIGUSR2 / profile-dump writes ring dumps
+    watchdog: bool = False  # Report calls and deliveries that run past their deadline
+    watchdog_deadline: float = 30.0  # Seconds a call may run before it is reported as hung
+    watchdog_deadlines: dict[str, float] = field(default_factory=dict)  # "Node" or "Node.method" -> seconds
+    watchdog_interval: float = 1.0  # Seconds between watchdog checks
+    watchdog_recover: bool = False  # Restart a node (via the health monitor) when one of its calls hangs
     extra_params: dict[str, Any] = field(default_factory=dict)
@@ -15,6 +15,10 @@ Quick reference::
         contract,        # Versioned API contracts for migration support
         schema_version,  # Per-handler schema version pinning
         auto_migrate,    # Automatic payload migration between schema versions
+        bulkhead,        # Per-node / per-method concurrency and rate limits
+        circuit_breaker, # Per-node / per-method failure isolation
+        every,           # Run a method on a fixed interval
+        cron,            # Run a method on a cron schedule
     )
 
 """
@@ -30,6 +34,10 @@ __all__ = [
     "contract",
     "schema_version",
     "auto_migrate",
+    "bulkhead",
+    "circuit_breaker",
+    "every",
+    "cron",
 ]
 
 
@@ -465,3 +473,231 @@ def auto_migrate(from_version: str, to_version: str) -> Callable:
         return wrapper
 
     return decorator
+
+
+def bulkhead(
+    max_concurrent: int | None = None,
+    rate: float | None = None,
+    burst: float | None = None,
+    policy: str = "queue",
+    timeout: float | None = None,
+) -> Callable:
+    """Isolate a node (class decorator) or one of its methods behind a bulkhead.
+
+    At runtime the :class:`~graphbus_core.runtime.executor.RuntimeExecutor`
+    enforces these limits around ``call_method`` and event delivery.  A call to
+    a method passes through the node-level bulkhead first, then the
+    method-level one.  Limits may also be declared without touching code via
+    ``RuntimeConfig.bulkheads``, which takes precedence over the decorator.
+
+    Args:
+        max_concurrent: Maximum executions in flight at once.
+        rate: Sustained executions per second (token-bucket refill rate).
+        burst: Token-bucket capacity; defaults to ``max(1, rate)``.
+        policy: ``"queue"`` makes excess callers wait for capacity;
+            ``"fail_fast"`` raises
+            :class:`~graphbus_core.exceptions.BulkheadRejectedError` at once.
+        timeout: Maximum seconds a queued caller waits before being rejected.
+
+    Returns:
+        A decorator that attaches a ``_graphbus_bulkhead`` dict to the class
+        or function without wrapping it.
+
+    Example::
+
+        from graphbus_core.decorators import bulkhead, subscribe
+        from graphbus_core.node_base import GraphBusNode
+
+        @bulkhead(max_concurrent=8)
+        class SearchService(GraphBusNode):
+
+            @bulkhead(rate=50, policy="fail_fast")
+            def reindex(self) -> dict:
+                ...
+    """
+    if policy not in ("queue", "fail_fast"):
+        raise ValueError(f"Invalid bulkhead policy: {policy}. Must be 'queue' or 'fail_fast'")
+
+    spec = {
+        "max_concurrent": max_concurrent,
+        "rate": rate,
+        "burst": burst,
+        "policy": policy,
+        "timeout": timeout,
+    }
+
+    def decorator(target):
+        target._graphbus_bulkhead = spec
+        return target
+
+    return decorator
+
+
+def circuit_breaker(
+    failure_rate: float = 0.5,
+    min_calls: int = 10,
+    window_seconds: float = 30.0,
+    window_buckets: int = 10,
+    open_seconds: float = 30.0,
+    probe_budget: int = 3,
+) -> Callable:
+    """Guard a node (class decorator) or one of its methods with a circuit breaker.
+
+    At runtime the :class:`~graphbus_core.runtime.executor.RuntimeExecutor`
+    checks the breaker before ``call_method`` and event delivery.  When the
+    failure rate over the last ``window_seconds`` reaches ``failure_rate``
+    the breaker opens and calls fail at once with
+    :class:`~graphbus_core.exceptions.CircuitOpenError`; after
+    ``open_seconds`` up to ``probe_budget`` trial calls decide whether it
+    closes again.  Breakers may also be declared via
+    ``RuntimeConfig.circuit_breakers``, which takes precedence.
+
+    Args:
+        failure_rate: Fraction of failed calls in the window that opens the breaker.
+        min_calls: Calls the window must hold before the rate is judged.
+        window_seconds: Length of the sliding window.
+        window_buckets: Time buckets the window is divided into.
+        open_seconds: Seconds an open breaker rejects calls before probing.
+        probe_budget: Trial calls admitted while half-open.
+
+    Returns:
+        A decorator that attaches a ``_graphbus_circuit_breaker`` dict to the
+        class or function without wrapping it.
+
+    Example::
+
+        from graphbus_core.decorators import circuit_breaker
+        from graphbus_core.node_base import GraphBusNode
+
+        class PaymentGateway(GraphBusNode):
+
+            @circuit_breaker(failure_rate=0.3, open_seconds=10)
+            def charge(self, order_id: str) -> dict:
+                ...
+    """
+    spec = {
+        "failure_rate": failure_rate,
+        "min_calls": min_calls,
+        "window_seconds": window_seconds,
+        "window_buckets": window_buckets,
+        "open_seconds": open_seconds,
+        "probe_budget": probe_budget,
+    }
+
+    def decorator(target):
+        target._graphbus_circuit_breaker = spec
+        return target
+
+    return decorator
+
+
+def _add_schedule(func: Callable, spec: Dict[str, Any]) -> Callable:
+    schedules = list(getattr(func, "_graphbus_schedules", []))
+    schedules.append(spec)
+    func._graphbus_schedules = schedules
+    return func
+
+
+def every(
+    interval: str | float,
+    publish: str | None = None,
+    missed: str = "fire_once",
+    jitter: str | float = 0,
+) -> Callable:
+    """Run a node method periodically while the runtime is running.
+
+    All scheduled methods share one timing-wheel thread owned by the
+    :class:`~graphbus_core.runtime.executor.RuntimeExecutor`.  Each run goes
+    through ``call_method``, so bulkheads, health monitoring and graceful
+    drain apply as for any other call.  The method must take no arguments
+    besides ``self``.
+
+    Args:
+        interval: Period as a duration string (``"500ms"``, ``"5s"``,
+            ``"2m"``, ``"1h"``) or a number of seconds.
+        publish: Optional topic; the method's return value is published to it
+            after each run (non-dict results are wrapped as ``{"result": ...}``;
+            ``None`` skips the publish).
+        missed: What to do when runs were missed because the runtime was busy:
+            ``"fire_once"`` runs once and resumes, ``"fire_all"`` runs once per
+            missed period, ``"skip"`` drops late runs.
+        jitter: Maximum random delay added to each run, to spread load when
+            many nodes share a period.
+
+    Returns:
+        A decorator that appends to the function's ``_graphbus_schedules``
+        list without wrapping it (decorators may be stacked).
+
+    Example::
+
+        from graphbus_core.decorators import every
+        from graphbus_core.node_base import GraphBusNode
+
+        class HeartbeatService(GraphBusNode):
+
+            @every("5s", publish="/System/Heartbeat", jitter="500ms")
+            def heartbeat(self) -> dict:
+                return {"status": "alive"}
+    """
+    from graphbus_core.runtime.scheduler import MISSED_POLICIES, parse_duration
+
+    if missed not in MISSED_POLICIES:
+        raise ValueError(f"Invalid missed-tick policy: {missed}. Must be one of {MISSED_POLICIES}")
+    parse_duration(interval)
+
+    spec = {"every": interval, "publish": publish, "missed": missed, "jitter": jitter}
+
+    def decorator(func: Callable) -> Callable:
+        return _add_schedule(func, spec)
+
+    return decorator
+
+
+def cron(
+    expression: str,
+    publish: str | None = None,
+    missed: str = "fire_once",
+    jitter: str | float = 0,
+) -> Callable:
+    """Run a node method on a cron schedule while the runtime is running.
+
+    Same semantics as :func:`every`, but the schedule is a standard five-field
+    cron expression (``minute hour day month weekday``) evaluated against
+    local wall-clock time.
+
+    Args:
+        expression: Cron expression, e.g. ``"*/5 * * * *"`` or ``"0 2 * * 1-5"``.
+        publish: Optional topic to publish the method's return value to.
+        missed: Missed-tick policy (``"fire_once"``, ``"fire_all"``, ``"skip"``).
+        jitter: Maximum random delay added to each run.
+
+    Returns:
+        A decorator that appends to the function's ``_graphbus_schedules``
+        list without wrapping it.
+
+    Raises:
+        ValueError: If the cron expression is malformed.
+
+    Example::
+
+        from graphbus_core.decorators import cron
+        from graphbus_core.node_base import GraphBusNode
+
+        class ReportService(GraphBusNode):
+
+            @cron("0 2 * * *", publish="/Report/Nightly")
+            def nightly_report(self) -> dict:
+                ...
+    """
+    from graphbus_core.runtime.scheduler import MISSED_POLICIES, CronExpression
+
+    if missed not in MISSED_POLICIES:
+        raise ValueError(f"Invalid missed-tick policy: {missed}. Must be one of {MISSED_POLICIES}")
+    CronExpression(expression)
+
+    spec = {"cron": expression, "publish": publish, "missed": missed, "jitter": jitter}
+
+    def decorator(func: Callable) -> Callable:
+        return _add_schedule(func, spec)
+
+    return decorator
@@ -87,3 +87,26 @@ class GitWorkflowError(GraphBusError):
 class SessionError(GraphBusError):
     """Errors in negotiation session management"""
     pass
+
+
+class BulkheadRejectedError(GraphBusError):
+    """A node or method bulkhead refused a call (limit reached or queue timeout)"""
+    def __init__(self, message: str, scope: str = None):
+        super().__init__(message)
+        self.scope = scope
+
+
+class CircuitOpenError(GraphBusError):
+    """A node or method circuit breaker is open (or out of half-open probes) and refused a call"""
+    def __init__(self, message: str, scope: str = None, retry_after: float = None):
+        super().__init__(message)
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class NodeRestartingError(GraphBusError):
+    """A call reached a node while it was being restarted by the health monitor"""
+    def __init__(self, message: str, node_name: str = None, retry_after: float = None):
+        super().__init__(message)
+        self.node_name = node_name
+        self.retry_after = retry_after
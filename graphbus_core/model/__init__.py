@@ -7,6 +7,7 @@ from graphbus_core.model.schema import Schema, SchemaMethod
 from graphbus_core.model.topic import Topic, Subscription
 from graphbus_core.model.message import Message, Event, Proposal, ProposalEvaluation, CommitRecord, CodeChange, SchemaChange
 from graphbus_core.model.agent_def import AgentDefinition, NodeMemory
+from graphbus_core.model.history import HistoryLog
 from graphbus_core.model.graph import GraphBusGraph, AgentGraph
 
 __all__ = [
@@ -24,6 +25,7 @@ __all__ = [
     "SchemaChange",
     "AgentDefinition",
     "NodeMemory",
+    "HistoryLog",
     "GraphBusGraph",
     "AgentGraph",
 ]
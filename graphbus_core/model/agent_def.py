@@ -5,6 +5,7 @@ Agent definition and memory primitives
 from dataclasses import dataclass, field
 from typing import Any
 
+from graphbus_core.model.history import DEFAULT_MAX_ENTRIES, HistoryLog
 from graphbus_core.model.prompt import SystemPrompt
 from graphbus_core.model.schema import SchemaMethod
 from graphbus_core.model.topic import Subscription
@@ -17,11 +18,24 @@ class NodeMemory:
 
     Build Mode: Used by LLM agents to track negotiation history and decisions.
     Runtime Mode: Minimal or unused - execution is stateless.
+
+    ``history`` is a bounded :class:`HistoryLog`: only the newest
+    ``max_history`` entries stay in memory, older ones are appended to
+    ``history_spill_path`` (if set) where :meth:`query_history` can still
+    find them.
     """
     state: dict[str, Any] = field(default_factory=dict)  # current agent state
-    history: list[dict] = field(default_factory=list)  # logs, observations, negotiation outcomes
+    history: HistoryLog = field(default_factory=HistoryLog)  # logs, observations, negotiation outcomes
     code_understanding: dict = field(default_factory=dict)  # agent's analysis of its source code
     pending_proposals: list[str] = field(default_factory=list)  # proposal IDs awaiting resolution
+    max_history: int | None = DEFAULT_MAX_ENTRIES  # resident history entries (None = unbounded)
+    history_spill_path: str | None = None  # JSON-lines file for evicted history (None = drop them)
+
+    def __post_init__(self) -> None:
+        if isinstance(self.history, HistoryLog):
+            self.history.configure(self.max_history, self.history_spill_path)
+        else:
+            self.history = HistoryLog(self.history, self.max_history, self.history_spill_path)
 
     def store(self, key: str, value: Any) -> None:
         """Store a value in agent memory."""
@@ -35,6 +49,30 @@ class NodeMemory:
         """Add an event to the history log."""
         self.history.append(event)
 
+    def query_history(self, start: float | None = None, end: float | None = None,
+                      key: str | None = None, **kwargs: Any) -> list:
+        """
+        Find history entries, including spilled ones, oldest first.
+
+        See :meth:`HistoryLog.query` for the filters.
+        """
+        return self.history.query(start=start, end=end, key=key, **kwargs)
+
+    def configure_history(self, max_history: int | None = DEFAULT_MAX_ENTRIES,
+                          spill_path: str | None = None) -> None:
+        """Change the resident history limit and spill file."""
+        self.max_history = max_history
+        self.history_spill_path = spill_path
+        self.history.configure(max_history, spill_path)
+
+    def memory_stats(self) -> dict[str, Any]:
+        """Sizes of this node's memory: state keys, proposals and history."""
+        return {
+            "state_keys": len(self.state),
+            "pending_proposals": len(self.pending_proposals),
+            "history": self.history.stats(),
+        }
+
 
 @dataclass
 class AgentDefinition:
@@ -6,6 +6,8 @@ import networkx as nx
 from typing import Any
 import json
 
+from graphbus_core import codec
+
 
 class GraphBusGraph:
     """
@@ -87,10 +89,8 @@ class GraphBusGraph:
 
     @classmethod
     def from_json(cls, filepath: str) -> "GraphBusGraph":
-        """Load graph from JSON file."""
-        with open(filepath, "r") as f:
-            data = json.load(f)
-        return cls.from_dict(data)
+        """Load graph from a JSON (or binary storage format) file."""
+        return cls.from_dict(codec.load(filepath))
 
     def __len__(self) -> int:
         """Number of nodes in the graph."""
@@ -0,0 +1,329 @@
+"""
+Bounded node history with optional spill to disk
+
+:class:`HistoryLog` keeps the most recent history entries in memory and,
+when a spill path is configured, appends older entries to a JSON-lines file
+instead of discarding them.  A fixed-size binary index next to the file
+(``<spill>.idx``: timestamp, offset and length per entry) lets spilled
+entries be found by time range or key without loading the file.
+"""
+
+import json
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+DEFAULT_MAX_ENTRIES = 1000
+
+# timestamp, byte offset, byte length
+INDEX_RECORD = struct.Struct("<dQI")
+
+
+class HistorySpill:
+    """
+    Append-only JSON-lines file of evicted history entries plus its index.
+
+    Timestamps, offsets and lengths are held in compact arrays (20 bytes per
+    entry); entry contents stay on disk until queried.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open (or create) a spill file, loading an existing index.
+
+        Args:
+            path: Path of the JSON-lines file; the index is ``<path>.idx``
+        """
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._times = array("d")
+        self._offsets = array("Q")
+        self._lengths = array("I")
+        # key -> entry numbers; None until rebuilt for a reopened file
+        self._keys: Optional[Dict[str, array]] = {}
+        self._load_index()
+
+        self._data = open(self.path, "ab")
+        self._index = open(self.index_path, "ab")
+        self._size = self._data.tell()
+
+    def _load_index(self) -> None:
+        if not self.index_path.exists():
+            return
+        data_size = self.path.stat().st_size if self.path.exists() else 0
+        raw = self.index_path.read_bytes()
+        valid = 0
+        for timestamp, offset, length in INDEX_RECORD.iter_unpack(raw[:len(raw) - len(raw) % INDEX_RECORD.size]):
+            if offset + length > data_size:
+                break  # entry never made it to the data file
+            self._times.append(timestamp)
+            self._offsets.append(offset)
+            self._lengths.append(length)
+            valid += 1
+        if valid * INDEX_RECORD.size != len(raw):
+            with open(self.index_path, "r+b") as f:
+                f.truncate(valid * INDEX_RECORD.size)
+        if valid:
+            self._keys = None
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def append(self, timestamp: float, event: dict) -> None:
+        """Append one entry to the file and the index."""
+        line = json.dumps({"t": timestamp, "e": event}, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+        offset = self._size
+        self._data.write(line)
+        self._index.write(INDEX_RECORD.pack(timestamp, offset, len(line)))
+        self._size += len(line)
+
+        number = len(self._times)
+        self._times.append(timestamp)
+        self._offsets.append(offset)
+        self._lengths.append(len(line))
+        if self._keys is not None and isinstance(event, dict):
+            for key in event:
+                self._keys.setdefault(str(key), array("I")).append(number)
+
+    def flush(self) -> None:
+        """Flush buffered writes so readers see every spilled entry."""
+        self._data.flush()
+        self._index.flush()
+
+    def close(self) -> None:
+        """Flush and close the file handles."""
+        if not self._data.closed:
+            self.flush()
+            self._data.close()
+            self._index.close()
+
+    def _read(self, numbers: Iterable[int]) -> Iterator[tuple]:
+        self.flush()
+        with open(self.path, "rb") as f:
+            for number in numbers:
+                f.seek(self._offsets[number])
+                record = json.loads(f.read(self._lengths[number]))
+                yield record["t"], record["e"]
+
+    def _key_index(self) -> Dict[str, array]:
+        if self._keys is None:
+            keys: Dict[str, array] = {}
+            for number, (_, event) in enumerate(self._read(range(len(self._times)))):
+                if isinstance(event, dict):
+                    for key in event:
+                        keys.setdefault(str(key), array("I")).append(number)
+            self._keys = keys
+        return self._keys
+
+    def select(self, start: Optional[float] = None, end: Optional[float] = None,
+               key: Optional[str] = None) -> Iterator[tuple]:
+        """
+        Yield ``(timestamp, event)`` for spilled entries in ``[start, end]``
+        that contain ``key``, oldest first.
+        """
+        lo = 0 if start is None else bisect_left(self._times, start)
+        hi = len(self._times) if end is None else bisect_right(self._times, end)
+        if lo >= hi:
+            return iter(())
+        if key is None:
+            return self._read(range(lo, hi))
+        numbers = self._key_index().get(key, array("I"))
+        return self._read(numbers[bisect_left(numbers, lo):bisect_left(numbers, hi)])
+
+    def stats(self) -> Dict[str, Any]:
+        """Spilled entry count, file sizes and resident index size."""
+        index_bytes = sum(a.itemsize * len(a) for a in (self._times, self._offsets, self._lengths))
+        if self._keys:
+            index_bytes += sum(a.itemsize * len(a) for a in self._keys.values())
+        return {
+            "spill_path": str(self.path),
+            "spilled_entries": len(self._times),
+            "spill_file_bytes": self._size,
+            "index_resident_bytes": index_bytes,
+        }
+
+
+class HistoryLog:
+    """
+    Bounded, list-like history log.
+
+    Appending beyond ``max_entries`` evicts the oldest resident entry, which
+    is written to the spill file if one is configured and counted as dropped
+    otherwise.  Iteration, ``len()`` and indexing cover the resident entries;
+    :meth:`query` also searches spilled ones.
+    """
+
+    def __init__(self, entries: Iterable[dict] = (), max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+                 spill_path: Optional[Union[str, Path]] = None):
+        """
+        Initialize history log.
+
+        Args:
+            entries: Initial entries, oldest first
+            max_entries: Resident entry limit (None or 0 = unbounded)
+            spill_path: JSON-lines file receiving evicted entries (None = drop them)
+        """
+        self.max_entries = max_entries or None
+        self._entries: deque = deque()  # (timestamp, event)
+        self._spill: Optional[HistorySpill] = HistorySpill(spill_path) if spill_path else None
+        self._lock = threading.RLock()
+        self._last_time = 0.0
+        self.dropped = 0
+        for entry in entries:
+            self.append(entry)
+
+    def configure(self, max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+                  spill_path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Change the resident limit and spill file, evicting entries over the new limit.
+
+        Args:
+            max_entries: Resident entry limit (None or 0 = unbounded)
+            spill_path: JSON-lines file receiving evicted entries (None = drop them)
+        """
+        with self._lock:
+            if self._spill is not None and (spill_path is None or Path(spill_path) != self._spill.path):
+                self._spill.close()
+                self._spill = None
+            if spill_path is not None and self._spill is None:
+                self._spill = HistorySpill(spill_path)
+            self.max_entries = max_entries or None
+            self._evict()
+
+    def _now(self) -> float:
+        # Keep timestamps non-decreasing so spilled entries stay sorted for bisect
+        now = max(time.time(), self._last_time)
+        self._last_time = now
+        return now
+
+    def _evict(self) -> None:
+        if self.max_entries is None:
+            return
+        while len(self._entries) > self.max_entries:
+            timestamp, event = self._entries.popleft()
+            if self._spill is not None:
+                self._spill.append(timestamp, event)
+            else:
+                self.dropped += 1
+
+    def append(self, event: dict) -> None:
+        """Add an entry, evicting the oldest one if the log is full."""
+        with self._lock:
+            self._entries.append((self._now(), event))
+            self._evict()
+
+    def extend(self, events: Iterable[dict]) -> None:
+        """Add several entries."""
+        for event in events:
+            self.append(event)
+
+    def clear(self) -> None:
+        """Drop the resident entries (spilled entries are kept on disk)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[dict]:
+        return (event for _, event in list(self._entries))
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [event for _, event in list(self._entries)[item]]
+        return self._entries[item][1]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (HistoryLog, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"HistoryLog({list(self)!r}, max_entries={self.max_entries})"
+
+    def query(self, start: Optional[float] = None, end: Optional[float] = None,
+              key: Optional[str] = None, value: Any = ...,
+              limit: Optional[int] = None, include_timestamps: bool = False) -> List[Any]:
+        """
+        Find entries, spilled and resident, oldest first.
+
+        Args:
+            start: Earliest timestamp (epoch seconds, inclusive)
+            end: Latest timestamp (inclusive)
+            key: Only entries containing this top-level key
+            value: With ``key``, only entries where it equals this value
+            limit: Return at most this many (the newest matches)
+            include_timestamps: Return ``(timestamp, event)`` pairs instead of events
+        """
+        with self._lock:
+            resident = list(self._entries)
+            spilled = self._spill.select(start, end, key) if self._spill is not None else iter(())
+            matches = [record for record in spilled if _matches(record[1], key, value)]
+
+        for timestamp, event in resident:
+            if start is not None and timestamp < start:
+                continue
+            if end is not None and timestamp > end:
+                break
+            if _matches(event, key, value):
+                matches.append((timestamp, event))
+
+        if limit is not None:
+            matches = matches[-limit:] if limit else []
+        return matches if include_timestamps else [event for _, event in matches]
+
+    def stats(self) -> Dict[str, Any]:
+        """Resident and spilled entry counts and approximate memory use."""
+        with self._lock:
+            resident = list(self._entries)
+            stats = {
+                "resident_entries": len(resident),
+                "max_entries": self.max_entries,
+                "resident_bytes": sum(_approx_size(event) for _, event in resident),
+                "dropped_entries": self.dropped,
+                "spilled_entries": 0,
+            }
+            if self._spill is not None:
+                stats.update(self._spill.stats())
+        return stats
+
+    def flush(self) -> None:
+        """Flush the spill file."""
+        with self._lock:
+            if self._spill is not None:
+                self._spill.flush()
+
+    def close(self) -> None:
+        """Close the spill file (resident entries are kept)."""
+        with self._lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+
+def _matches(event: Any, key: Optional[str], value: Any) -> bool:
+    if key is None:
+        return True
+    if not isinstance(event, dict) or key not in event:
+        return False
+    return value is ... or event[key] == value
+
+
+def _approx_size(obj: Any, _depth: int = 0) -> int:
+    """Rough deep size of a JSON-like object in bytes."""
+    size = sys.getsizeof(obj)
+    if _depth > 8:
+        return size
+    if isinstance(obj, dict):
+        size += sum(_approx_size(k, _depth + 1) + _approx_size(v, _depth + 1) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(_approx_size(v, _depth + 1) for v in obj)
+    return size
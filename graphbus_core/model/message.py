@@ -32,6 +32,8 @@ class Event:
     src: str
     payload: dict[str, Any]
     timestamp: float = field(default_factory=time.time)
+    trace_id: str | None = None  # causal trace this event belongs to
+    parent_id: str | None = None  # span that published it
 
 
 # Build Mode Only - Negotiation Primitives
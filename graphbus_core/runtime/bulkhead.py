@@ -0,0 +1,443 @@
+"""
+Bulkheads - Per-node and per-method isolation for Runtime Mode
+
+Caps how many executions of a node (or a single method) may run at once and
+how fast new ones may start, so one noisy node cannot starve the rest of the
+graph during a load spike.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, FrozenSet, Iterator, List, Optional
+from contextlib import asynccontextmanager, contextmanager
+
+from graphbus_core.exceptions import BulkheadRejectedError
+
+
+POLICY_QUEUE = "queue"
+POLICY_FAIL_FAST = "fail_fast"
+_POLICIES = (POLICY_QUEUE, POLICY_FAIL_FAST)
+
+# Bulkheads held by the current call chain (the bus dispatches synchronously,
+# so a handler publishing to its own node re-enters the same scope)
+_held_bulkheads: contextvars.ContextVar[FrozenSet["Bulkhead"]] = contextvars.ContextVar(
+    "graphbus_held_bulkheads", default=frozenset()
+)
+
+
+@dataclass
+class BulkheadSpec:
+    """
+    Declared limits for one node or node method.
+
+    Attributes:
+        max_concurrent: Maximum executions in flight (None = unlimited)
+        rate: Sustained executions per second (None = unlimited)
+        burst: Token-bucket capacity (defaults to ``max(1, rate)``)
+        policy: ``"queue"`` to wait for capacity, ``"fail_fast"`` to reject
+        timeout: Max seconds a queued caller waits (None = wait forever)
+    """
+    max_concurrent: Optional[int] = None
+    rate: Optional[float] = None
+    burst: Optional[float] = None
+    policy: str = POLICY_QUEUE
+    timeout: Optional[float] = None
+
+    def __post_init__(self):
+        if self.policy not in _POLICIES:
+            raise ValueError(f"Invalid bulkhead policy: {self.policy}. Must be one of {_POLICIES}")
+        if self.max_concurrent is not None and self.max_concurrent < 1:
+            raise ValueError("max_concurrent must be >= 1")
+        if self.rate is not None and self.rate <= 0:
+            raise ValueError("rate must be > 0")
+        if self.burst is not None and self.burst < 1:
+            raise ValueError("burst must be >= 1")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BulkheadSpec":
+        """Build a spec from a ``RuntimeConfig.bulkheads`` / decorator dict."""
+        return cls(
+            max_concurrent=data.get("max_concurrent"),
+            rate=data.get("rate"),
+            burst=data.get("burst"),
+            policy=data.get("policy", POLICY_QUEUE),
+            timeout=data.get("timeout"),
+        )
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Refill rate in tokens per second
+            capacity: Maximum tokens held (default: ``max(1, rate)``)
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens if available.
+
+        Returns:
+            0.0 on success, otherwise the seconds until enough tokens exist
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class Bulkhead:
+    """
+    Concurrency limit plus optional token-bucket rate limit for one scope.
+
+    Use as a context manager around the protected execution::
+
+        with bulkhead:
+            handler(payload)
+
+    Raises BulkheadRejectedError when the policy is ``fail_fast`` and no
+    capacity is available, or when a queued caller exceeds ``timeout``.
+    """
+
+    def __init__(self, name: str, spec: BulkheadSpec):
+        """
+        Initialize bulkhead.
+
+        Args:
+            name: Scope name, ``"Node"`` or ``"Node.method"``
+            spec: Declared limits
+        """
+        self.name = name
+        self.spec = spec
+        self._slots = (
+            threading.BoundedSemaphore(spec.max_concurrent)
+            if spec.max_concurrent is not None else None
+        )
+        self._bucket = TokenBucket(spec.rate, spec.burst) if spec.rate is not None else None
+        self._stats_lock = threading.Lock()
+
+        self.active = 0
+        self.peak_active = 0
+        self.waiting = 0
+        self.accepted_total = 0
+        self.rejected_total = 0
+        self.queued_total = 0
+        self.wait_time_total = 0.0
+
+    def acquire(self) -> None:
+        """Acquire capacity according to the bulkhead policy."""
+        fail_fast = self.spec.policy == POLICY_FAIL_FAST
+        deadline = (
+            time.monotonic() + self.spec.timeout
+            if self.spec.timeout is not None else None
+        )
+        queued = False
+        wait_start = time.monotonic()
+
+        try:
+            # Rate limit first so callers waiting on tokens do not hold a slot.
+            if self._bucket is not None:
+                while True:
+                    wait = self._bucket.try_acquire()
+                    if wait == 0.0:
+                        break
+                    if fail_fast:
+                        self._reject("rate limit exceeded")
+                    if not queued:
+                        queued = self._mark_queued()
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._reject("timed out waiting for rate limit")
+                        wait = min(wait, remaining)
+                    time.sleep(wait)
+
+            if self._slots is not None:
+                if not self._slots.acquire(blocking=False):
+                    if fail_fast:
+                        self._reject("concurrency limit reached")
+                    if not queued:
+                        queued = self._mark_queued()
+                    timeout = None
+                    if deadline is not None:
+                        timeout = max(0.0, deadline - time.monotonic())
+                    if not self._slots.acquire(timeout=timeout):
+                        self._reject("timed out waiting for a concurrency slot")
+        finally:
+            if queued:
+                with self._stats_lock:
+                    self.waiting -= 1
+                    self.wait_time_total += time.monotonic() - wait_start
+
+        with self._stats_lock:
+            self.active += 1
+            self.accepted_total += 1
+            if self.active > self.peak_active:
+                self.peak_active = self.active
+
+    def release(self) -> None:
+        """Release capacity taken by :meth:`acquire`."""
+        with self._stats_lock:
+            self.active -= 1
+        if self._slots is not None:
+            self._slots.release()
+
+    def __enter__(self) -> "Bulkhead":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+    def _mark_queued(self) -> bool:
+        with self._stats_lock:
+            self.waiting += 1
+            self.queued_total += 1
+        return True
+
+    def _reject(self, reason: str) -> None:
+        with self._stats_lock:
+            self.rejected_total += 1
+        raise BulkheadRejectedError(f"Bulkhead '{self.name}' rejected call: {reason}", scope=self.name)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get limiter statistics.
+
+        Returns:
+            Dict with current and cumulative counters
+        """
+        with self._stats_lock:
+            stats = {
+                "max_concurrent": self.spec.max_concurrent,
+                "rate": self.spec.rate,
+                "policy": self.spec.policy,
+                "active": self.active,
+                "peak_active": self.peak_active,
+                "waiting": self.waiting,
+                "accepted_total": self.accepted_total,
+                "rejected_total": self.rejected_total,
+                "queued_total": self.queued_total,
+                "wait_time_total": self.wait_time_total,
+            }
+        if self._bucket is not None:
+            stats["tokens_available"] = self._bucket.available
+        return stats
+
+    def __repr__(self) -> str:
+        return (
+            f"Bulkhead({self.name!r}, "
+            f"max_concurrent={self.spec.max_concurrent}, "
+            f"rate={self.spec.rate}, "
+            f"policy={self.spec.policy!r})"
+        )
+
+
+class BulkheadRegistry:
+    """
+    Resolves the bulkheads that guard a node method.
+
+    A call to ``Node.method`` passes through the node-level bulkhead (if
+    declared) and then the method-level one (if declared).  Scopes without a
+    declaration cost a single dict lookup.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._bulkheads: Dict[str, Bulkhead] = {}
+
+    def configure(self, scope: str, spec: BulkheadSpec) -> Bulkhead:
+        """
+        Declare (or replace) limits for a scope.
+
+        Args:
+            scope: ``"Node"`` or ``"Node.method"``
+            spec: Limits to enforce
+
+        Returns:
+            The created Bulkhead
+        """
+        bulkhead = Bulkhead(scope, spec)
+        self._bulkheads[scope] = bulkhead
+        return bulkhead
+
+    def configure_node(self, node_name: str, node: Any) -> None:
+        """
+        Register limits declared with ``@bulkhead`` on a node class and its methods.
+
+        Args:
+            node_name: Runtime name of the node
+            node: Node instance
+        """
+        cls = type(node)
+        spec = getattr(cls, "_graphbus_bulkhead", None)
+        if spec is not None:
+            self.configure(node_name, BulkheadSpec.from_dict(spec))
+
+        for attr_name in dir(cls):
+            if attr_name.startswith("_"):
+                continue
+            attr = getattr(cls, attr_name, None)
+            spec = getattr(attr, "_graphbus_bulkhead", None) if callable(attr) else None
+            if spec is not None:
+                self.configure(f"{node_name}.{attr_name}", BulkheadSpec.from_dict(spec))
+
+    def remove_node(self, node_name: str) -> None:
+        """Drop every bulkhead belonging to a node."""
+        prefix = f"{node_name}."
+        for scope in list(self._bulkheads):
+            if scope == node_name or scope.startswith(prefix):
+                del self._bulkheads[scope]
+
+    def get(self, scope: str) -> Optional[Bulkhead]:
+        """Get the bulkhead for a scope, if any."""
+        return self._bulkheads.get(scope)
+
+    def resolve(self, node_name: str, method_name: str) -> List[Bulkhead]:
+        """Bulkheads guarding ``node_name.method_name``, outermost first."""
+        resolved = []
+        node_bulkhead = self._bulkheads.get(node_name)
+        if node_bulkhead is not None:
+            resolved.append(node_bulkhead)
+        method_bulkhead = self._bulkheads.get(f"{node_name}.{method_name}")
+        if method_bulkhead is not None:
+            resolved.append(method_bulkhead)
+        return resolved
+
+    @contextmanager
+    def guard(self, node_name: str, method_name: str) -> Iterator[None]:
+        """
+        Hold every applicable bulkhead for the duration of the block.
+
+        Bulkheads already held by the calling context (a handler publishing
+        an event to its own node) are not acquired again, so nested
+        deliveries cannot wait on a slot held by their own caller.
+
+        Raises:
+            BulkheadRejectedError: If any bulkhead rejects the call
+        """
+        if not self._bulkheads:
+            yield
+            return
+        held = _held_bulkheads.get()
+        bulkheads = [b for b in self.resolve(node_name, method_name) if b not in held]
+        acquired: List[Bulkhead] = []
+        token = None
+        try:
+            for bulkhead in bulkheads:
+                bulkhead.acquire()
+                acquired.append(bulkhead)
+            if acquired:
+                token = _held_bulkheads.set(held.union(acquired))
+            yield
+        finally:
+            if token is not None:
+                _held_bulkheads.reset(token)
+            for bulkhead in reversed(acquired):
+                bulkhead.release()
+
+    @asynccontextmanager
+    async def guard_async(
+        self,
+        node_name: str,
+        method_name: str,
+        run_blocking: Callable[[Callable[[], Any]], Awaitable[Any]],
+    ) -> AsyncIterator[None]:
+        """
+        Async form of :meth:`guard` for coroutine methods.
+
+        Acquisition may block (queue policy), so each bulkhead is acquired
+        through ``run_blocking`` (e.g. an executor's thread pool) instead of
+        on the event loop.  The held bulkheads are recorded in the awaiting
+        task's context, so events the coroutine publishes to its own node
+        re-enter them like :meth:`guard` does.
+
+        Args:
+            node_name: Node being called
+            method_name: Method being called
+            run_blocking: Awaits a blocking callable off the event loop
+
+        Raises:
+            BulkheadRejectedError: If any bulkhead rejects the call
+        """
+        if not self._bulkheads:
+            yield
+            return
+        held = _held_bulkheads.get()
+        bulkheads = [b for b in self.resolve(node_name, method_name) if b not in held]
+        acquired: List[Bulkhead] = []
+        token = None
+        try:
+            for bulkhead in bulkheads:
+                await _acquire_off_loop(bulkhead, run_blocking)
+                acquired.append(bulkhead)
+            if acquired:
+                token = _held_bulkheads.set(held.union(acquired))
+            yield
+        finally:
+            if token is not None:
+                _held_bulkheads.reset(token)
+            for bulkhead in reversed(acquired):
+                bulkhead.release()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get statistics for every configured bulkhead.
+
+        Returns:
+            Dict of scope -> bulkhead stats
+        """
+        return {scope: bulkhead.get_stats() for scope, bulkhead in self._bulkheads.items()}
+
+    def __len__(self) -> int:
+        return len(self._bulkheads)
+
+    def __repr__(self) -> str:
+        return f"BulkheadRegistry(scopes={len(self._bulkheads)})"
+
+
+async def _acquire_off_loop(
+    bulkhead: Bulkhead,
+    run_blocking: Callable[[Callable[[], Any]], Awaitable[Any]],
+) -> None:
+    """Acquire ``bulkhead`` via ``run_blocking``, releasing it if the caller is cancelled meanwhile."""
+    future = asyncio.ensure_future(run_blocking(bulkhead.acquire))
+    try:
+        await asyncio.shield(future)
+    except asyncio.CancelledError:
+        # The worker may still get the slot after we stop waiting; hand it back
+        future.add_done_callback(
+            lambda f: f.cancelled() or f.exception() is not None or bulkhead.release()
+        )
+        raise
@@ -0,0 +1,294 @@
+"""
+Coordinated Checkpoints
+
+Consistent snapshots of every node's state plus the events in transit,
+taken as a single versioned checkpoint.
+
+The runtime bus dispatches synchronously, so the channels of the
+Chandy-Lamport algorithm are the callers waiting to publish.  A checkpoint
+raises a :class:`SnapshotBarrier`: new top-level publishes and method calls
+wait at the barrier (publishes are recorded as channel state), while work
+already in flight -- including anything it publishes -- runs to
+completion.  Once nothing is in flight every node's state is captured at
+the same cut, the barrier is lowered and the held callers proceed.
+Restoring a checkpoint sets every node back to the cut and re-publishes the
+recorded events, so nothing is lost or processed twice.
+"""
+
+import asyncio
+import os
+import re
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from graphbus_core import codec
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+class SnapshotBarrier:
+    """
+    Gate that holds new top-level work while a checkpoint is being cut.
+
+    Top-level publishes and calls enter through :meth:`admit`.  While the
+    barrier is raised they wait (publishes are recorded as channel state);
+    :meth:`wait_quiet` waits for the ones admitted earlier to finish.
+    Calls made from inside in-flight work (``is_exempt()`` true) pass
+    straight through, so a handler that publishes can still complete.
+    """
+
+    def __init__(self, is_exempt: Optional[Callable[[], bool]] = None):
+        """
+        Initialize barrier (lowered).
+
+        Args:
+            is_exempt: Returns True when the calling thread is running work
+                that must be allowed to complete
+        """
+        self._cond = threading.Condition()
+        self._is_exempt = is_exempt or (lambda: False)
+        self._raised = False
+        self._recording = False
+        self._channel: List[Dict[str, Any]] = []
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._active = 0
+        self.held_total = 0
+
+    @property
+    def is_raised(self) -> bool:
+        """Whether new work is currently being held."""
+        return self._raised
+
+    @contextmanager
+    def admit(self, topic: Optional[str] = None, payload: Any = None,
+              source: Optional[str] = None) -> Iterator[None]:
+        """
+        Run the enclosed block as top-level work, waiting out a raised barrier.
+
+        Args:
+            topic: Topic being published (recorded as in transit if held)
+            payload: Event payload
+            source: Event source
+        """
+        if self._is_exempt():
+            yield
+            return
+
+        with self._cond:
+            if self._raised:
+                self.held_total += 1
+                if topic is not None and self._recording:
+                    self._channel.append({
+                        "topic": topic,
+                        "payload": payload,
+                        "source": source,
+                        "held_at": time.time(),
+                    })
+                self._cond.wait_for(lambda: not self._raised)
+            self._active += 1
+        try:
+            yield
+        finally:
+            self._leave()
+
+    @asynccontextmanager
+    async def admit_async(self) -> AsyncIterator[None]:
+        """
+        :meth:`admit` for coroutine calls.
+
+        A raised barrier is waited out by suspending the calling task, so
+        the event loop keeps running the work the checkpoint is waiting for.
+        """
+        if self._is_exempt():
+            yield
+            return
+
+        loop = asyncio.get_running_loop()
+        held = False
+        while True:
+            with self._cond:
+                if not self._raised:
+                    self._active += 1
+                    break
+                if not held:
+                    held = True
+                    self.held_total += 1
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            await waiter
+        try:
+            yield
+        finally:
+            self._leave()
+
+    def _leave(self) -> None:
+        with self._cond:
+            self._active -= 1
+            if not self._active:
+                self._cond.notify_all()
+
+    def raise_barrier(self) -> None:
+        """Start holding new work and recording held publishes."""
+        with self._cond:
+            self._raised = True
+            self._recording = True
+            self._channel = []
+
+    def wait_quiet(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until no top-level work admitted before the barrier is running.
+
+        Returns:
+            True if quiet, False if the timeout expired first
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._active, timeout=timeout)
+
+    def close_channel(self) -> List[Dict[str, Any]]:
+        """Stop recording and return the publishes held so far, oldest first."""
+        with self._cond:
+            self._recording = False
+            return list(self._channel)
+
+    def lower_barrier(self) -> None:
+        """Release every held caller."""
+        with self._cond:
+            self._raised = False
+            self._recording = False
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                pass  # loop already closed
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class CheckpointStore:
+    """
+    Versioned checkpoint files in one directory.
+
+    Each checkpoint is written atomically as ``checkpoint-<sequence>.json``
+    (JSON or the binary storage format) and only the newest ``retention``
+    are kept.
+    """
+
+    FILENAME = re.compile(r"^checkpoint-(\d+)\.json$")
+
+    def __init__(self, directory: Union[str, Path], storage_format: str = "json",
+                 retention: int = 5):
+        """
+        Initialize checkpoint store.
+
+        Args:
+            directory: Directory holding checkpoint files
+            storage_format: ``"json"`` or ``"binary"``
+            retention: Checkpoints to keep (0 = keep all)
+        """
+        self.directory = Path(directory)
+        self.storage_format = codec.validate_format(storage_format)
+        self.retention = retention
+        self._lock = threading.Lock()
+
+    def path_for(self, sequence: int) -> Path:
+        """Path of the checkpoint with the given sequence number."""
+        return self.directory / f"checkpoint-{sequence:08d}.json"
+
+    def sequences(self) -> List[int]:
+        """Sequence numbers of stored checkpoints, oldest first."""
+        if not self.directory.exists():
+            return []
+        found = []
+        for path in self.directory.iterdir():
+            match = self.FILENAME.match(path.name)
+            if match:
+                found.append(int(match.group(1)))
+        return sorted(found)
+
+    def next_sequence(self) -> int:
+        """Sequence number for the next checkpoint."""
+        sequences = self.sequences()
+        return sequences[-1] + 1 if sequences else 1
+
+    def encode(self, document: Dict[str, Any]) -> bytes:
+        """Serialize a checkpoint document (freezing its contents)."""
+        return codec.dumps(document, self.storage_format)
+
+    def write(self, sequence: int, data: bytes) -> Path:
+        """
+        Atomically write an encoded checkpoint and prune old ones.
+
+        Returns:
+            Path of the written checkpoint
+        """
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.path_for(sequence)
+            codec.write_bytes_atomic(path, data, fsync=True)
+            self._prune()
+        return path
+
+    def _prune(self) -> None:
+        if self.retention <= 0:
+            return
+        for sequence in self.sequences()[:-self.retention]:
+            try:
+                os.unlink(self.path_for(sequence))
+            except OSError:
+                pass
+
+    def load(self, sequence: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Load a checkpoint document.
+
+        Args:
+            sequence: Sequence number (default: the newest)
+
+        Raises:
+            FileNotFoundError: If there is no such checkpoint
+            ValueError: If the checkpoint is corrupted or has an unknown format
+        """
+        if sequence is None:
+            sequences = self.sequences()
+            if not sequences:
+                raise FileNotFoundError(f"No checkpoints found in {self.directory}")
+            sequence = sequences[-1]
+
+        path = self.path_for(sequence)
+        if not path.exists():
+            raise FileNotFoundError(f"Checkpoint {sequence} not found in {self.directory}")
+
+        document = codec.load(path)
+        if not isinstance(document, dict) or "nodes" not in document:
+            raise ValueError(f"Invalid checkpoint file: {path}")
+        version = document.get("format_version")
+        if version != CHECKPOINT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported checkpoint format version {version} in {path}")
+        return document
+
+    def list_checkpoints(self) -> List[Dict[str, Any]]:
+        """Summary of every stored checkpoint, oldest first."""
+        summaries = []
+        for sequence in self.sequences():
+            path = self.path_for(sequence)
+            try:
+                document = self.load(sequence)
+            except (OSError, ValueError):
+                continue
+            summaries.append({
+                "sequence": sequence,
+                "checkpoint_id": document.get("checkpoint_id"),
+                "created_at": document.get("created_at"),
+                "nodes": len(document["nodes"]),
+                "pending_events": len(document.get("pending_events", [])),
+                "file_size": path.stat().st_size,
+            })
+        return summaries
@@ -0,0 +1,221 @@
+"""
+Chrome Trace Export
+
+Writes timelines in the Chrome Trace Event Format, which Perfetto
+(ui.perfetto.dev) and ``chrome://tracing`` load as a zoomable timeline
+with one track per thread.
+
+:class:`ChromeTraceRecorder` collects two kinds of slices:
+
+- runtime spans from a :class:`~graphbus_core.runtime.tracing.Tracer`
+  (publish, bus delivery to each node handler, method calls), attached
+  with :meth:`ChromeTraceRecorder.attach`; a parent and child span on
+  different threads are joined by a flow arrow
+- build phases and LLM calls, timed with :meth:`ChromeTraceRecorder.phase`
+  (or :func:`trace_phase`, which is a no-op without a recorder)
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from graphbus_core.runtime.tracing import Trace, Tracer
+
+
+class ChromeTraceRecorder:
+    """
+    Collects timeline slices and writes them as Chrome Trace Event JSON.
+
+    Thread-safe; events beyond ``max_events`` push out the oldest ones, so
+    a long-running recorder keeps the most recent part of the timeline.
+    """
+
+    def __init__(self, max_events: Optional[int] = 1_000_000, process_name: str = "graphbus",
+                 origin_ns: Optional[int] = None):
+        """
+        Initialize recorder.
+
+        Args:
+            max_events: Slices kept, oldest dropped first (None = unbounded)
+            process_name: Label of the process track
+            origin_ns: ``perf_counter_ns`` time shown as zero (default: now)
+        """
+        self.process_name = process_name
+        self.pid = os.getpid()
+        self._origin_ns = time.perf_counter_ns() if origin_ns is None else origin_ns
+        self._events: deque = deque(maxlen=max_events)
+        self._thread_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._flows = 0
+
+    def _ts(self, ns: int) -> float:
+        # Microseconds since the recorder was created
+        return (ns - self._origin_ns) / 1000.0
+
+    def _name_thread(self, tid: int) -> None:
+        if tid not in self._thread_names:
+            for thread in threading.enumerate():
+                if thread.ident == tid:
+                    self._thread_names[tid] = thread.name
+                    break
+
+    def complete(self, name: str, cat: str, start_ns: int, duration_ns: int,
+                 tid: Optional[int] = None, args: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Add a slice (a complete ``"X"`` event).
+
+        Args:
+            name: Slice label
+            cat: Category, e.g. "deliver", "build" or "llm"
+            start_ns: Start in ``time.perf_counter_ns`` nanoseconds
+            duration_ns: Duration in nanoseconds
+            tid: Thread the slice ran on (default: current thread)
+            args: Extra fields shown when the slice is selected
+        """
+        tid = threading.get_ident() if tid is None else tid
+        event = {
+            "name": name, "cat": cat, "ph": "X", "pid": self.pid, "tid": tid,
+            "ts": self._ts(start_ns), "dur": duration_ns / 1000.0,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._name_thread(tid)
+            self._events.append(event)
+
+    def instant(self, name: str, cat: str, **args: Any) -> None:
+        """Add a zero-length marker on the current thread."""
+        tid = threading.get_ident()
+        event = {"name": name, "cat": cat, "ph": "i", "s": "t", "pid": self.pid, "tid": tid,
+                 "ts": self._ts(time.perf_counter_ns())}
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._name_thread(tid)
+            self._events.append(event)
+
+    def counter(self, name: str, cat: str, ts_ns: int, **values: float) -> None:
+        """
+        Add a counter sample (a ``"C"`` event, drawn as a stacked chart).
+
+        Args:
+            name: Counter track name
+            cat: Category
+            ts_ns: Sample time in ``time.perf_counter_ns`` nanoseconds
+            **values: Series name -> value
+        """
+        event = {"name": name, "cat": cat, "ph": "C", "pid": self.pid, "tid": 0,
+                 "ts": self._ts(ts_ns), "args": values}
+        with self._lock:
+            self._events.append(event)
+
+    @contextmanager
+    def phase(self, name: str, cat: str = "build", **args: Any) -> Iterator[None]:
+        """
+        Time the enclosed block as a slice on the current thread.
+
+        Args:
+            name: Slice label, e.g. "proposal round 2"
+            cat: Category
+            **args: Extra fields shown when the slice is selected
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield
+        except BaseException as e:
+            args["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.complete(name, cat, start, time.perf_counter_ns() - start, args=args)
+
+    def attach(self, tracer: Tracer) -> None:
+        """Record every trace ``tracer`` completes from now on."""
+        if self.add_trace not in tracer.listeners:
+            tracer.listeners.append(self.add_trace)
+
+    def detach(self, tracer: Tracer) -> None:
+        """Stop recording ``tracer``'s traces."""
+        if self.add_trace in tracer.listeners:
+            tracer.listeners.remove(self.add_trace)
+
+    def add_trace(self, trace: Trace) -> None:
+        """Add all spans of a completed trace."""
+        spans = {s.span_id: s for s in trace.spans}
+        events: List[Dict[str, Any]] = []
+        for span in trace.spans:
+            if span.duration is None:
+                continue
+            args = {"trace_id": span.trace_id, "span_id": span.span_id}
+            for key in ("node", "handler", "topic", "event_id", "parent_id", "error"):
+                value = getattr(span, key)
+                if value is not None:
+                    args[key] = value
+            ts = self._ts(span.start_ns)
+            events.append({
+                "name": span.name, "cat": span.kind, "ph": "X", "pid": self.pid,
+                "tid": span.thread_id, "ts": ts, "dur": span.duration * 1e6, "args": args,
+            })
+
+            parent = spans.get(span.parent_id)
+            if parent is not None and parent.thread_id != span.thread_id:
+                # Flow arrow from the parent slice to the child on another thread
+                with self._lock:
+                    self._flows += 1
+                    flow_id = self._flows
+                common = {"name": "causes", "cat": "flow", "id": flow_id, "pid": self.pid}
+                events.append({**common, "ph": "s", "tid": parent.thread_id, "ts": ts})
+                events.append({**common, "ph": "f", "bp": "e", "tid": span.thread_id, "ts": ts})
+
+        with self._lock:
+            for span in trace.spans:
+                self._name_thread(span.thread_id)
+            self._events.extend(events)
+
+    def clear(self) -> None:
+        """Drop all recorded events."""
+        with self._lock:
+            self._events.clear()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The timeline as a Chrome Trace Event document.
+
+        Returns:
+            ``{"traceEvents": [...], "displayTimeUnit": "ms", ...}``
+        """
+        with self._lock:
+            events = list(self._events)
+            names = dict(self._thread_names)
+        metadata = [{"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0,
+                     "args": {"name": self.process_name}}]
+        metadata.extend(
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+            for tid, name in names.items()
+        )
+        return {
+            "traceEvents": metadata + sorted(events, key=lambda e: e["ts"]),
+            "displayTimeUnit": "ms",
+            "otherData": {"generator": "graphbus", "events": len(events)},
+        }
+
+    def write(self, path: Union[str, Path]) -> Path:
+        """Write :meth:`to_dict` as JSON to ``path``."""
+        path = Path(path)
+        path.write_text(json.dumps(self.to_dict()))
+        return path
+
+
+def trace_phase(recorder: Optional[ChromeTraceRecorder], name: str, cat: str = "build",
+                **args: Any):
+    """:meth:`ChromeTraceRecorder.phase`, or a no-op context when ``recorder`` is None."""
+    if recorder is None:
+        return nullcontext()
+    return recorder.phase(name, cat, **args)
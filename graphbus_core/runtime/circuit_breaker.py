@@ -0,0 +1,386 @@
+"""
+Circuit Breakers - Per-node and per-method failure isolation for Runtime Mode
+
+Stops calling a node (or a single method) that keeps failing, so callers get
+an immediate rejection instead of waiting on a handler that is known to be
+broken, and the node gets room to recover.
+
+A breaker is **closed** while the failure rate over a sliding time window
+stays below its threshold.  Once enough calls have failed it **opens** and
+rejects every call with :class:`~graphbus_core.exceptions.CircuitOpenError`.
+After ``open_seconds`` it turns **half-open** and admits up to
+``probe_budget`` trial calls: if they all succeed it closes again, and the
+first failing probe opens it for another ``open_seconds``.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from graphbus_core.exceptions import (
+    BulkheadRejectedError,
+    CircuitOpenError,
+    NodeRestartingError,
+)
+
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Numeric state for gauges
+STATE_VALUES = {STATE_CLOSED: 0, STATE_HALF_OPEN: 1, STATE_OPEN: 2}
+
+# Scope keys in RuntimeConfig.circuit_breakers that apply to every node / method
+ALL_NODES = "*"
+ALL_METHODS = "*.*"
+
+# Rejections by the runtime itself say nothing about the node's health
+_NOT_FAILURES = (BulkheadRejectedError, CircuitOpenError, NodeRestartingError)
+
+
+@dataclass
+class CircuitBreakerSpec:
+    """
+    Declared thresholds for one node or node method.
+
+    Attributes:
+        failure_rate: Fraction of failed calls in the window that opens the breaker
+        min_calls: Calls the window must hold before the rate is judged
+        window_seconds: Length of the sliding window
+        window_buckets: Time buckets the window is divided into
+        open_seconds: Seconds an open breaker rejects calls before probing
+        probe_budget: Trial calls admitted while half-open; all must succeed to close
+    """
+    failure_rate: float = 0.5
+    min_calls: int = 10
+    window_seconds: float = 30.0
+    window_buckets: int = 10
+    open_seconds: float = 30.0
+    probe_budget: int = 3
+
+    def __post_init__(self):
+        if not 0 < self.failure_rate <= 1:
+            raise ValueError("failure_rate must be in (0, 1]")
+        if self.min_calls < 1:
+            raise ValueError("min_calls must be >= 1")
+        if self.window_seconds <= 0 or self.window_buckets < 1:
+            raise ValueError("window_seconds must be > 0 and window_buckets >= 1")
+        if self.probe_budget < 1:
+            raise ValueError("probe_budget must be >= 1")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CircuitBreakerSpec":
+        """Build a spec from a ``RuntimeConfig.circuit_breakers`` / decorator dict."""
+        defaults = cls()
+        return cls(**{key: data.get(key, getattr(defaults, key)) for key in cls.__dataclass_fields__})
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker over a sliding window of outcomes.
+
+    Use :meth:`allow` before a call and :meth:`record_success`,
+    :meth:`record_failure` or :meth:`cancel` after it, passing back the
+    probe flag :meth:`allow` returned.
+    """
+
+    def __init__(self, name: str, spec: CircuitBreakerSpec):
+        """
+        Initialize breaker.
+
+        Args:
+            name: Scope name, ``"Node"`` or ``"Node.method"``
+            spec: Declared thresholds
+        """
+        self.name = name
+        self.spec = spec
+        self._lock = threading.Lock()
+        self._bucket_seconds = spec.window_seconds / spec.window_buckets
+        # Ring of time buckets: absolute bucket index, calls, failures
+        self._bucket_ids = [-1] * spec.window_buckets
+        self._calls = [0] * spec.window_buckets
+        self._failures = [0] * spec.window_buckets
+
+        self.state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._probes_started = 0
+        self._probes_succeeded = 0
+
+        self.calls_total = 0
+        self.failures_total = 0
+        self.rejected_total = 0
+        self.opened_total = 0
+
+    def allow(self) -> bool:
+        """
+        Admit or reject a call.
+
+        Returns:
+            True if the call is a half-open probe, False for a normal call
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with its
+                probe budget spent
+        """
+        if self.state == STATE_CLOSED:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if self.state == STATE_OPEN and now - self._opened_at >= self.spec.open_seconds:
+                self.state = STATE_HALF_OPEN
+                self._probes_started = self._probes_succeeded = 0
+            if self.state == STATE_CLOSED:
+                return False
+            if self.state == STATE_HALF_OPEN and self._probes_started < self.spec.probe_budget:
+                self._probes_started += 1
+                return True
+            self.rejected_total += 1
+            retry_after = max(0.0, self._opened_at + self.spec.open_seconds - now)
+        raise CircuitOpenError(f"Circuit breaker '{self.name}' is {self.state}; call rejected",
+                               scope=self.name, retry_after=retry_after)
+
+    def record_success(self, probe: bool = False) -> None:
+        """Record a call that completed."""
+        with self._lock:
+            self._record(time.monotonic(), failed=False)
+            if probe and self.state == STATE_HALF_OPEN:
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self.spec.probe_budget:
+                    self.state = STATE_CLOSED
+                    self._reset_window()
+
+    def record_failure(self, probe: bool = False) -> None:
+        """Record a call that raised."""
+        with self._lock:
+            now = time.monotonic()
+            self._record(now, failed=True)
+            if probe and self.state == STATE_HALF_OPEN:
+                self._open(now)
+            elif self.state == STATE_CLOSED:
+                calls, failures = self._window(now)
+                if calls >= self.spec.min_calls and failures >= self.spec.failure_rate * calls:
+                    self._open(now)
+
+    def cancel(self, probe: bool = False) -> None:
+        """Give back an admission whose call never ran or was rejected downstream."""
+        if probe:
+            with self._lock:
+                if self.state == STATE_HALF_OPEN and self._probes_started > 0:
+                    self._probes_started -= 1
+
+    def reset(self) -> None:
+        """Force the breaker closed and forget the window."""
+        with self._lock:
+            self.state = STATE_CLOSED
+            self._reset_window()
+
+    def _record(self, now: float, failed: bool) -> None:
+        index = int(now / self._bucket_seconds)
+        slot = index % len(self._bucket_ids)
+        if self._bucket_ids[slot] != index:
+            self._bucket_ids[slot] = index
+            self._calls[slot] = self._failures[slot] = 0
+        self._calls[slot] += 1
+        self.calls_total += 1
+        if failed:
+            self._failures[slot] += 1
+            self.failures_total += 1
+
+    def _window(self, now: float) -> Tuple[int, int]:
+        """(calls, failures) in the buckets still inside the window."""
+        oldest = int(now / self._bucket_seconds) - len(self._bucket_ids)
+        calls = failures = 0
+        for slot, index in enumerate(self._bucket_ids):
+            if index > oldest:
+                calls += self._calls[slot]
+                failures += self._failures[slot]
+        return calls, failures
+
+    def _open(self, now: float) -> None:
+        self.state = STATE_OPEN
+        self._opened_at = now
+        self.opened_total += 1
+
+    def _reset_window(self) -> None:
+        for slot in range(len(self._bucket_ids)):
+            self._bucket_ids[slot] = -1
+            self._calls[slot] = self._failures[slot] = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get breaker statistics.
+
+        Returns:
+            Dict with state, window counts and cumulative counters
+        """
+        with self._lock:
+            now = time.monotonic()
+            calls, failures = self._window(now)
+            state = self.state
+            if state == STATE_OPEN and now - self._opened_at >= self.spec.open_seconds:
+                state = STATE_HALF_OPEN  # next call will probe
+            return {
+                "state": state,
+                "window_calls": calls,
+                "window_failures": failures,
+                "failure_rate": failures / calls if calls else 0.0,
+                "calls_total": self.calls_total,
+                "failures_total": self.failures_total,
+                "rejected_total": self.rejected_total,
+                "opened_total": self.opened_total,
+            }
+
+    def __repr__(self) -> str:
+        return f"CircuitBreaker({self.name!r}, state={self.state!r})"
+
+
+class CircuitBreakerRegistry:
+    """
+    Resolves the circuit breakers that guard a node method.
+
+    A call to ``Node.method`` passes the node-level breaker (if declared)
+    and then the method-level one (if declared).  Specs registered under
+    ``"*"`` and ``"*.*"`` give every node and every method a breaker of its
+    own, created on first use.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._defaults: Dict[str, CircuitBreakerSpec] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, scope: str, spec: CircuitBreakerSpec) -> Optional[CircuitBreaker]:
+        """
+        Declare (or replace) thresholds for a scope.
+
+        Args:
+            scope: ``"Node"``, ``"Node.method"``, or ``"*"`` / ``"*.*"`` for
+                every node / method
+            spec: Thresholds to enforce
+
+        Returns:
+            The created CircuitBreaker (None for a wildcard scope)
+        """
+        if scope in (ALL_NODES, ALL_METHODS):
+            self._defaults[scope] = spec
+            return None
+        breaker = CircuitBreaker(scope, spec)
+        with self._lock:
+            self._breakers[scope] = breaker
+        return breaker
+
+    def configure_node(self, node_name: str, node: Any) -> None:
+        """
+        Register thresholds declared with ``@circuit_breaker`` on a node class and its methods.
+
+        Args:
+            node_name: Runtime name of the node
+            node: Node instance
+        """
+        cls = type(node)
+        spec = getattr(cls, "_graphbus_circuit_breaker", None)
+        if spec is not None:
+            self.configure(node_name, CircuitBreakerSpec.from_dict(spec))
+
+        for attr_name in dir(cls):
+            if attr_name.startswith("_"):
+                continue
+            attr = getattr(cls, attr_name, None)
+            spec = getattr(attr, "_graphbus_circuit_breaker", None) if callable(attr) else None
+            if spec is not None:
+                self.configure(f"{node_name}.{attr_name}", CircuitBreakerSpec.from_dict(spec))
+
+    def remove_node(self, node_name: str) -> None:
+        """Drop every breaker belonging to a node."""
+        prefix = f"{node_name}."
+        with self._lock:
+            for scope in list(self._breakers):
+                if scope == node_name or scope.startswith(prefix):
+                    del self._breakers[scope]
+
+    def get(self, scope: str) -> Optional[CircuitBreaker]:
+        """Get the breaker for a scope, if any."""
+        return self._breakers.get(scope)
+
+    def _lookup(self, scope: str, default_key: str) -> Optional[CircuitBreaker]:
+        breaker = self._breakers.get(scope)
+        if breaker is None and default_key in self._defaults:
+            with self._lock:
+                breaker = self._breakers.get(scope)
+                if breaker is None:
+                    breaker = self._breakers[scope] = CircuitBreaker(scope, self._defaults[default_key])
+        return breaker
+
+    def resolve(self, node_name: str, method_name: str) -> List[CircuitBreaker]:
+        """Breakers guarding ``node_name.method_name``, outermost first."""
+        resolved = []
+        node_breaker = self._lookup(node_name, ALL_NODES)
+        if node_breaker is not None:
+            resolved.append(node_breaker)
+        method_breaker = self._lookup(f"{node_name}.{method_name}", ALL_METHODS)
+        if method_breaker is not None:
+            resolved.append(method_breaker)
+        return resolved
+
+    @contextmanager
+    def guard(self, node_name: str, method_name: str) -> Iterator[None]:
+        """
+        Admit the block through every applicable breaker and record its outcome.
+
+        Exceptions raised by the block count as failures, except rejections
+        by the runtime itself (bulkheads, breakers, restarting nodes).
+
+        Raises:
+            CircuitOpenError: If any breaker rejects the call
+        """
+        breakers = self.resolve(node_name, method_name) if self._breakers or self._defaults else []
+        admitted: List[Tuple[CircuitBreaker, bool]] = []
+        try:
+            for breaker in breakers:
+                admitted.append((breaker, breaker.allow()))
+        except CircuitOpenError:
+            for breaker, probe in admitted:
+                breaker.cancel(probe)
+            raise
+
+        try:
+            yield
+        except _NOT_FAILURES:
+            for breaker, probe in admitted:
+                breaker.cancel(probe)
+            raise
+        except Exception:
+            for breaker, probe in admitted:
+                breaker.record_failure(probe)
+            raise
+        except BaseException:
+            for breaker, probe in admitted:
+                breaker.cancel(probe)
+            raise
+        for breaker, probe in admitted:
+            breaker.record_success(probe)
+
+    def open_scopes(self) -> List[str]:
+        """Scopes whose breaker is currently open or half-open."""
+        return sorted(scope for scope, stats in self.get_stats().items() if stats["state"] != STATE_CLOSED)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get statistics for every breaker.
+
+        Returns:
+            Dict of scope -> breaker stats
+        """
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {scope: breaker.get_stats() for scope, breaker in breakers}
+
+    def __len__(self) -> int:
+        return len(self._breakers) + len(self._defaults)
+
+    def __repr__(self) -> str:
+        return f"CircuitBreakerRegistry(scopes={len(self._breakers)})"
@@ -3,17 +3,29 @@ Long-Form Coherence Tracking
 
 This module tracks and maintains coherence across agent interactions over time,
 detecting schema drift and using networkx to analyze consistency along execution paths.
+
+Interactions are kept in an :class:`InteractionLog`: a fixed-capacity ring
+stored column by column (interned agent/topic/version ids, epoch timestamps,
+success flags and a payload hash), so tracking is O(1) with bounded memory
+and metrics are computed from whole columns.
 """
 
+import hashlib
 import json
+import threading
+import time
+from array import array
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Set, Tuple
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import Counter, defaultdict
 from enum import Enum
+from itertools import compress
 import networkx as nx
 
+from graphbus_core import codec
+
 
 class CoherenceLevel(Enum):
     """Coherence level classifications"""
@@ -30,10 +42,11 @@ class Interaction:
     target: str
     topic: str
     schema_version: str
-    payload: Dict[str, Any]
+    payload: Optional[Dict[str, Any]]  # None once stored in an InteractionLog
     timestamp: datetime
     successful: bool = True
     error: Optional[str] = None
+    payload_hash: Optional[int] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -43,12 +56,273 @@ class Interaction:
             "topic": self.topic,
             "schema_version": self.schema_version,
             "payload": self.payload,
+            "payload_hash": self.payload_hash,
             "timestamp": self.timestamp.isoformat(),
             "successful": self.successful,
             "error": self.error
         }
 
 
+def payload_hash(payload: Any) -> int:
+    """
+    Stable 64-bit hash of a payload (canonical JSON, blake2b).
+
+    Args:
+        payload: Event payload
+
+    Returns:
+        Signed 64-bit integer, 0 for ``None``
+    """
+    if payload is None:
+        return 0
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+class InteractionLog:
+    """
+    Fixed-capacity ring of interactions stored column by column.
+
+    Agent names, topics and schema versions are interned into
+    :attr:`symbols` and stored as ``array('i')`` ids, timestamps as epoch
+    seconds in ``array('d')``, success flags in ``array('b')`` and payloads
+    only as a 64-bit hash.  Recording overwrites the oldest slot once the
+    log is full.  Errors of failed interactions are kept per slot.
+
+    Reading behaves like a list of :class:`Interaction` (``len``, indexing,
+    iteration, ``append``); records are materialized on access, so changing
+    one does not change the log.  Metric code reads whole columns with
+    :meth:`columns` instead.
+    """
+
+    COLUMNS = ("source", "target", "topic", "schema_version", "timestamp", "successful", "payload_hash")
+    SYMBOL_COLUMNS = ("source", "target", "topic", "schema_version")
+
+    def __init__(self, capacity: int = 10000):
+        """
+        Initialize interaction log.
+
+        Args:
+            capacity: Interactions kept; older ones are overwritten
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.symbols: List[str] = []
+        self._symbol_ids: Dict[str, int] = {}
+        self._columns: Dict[str, array] = {
+            "source": array("i", [0]) * capacity,
+            "target": array("i", [0]) * capacity,
+            "topic": array("i", [0]) * capacity,
+            "schema_version": array("i", [0]) * capacity,
+            "timestamp": array("d", [0.0]) * capacity,
+            "successful": array("b", [0]) * capacity,
+            "payload_hash": array("q", [0]) * capacity,
+        }
+        self._errors: Dict[int, str] = {}  # slot -> error
+        self._head = 0  # next slot written
+        self._count = 0
+        self.total = 0  # interactions ever recorded
+        self._lock = threading.Lock()
+
+    def _intern(self, name: str) -> int:
+        symbol_id = self._symbol_ids.get(name)
+        if symbol_id is None:
+            symbol_id = len(self.symbols)
+            self.symbols.append(name)
+            self._symbol_ids[name] = symbol_id
+        return symbol_id
+
+    def symbol_id(self, name: str) -> Optional[int]:
+        """Id of an interned name, or None if it was never recorded."""
+        return self._symbol_ids.get(name)
+
+    def record(self, source: str, target: str, topic: str, schema_version: str,
+               timestamp: float, successful: bool = True, payload_hash: int = 0,
+               error: Optional[str] = None) -> None:
+        """
+        Record one interaction, overwriting the oldest when full.
+
+        Args:
+            source: Source agent name
+            target: Target agent name
+            topic: Event topic
+            schema_version: Schema version used
+            timestamp: Epoch seconds
+            successful: Whether interaction was successful
+            payload_hash: Hash of the payload (see :func:`payload_hash`)
+            error: Error message if failed
+        """
+        with self._lock:
+            slot = self._head
+            columns = self._columns
+            columns["source"][slot] = self._intern(source)
+            columns["target"][slot] = self._intern(target)
+            columns["topic"][slot] = self._intern(topic)
+            columns["schema_version"][slot] = self._intern(schema_version)
+            columns["timestamp"][slot] = timestamp
+            columns["successful"][slot] = 1 if successful else 0
+            columns["payload_hash"][slot] = payload_hash
+            if error is not None:
+                self._errors[slot] = error
+            else:
+                self._errors.pop(slot, None)
+            self._head = (slot + 1) % self.capacity
+            if self._count < self.capacity:
+                self._count += 1
+            self.total += 1
+
+    def append(self, interaction: Interaction) -> None:
+        """Record an :class:`Interaction` (its payload is reduced to a hash)."""
+        digest = interaction.payload_hash
+        if digest is None:
+            digest = payload_hash(interaction.payload)
+        self.record(interaction.source, interaction.target, interaction.topic,
+                    interaction.schema_version, interaction.timestamp.timestamp(),
+                    interaction.successful, digest, interaction.error)
+
+    def extend(self, interactions: Iterable[Interaction]) -> None:
+        """Record several interactions."""
+        for interaction in interactions:
+            self.append(interaction)
+
+    def clear(self) -> None:
+        """Drop all interactions (interned names are kept)."""
+        with self._lock:
+            self._errors.clear()
+            self._head = 0
+            self._count = 0
+
+    def _ordered(self, column: array) -> array:
+        # Oldest first; caller holds the lock
+        if self._count < self.capacity:
+            return column[:self._count]
+        return column[self._head:] + column[:self._head]
+
+    def columns(self, *names: str) -> Tuple[array, ...]:
+        """
+        Copy columns, oldest interaction first.
+
+        Args:
+            *names: Names from :attr:`COLUMNS`; symbol columns hold ids into :attr:`symbols`
+
+        Returns:
+            One array per name, all the same length
+        """
+        with self._lock:
+            return tuple(self._ordered(self._columns[name]) for name in names)
+
+    def errors(self) -> Dict[int, str]:
+        """Errors by position (oldest interaction is 0)."""
+        with self._lock:
+            start = self._head if self._count == self.capacity else 0
+            return {(slot - start) % self.capacity: error for slot, error in self._errors.items()}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _materialize(self, slot: int) -> Interaction:
+        columns = self._columns
+        symbols = self.symbols
+        return Interaction(
+            source=symbols[columns["source"][slot]],
+            target=symbols[columns["target"][slot]],
+            topic=symbols[columns["topic"][slot]],
+            schema_version=symbols[columns["schema_version"][slot]],
+            payload=None,
+            timestamp=datetime.fromtimestamp(columns["timestamp"][slot]),
+            successful=bool(columns["successful"][slot]),
+            error=self._errors.get(slot),
+            payload_hash=columns["payload_hash"][slot],
+        )
+
+    def __getitem__(self, index):
+        with self._lock:
+            count = self._count
+            start = self._head if count == self.capacity else 0
+            if isinstance(index, slice):
+                return [self._materialize((start + i) % self.capacity)
+                        for i in range(*index.indices(count))]
+            if index < 0:
+                index += count
+            if not 0 <= index < count:
+                raise IndexError("interaction index out of range")
+            return self._materialize((start + index) % self.capacity)
+
+    def __iter__(self) -> Iterator[Interaction]:
+        return iter(self[:])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (InteractionLog, list)):
+            return self[:] == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"InteractionLog({self._count}/{self.capacity})"
+
+    def to_dict(self, last: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Columnar, JSON-serializable form (oldest first).
+
+        Args:
+            last: Only the newest ``last`` interactions (all if None)
+
+        Returns:
+            Dict with ``symbols``, one list per column (symbol columns index
+            into ``symbols``) and ``errors`` as ``[position, error]`` pairs
+        """
+        with self._lock:
+            skipped = self._count - min(self._count, self._count if last is None else last)
+            columns = {name: self._ordered(self._columns[name])[skipped:] for name in self.COLUMNS}
+        errors = [(position - skipped, error) for position, error in sorted(self.errors().items())
+                  if position >= skipped]
+
+        # Renumber the symbols that are used, so a partial dump stays small
+        used = sorted(set().union(*(columns[name] for name in self.SYMBOL_COLUMNS)))
+        renumber = {symbol_id: i for i, symbol_id in enumerate(used)}
+        data: Dict[str, Any] = {"format": "columns", "symbols": [self.symbols[i] for i in used]}
+        for name in self.COLUMNS:
+            if name in self.SYMBOL_COLUMNS:
+                data[name] = [renumber[symbol_id] for symbol_id in columns[name]]
+            else:
+                data[name] = columns[name].tolist()
+        data["errors"] = errors
+        return data
+
+    def load_dict(self, data: Dict[str, Any]) -> None:
+        """
+        Record the interactions of a :meth:`to_dict` document after the current ones.
+
+        Args:
+            data: Output of :meth:`to_dict`
+        """
+        symbols = data["symbols"]
+        errors = dict(data.get("errors", []))
+        count = len(data["timestamp"])
+        skipped = count - min(count, self.capacity)
+        rows = zip(*(data[name][skipped:] for name in self.COLUMNS))
+        for position, (source, target, topic, version, timestamp, successful, digest) in enumerate(rows, skipped):
+            self.record(symbols[source], symbols[target], symbols[topic], symbols[version],
+                        timestamp, bool(successful), digest, errors.get(position))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], capacity: int = 10000) -> "InteractionLog":
+        """
+        Rebuild a log written by :meth:`to_dict`, keeping the newest ``capacity``.
+
+        Args:
+            data: Output of :meth:`to_dict`
+            capacity: Capacity of the new log
+
+        Returns:
+            InteractionLog
+        """
+        log = cls(capacity)
+        log.load_dict(data)
+        return log
+
+
 @dataclass
 class DriftWarning:
     """Warning about schema drift"""
@@ -123,20 +397,30 @@ class CoherenceTracker:
     Uses networkx for path analysis and consistency checking.
     """
 
-    def __init__(self, storage_path: str = ".graphbus/coherence", graph: nx.DiGraph = None):
+    SAVE_INTERVAL = 100  # interactions tracked between automatic saves
+
+    def __init__(self, storage_path: str = ".graphbus/coherence", graph: nx.DiGraph = None,
+                 storage_format: str = "json", capacity: int = 10000):
         """
         Initialize coherence tracker
 
         Args:
             storage_path: Directory to store coherence data
             graph: NetworkX dependency graph for path analysis
+            storage_format: ``"json"`` or ``"binary"`` for interactions.json
+                (either is read back)
+            capacity: Interactions kept; the oldest are overwritten
         """
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
         self.graph = graph
+        self.storage_format = codec.validate_format(storage_format)
 
-        # Interaction history
-        self.interactions: List[Interaction] = []
+        # Interaction history (fixed-capacity columnar ring)
+        self.interactions = InteractionLog(capacity)
+        self._saved_total = 0  # interactions.total when last persisted
+        self._journaled = 0  # interactions in the journal since the last snapshot
+        self._save_lock = threading.Lock()
 
         # Agent version tracking
         self.agent_versions: Dict[str, List[Tuple[str, datetime]]] = defaultdict(list)
@@ -150,41 +434,80 @@ class CoherenceTracker:
         # Coherence threshold
         self.coherence_threshold = 0.8
 
+    @property
+    def journal_path(self) -> Path:
+        """Journal of interactions tracked since the last snapshot (JSON lines)."""
+        return self.storage_path / "interactions.jsonl"
+
     def _load_data(self):
         """Load coherence data from storage"""
         interactions_file = self.storage_path / "interactions.json"
         if interactions_file.exists():
             try:
-                with open(interactions_file, 'r') as f:
-                    data = json.load(f)
-                    for item in data[-10000:]:  # Keep last 10000 interactions
-                        interaction = Interaction(
+                data = codec.load(interactions_file)
+                capacity = self.interactions.capacity
+                if isinstance(data, dict):
+                    self.interactions = InteractionLog.from_dict(data, capacity)
+                else:
+                    # List of Interaction.to_dict() records (older files)
+                    for item in data[-capacity:]:
+                        self.interactions.record(
                             source=item["source"],
                             target=item["target"],
                             topic=item["topic"],
                             schema_version=item["schema_version"],
-                            payload=item["payload"],
-                            timestamp=datetime.fromisoformat(item["timestamp"]),
+                            timestamp=datetime.fromisoformat(item["timestamp"]).timestamp(),
                             successful=item.get("successful", True),
+                            payload_hash=payload_hash(item.get("payload")),
                             error=item.get("error")
                         )
-                        self.interactions.append(interaction)
 
-                        # Rebuild topic_versions tracking
-                        self.topic_versions[interaction.topic][interaction.schema_version] += 1
             except Exception as e:
                 print(f"Warning: Failed to load interactions: {e}")
 
+        if self.journal_path.exists():
+            for line in self.journal_path.read_text().splitlines():
+                try:
+                    batch = json.loads(line)
+                except ValueError:
+                    continue  # torn write
+                self.interactions.load_dict(batch)
+                self._journaled += len(batch["timestamp"])
+
+        # Rebuild topic_versions tracking
+        symbols = self.interactions.symbols
+        topics, versions = self.interactions.columns("topic", "schema_version")
+        for (topic, version), count in Counter(zip(topics, versions)).items():
+            self.topic_versions[symbols[topic]][symbols[version]] += count
+        self._saved_total = self.interactions.total
+
     def _save_data(self):
-        """Save coherence data to storage"""
+        """Save coherence data to storage (full snapshot; clears the journal)"""
         interactions_file = self.storage_path / "interactions.json"
-
-        # Keep last 10000 interactions
-        recent_interactions = self.interactions[-10000:]
-        data = [i.to_dict() for i in recent_interactions]
-
-        with open(interactions_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        with self._save_lock:
+            total = self.interactions.total
+            codec.dump(self.interactions.to_dict(), interactions_file, self.storage_format)
+            self.journal_path.unlink(missing_ok=True)
+            self._saved_total = total
+            self._journaled = 0
+
+    def _append_journal(self):
+        """Append interactions tracked since the last save to the journal"""
+        with self._save_lock:
+            total = self.interactions.total
+            new = total - self._saved_total
+            if new <= 0:
+                return
+            compact = self._journaled + new >= self.interactions.capacity
+            if not compact:
+                batch = self.interactions.to_dict(last=new)
+                with open(self.journal_path, "a") as f:
+                    f.write(json.dumps(batch, separators=(",", ":")) + "\n")
+                self._saved_total = total
+                self._journaled += new
+        if compact:
+            # The journal would replay a whole ring: write a snapshot instead
+            self._save_data()
 
     def save(self):
         """Public method to save coherence data"""
@@ -237,25 +560,23 @@ class CoherenceTracker:
             successful: Whether interaction was successful
             error: Error message if failed
         """
-        interaction = Interaction(
+        self.interactions.record(
             source=source,
             target=target,
             topic=topic,
             schema_version=schema_version,
-            payload=payload,
-            timestamp=datetime.now(),
+            timestamp=time.time(),
             successful=successful,
+            payload_hash=payload_hash(payload),
             error=error
         )
 
-        self.interactions.append(interaction)
-
         # Track version usage
         self.topic_versions[topic][schema_version] += 1
 
-        # Periodically save (every 100 interactions)
-        if len(self.interactions) % 100 == 0:
-            self._save_data()
+        # Periodically journal new interactions
+        if self.interactions.total - self._saved_total >= self.SAVE_INTERVAL:
+            self._append_journal()
 
     def detect_schema_drift(self, time_window: Optional[timedelta] = None) -> List[DriftWarning]:
         """
@@ -268,55 +589,52 @@ class CoherenceTracker:
             List of drift warnings
         """
         warnings = []
+        symbols = self.interactions.symbols
+        topics, versions, sources, timestamps = self.interactions.columns(
+            "topic", "schema_version", "source", "timestamp")
 
         # Filter interactions by time window
         if time_window:
-            cutoff = datetime.now() - time_window
-            recent_interactions = [i for i in self.interactions if i.timestamp >= cutoff]
-        else:
-            recent_interactions = self.interactions
-
-        # Group by topic
-        topic_interactions: Dict[str, List[Interaction]] = defaultdict(list)
-        for interaction in recent_interactions:
-            topic_interactions[interaction.topic].append(interaction)
+            cutoff = time.time() - time_window.total_seconds()
+            recent = [t >= cutoff for t in timestamps]
+            topics, versions, sources, timestamps = (
+                list(compress(column, recent)) for column in (topics, versions, sources, timestamps))
+
+        # Version distribution per topic, and when each agent first used each version
+        topic_version_counts: Dict[int, Dict[int, int]] = defaultdict(dict)
+        for (topic, version), count in Counter(zip(topics, versions)).items():
+            topic_version_counts[topic][version] = count
+        first_used: Dict[Tuple[int, int, int], float] = {}
+        for key, timestamp in zip(zip(topics, versions, sources), timestamps):
+            if key not in first_used or timestamp < first_used[key]:
+                first_used[key] = timestamp
 
         # Check for version drift in each topic
-        for topic, interactions in topic_interactions.items():
-            # Find version distribution
-            version_counts = defaultdict(int)
-            for interaction in interactions:
-                version_counts[interaction.schema_version] += 1
-
+        for topic, version_counts in topic_version_counts.items():
             # If multiple versions in use, check drift
             if len(version_counts) > 1:
                 total = sum(version_counts.values())
                 sorted_versions = sorted(version_counts.items(), key=lambda x: x[1], reverse=True)
 
                 dominant_version = sorted_versions[0][0]
-                dominant_count = sorted_versions[0][1]
 
                 # Check other versions
                 for version, count in sorted_versions[1:]:
                     drift_severity = count / total
 
                     if drift_severity > 0.1:  # More than 10% using old version
-                        # Find affected agents
-                        affected_agents = set(i.source for i in interactions
-                                            if i.schema_version == version)
-
-                        for agent in affected_agents:
-                            first_detected = min(i.timestamp for i in interactions
-                                               if i.source == agent and i.schema_version == version)
-
+                        # Affected agents, by first use
+                        for (t, v, agent), first_detected in first_used.items():
+                            if t != topic or v != version:
+                                continue
                             warnings.append(DriftWarning(
-                                agent_name=agent,
-                                expected_version=dominant_version,
-                                actual_version=version,
+                                agent_name=symbols[agent],
+                                expected_version=symbols[dominant_version],
+                                actual_version=symbols[version],
                                 drift_severity=drift_severity,
-                                description=f"Agent using outdated schema version {version} for topic {topic}",
+                                description=f"Agent using outdated schema version {symbols[version]} for topic {symbols[topic]}",
                                 affected_interactions=count,
-                                first_detected=first_detected
+                                first_detected=datetime.fromtimestamp(first_detected)
                             ))
 
         return warnings
@@ -344,14 +662,17 @@ class CoherenceTracker:
         Returns:
             CoherenceMetrics object
         """
+        sources, targets, versions, timestamps, successful = self.interactions.columns(
+            "source", "target", "schema_version", "timestamp", "successful")
+
         # Filter interactions
         if agent_name:
-            interactions = [i for i in self.interactions
-                          if i.source == agent_name or i.target == agent_name]
-        else:
-            interactions = self.interactions
+            agent = self.interactions.symbol_id(agent_name)
+            involved = [source == agent or target == agent for source, target in zip(sources, targets)]
+            sources, versions, timestamps, successful = (
+                list(compress(column, involved)) for column in (sources, versions, timestamps, successful))
 
-        if not interactions:
+        if not timestamps:
             # No interactions = perfect coherence (nothing to be incoherent)
             return CoherenceMetrics(
                 schema_version_consistency=1.0,
@@ -375,8 +696,7 @@ class CoherenceTracker:
         schema_consistency = sum(topic_version_consistency) / len(topic_version_consistency) if topic_version_consistency else 0
 
         # Contract compliance rate (successful interactions)
-        successful = sum(1 for i in interactions if i.successful)
-        compliance_rate = successful / len(interactions) if interactions else 0
+        compliance_rate = sum(successful) / len(successful)
 
         # Migration completion rate (placeholder - would check actual migration records)
         migration_rate = 0.85  # TODO: Calculate from migration manager
@@ -385,10 +705,10 @@ class CoherenceTracker:
         propagation = 0.9  # TODO: Calculate based on contract manager
 
         # Temporal consistency (same agent over time)
-        temporal = self._calculate_temporal_consistency(agent_name, interactions)
+        temporal = self._calculate_temporal_consistency(sources, timestamps, versions)
 
         # Spatial consistency (different agents at same time)
-        spatial = self._calculate_spatial_consistency(interactions)
+        spatial = self._calculate_spatial_consistency(timestamps, versions)
 
         # Overall score (weighted average)
         overall = (
@@ -410,69 +730,72 @@ class CoherenceTracker:
             overall_score=overall
         )
 
-    def _calculate_temporal_consistency(self, agent_name: Optional[str],
-                                       interactions: List[Interaction]) -> float:
-        """Calculate temporal consistency (same agent over time)"""
-        if not interactions:
-            return 1.0
-
+    def _calculate_temporal_consistency(self, sources: Iterable[int], timestamps: Iterable[float],
+                                        versions: Iterable[int]) -> float:
+        """Calculate temporal consistency (same agent over time) from interaction columns"""
         # Group by agent
-        agent_interactions: Dict[str, List[Interaction]] = defaultdict(list)
-        for interaction in interactions:
-            agent_interactions[interaction.source].append(interaction)
+        agent_history: Dict[int, List[Tuple[float, int]]] = defaultdict(list)
+        for source, timestamp, version in zip(sources, timestamps, versions):
+            agent_history[source].append((timestamp, version))
 
         consistency_scores = []
 
-        for agent, agent_ints in agent_interactions.items():
-            if len(agent_ints) < 2:
+        for history in agent_history.values():
+            if len(history) < 2:
                 continue
 
-            # Sort by time
-            sorted_ints = sorted(agent_ints, key=lambda i: i.timestamp)
-
-            # Check version changes
-            version_changes = 0
-            current_version = sorted_ints[0].schema_version
-
-            for interaction in sorted_ints[1:]:
-                if interaction.schema_version != current_version:
-                    version_changes += 1
-                    current_version = interaction.schema_version
+            # Count version changes in time order
+            history.sort(key=lambda entry: entry[0])
+            agent_versions = [version for _, version in history]
+            version_changes = sum(a != b for a, b in zip(agent_versions, agent_versions[1:]))
 
             # Lower score for frequent changes
-            consistency = 1.0 - (version_changes / len(sorted_ints))
-            consistency_scores.append(consistency)
+            consistency_scores.append(1.0 - (version_changes / len(history)))
 
         return sum(consistency_scores) / len(consistency_scores) if consistency_scores else 1.0
 
-    def _calculate_spatial_consistency(self, interactions: List[Interaction]) -> float:
-        """Calculate spatial consistency (different agents at same time)"""
-        if not interactions:
-            return 1.0
-
+    def _calculate_spatial_consistency(self, timestamps: Iterable[float], versions: Iterable[int]) -> float:
+        """Calculate spatial consistency (different agents at same time) from interaction columns"""
         # Group by time windows (1 hour buckets)
-        time_buckets: Dict[datetime, List[Interaction]] = defaultdict(list)
-
-        for interaction in interactions:
-            bucket = interaction.timestamp.replace(minute=0, second=0, microsecond=0)
-            time_buckets[bucket].append(interaction)
+        buckets = [int(timestamp // 3600) for timestamp in timestamps]
+        bucket_sizes = Counter(buckets)
+        bucket_versions = Counter(bucket for bucket, _ in set(zip(buckets, versions)))
 
         consistency_scores = []
 
-        for bucket, bucket_ints in time_buckets.items():
-            if len(bucket_ints) < 2:
+        for bucket, size in bucket_sizes.items():
+            if size < 2:
                 continue
 
-            # Check version consistency within bucket
-            versions = [i.schema_version for i in bucket_ints]
-            unique_versions = set(versions)
-
             # Higher score for fewer versions in same time window
-            consistency = 1.0 - ((len(unique_versions) - 1) / len(versions))
+            consistency = 1.0 - ((bucket_versions[bucket] - 1) / size)
             consistency_scores.append(max(0, consistency))
 
         return sum(consistency_scores) / len(consistency_scores) if consistency_scores else 1.0
 
+    def _edge_stats(self) -> Dict[Tuple[str, str], Tuple[int, int, Set[str]]]:
+        """
+        Aggregate interactions per (source, target) edge.
+
+        Returns:
+            ``(source, target)`` -> ``(interactions, failures, versions)``, in
+            order of first interaction
+        """
+        sources, targets, versions, successful = self.interactions.columns(
+            "source", "target", "schema_version", "successful")
+        edges = list(zip(sources, targets))
+        counts = Counter(edges)
+        failures = Counter(compress(edges, [not ok for ok in successful]))
+        edge_versions: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+        symbols = self.interactions.symbols
+        for source, target, version in set(zip(sources, targets, versions)):
+            edge_versions[(source, target)].add(symbols[version])
+
+        return {
+            (symbols[source], symbols[target]): (count, failures[(source, target)], edge_versions[(source, target)])
+            for (source, target), count in counts.items()
+        }
+
     def analyze_coherence_paths(self) -> CoherenceReport:
         """
         Use networkx to analyze coherence across execution paths
@@ -493,6 +816,7 @@ class CoherenceTracker:
 
         # Find incoherent paths
         incoherent_paths = []
+        edges = self._edge_stats()
 
         for source in self.graph.nodes():
             for target in self.graph.nodes():
@@ -504,10 +828,10 @@ class CoherenceTracker:
                     paths = nx.all_simple_paths(self.graph, source, target, cutoff=5)
 
                     for path in paths:
-                        score = self._check_path_coherence(path)
+                        score = self._check_path_coherence(path, edges)
 
                         if score < self.coherence_threshold:
-                            issues = self._identify_path_issues(path)
+                            issues = self._identify_path_issues(path, edges)
                             recommendation = self._generate_path_recommendation(path, issues)
 
                             incoherent_paths.append(IncoherentPath(
@@ -530,56 +854,50 @@ class CoherenceTracker:
 
         return report
 
-    def _check_path_coherence(self, path: List[str]) -> float:
+    def _path_stats(self, path: List[str], edges: Optional[Dict] = None) -> Tuple[int, int, Set[str]]:
+        """Interactions, failures and schema versions along the edges of a path"""
+        if edges is None:
+            edges = self._edge_stats()
+
+        total, failures, versions = 0, 0, set()
+        for edge in zip(path, path[1:]):
+            count, failed, edge_versions = edges.get(edge, (0, 0, ()))
+            total += count
+            failures += failed
+            versions.update(edge_versions)
+        return total, failures, versions
+
+    def _check_path_coherence(self, path: List[str], edges: Optional[Dict] = None) -> float:
         """Check coherence along a path"""
         if len(path) < 2:
             return 1.0
 
-        # Find interactions along this path
-        path_interactions = []
-        for i in range(len(path) - 1):
-            source = path[i]
-            target = path[i + 1]
-
-            matching = [inter for inter in self.interactions
-                       if inter.source == source and inter.target == target]
-            path_interactions.extend(matching)
+        total, failures, versions = self._path_stats(path, edges)
 
-        if not path_interactions:
+        if not total:
             return 1.0  # No data, assume coherent
 
-        # Check version consistency
-        versions = [i.schema_version for i in path_interactions]
-        unique_versions = set(versions)
-
         # Higher score for fewer versions
-        base_score = 1.0 - ((len(unique_versions) - 1) / len(versions))
+        base_score = 1.0 - ((len(versions) - 1) / total)
 
         # Penalize failures
-        failures = sum(1 for i in path_interactions if not i.successful)
-        failure_penalty = failures / len(path_interactions)
+        failure_penalty = failures / total
 
         return max(0, base_score - failure_penalty)
 
-    def _identify_path_issues(self, path: List[str]) -> List[str]:
+    def _identify_path_issues(self, path: List[str], edges: Optional[Dict] = None) -> List[str]:
         """Identify issues along a path"""
         issues = []
 
-        # Check for version mismatches
-        path_interactions = []
-        for i in range(len(path) - 1):
-            matching = [inter for inter in self.interactions
-                       if inter.source == path[i] and inter.target == path[i + 1]]
-            path_interactions.extend(matching)
+        total, failures, versions = self._path_stats(path, edges)
 
-        if path_interactions:
-            versions = set(i.schema_version for i in path_interactions)
+        if total:
+            # Check for version mismatches
             if len(versions) > 1:
-                issues.append(f"Multiple schema versions in use: {', '.join(versions)}")
+                issues.append(f"Multiple schema versions in use: {', '.join(sorted(versions))}")
 
-            failures = [i for i in path_interactions if not i.successful]
             if failures:
-                issues.append(f"{len(failures)} failed interactions")
+                issues.append(f"{failures} failed interactions")
 
         return issues
 
@@ -639,34 +957,20 @@ class CoherenceTracker:
         Returns:
             NetworkX DiGraph with coherence annotations
         """
+        edges = self._edge_stats()
+
         if not self.graph:
             # Create basic graph from interactions
             coherence_graph = nx.DiGraph()
 
-            for interaction in self.interactions:
-                if not coherence_graph.has_edge(interaction.source, interaction.target):
-                    coherence_graph.add_edge(interaction.source, interaction.target,
-                                           interaction_count=0, versions=set(), coherence_score=0.0)
-
-                edge_data = coherence_graph[interaction.source][interaction.target]
-                edge_data['interaction_count'] += 1
-                edge_data['versions'].add(interaction.schema_version)
-
-            # Calculate coherence scores
-            for source, target in coherence_graph.edges():
-                matching_interactions = [i for i in self.interactions
-                                       if i.source == source and i.target == target]
-                if matching_interactions:
-                    successful = sum(1 for i in matching_interactions if i.successful)
-                    success_rate = successful / len(matching_interactions)
-
-                    # Version consistency factor
-                    versions = coherence_graph[source][target]['versions']
-                    version_consistency = 1.0 if len(versions) == 1 else 0.8
+            for (source, target), (count, failures, versions) in edges.items():
+                # Version consistency factor
+                version_consistency = 1.0 if len(versions) == 1 else 0.8
 
-                    # Overall coherence
-                    coherence = success_rate * version_consistency
-                    coherence_graph[source][target]['coherence_score'] = coherence
+                # Overall coherence
+                success_rate = (count - failures) / count
+                coherence_graph.add_edge(source, target, interaction_count=count, versions=versions,
+                                         coherence_score=success_rate * version_consistency)
 
             return coherence_graph
 
@@ -674,13 +978,9 @@ class CoherenceTracker:
         coherence_graph = self.graph.copy()
 
         for source, target in coherence_graph.edges():
-            matching_interactions = [i for i in self.interactions
-                                   if i.source == source and i.target == target]
-
-            if matching_interactions:
-                versions = set(i.schema_version for i in matching_interactions)
-                successful = sum(1 for i in matching_interactions if i.successful)
-                success_rate = successful / len(matching_interactions)
+            if (source, target) in edges:
+                count, failures, versions = edges[(source, target)]
+                success_rate = (count - failures) / count
 
                 # Version consistency factor: penalize if multiple versions are in use
                 version_consistency = 1.0 if len(versions) == 1 else 0.8
@@ -690,7 +990,7 @@ class CoherenceTracker:
 
                 coherence_graph[source][target]['coherence_score'] = coherence
                 coherence_graph[source][target]['versions'] = versions
-                coherence_graph[source][target]['interaction_count'] = len(matching_interactions)
+                coherence_graph[source][target]['interaction_count'] = count
             else:
                 # No interactions tracked for this edge - set defaults
                 coherence_graph[source][target]['coherence_score'] = 1.0  # No evidence of issues
@@ -0,0 +1,234 @@
+"""
+Continuous Profiling
+
+Keeps the last few minutes of runtime behaviour in fixed memory so there
+is data to look at when an incident happens, instead of having to start
+``graphbus profile`` afterwards.
+
+:class:`ContinuousProfiler` runs a :class:`PerformanceProfiler` whose
+sliding window is the retention period: latency histograms per method and
+handler, and per topic, are kept in one slice per ``slice_seconds``, and
+resource samples in a bounded ring.  Old slices are folded into the
+since-start totals, so memory does not grow with uptime.
+
+A dump writes the ring as JSON or as a Chrome trace of counter tracks
+(calls/s, p50/p99 latency, topic rates, CPU and memory).  Dumps are taken
+with :meth:`ContinuousProfiler.dump`, ``graphbus profile-dump <pid>`` or
+by sending the process ``SIGUSR2``.
+"""
+
+import json
+import os
+import signal
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from graphbus_core.runtime.chrome_trace import ChromeTraceRecorder
+from graphbus_core.runtime.profiler import PerformanceProfiler
+
+DUMP_SIGNAL = getattr(signal, "SIGUSR2", None)
+DUMP_FORMATS = ("json", "chrome-trace")
+
+
+class ContinuousProfiler:
+    """
+    Always-on, fixed-memory profiling ring with on-demand dumps.
+    """
+
+    def __init__(self, minutes: float = 10.0, slice_seconds: float = 10.0,
+                 snapshot_interval: float = 5.0, dump_dir: Union[str, Path] = ".graphbus/profiles"):
+        """
+        Initialize continuous profiler.
+
+        Args:
+            minutes: How much history the ring keeps
+            slice_seconds: Resolution of the latency and rate history
+            snapshot_interval: Seconds between CPU/memory samples
+            dump_dir: Directory signal-triggered dumps are written to
+        """
+        slots = max(1, round(minutes * 60 / slice_seconds))
+        self.minutes = minutes
+        self.dump_dir = Path(dump_dir)
+        self.profiler = PerformanceProfiler(
+            snapshot_interval=snapshot_interval,
+            window_seconds=slots * slice_seconds,
+            window_slots=slots,
+            snapshot_history=max(1, int(minutes * 60 / snapshot_interval)),
+        )
+        self._previous_handler = None
+        self.last_dump: List[Path] = []
+
+    @property
+    def enabled(self) -> bool:
+        """True while recording."""
+        return self.profiler.enabled
+
+    def start(self) -> None:
+        """Start recording."""
+        self.profiler.enable()
+
+    def stop(self) -> None:
+        """Stop recording and restore any signal handler replaced by :meth:`install_signal_handler`."""
+        self.profiler.disable()
+        self.uninstall_signal_handler()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        The ring as a JSON-serializable document.
+
+        Returns:
+            Dict with ``slices`` (per time slice: method latency and calls/s,
+            topic publish rates and routing latency), ``resources`` (CPU,
+            memory and thread samples) and since-start ``summary`` and
+            ``latency``; times are epoch seconds
+        """
+        timeline = self.profiler.get_timeline()
+        slice_seconds = timeline["slice_seconds"]
+        to_epoch = _epoch_converter()
+
+        slices: Dict[int, Dict[str, Any]] = {}
+
+        def slot(start_ns: int) -> Dict[str, Any]:
+            entry = slices.get(start_ns)
+            if entry is None:
+                entry = slices[start_ns] = {"start": to_epoch(start_ns), "methods": {}, "topics": {}}
+            return entry
+
+        for name, history in timeline["methods"].items():
+            for start_ns, histogram in history:
+                slot(start_ns)["methods"][name] = {
+                    **histogram.percentiles(), "rate": histogram.count / slice_seconds
+                }
+        for topic, history in timeline["topics"].items():
+            for start_ns, histogram in history:
+                slot(start_ns)["topics"][topic] = {
+                    **histogram.percentiles(), "rate": histogram.count / slice_seconds
+                }
+
+        cutoff = time.time() - self.minutes * 60
+        resources = [
+            {
+                "timestamp": s.timestamp,
+                "cpu_percent": s.cpu_percent,
+                "memory_mb": s.memory_mb,
+                "memory_percent": s.memory_percent,
+                "thread_count": s.thread_count,
+            }
+            for s in list(self.profiler.system_snapshots) if s.timestamp >= cutoff
+        ]
+
+        return {
+            "pid": os.getpid(),
+            "generated_at": time.time(),
+            "window_seconds": self.profiler.window_seconds,
+            "slice_seconds": slice_seconds,
+            "slices": [slices[start] for start in sorted(slices)],
+            "resources": resources,
+            "summary": self.profiler.get_summary(),
+            "latency": self.profiler.get_latency_percentiles(),
+        }
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        The ring as Chrome trace counter tracks (see :mod:`chrome_trace`).
+
+        Each method and topic gets a rate track and a latency track (p50 and
+        p99 in ms) with one sample per slice; resources get CPU, memory and
+        thread tracks.
+        """
+        timeline = self.profiler.get_timeline()
+        slice_seconds = timeline["slice_seconds"]
+        origin = time.perf_counter_ns() - int(self.profiler.window_seconds * 1e9)
+        recorder = ChromeTraceRecorder(max_events=None, process_name="graphbus runtime", origin_ns=origin)
+
+        for kind, histories in (("method", timeline["methods"]), ("topic", timeline["topics"])):
+            for name, history in histories.items():
+                for start_ns, histogram in history:
+                    recorder.counter(f"{name} rate/s", kind, start_ns, rate=histogram.count / slice_seconds)
+                    recorder.counter(f"{name} latency ms", kind, start_ns,
+                                     p50=histogram.percentile(0.5) * 1000,
+                                     p99=histogram.percentile(0.99) * 1000)
+
+        offset_ns = time.perf_counter_ns() - int(time.time() * 1e9)
+        for s in list(self.profiler.system_snapshots):
+            ts_ns = int(s.timestamp * 1e9) + offset_ns
+            if ts_ns < origin:
+                continue
+            recorder.counter("cpu %", "resources", ts_ns, cpu=s.cpu_percent)
+            recorder.counter("memory MB", "resources", ts_ns, rss=s.memory_mb)
+            recorder.counter("threads", "resources", ts_ns, threads=s.thread_count)
+        return recorder.to_dict()
+
+    def dump(self, path: Optional[Union[str, Path]] = None, format: str = "json") -> Path:
+        """
+        Write the ring to disk.
+
+        Args:
+            path: Output file (default: a timestamped file in ``dump_dir``)
+            format: "json" or "chrome-trace"
+
+        Returns:
+            Path written
+        """
+        if format not in DUMP_FORMATS:
+            raise ValueError(f"Unknown dump format {format!r}; expected one of {DUMP_FORMATS}")
+        if path is None:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            suffix = ".trace.json" if format == "chrome-trace" else ".json"
+            path = self.dump_dir / f"graphbus-profile-{os.getpid()}-{stamp}{suffix}"
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        document = self.to_chrome_trace() if format == "chrome-trace" else self.snapshot()
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(document, default=str))
+        os.replace(tmp, path)  # readers never see a partial dump
+        return path
+
+    def dump_all(self) -> List[Path]:
+        """Write both formats to ``dump_dir``."""
+        self.last_dump = [self.dump(format=fmt) for fmt in DUMP_FORMATS]
+        return self.last_dump
+
+    def install_signal_handler(self, signum: Optional[int] = DUMP_SIGNAL) -> bool:
+        """
+        Dump both formats to ``dump_dir`` when the process receives ``signum``.
+
+        The dump runs on a separate thread, so the signal never interrupts
+        a thread that holds one of the profiler's locks.
+
+        Returns:
+            False if signals cannot be installed here (not the main thread,
+            or the platform has no such signal)
+        """
+        if signum is None or threading.current_thread() is not threading.main_thread():
+            return False
+
+        def on_signal(sig, frame):
+            threading.Thread(target=self._dump_quietly, name="graphbus-profile-dump", daemon=True).start()
+
+        self._previous_handler = (signum, signal.signal(signum, on_signal))
+        return True
+
+    def uninstall_signal_handler(self) -> None:
+        """Restore the handler replaced by :meth:`install_signal_handler`."""
+        if self._previous_handler is None or threading.current_thread() is not threading.main_thread():
+            return
+        signum, previous = self._previous_handler
+        signal.signal(signum, previous if previous is not None else signal.SIG_DFL)
+        self._previous_handler = None
+
+    def _dump_quietly(self) -> None:
+        try:
+            paths = self.dump_all()
+            print(f"[ContinuousProfiler] Dumped profile to {', '.join(str(p) for p in paths)}")
+        except Exception as e:
+            print(f"[ContinuousProfiler] Warning: Profile dump failed: {e}")
+
+
+def _epoch_converter():
+    """Map ``perf_counter_ns`` timestamps to epoch seconds."""
+    offset = time.time() - time.perf_counter_ns() / 1e9
+    return lambda ns: ns / 1e9 + offset
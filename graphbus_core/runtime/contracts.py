@@ -6,7 +6,6 @@ checking between agents. It uses the networkx dependency graph to analyze
 impact of schema changes and notify affected downstream agents.
 """
 
-import json
 import re
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Set, Tuple
@@ -15,6 +14,8 @@ from datetime import datetime
 from enum import Enum
 import networkx as nx
 
+from graphbus_core import codec
+
 
 class ChangeType(Enum):
     """Types of schema changes"""
@@ -201,17 +202,21 @@ class ContractManager:
     Uses networkx dependency graph for impact analysis.
     """
 
-    def __init__(self, storage_path: str = ".graphbus/contracts", graph: nx.DiGraph = None):
+    def __init__(self, storage_path: str = ".graphbus/contracts", graph: nx.DiGraph = None,
+                 storage_format: str = "json"):
         """
         Initialize contract manager
 
         Args:
             storage_path: Directory to store contract files
             graph: NetworkX dependency graph for impact analysis
+            storage_format: ``"json"`` or ``"binary"`` for contract files
+                (either is read back)
         """
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
         self.graph = graph
+        self.storage_format = codec.validate_format(storage_format)
         self.contracts: Dict[str, Dict[str, Contract]] = {}  # agent_name -> version -> Contract
 
         # Load existing contracts
@@ -224,13 +229,11 @@ class ContractManager:
 
         for contract_file in self.storage_path.glob("*.json"):
             try:
-                with open(contract_file, 'r') as f:
-                    data = json.load(f)
-                    contract = Contract.from_dict(data)
+                contract = Contract.from_dict(codec.load(contract_file))
 
-                    if contract.agent_name not in self.contracts:
-                        self.contracts[contract.agent_name] = {}
-                    self.contracts[contract.agent_name][contract.version] = contract
+                if contract.agent_name not in self.contracts:
+                    self.contracts[contract.agent_name] = {}
+                self.contracts[contract.agent_name][contract.version] = contract
             except Exception as e:
                 print(f"Warning: Failed to load contract {contract_file}: {e}")
 
@@ -310,8 +313,7 @@ class ContractManager:
         filename = f"{contract.agent_name}_{contract.version}.json"
         filepath = self.storage_path / filename
 
-        with open(filepath, 'w') as f:
-            json.dump(contract.to_dict(), f, indent=2)
+        codec.dump(contract.to_dict(), filepath, self.storage_format)
 
     def get_contract(self, agent_name: str, version: Optional[str] = None) -> Optional[Contract]:
         """
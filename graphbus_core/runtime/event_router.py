@@ -3,13 +3,19 @@ Event Router - Routes events to node handlers in Runtime Mode
 """
 
 import logging
-from typing import Dict, List, Callable
+import time
+from typing import Dict, List, Callable, Optional
 import inspect
 
 from graphbus_core.model.message import Event
 from graphbus_core.model.topic import Subscription
 from graphbus_core.node_base import GraphBusNode
 from graphbus_core.runtime.message_bus import MessageBus
+from graphbus_core.exceptions import CircuitOpenError
+from graphbus_core.runtime.bulkhead import BulkheadRegistry
+from graphbus_core.runtime.circuit_breaker import CircuitBreakerRegistry
+from graphbus_core.runtime.inflight import InFlightTracker
+from graphbus_core.runtime.tracing import current_span
 
 logger = logging.getLogger(__name__)
 
@@ -25,21 +31,34 @@ class EventRouter:
     - Support @subscribe decorator and SUBSCRIBE class attribute
     """
 
-    def __init__(self, bus: MessageBus, nodes: Dict[str, GraphBusNode]):
+    def __init__(self, bus: MessageBus, nodes: Dict[str, GraphBusNode],
+                 bulkheads: Optional[BulkheadRegistry] = None,
+                 inflight: Optional[InFlightTracker] = None,
+                 circuit_breakers: Optional[CircuitBreakerRegistry] = None):
         """
         Initialize event router.
 
         Args:
             bus: MessageBus instance
             nodes: Dict of node_name -> GraphBusNode instance
+            bulkheads: Optional bulkhead registry enforced around handler calls
+            inflight: Optional tracker counting deliveries per node and topic
+            circuit_breakers: Optional breaker registry checked before handler calls
         """
         self.bus = bus
         self.nodes = nodes
+        self.bulkheads = bulkheads if bulkheads is not None else BulkheadRegistry()
+        self.inflight = inflight if inflight is not None else InFlightTracker()
+        self.circuit_breakers = circuit_breakers if circuit_breakers is not None else CircuitBreakerRegistry()
         self._handlers: Dict[str, List[tuple[GraphBusNode, str]]] = {}  # topic -> [(node, method_name)]
         # Cache the calling convention for each (node_name, handler_name) pair so
         # route_event_to_node() doesn't re-run inspect.signature() on every event.
         # Values: 0 = no params, 1 = pass payload dict, 2+ = pass full Event.
         self._handler_param_counts: Dict[tuple[str, str], int] = {}
+        # Optional PerformanceProfiler timing each handler as "Node.handler"
+        self.profiler = None
+        # Optional PrometheusMetrics counting handler calls, errors and durations
+        self.metrics = None
 
     def register_subscriptions(self, subscriptions: List[Subscription]) -> None:
         """
@@ -108,6 +127,10 @@ class EventRouter:
             handler_name: Name of handler method
             event: Event to deliver
         """
+        span = current_span()
+        if span is not None and span.event_id == event.event_id:
+            span.handler = handler_name  # delivery span opened by the bus
+
         try:
             handler = getattr(node, handler_name)
 
@@ -118,20 +141,43 @@ class EventRouter:
                 1,  # safe default: pass payload
             )
 
-            # Remove 'self' parameter (it's a bound method)
-            # The handler is already bound to the node instance
-            if param_count == 0:
-                # No parameters (just self, already bound)
-                handler()
-            elif param_count == 1:
-                # One parameter: pass payload dict by default
-                # (Most handlers expect the payload, not the Event object)
-                handler(event.payload)
-            else:
-                # Multiple parameters or unclear - default to passing event
-                handler(event)
-
+            profiler, metrics = self.profiler, self.metrics
+            with self.circuit_breakers.guard(node.name, handler_name), \
+                    self.inflight.track(node=node.name, topic=event.topic, handler=handler_name), \
+                    self.bulkheads.guard(node.name, handler_name):
+                profiled = profiler.start_method_call(node.name, handler_name) if profiler is not None else None
+                started = time.perf_counter() if metrics is not None else 0.0
+                try:
+                    # Remove 'self' parameter (it's a bound method)
+                    # The handler is already bound to the node instance
+                    if param_count == 0:
+                        # No parameters (just self, already bound)
+                        handler()
+                    elif param_count == 1:
+                        # One parameter: pass payload dict by default
+                        # (Most handlers expect the payload, not the Event object)
+                        handler(event.payload)
+                    else:
+                        # Multiple parameters or unclear - default to passing event
+                        handler(event)
+                finally:
+                    if profiled is not None:
+                        profiler.end_method_call(node.name, handler_name, profiled)
+                    if metrics is not None:
+                        metrics.increment_method_calls(node.name, handler_name)
+                        metrics.observe_method_duration(node.name, handler_name, time.perf_counter() - started,
+                                                        span.trace_id if span is not None else None)
+
+        except CircuitOpenError as e:
+            # The handler is known to be failing; skip it without a traceback
+            if span is not None and span.event_id == event.event_id:
+                span.error = f"{type(e).__name__}: {e}"
+            logger.warning("Skipped %s.%s() for %s: %s", node.name, handler_name, event.topic, e)
         except Exception as e:
+            if span is not None and span.event_id == event.event_id:
+                span.error = f"{type(e).__name__}: {e}"
+            if self.metrics is not None:
+                self.metrics.increment_method_errors(node.name, handler_name)
             logger.error("Error executing %s.%s(): %s", node.name, handler_name, e, exc_info=True)
 
     def get_handlers_for_topic(self, topic: str) -> List[tuple[GraphBusNode, str]]:
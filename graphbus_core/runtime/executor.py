@@ -2,16 +2,27 @@
 Runtime Executor - Main entry point for Runtime Mode
 """
 
+import asyncio
+import contextvars
+import functools
 import importlib
+import inspect
+import os
 import sys
+import threading
 import time
-from typing import Dict, Any, List, Optional
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, Dict, Any, Iterator, List, Optional
 from pathlib import Path
 from collections import deque
 
 from graphbus_core.config import RuntimeConfig
 from graphbus_core.model.agent_def import AgentDefinition
 from graphbus_core.model.graph import AgentGraph
+from graphbus_core.model.message import generate_id
 from graphbus_core.node_base import GraphBusNode
 from graphbus_core.runtime.loader import ArtifactLoader
 from graphbus_core.runtime.message_bus import MessageBus
@@ -22,6 +33,31 @@ from graphbus_core.runtime.health import HealthMonitor
 from graphbus_core.runtime.debugger import InteractiveDebugger
 from graphbus_core.runtime.contracts import ContractManager
 from graphbus_core.runtime.coherence import CoherenceTracker
+from graphbus_core.runtime.bulkhead import BulkheadRegistry, BulkheadSpec
+from graphbus_core.runtime.circuit_breaker import _NOT_FAILURES, CircuitBreakerRegistry, CircuitBreakerSpec
+from graphbus_core.runtime.inflight import InFlightTracker
+from graphbus_core.runtime.scheduler import Scheduler
+from graphbus_core.runtime.tracing import Tracer
+from graphbus_core.runtime.watchdog import Watchdog
+from graphbus_core.runtime.monitoring import PrometheusMetrics
+from graphbus_core.runtime.checkpoint import (
+    CHECKPOINT_FORMAT_VERSION, CheckpointStore, SnapshotBarrier
+)
+
+if TYPE_CHECKING:
+    from graphbus_core.runtime.continuous import ContinuousProfiler
+    from graphbus_core.runtime.profiler import PerformanceProfiler
+
+
+class _MethodCall:
+    """A method call passing through RuntimeExecutor._observe_call."""
+
+    __slots__ = ("node", "method", "trace_id")
+
+    def __init__(self, node: str, method: str):
+        self.node = node
+        self.method = method
+        self.trace_id: Optional[str] = None  # set by the call's trace span
 
 
 class RuntimeExecutor:
@@ -53,6 +89,11 @@ class RuntimeExecutor:
         self.bus: Optional[MessageBus] = None
         self.router: Optional[EventRouter] = None
         self._is_running = False
+        self._draining = False
+
+        # In-flight method calls and event deliveries, drained by stop()
+        self.inflight = InFlightTracker()
+        self.last_drain_report: Optional[Dict[str, Any]] = None
 
         # Advanced features
         self.state_manager: Optional[StateManager] = None
@@ -64,6 +105,35 @@ class RuntimeExecutor:
         self.contract_manager: Optional[ContractManager] = None
         self.coherence_tracker: Optional[CoherenceTracker] = None
 
+        # Per-node / per-method concurrency and rate limits
+        self.bulkheads = BulkheadRegistry()
+        self.circuit_breakers = CircuitBreakerRegistry()
+
+        # Timer/cron jobs declared with @every / @cron (one timing-wheel thread)
+        self.scheduler: Optional[Scheduler] = None
+
+        # Causal tracing of publishes, deliveries and method calls
+        self.tracer: Optional[Tracer] = None
+        if config.enable_tracing:
+            self.setup_tracing()
+
+        # Always-on profiling ring (started with the runtime, see setup_continuous_profiling)
+        self.continuous_profiler: Optional["ContinuousProfiler"] = None
+        self.profiler: Optional["PerformanceProfiler"] = None
+
+        # Prometheus metrics fed by the bus, router and call_method (see setup_metrics)
+        self.metrics: Optional[PrometheusMetrics] = None
+
+        # Hung-handler detection over in-flight calls (see setup_watchdog)
+        self.watchdog: Optional[Watchdog] = None
+
+        # Coordinated checkpoints: the barrier holds new top-level publishes
+        # and calls (work already in flight passes) while a cut is taken
+        self._barrier = SnapshotBarrier(is_exempt=self.inflight.is_nested)
+        self._checkpoint_lock = threading.Lock()
+        self.checkpoint_store: Optional[CheckpointStore] = None
+        self.last_checkpoint: Optional[Dict[str, Any]] = None
+
         # Initialize contract manager if validation is enabled
         if config.enable_validation:
             contracts_dir = Path(config.artifacts_dir) / "contracts"
@@ -77,6 +147,14 @@ class RuntimeExecutor:
         self._event_history: deque = deque(maxlen=1000)
         self._method_call_history: deque = deque(maxlen=1000)
 
+        # Async dispatch: a bounded thread pool for offloading sync node methods
+        # and one asyncio.Semaphore per (event loop, node) capping how many
+        # async calls may be in flight on a single node at once.  Semaphores are
+        # bound to the loop that first waits on them, hence the per-loop map.
+        self._async_pool: Optional[ThreadPoolExecutor] = None
+        self._async_pool_lock = threading.Lock()
+        self._node_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
     @property
     def message_bus(self):
         """Alias for bus property."""
@@ -137,6 +215,7 @@ class RuntimeExecutor:
 
                 # Set the node name for identification
                 node.name = agent_def.name
+                self._configure_node_memory(node)
 
                 # Store instance
                 self.nodes[agent_def.name] = node
@@ -150,6 +229,26 @@ class RuntimeExecutor:
 
         return self.nodes
 
+    def _configure_node_memory(self, node: GraphBusNode) -> None:
+        """Apply the configured history limit and spill file to a node's memory."""
+        spill_path = None
+        if self.config.history_spill_dir:
+            spill_path = str(Path(self.config.history_spill_dir) / f"{node.name}.jsonl")
+        node.memory.configure_history(self.config.history_max_entries, spill_path)
+
+    def get_memory_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-node memory statistics.
+
+        Returns:
+            Dict of node_name -> NodeMemory.memory_stats()
+        """
+        return {
+            name: node.memory.memory_stats()
+            for name, node in self.nodes.items()
+            if getattr(node, "memory", None) is not None
+        }
+
     def setup_message_bus(self) -> None:
         """Setup message bus and connect nodes."""
         if not self.config.enable_message_bus:
@@ -160,9 +259,18 @@ class RuntimeExecutor:
 
         # Create message bus
         self.bus = MessageBus()
+        self.bus.barrier = self._barrier
+        self.bus.tracer = self.tracer
+        self.bus.profiler = self.profiler
+        self.bus.metrics = self.metrics
 
         # Create event router
-        self.router = EventRouter(self.bus, self.nodes)
+        self.router = EventRouter(
+            self.bus, self.nodes, bulkheads=self.bulkheads, inflight=self.inflight,
+            circuit_breakers=self.circuit_breakers
+        )
+        self.router.profiler = self.profiler
+        self.router.metrics = self.metrics
 
         # Register all subscriptions from artifacts
         subscriptions = self.loader.load_subscriptions()
@@ -202,6 +310,8 @@ class RuntimeExecutor:
 
         # Initialize nodes
         self.initialize_nodes()
+        self.setup_bulkheads()
+        self.setup_circuit_breakers()
 
         # Setup message bus
         self.setup_message_bus()
@@ -223,8 +333,18 @@ class RuntimeExecutor:
         self.setup_contract_validation()
         self.setup_coherence_tracking()
 
+        if self.config.continuous_profiling:
+            self.setup_continuous_profiling()
+
+        if self.config.watchdog:
+            self.setup_watchdog()
+
         self._is_running = True
 
+        # Scheduled jobs call back into the executor, so start them last
+        if self._has_scheduled_methods():
+            self.setup_scheduler()
+
         print("=" * 60)
         print(f"RUNTIME READY - {len(self.nodes)} nodes active")
         if self.state_manager:
@@ -239,18 +359,111 @@ class RuntimeExecutor:
             print("  Contract Validation: ENABLED")
         if self.coherence_tracker:
             print("  Coherence Tracking: ENABLED")
+        if self.scheduler:
+            print(f"  Scheduler: {len(self.scheduler.get_jobs())} job(s)")
+        if self.continuous_profiler:
+            print(f"  Continuous Profiling: last {self.config.continuous_profile_minutes:g} min")
+        if self.watchdog:
+            print(f"  Watchdog: {self.config.watchdog_deadline:g}s deadline")
         print("=" * 60)
         print()
 
-    def stop(self) -> None:
-        """Stop the runtime executor."""
+    def stop(self, drain_timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Stop the runtime executor, draining in-flight work first.
+
+        Shutdown proceeds in order:
+
+        1. Stop the scheduler and the health monitor's restart supervisor,
+           and stop accepting new calls and publishes (work already running,
+           and anything it triggers, is still allowed to finish).
+        2. Wait for queued and in-flight calls/deliveries to complete, up to
+           ``drain_timeout`` seconds.
+        3. Shut down the async offload pool.
+        4. Persist node state via :meth:`save_all_states` and close the
+           state writer if state management is enabled.
+
+        Args:
+            drain_timeout: Seconds to wait for in-flight work
+                (default: ``config.drain_timeout``; 0 = don't wait)
+
+        Returns:
+            Drain report (also stored as ``last_drain_report``), or an empty
+            dict if the executor was not running
+        """
         if not self._is_running:
             print("[RuntimeExecutor] Not running")
-            return
+            return {}
+
+        if drain_timeout is None:
+            drain_timeout = self.config.drain_timeout
 
         print("[RuntimeExecutor] Stopping...")
+        if self.scheduler:
+            self.scheduler.stop()
+        if self.health_monitor:
+            self.health_monitor.stop()
+        self._draining = True
+        drain_start = time.time()
+        in_flight_at_stop = self.inflight.snapshot()
+
+        if in_flight_at_stop["active"] or in_flight_at_stop["pending"]:
+            print(f"[RuntimeExecutor] Draining {in_flight_at_stop['active']} active, "
+                  f"{in_flight_at_stop['pending']} queued operation(s) "
+                  f"(timeout {drain_timeout}s)...")
+        drained = self.inflight.wait_idle(timeout=drain_timeout)
+        remaining = self.inflight.snapshot()
+
+        with self._async_pool_lock:
+            if self._async_pool is not None:
+                # After a timed-out drain, don't block on stragglers and drop
+                # whatever never started.
+                self._async_pool.shutdown(wait=drained, cancel_futures=not drained)
+                self._async_pool = None
+
+        states_saved = None
+        if self.state_manager:
+            try:
+                states_saved = self.save_all_states()
+                self.state_manager.close()
+            except Exception as e:
+                print(f"[RuntimeExecutor] Warning: Failed to save states during shutdown: {e}")
+
+        for node in self.nodes.values():
+            if getattr(node, "memory", None) is not None:
+                node.memory.history.flush()
+
+        if self.continuous_profiler:
+            self.continuous_profiler.stop()
+        if self.watchdog:
+            # Stopped after the drain, so work stuck during it is still reported
+            self.watchdog.stop()
+
         self._is_running = False
+        self._draining = False
+
+        report = {
+            "drained": drained,
+            "drain_seconds": time.time() - drain_start,
+            "in_flight_at_stop": in_flight_at_stop,
+            "completed_during_drain": (
+                remaining["completed_total"] - in_flight_at_stop["completed_total"]
+            ),
+            "abandoned": {
+                "active": remaining["active"],
+                "pending": remaining["pending"],
+                "nodes": remaining["nodes"],
+                "topics": remaining["topics"],
+            },
+            "states_saved": states_saved,
+        }
+        self.last_drain_report = report
+
+        if not drained:
+            print(f"[RuntimeExecutor] Warning: drain timed out with {remaining['active']} "
+                  f"active operation(s) still running: {remaining['nodes'] or remaining['topics']}")
         print("[RuntimeExecutor] Stopped")
+        return report
 
     def call_method(
         self,
@@ -272,11 +485,167 @@ class RuntimeExecutor:
         Raises:
             ValueError: If node or method not found
         """
+        method = self._resolve_method(node_name, method_name)
+
+        with self._observe_call(node_name, method_name, kwargs) as call, \
+                self._barrier.admit(), self.circuit_breakers.guard(node_name, method_name), \
+                self.inflight.track(node=node_name, handler=method_name), \
+                self.bulkheads.guard(node_name, method_name), \
+                self._call_span(call):
+            return method(**kwargs)
+
+    async def call_method_async(
+        self,
+        node_name: str,
+        method_name: str,
+        **kwargs
+    ) -> Any:
+        """
+        Call a node method without blocking the running event loop.
+
+        Coroutine methods (``async def``) are awaited natively on the current
+        loop.  Regular methods are offloaded to the executor's bounded thread
+        pool via :meth:`call_method`, so any wrapping installed on it (health
+        monitoring, profiling) still applies.  At most
+        ``config.async_node_concurrency`` calls run on one node at a time;
+        further callers wait for a slot, while calls to other nodes proceed
+        concurrently.
+
+        Args:
+            node_name: Name of the node
+            method_name: Name of the method
+            **kwargs: Method arguments
+
+        Returns:
+            Method return value
+
+        Raises:
+            ValueError: If node or method not found
+            RuntimeError: If the executor has not been started
+        """
+        method = self._resolve_method(node_name, method_name)
+
+        if self.health_monitor and self.health_monitor.is_restarting(node_name):
+            # The buffer policy blocks until the restart finishes, so wait on the pool
+            await self._run_in_pool(functools.partial(self.health_monitor.admit, node_name))
+
+        async with self._get_node_semaphore(node_name):
+            if not inspect.iscoroutinefunction(inspect.unwrap(method)):
+                return await self._run_in_pool(
+                    functools.partial(self.call_method, node_name, method_name, **kwargs)
+                )
+
+            # Same guards as call_method, but those that can block (barrier,
+            # bulkheads) wait without holding up the event loop
+            try:
+                with self._observe_call(node_name, method_name, kwargs) as call:
+                    async with self._barrier.admit_async():
+                        with self.circuit_breakers.guard(node_name, method_name), \
+                                self.inflight.track(node=node_name, handler=method_name, coroutine=True):
+                            async with self.bulkheads.guard_async(node_name, method_name, self._run_in_pool):
+                                with self._call_span(call):
+                                    result = await method(**kwargs)
+            except _NOT_FAILURES:
+                raise
+            except Exception as e:
+                if self.health_monitor:
+                    self.health_monitor.record_failure(node_name, e)
+                raise
+
+            if self.health_monitor:
+                self.health_monitor.record_success(node_name)
+            return result
+
+    @contextmanager
+    def _observe_call(self, node_name: str, method_name: str,
+                      kwargs: Dict[str, Any]) -> Iterator["_MethodCall"]:
+        """
+        Debugger hook, dashboard log, profiling and metrics around one method call.
+
+        Shared by :meth:`call_method` and coroutine methods in
+        :meth:`call_method_async`; the guards go inside it.
+        """
+        # Debugger hook before method call
+        if self.debugger and self.debugger.enabled:
+            self.debugger.on_method_call(node_name, method_name, **kwargs)
+
+        # Log method call for dashboard.  Keep a handle on our own entry rather
+        # than patching _method_call_history[-1] afterwards: with concurrent
+        # callers the newest entry may belong to a different call.
+        call_log = self._log_method_call(node_name, method_name, kwargs)
+
+        # Always record duration even when an exception is raised.  Without
+        # try/finally a failed call leaves duration_ms: 0 in the dashboard,
+        # hiding how long the method ran before it crashed.
+        call = _MethodCall(node_name, method_name)
+        start_time = time.time()
+        profiler, metrics = self.profiler, self.metrics
+        profiled = profiler.start_method_call(node_name, method_name) if profiler is not None else None
+        try:
+            yield call
+            call_log['success'] = True
+        except Exception:
+            if metrics is not None:
+                metrics.increment_method_errors(node_name, method_name)
+            raise  # re-raise unchanged; caller/health-monitor handles it
+        finally:
+            duration = time.time() - start_time
+            call_log['duration_ms'] = duration * 1000
+            if profiled is not None:
+                profiler.end_method_call(node_name, method_name, profiled)
+            if metrics is not None:
+                metrics.increment_method_calls(node_name, method_name)
+                metrics.observe_method_duration(node_name, method_name, duration, call.trace_id)
+
+    @contextmanager
+    def _call_span(self, call: "_MethodCall") -> Iterator[None]:
+        """Trace span around the method body itself, if tracing is enabled."""
+        if self.tracer is None:
+            yield
+            return
+        with self.tracer.span("call", f"{call.node}.{call.method}",
+                              node=call.node, handler=call.method) as span:
+            call.trace_id = span.trace_id
+            yield
+
+    async def publish_async(
+        self,
+        topic: str,
+        payload: Dict[str, Any],
+        source: str = "runtime"
+    ) -> None:
+        """
+        Publish an event without blocking the running event loop.
+
+        Dispatch (and therefore every subscribed handler) runs on the
+        executor's thread pool, so slow handlers tie up a pool worker rather
+        than the caller's event loop.
+
+        Args:
+            topic: Topic name (e.g., "/Order/Created")
+            payload: Event payload
+            source: Source of the event
+
+        Raises:
+            RuntimeError: If the executor is not started or the bus is disabled
+        """
+        await self._run_in_pool(functools.partial(self.publish, topic, payload, source))
+
+    def _resolve_method(self, node_name: str, method_name: str) -> Callable:
+        """
+        Look up a callable method on a node, raising descriptive errors.
+
+        Raises:
+            RuntimeError: If the executor has not been started
+            ValueError: If node or method not found, or not callable
+        """
         if not self._is_running:
             raise RuntimeError(
                 "Runtime executor not started. Call executor.start() before invoking methods."
             )
 
+        self._ensure_accepting()
+
         if node_name not in self.nodes:
             available = sorted(self.nodes.keys())
             hint = (
@@ -307,28 +676,68 @@ class RuntimeExecutor:
                 f"'{method_name}' on '{node_name}' is an attribute, not a callable method."
             )
 
-        # Debugger hook before method call
-        if self.debugger and self.debugger.enabled:
-            self.debugger.on_method_call(node_name, method_name, **kwargs)
+        return method
 
-        # Log method call for dashboard
-        self._log_method_call(node_name, method_name, kwargs)
+    def _ensure_accepting(self) -> None:
+        """
+        Refuse new work while stop() is draining.
+
+        Work started from inside an in-flight call or delivery (e.g. a handler
+        that publishes) is part of what is being drained and is let through.
+        """
+        if self._draining and not self.inflight.is_nested():
+            raise RuntimeError(
+                "Runtime executor is shutting down and no longer accepts new work."
+            )
+
+    def _get_async_pool(self) -> ThreadPoolExecutor:
+        """Return the shared offload pool, creating it on first use."""
+        with self._async_pool_lock:
+            if self._async_pool is None:
+                self._async_pool = ThreadPoolExecutor(
+                    max_workers=self.config.async_max_workers,
+                    thread_name_prefix="graphbus-runtime",
+                )
+            return self._async_pool
+
+    async def _run_in_pool(self, func: Callable[[], Any]) -> Any:
+        """
+        Run a blocking callable on the offload pool and await its result.
+
+        Queued work counts as pending in-flight work, and is treated as
+        already admitted when it starts, so a drain waits for it instead of
+        rejecting it.  The caller's context variables (such as the active
+        trace span) are carried over to the worker.
+        """
+        loop = asyncio.get_running_loop()
+        self.inflight.add_pending()
+        context = contextvars.copy_context()
+
+        def run():
+            with self.inflight.start_pending():
+                return func()
 
-        # Call the method, always recording duration even when an exception is raised.
-        # Without try/finally a failed call leaves duration_ms: 0 in the dashboard,
-        # hiding how long the method ran before it crashed.
-        start_time = time.time()
         try:
-            result = method(**kwargs)
-            if self._method_call_history:
-                self._method_call_history[-1]['success'] = True
-            return result
-        except Exception:
-            raise  # re-raise unchanged; caller/health-monitor handles it
-        finally:
-            duration = time.time() - start_time
-            if self._method_call_history:
-                self._method_call_history[-1]['duration_ms'] = duration * 1000
+            # Admitted inside the caller's context, where is_nested() looks
+            future = loop.run_in_executor(self._get_async_pool(), context.run, run)
+        except BaseException:
+            self.inflight.remove_pending()
+            raise
+        return await future
+
+    def _get_node_semaphore(self, node_name: str) -> asyncio.Semaphore:
+        """Return the per-node concurrency semaphore for the running loop."""
+        loop = asyncio.get_running_loop()
+        semaphores = self._node_semaphores.get(loop)
+        if semaphores is None:
+            semaphores = {}
+            self._node_semaphores[loop] = semaphores
+
+        semaphore = semaphores.get(node_name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.config.async_node_concurrency)
+            semaphores[node_name] = semaphore
+        return semaphore
 
     def publish(
         self,
@@ -352,6 +761,8 @@ class RuntimeExecutor:
                 "Runtime executor not started. Call executor.start() before publishing events."
             )
 
+        self._ensure_accepting()
+
         if self.bus is None:
             raise RuntimeError(
                 "Message bus not enabled. "
@@ -405,6 +816,7 @@ class RuntimeExecutor:
         """
         stats = {
             "is_running": self._is_running,
+            "inflight": self.inflight.snapshot(),
             "nodes_count": len(self.nodes),
             "agents_count": len(self.agent_definitions),
             "nodes_active": list(self.nodes.keys())
@@ -413,6 +825,34 @@ class RuntimeExecutor:
         if self.bus:
             stats["message_bus"] = self.bus.get_stats()
 
+        if len(self.bulkheads):
+            stats["bulkheads"] = self.bulkheads.get_stats()
+
+        if len(self.circuit_breakers):
+            stats["circuit_breakers"] = self.circuit_breakers.get_stats()
+
+        if self.scheduler:
+            stats["scheduler"] = self.scheduler.get_stats()
+
+        if self.last_checkpoint:
+            stats["last_checkpoint"] = self.last_checkpoint
+
+        if self.tracer:
+            stats["tracing"] = self.tracer.get_stats()
+
+        if self.watchdog:
+            stats["watchdog"] = self.watchdog.get_stats()
+
+        if self.continuous_profiler:
+            stats["continuous_profiling"] = {
+                "window_seconds": self.profiler.window_seconds,
+                "dump_dir": str(self.continuous_profiler.dump_dir),
+                "last_dump": [str(p) for p in self.continuous_profiler.last_dump],
+            }
+
+        if self.nodes:
+            stats["memory"] = self.get_memory_stats()
+
         if self.router:
             stats["router"] = {
                 "topics_count": len(self.router.get_all_handlers()),
@@ -423,6 +863,212 @@ class RuntimeExecutor:
 
         return stats
 
+    def setup_tracing(self) -> Tracer:
+        """
+        Enable causal tracing of publishes, deliveries and method calls.
+
+        Returns:
+            The tracer (also available as ``executor.tracer``)
+        """
+        if self.tracer is None:
+            self.tracer = Tracer(max_slowest=self.config.trace_slowest)
+        if self.bus is not None:
+            self.bus.tracer = self.tracer
+        return self.tracer
+
+    def setup_metrics(self, metrics: Optional[PrometheusMetrics] = None) -> PrometheusMetrics:
+        """
+        Feed Prometheus metrics from the runtime.
+
+        The bus counts publishes, deliveries and dispatch time per topic; the
+        router and :meth:`call_method` count calls, errors and durations per
+        node method; active agents, agent health and per-topic queue depth
+        are read from the executor on each scrape.  Bulkhead stats are
+        exported as well.
+
+        Args:
+            metrics: Metrics to feed (default: a new PrometheusMetrics)
+
+        Returns:
+            The metrics (also ``executor.metrics``)
+        """
+        self.metrics = metrics if metrics is not None else PrometheusMetrics()
+        self.metrics.track_bulkheads(self.bulkheads)
+        self.metrics.track_circuit_breakers(self.circuit_breakers)
+        self.metrics.track_runtime(self)
+        if self.bus is not None:
+            self.bus.metrics = self.metrics
+        if self.router is not None:
+            self.router.metrics = self.metrics
+        return self.metrics
+
+    def setup_continuous_profiling(self) -> "ContinuousProfiler":
+        """
+        Start the always-on profiling ring.
+
+        Method calls, handler deliveries and publishes are recorded into a
+        fixed-memory ring covering ``config.continuous_profile_minutes``.
+        ``SIGUSR2`` (or ``graphbus profile-dump <pid>``) dumps it to
+        ``config.continuous_profile_dir`` as JSON and Chrome trace.
+
+        Returns:
+            The continuous profiler (its PerformanceProfiler is ``executor.profiler``)
+        """
+        # Imported here: resource sampling needs psutil, which is optional
+        from graphbus_core.runtime.continuous import ContinuousProfiler
+
+        if self.continuous_profiler is None:
+            self.continuous_profiler = ContinuousProfiler(
+                minutes=self.config.continuous_profile_minutes,
+                dump_dir=self.config.continuous_profile_dir,
+            )
+            self.profiler = self.continuous_profiler.profiler
+        self.continuous_profiler.start()
+        if self.bus is not None:
+            self.bus.profiler = self.profiler
+        if self.router is not None:
+            self.router.profiler = self.profiler
+        if self.continuous_profiler.install_signal_handler():
+            print(f"[RuntimeExecutor] Continuous profiling on; send SIGUSR2 to pid {os.getpid()} "
+                  f"to dump to {self.continuous_profiler.dump_dir}")
+        return self.continuous_profiler
+
+    def setup_watchdog(self) -> Watchdog:
+        """
+        Start the hung-handler watchdog.
+
+        Calls and deliveries running longer than ``config.watchdog_deadline``
+        (or their entry in ``config.watchdog_deadlines``) are logged with
+        the stuck thread's stack and flag their node in the health monitor;
+        with ``config.watchdog_recover`` the node is also restarted.
+
+        Returns:
+            The watchdog (also ``executor.watchdog``)
+        """
+        if self.watchdog is None:
+            self.watchdog = Watchdog(
+                self.inflight,
+                health_monitor=self.health_monitor,
+                deadline=self.config.watchdog_deadline,
+                deadlines=self.config.watchdog_deadlines,
+                interval=self.config.watchdog_interval,
+                recover=self.config.watchdog_recover,
+            )
+        self.watchdog.start()
+        print(f"[RuntimeExecutor] Watchdog on ({self.config.watchdog_deadline:g}s deadline)")
+        return self.watchdog
+
+    def setup_bulkheads(self) -> None:
+        """
+        Register bulkheads declared with @bulkhead and in RuntimeConfig.bulkheads.
+
+        Config entries are applied after decorators, so operators can override
+        limits baked into node classes without a rebuild.
+        """
+        for node_name, node in self.nodes.items():
+            self.bulkheads.configure_node(node_name, node)
+
+        for scope, spec in self.config.bulkheads.items():
+            self.bulkheads.configure(scope, BulkheadSpec.from_dict(spec))
+
+        if len(self.bulkheads):
+            print(f"[RuntimeExecutor] Bulkheads configured for {len(self.bulkheads)} scope(s)")
+
+    def setup_circuit_breakers(self) -> None:
+        """
+        Register circuit breakers declared with @circuit_breaker and in RuntimeConfig.circuit_breakers.
+
+        Config entries are applied after decorators; ``"*"`` and ``"*.*"``
+        give every node and every method a breaker.
+        """
+        for node_name, node in self.nodes.items():
+            self.circuit_breakers.configure_node(node_name, node)
+
+        for scope, spec in self.config.circuit_breakers.items():
+            self.circuit_breakers.configure(scope, CircuitBreakerSpec.from_dict(spec))
+
+        if len(self.circuit_breakers):
+            print(f"[RuntimeExecutor] Circuit breakers configured for {len(self.circuit_breakers)} scope(s)")
+
+    def _has_scheduled_methods(self) -> bool:
+        """True if any node method carries @every / @cron."""
+        for node in self.nodes.values():
+            cls = type(node)
+            for attr_name in dir(cls):
+                if getattr(getattr(cls, attr_name, None), "_graphbus_schedules", None):
+                    return True
+        return False
+
+    def setup_scheduler(self, clock: Any = None) -> Scheduler:
+        """
+        Create the scheduler and register jobs declared with @every / @cron.
+
+        Called by start() when any node declares a schedule.  Call it
+        directly to schedule jobs programmatically via ``executor.scheduler``
+        or to drive jobs from a VirtualClock in tests (jobs then run inline
+        on the thread calling ``clock.advance``).
+
+        Args:
+            clock: Clock to drive the timing wheel (default: real time)
+
+        Returns:
+            The running Scheduler
+        """
+        if self.scheduler:
+            self.scheduler.stop()
+
+        virtual = getattr(clock, "is_virtual", False)
+        self.scheduler = Scheduler(
+            tick=self.config.scheduler_tick,
+            clock=clock,
+            dispatch=None if virtual else self._dispatch_scheduled,
+        )
+
+        for node_name, node in self.nodes.items():
+            cls = type(node)
+            for attr_name in dir(cls):
+                if attr_name.startswith("_"):
+                    continue
+                specs = getattr(getattr(cls, attr_name, None), "_graphbus_schedules", None)
+                for spec in specs or []:
+                    run = functools.partial(
+                        self._run_scheduled, node_name, attr_name, spec.get("publish")
+                    )
+                    options = {
+                        "name": f"{node_name}.{attr_name}",
+                        "missed": spec.get("missed", "fire_once"),
+                        "jitter": spec.get("jitter", 0),
+                    }
+                    if "cron" in spec:
+                        self.scheduler.cron(spec["cron"], run, **options)
+                    else:
+                        self.scheduler.every(spec["every"], run, **options)
+
+        self.scheduler.start()
+        print(f"[RuntimeExecutor] Scheduler started with {len(self.scheduler.get_jobs())} job(s)")
+        return self.scheduler
+
+    def _dispatch_scheduled(self, run: Callable[[], None]) -> None:
+        """Run a due job on the offload pool so slow jobs don't stall the wheel."""
+        self.inflight.add_pending()
+
+        def task():
+            with self.inflight.start_pending():
+                run()
+
+        try:
+            self._get_async_pool().submit(task)
+        except RuntimeError:
+            # Pool already shut down by stop()
+            self.inflight.remove_pending()
+
+    def _run_scheduled(self, node_name: str, method_name: str, topic: Optional[str]) -> None:
+        """Invoke a scheduled method and optionally publish its result."""
+        result = self.call_method(node_name, method_name)
+        if topic and result is not None:
+            payload = result if isinstance(result, dict) else {"result": result}
+            self.publish(topic, payload, source=node_name)
+
     def setup_state_management(self, state_dir: str = ".graphbus/state") -> None:
         """
         Setup state management for agents.
@@ -431,16 +1077,22 @@ class RuntimeExecutor:
             state_dir: Directory to store state files
         """
         print("[RuntimeExecutor] Setting up state management...")
-        self.state_manager = StateManager(state_dir)
+        self.state_manager = StateManager(
+            state_dir,
+            write_behind=self.config.state_write_behind,
+            flush_interval=self.config.state_flush_interval,
+            backend=self.config.state_backend,
+            delta_checkpoints=self.config.state_delta_checkpoints,
+            storage_format=self.config.storage_format,
+        )
 
-        # Load saved states for all nodes
-        saved_states = self.state_manager.list_saved_states()
-        for node_name in saved_states:
+        # Load saved states for all nodes in one pass
+        saved_states = self.state_manager.load_all_states()
+        for node_name, state in saved_states.items():
             if node_name in self.nodes:
                 node = self.nodes[node_name]
                 if hasattr(node, 'set_state'):
                     try:
-                        state = self.state_manager.load_state(node_name)
                         node.set_state(state)
                         print(f"[RuntimeExecutor]   ✓ Restored state for {node_name}")
                     except Exception as e:
@@ -467,19 +1119,26 @@ class RuntimeExecutor:
             enable_auto_restart=enable_auto_restart
         )
 
-        # Wrap call_method to record health metrics
+        # Wrap call_method to record health metrics; calls to an agent that
+        # is being restarted are gated, and calls an open circuit breaker
+        # rejected never ran, so neither counts against the agent
         original_call_method = self.call_method
 
         def monitored_call_method(node_name: str, method_name: str, **kwargs):
+            self.health_monitor.admit(node_name)
             try:
                 result = original_call_method(node_name, method_name, **kwargs)
                 self.health_monitor.record_success(node_name)
                 return result
+            except _NOT_FAILURES:
+                raise
             except Exception as e:
                 self.health_monitor.record_failure(node_name, e)
                 raise
 
         self.call_method = monitored_call_method
+        if self.watchdog:
+            self.watchdog.health_monitor = self.health_monitor
 
         print(f"[RuntimeExecutor] Health monitoring ready (auto-restart: {enable_auto_restart})")
 
@@ -537,6 +1196,11 @@ class RuntimeExecutor:
         """
         Save state for all nodes that support it.
 
+        With write-behind checkpointing the states are queued as one batch
+        and this waits for the batch to reach disk.  States are read one by
+        one while events keep flowing; use :meth:`checkpoint` for a
+        mutually consistent snapshot.
+
         Returns:
             Number of states saved
 
@@ -559,8 +1223,189 @@ class RuntimeExecutor:
                 except Exception as e:
                     print(f"Warning: Failed to save state for {node_name}: {e}")
 
+        if not self.state_manager.flush():
+            print(f"Warning: Failed to write some state checkpoints: {self.state_manager.last_error}")
+
         return count
 
+    def checkpoint(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Take a coordinated checkpoint of every node plus events in transit.
+
+        Unlike :meth:`save_all_states`, which reads node states one by one
+        while events keep flowing, this cuts the whole graph at one
+        consistent point:
+
+        1. Raise the snapshot barrier: new top-level publishes and method
+           calls wait (held publishes are recorded as in-transit events);
+           work already in flight, and anything it triggers, continues.
+        2. Wait until nothing is in flight, up to ``timeout`` seconds.
+        3. Capture every node's ``get_state()`` and the recorded events as
+           one versioned document, then lower the barrier.
+        4. Write the document to ``config.checkpoint_dir``.
+
+        Coroutine (``async def``) node methods are held too: they wait at the
+        barrier without blocking the event loop.
+
+        Args:
+            timeout: Seconds to wait for in-flight work
+                (default: ``config.checkpoint_timeout``)
+
+        Returns:
+            Checkpoint summary (also stored as ``last_checkpoint``)
+
+        Raises:
+            RuntimeError: If the executor is not running, or this is called
+                from inside a handler or node method
+            TimeoutError: If in-flight work did not finish in time (no
+                checkpoint is written and held work is released)
+        """
+        if not self._is_running:
+            raise RuntimeError(
+                "Runtime executor not started. Call executor.start() before taking a checkpoint."
+            )
+        store = self._get_checkpoint_store()
+
+        with self._checkpoint_lock:
+            sequence = store.next_sequence()
+            barrier_start = time.time()
+            with self._cut(timeout):
+                states = {
+                    node_name: node.get_state()
+                    for node_name, node in self.nodes.items()
+                    if hasattr(node, 'get_state')
+                }
+                pending_events = self._barrier.close_channel()
+                document = {
+                    "format_version": CHECKPOINT_FORMAT_VERSION,
+                    "checkpoint_id": generate_id("checkpoint_"),
+                    "sequence": sequence,
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "nodes": states,
+                    "pending_events": pending_events,
+                }
+                # Encode before releasing the barrier so later mutations of
+                # node state or payloads can't leak into the checkpoint
+                data = store.encode(document)
+            barrier_seconds = time.time() - barrier_start
+            path = store.write(sequence, data)
+
+        summary = {
+            "checkpoint_id": document["checkpoint_id"],
+            "sequence": sequence,
+            "path": str(path),
+            "nodes": len(states),
+            "pending_events": len(pending_events),
+            "barrier_seconds": barrier_seconds,
+            "size": len(data),
+        }
+        self.last_checkpoint = summary
+        print(f"[RuntimeExecutor] Checkpoint {sequence}: {len(states)} node(s), "
+              f"{len(pending_events)} pending event(s), barrier {barrier_seconds * 1000:.1f}ms")
+        return summary
+
+    def restore_checkpoint(self, sequence: Optional[int] = None,
+                           replay_pending: bool = True,
+                           timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Bring the whole graph back to a coordinated checkpoint.
+
+        Node states are set under the snapshot barrier, so no event is
+        delivered against a half-restored graph; the events that were in
+        transit at the cut are then re-published in their original order.
+
+        Args:
+            sequence: Checkpoint sequence number (default: the newest)
+            replay_pending: Re-publish the checkpoint's in-transit events
+            timeout: Seconds to wait for in-flight work
+                (default: ``config.checkpoint_timeout``)
+
+        Returns:
+            Dict with the restored sequence, restored/skipped nodes and the
+            number of replayed events
+
+        Raises:
+            RuntimeError: If the executor is not running
+            FileNotFoundError: If there is no such checkpoint
+            ValueError: If the checkpoint is corrupted
+            TimeoutError: If in-flight work did not finish in time
+        """
+        if not self._is_running:
+            raise RuntimeError(
+                "Runtime executor not started. Call executor.start() before restoring a checkpoint."
+            )
+        document = self._get_checkpoint_store().load(sequence)
+
+        restored, skipped = [], []
+        with self._checkpoint_lock, self._cut(timeout):
+            for node_name, state in document["nodes"].items():
+                node = self.nodes.get(node_name)
+                if node is None or not hasattr(node, 'set_state'):
+                    skipped.append(node_name)
+                    continue
+                node.set_state(state)
+                restored.append(node_name)
+
+        replayed = 0
+        if replay_pending:
+            for event in document.get("pending_events", []):
+                self.publish(event["topic"], event["payload"], event.get("source") or "runtime")
+                replayed += 1
+
+        print(f"[RuntimeExecutor] Restored checkpoint {document['sequence']}: "
+              f"{len(restored)} node(s), {replayed} event(s) replayed")
+        if skipped:
+            print(f"[RuntimeExecutor]   ⚠ Skipped unknown/stateless node(s): {skipped}")
+        return {
+            "checkpoint_id": document["checkpoint_id"],
+            "sequence": document["sequence"],
+            "restored": restored,
+            "skipped": skipped,
+            "replayed": replayed,
+        }
+
+    def list_checkpoints(self) -> List[Dict[str, Any]]:
+        """Summaries of stored coordinated checkpoints, oldest first."""
+        return self._get_checkpoint_store().list_checkpoints()
+
+    def _get_checkpoint_store(self) -> CheckpointStore:
+        if self.checkpoint_store is None:
+            self.checkpoint_store = CheckpointStore(
+                self.config.checkpoint_dir,
+                storage_format=self.config.storage_format,
+                retention=self.config.checkpoint_retention,
+            )
+        return self.checkpoint_store
+
+    @contextmanager
+    def _cut(self, timeout: Optional[float] = None) -> Iterator[None]:
+        """Hold new work and wait until nothing is in flight."""
+        if self.inflight.is_nested():
+            raise RuntimeError(
+                "A checkpoint cannot be taken or restored from inside a handler or node method."
+            )
+        if timeout is None:
+            timeout = self.config.checkpoint_timeout
+        if self.bus is not None and self.bus.barrier is None:
+            self.bus.barrier = self._barrier
+
+        deadline = time.time() + timeout
+        self._barrier.raise_barrier()
+        try:
+            quiet = (
+                self._barrier.wait_quiet(timeout)
+                and self.inflight.wait_idle(max(0.0, deadline - time.time()))
+            )
+            if not quiet:
+                in_flight = self.inflight.snapshot()
+                raise TimeoutError(
+                    f"In-flight work did not finish within {timeout}s "
+                    f"(still active: {in_flight['nodes'] or in_flight['active']})"
+                )
+            yield
+        finally:
+            self._barrier.lower_barrier()
+
     def _log_event(self, topic: str, payload: Dict[str, Any], source: str) -> None:
         """Log event for dashboard timeline."""
         event_log = {
@@ -572,8 +1417,8 @@ class RuntimeExecutor:
         }
         self._event_history.append(event_log)
 
-    def _log_method_call(self, node_name: str, method_name: str, kwargs: Dict[str, Any]) -> None:
-        """Log method call for dashboard."""
+    def _log_method_call(self, node_name: str, method_name: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Log method call for dashboard and return the mutable log entry."""
         method_log = {
             'timestamp': time.time(),
             'type': 'method_call',
@@ -584,6 +1429,7 @@ class RuntimeExecutor:
             'success': False
         }
         self._method_call_history.append(method_log)
+        return method_log
 
     def setup_contract_validation(self) -> None:
         """Setup contract validation for runtime."""
@@ -614,7 +1460,9 @@ class RuntimeExecutor:
         try:
             self.coherence_tracker = CoherenceTracker(
                 storage_path=str(coherence_dir),
-                graph=self.graph.graph if self.graph else None
+                graph=self.graph.graph if self.graph else None,
+                storage_format=self.config.storage_format,
+                capacity=self.config.coherence_capacity
             )
             print(f"[RuntimeExecutor] Coherence tracking enabled")
         except Exception as e:
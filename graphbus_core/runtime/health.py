@@ -2,17 +2,40 @@
 Health Monitor
 
 Monitors agent health and handles failures with automatic recovery.
+
+Besides lifetime totals, every agent keeps its calls and failures in two
+rings of time buckets (60 one-second and 60 one-minute buckets), so the
+degraded check judges the error rate of the last minute (configurable up
+to an hour) in constant memory, however long the runtime has been up.
+
+Restarts never run on the thread that recorded the failure: a failed agent
+is queued on a background supervisor thread, which waits out the backoff
+delay and reloads it.  While an agent is restarting, calls to it are
+rejected with :class:`~graphbus_core.exceptions.NodeRestartingError` or held
+until the restart finishes, depending on the policy, and every step is
+reported on :data:`RESTART_TOPIC` and to ``on_restart`` callbacks.
 """
 
+import heapq
+import itertools
 import logging
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from graphbus_core.exceptions import NodeRestartingError
 
 logger = logging.getLogger(__name__)
 
+RESTART_TOPIC = "/system/health/restart"
+
+DURING_RESTART_FAIL_FAST = "fail_fast"
+DURING_RESTART_BUFFER = "buffer"
+_DURING_RESTART = (DURING_RESTART_FAIL_FAST, DURING_RESTART_BUFFER)
+
 
 class HealthStatus(Enum):
     """Agent health status"""
@@ -22,6 +45,97 @@ class HealthStatus(Enum):
     FAILED = "failed"
 
 
+class RollingWindow:
+    """
+    Calls and failures over the last ``buckets * bucket_seconds`` seconds.
+
+    A fixed ring of time buckets: recording advances the ring past buckets
+    that have expired since the previous update (each bucket is cleared at
+    most once per lap, so updates are amortized O(1)) and keeps running
+    totals for the whole window.  Callers on any thread may record and read
+    at once; a lock keeps the ring and totals consistent.
+    """
+
+    __slots__ = ("bucket_seconds", "_calls", "_failures", "_head", "_lock", "calls", "failures")
+
+    def __init__(self, buckets: int = 60, bucket_seconds: float = 1.0):
+        """
+        Initialize window.
+
+        Args:
+            buckets: Number of buckets in the ring
+            bucket_seconds: Width of one bucket
+        """
+        self.bucket_seconds = bucket_seconds
+        self._calls = [0] * buckets
+        self._failures = [0] * buckets
+        self._head: Optional[int] = None  # absolute index of the newest bucket
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+
+    @property
+    def window_seconds(self) -> float:
+        """Span covered by the ring."""
+        return len(self._calls) * self.bucket_seconds
+
+    def _advance(self, now: float) -> int:
+        """Move the ring to ``now``, clearing expired buckets; returns the current slot (lock held)."""
+        index = int(now // self.bucket_seconds)
+        size = len(self._calls)
+        head = self._head
+        if head is None or index - head >= size:
+            for slot in range(size):
+                self._calls[slot] = self._failures[slot] = 0
+            self.calls = self.failures = 0
+        elif index > head:
+            for i in range(head + 1, index + 1):
+                slot = i % size
+                self.calls -= self._calls[slot]
+                self.failures -= self._failures[slot]
+                self._calls[slot] = self._failures[slot] = 0
+        if head is None or index > head:
+            self._head = index
+        return self._head % size
+
+    def record(self, failed: bool = False, now: Optional[float] = None) -> None:
+        """Count one call (and one failure if ``failed``)."""
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            slot = self._advance(now)
+            self._calls[slot] += 1
+            self.calls += 1
+            if failed:
+                self._failures[slot] += 1
+                self.failures += 1
+
+    def totals(self, seconds: Optional[float] = None, now: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Calls and failures in the most recent ``seconds`` of the window.
+
+        Args:
+            seconds: Span to sum, rounded up to whole buckets (default: whole window)
+            now: Current ``time.monotonic()`` (for tests)
+
+        Returns:
+            (calls, failures)
+        """
+        if now is None:
+            now = time.monotonic()
+        size = len(self._calls)
+        span = size if seconds is None else min(size, max(1, -int(-seconds // self.bucket_seconds)))
+        with self._lock:
+            slot = self._advance(now)
+            if span == size:
+                return self.calls, self.failures
+            calls = failures = 0
+            for i in range(span):
+                calls += self._calls[(slot - i) % size]
+                failures += self._failures[(slot - i) % size]
+        return calls, failures
+
+
 @dataclass
 class HealthMetrics:
     """Health metrics for an agent"""
@@ -34,13 +148,41 @@ class HealthMetrics:
     last_error_time: Optional[datetime] = None
     last_success_time: Optional[datetime] = None
     consecutive_failures: int = 0
+    hung_calls: int = 0  # calls the watchdog reports past their deadline
     uptime_seconds: float = 0
     created_at: datetime = None
+    # Recent calls: 60 one-second buckets and 60 one-minute buckets
+    per_second: RollingWindow = field(default_factory=lambda: RollingWindow(60, 1.0), repr=False, compare=False)
+    per_minute: RollingWindow = field(default_factory=lambda: RollingWindow(60, 60.0), repr=False, compare=False)
 
     def __post_init__(self):
         if self.created_at is None:
             self.created_at = datetime.now(timezone.utc)
 
+    def record_call(self, failed: bool, now: Optional[float] = None) -> None:
+        """Count a call in the recent-window buckets."""
+        now = time.monotonic() if now is None else now
+        self.per_second.record(failed, now)
+        self.per_minute.record(failed, now)
+
+    def recent_totals(self, seconds: float = 60.0, now: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Calls and failures in the last ``seconds`` (up to an hour).
+
+        Spans up to a minute are read from the one-second buckets, longer
+        ones from the one-minute buckets.
+
+        Returns:
+            (calls, failures)
+        """
+        window = self.per_second if seconds <= self.per_second.window_seconds else self.per_minute
+        return window.totals(seconds, now)
+
+    def recent_error_rate(self, seconds: float = 60.0, now: Optional[float] = None) -> float:
+        """Error rate (0.0 to 1.0) over the last ``seconds``."""
+        calls, failures = self.recent_totals(seconds, now)
+        return failures / calls if calls else 0.0
+
     @property
     def error_rate(self) -> float:
         """Calculate error rate (0.0 to 1.0)"""
@@ -67,7 +209,12 @@ class HealthMetrics:
             "last_error_time": self.last_error_time.isoformat() if self.last_error_time else None,
             "last_success_time": self.last_success_time.isoformat() if self.last_success_time else None,
             "consecutive_failures": self.consecutive_failures,
-            "uptime_seconds": self.uptime_seconds
+            "hung_calls": self.hung_calls,
+            "uptime_seconds": self.uptime_seconds,
+            "calls_1m": self.recent_totals(60)[0],
+            "error_rate_1m": self.recent_error_rate(60),
+            "calls_1h": self.recent_totals(3600)[0],
+            "error_rate_1h": self.recent_error_rate(3600),
         }
 
 
@@ -79,7 +226,9 @@ class RestartPolicy:
         max_restarts: int = 3,
         restart_window_seconds: int = 300,
         backoff_multiplier: float = 2.0,
-        initial_delay_seconds: float = 1.0
+        initial_delay_seconds: float = 1.0,
+        during_restart: str = DURING_RESTART_FAIL_FAST,
+        buffer_timeout_seconds: float = 5.0
     ):
         """
         Initialize restart policy.
@@ -89,11 +238,20 @@ class RestartPolicy:
             restart_window_seconds: Time window for restart counting
             backoff_multiplier: Exponential backoff multiplier
             initial_delay_seconds: Initial delay before first restart
+            during_restart: What calls to a restarting agent do: ``"fail_fast"``
+                raises NodeRestartingError, ``"buffer"`` holds the caller until
+                the restart finishes
+            buffer_timeout_seconds: Longest a buffered call is held before it
+                fails with NodeRestartingError
         """
+        if during_restart not in _DURING_RESTART:
+            raise ValueError(f"Invalid during_restart policy: {during_restart}. Must be one of {_DURING_RESTART}")
         self.max_restarts = max_restarts
         self.restart_window = timedelta(seconds=restart_window_seconds)
         self.backoff_multiplier = backoff_multiplier
         self.initial_delay = initial_delay_seconds
+        self.during_restart = during_restart
+        self.buffer_timeout = buffer_timeout_seconds
         self.restart_history: Dict[str, list[datetime]] = {}
 
     def should_restart(self, node_name: str) -> bool:
@@ -151,7 +309,8 @@ class HealthMonitor:
     Monitors agent health and handles failures.
 
     Tracks success/failure rates, detects unhealthy agents,
-    and can automatically restart failed agents.
+    and can automatically restart failed agents on a background
+    supervisor thread.
     """
 
     def __init__(
@@ -160,7 +319,8 @@ class HealthMonitor:
         enable_auto_restart: bool = False,
         restart_policy: Optional[RestartPolicy] = None,
         failure_threshold: int = 5,
-        error_rate_threshold: float = 0.5
+        error_rate_threshold: float = 0.5,
+        window_seconds: float = 60.0
     ):
         """
         Initialize HealthMonitor.
@@ -171,16 +331,30 @@ class HealthMonitor:
             restart_policy: Policy for restarting agents
             failure_threshold: Consecutive failures before marking unhealthy
             error_rate_threshold: Error rate threshold for degraded status
+            window_seconds: Span (up to 3600s) the error rate is judged over
         """
         self.executor = runtime_executor
         self.enable_auto_restart = enable_auto_restart
         self.restart_policy = restart_policy or RestartPolicy()
         self.failure_threshold = failure_threshold
         self.error_rate_threshold = error_rate_threshold
+        self.window_seconds = window_seconds
 
         self.metrics: Dict[str, HealthMetrics] = {}
         self.failure_callbacks: list[Callable] = []
         self.recovery_callbacks: list[Callable] = []
+        self.restart_callbacks: list[Callable] = []
+
+        # Restart supervisor: agents being restarted -> attempt number, and
+        # a heap of (due time, seq, agent) the supervisor thread works through
+        self._restart_cond = threading.Condition()
+        self._restarting: Dict[str, int] = {}
+        self._restart_due: Dict[str, float] = {}
+        self._restart_queue: List[Tuple[float, int, str]] = []
+        self._restart_seq = itertools.count()
+        self._supervisor: Optional[threading.Thread] = None
+        self._stopped = False
+        self._last_restart_error: Optional[str] = None
 
         # Initialize metrics for all nodes
         for node_name in self.executor.nodes.keys():
@@ -207,6 +381,7 @@ class HealthMonitor:
         metrics.successful_calls += 1
         metrics.consecutive_failures = 0
         metrics.last_success_time = datetime.now(timezone.utc)
+        metrics.record_call(failed=False)
 
         # Update status
         self._update_status(node_name)
@@ -231,6 +406,7 @@ class HealthMonitor:
         metrics.consecutive_failures += 1
         metrics.last_error = str(error)
         metrics.last_error_time = datetime.now(timezone.utc)
+        metrics.record_call(failed=True)
 
         # Update status
         old_status = metrics.status
@@ -242,12 +418,55 @@ class HealthMonitor:
 
         # Auto-restart if enabled and threshold exceeded
         if self.enable_auto_restart and metrics.status == HealthStatus.FAILED:
-            self._attempt_restart(node_name)
+            self.schedule_restart(node_name)
+
+    def mark_hung(self, node_name: str, reason: str) -> None:
+        """
+        Flag a call of an agent as stuck past its deadline.
+
+        The agent is at least UNHEALTHY until every hung call is cleared
+        with :meth:`clear_hung`.  A hung call is not counted as failed; if
+        it eventually raises, that is recorded as usual.
+
+        Args:
+            node_name: Name of the agent
+            reason: Description of the stuck call
+        """
+        if node_name not in self.metrics:
+            self.metrics[node_name] = HealthMetrics(
+                node_name=node_name,
+                status=HealthStatus.HEALTHY
+            )
+
+        metrics = self.metrics[node_name]
+        metrics.hung_calls += 1
+        metrics.last_error = reason
+        metrics.last_error_time = datetime.now(timezone.utc)
+
+        old_status = metrics.status
+        self._update_status(node_name)
+        if old_status != metrics.status:
+            self._trigger_failure_callbacks(node_name, metrics)
+
+    def clear_hung(self, node_name: str) -> None:
+        """
+        Clear one call flagged by :meth:`mark_hung` (it finished).
+
+        Args:
+            node_name: Name of the agent
+        """
+        metrics = self.metrics.get(node_name)
+        if metrics is not None and metrics.hung_calls > 0:
+            metrics.hung_calls -= 1
+            self._update_status(node_name)
 
     def check_health(self, node_name: str) -> HealthStatus:
         """
         Check agent health status.
 
+        The status is re-evaluated first, so a DEGRADED agent whose failures
+        have aged out of the window reports HEALTHY even without new calls.
+
         Args:
             node_name: Name of the agent
 
@@ -257,6 +476,7 @@ class HealthMonitor:
         if node_name not in self.metrics:
             return HealthStatus.HEALTHY
 
+        self._update_status(node_name)
         return self.metrics[node_name].status
 
     def get_metrics(self, node_name: str) -> Optional[HealthMetrics]:
@@ -318,13 +538,153 @@ class HealthMonitor:
         """
         self.recovery_callbacks.append(callback)
 
+    def on_restart(self, callback: Callable) -> None:
+        """
+        Register callback for restart events.
+
+        Args:
+            callback: Function(event) called with the payload published on
+                RESTART_TOPIC each time a restart is scheduled, succeeds,
+                fails or is given up
+        """
+        self.restart_callbacks.append(callback)
+
+    def schedule_restart(self, node_name: str) -> bool:
+        """
+        Queue a restart of an agent on the supervisor thread.
+
+        Returns immediately; the supervisor waits out the policy's backoff
+        delay, reloads the agent and retries with a longer delay if the
+        reload fails.
+
+        Args:
+            node_name: Name of the agent
+
+        Returns:
+            True if a restart was scheduled, False if one is already pending
+            or the restart policy refuses another
+        """
+        with self._restart_cond:
+            if self._stopped or node_name in self._restarting:
+                return False
+            if not self.restart_policy.should_restart(node_name):
+                logger.warning("agent '%s' exceeded restart limit", node_name)
+                gave_up = True
+            else:
+                gave_up = False
+                delay = self.restart_policy.get_restart_delay(node_name)
+                self._enqueue_restart(node_name, 1, delay)
+
+        if gave_up:
+            self._emit_restart_event(node_name, "gave_up", 0, error="restart limit reached")
+            return False
+        logger.info("restart of '%s' scheduled in %.1fs", node_name, delay)
+        self._emit_restart_event(node_name, "scheduled", 1, delay_seconds=delay)
+        return True
+
+    def is_restarting(self, node_name: str) -> bool:
+        """True while a restart of ``node_name`` is scheduled or running."""
+        return node_name in self._restarting
+
+    def get_restarting(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Agents currently being restarted.
+
+        Returns:
+            Dict of agent name -> ``{"attempt", "retry_after"}``, where
+            ``retry_after`` is seconds until the next reload (0 if running)
+        """
+        now = time.monotonic()
+        with self._restart_cond:
+            return {
+                name: {"attempt": attempt,
+                       "retry_after": max(0.0, self._restart_due.get(name, now) - now)}
+                for name, attempt in self._restarting.items()
+            }
+
+    def admit(self, node_name: str) -> None:
+        """
+        Gate a call to an agent on its restart state.
+
+        Calls to agents that are not restarting pass straight through.  For
+        a restarting agent the policy's ``during_restart`` decides: fail
+        fast, or hold the caller on a condition (not a sleep) until the
+        restart finishes or ``buffer_timeout_seconds`` pass.
+
+        Args:
+            node_name: Name of the agent about to be called
+
+        Raises:
+            NodeRestartingError: If the agent is (still) restarting
+        """
+        if node_name not in self._restarting:
+            return
+
+        if self.restart_policy.during_restart == DURING_RESTART_BUFFER:
+            deadline = time.monotonic() + self.restart_policy.buffer_timeout
+            with self._restart_cond:
+                while node_name in self._restarting and not self._stopped:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._restart_cond.wait(remaining)
+            if node_name not in self._restarting:
+                return
+
+        retry_after = self.get_restarting().get(node_name, {}).get("retry_after")
+        raise NodeRestartingError(f"Agent '{node_name}' is restarting", node_name=node_name,
+                                  retry_after=retry_after)
+
+    def wait_for_restarts(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until no restart is pending or running.
+
+        Args:
+            timeout: Seconds to wait (None = no limit)
+
+        Returns:
+            True if all restarts finished within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._restart_cond:
+            while self._restarting and not self._stopped:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._restart_cond.wait(remaining)
+            return not self._restarting
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the restart supervisor, dropping restarts that have not started.
+
+        Callers held by the buffer policy are released with
+        NodeRestartingError.
+
+        Args:
+            timeout: Seconds to wait for a reload that is already running
+        """
+        with self._restart_cond:
+            self._stopped = True
+            self._restart_queue.clear()
+            self._restart_cond.notify_all()
+            supervisor = self._supervisor
+        if supervisor is not None and supervisor is not threading.current_thread():
+            supervisor.join(timeout)
+        with self._restart_cond:
+            self._restarting.clear()
+            self._restart_due.clear()
+            self._restart_cond.notify_all()
+
     def _update_status(self, node_name: str) -> None:
         """Update health status based on metrics.
 
         Four-level escalation path:
           HEALTHY   – no issues
-          DEGRADED  – elevated error rate but no run of consecutive failures
-          UNHEALTHY – one or more consecutive failures (can't service all requests)
+          DEGRADED  – elevated error rate over the last ``window_seconds``
+                      but no run of consecutive failures
+          UNHEALTHY – one or more consecutive failures or hung calls
+                      (can't service all requests)
           FAILED    – consecutive failures ≥ failure_threshold (auto-restart eligible)
         """
         metrics = self.metrics[node_name]
@@ -333,12 +693,12 @@ class HealthMonitor:
         # Determine new status
         if metrics.consecutive_failures >= self.failure_threshold:
             new_status = HealthStatus.FAILED
-        elif metrics.consecutive_failures > 0:
+        elif metrics.consecutive_failures > 0 or metrics.hung_calls > 0:
             # A run of back-to-back failures is worse than a high error rate
             # spread over many calls — use UNHEALTHY (not DEGRADED) so that
             # get_unhealthy_agents() correctly surfaces these nodes.
             new_status = HealthStatus.UNHEALTHY
-        elif metrics.error_rate > self.error_rate_threshold:
+        elif metrics.recent_error_rate(self.window_seconds) > self.error_rate_threshold:
             new_status = HealthStatus.DEGRADED
         else:
             new_status = HealthStatus.HEALTHY
@@ -349,9 +709,87 @@ class HealthMonitor:
         if old_status in (HealthStatus.DEGRADED, HealthStatus.UNHEALTHY, HealthStatus.FAILED) and new_status == HealthStatus.HEALTHY:
             self._trigger_recovery_callbacks(node_name, metrics)
 
+    def _enqueue_restart(self, node_name: str, attempt: int, delay: float) -> None:
+        """Queue a reload ``delay`` seconds from now; caller holds ``_restart_cond``."""
+        due = time.monotonic() + delay
+        self._restarting[node_name] = attempt
+        self._restart_due[node_name] = due
+        heapq.heappush(self._restart_queue, (due, next(self._restart_seq), node_name))
+        if self._supervisor is None or not self._supervisor.is_alive():
+            self._supervisor = threading.Thread(target=self._supervise, name="graphbus-restart-supervisor",
+                                                daemon=True)
+            self._supervisor.start()
+        self._restart_cond.notify_all()
+
+    def _supervise(self) -> None:
+        """Supervisor loop: run each queued restart once its delay has passed."""
+        while True:
+            with self._restart_cond:
+                while not self._stopped:
+                    if self._restart_queue:
+                        wait = self._restart_queue[0][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._restart_cond.wait(wait)
+                    else:
+                        self._restart_cond.wait()
+                if self._stopped:
+                    return
+                _, _, node_name = heapq.heappop(self._restart_queue)
+                attempt = self._restarting.get(node_name, 1)
+                self._restart_due.pop(node_name, None)
+
+            success = self._attempt_restart(node_name)
+
+            with self._restart_cond:
+                if self._stopped:
+                    return
+                retry = not success and self.restart_policy.should_restart(node_name)
+                if retry:
+                    delay = self.restart_policy.get_restart_delay(node_name)
+                    self._enqueue_restart(node_name, attempt + 1, delay)
+                else:
+                    self._restarting.pop(node_name, None)
+                    self._restart_cond.notify_all()
+
+            if success:
+                self._emit_restart_event(node_name, "succeeded", attempt)
+            elif retry:
+                self._emit_restart_event(node_name, "failed", attempt, delay_seconds=delay,
+                                         error=self._last_restart_error)
+            else:
+                self._emit_restart_event(node_name, "gave_up", attempt, error=self._last_restart_error)
+
+    def _emit_restart_event(self, node_name: str, status: str, attempt: int,
+                            delay_seconds: Optional[float] = None, error: Optional[str] = None) -> None:
+        """Report a restart step to callbacks and on RESTART_TOPIC."""
+        event = {
+            "node_name": node_name,
+            "status": status,
+            "attempt": attempt,
+            "delay_seconds": delay_seconds,
+            "error": error,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+        for callback in self.restart_callbacks:
+            try:
+                callback(event)
+            except Exception as exc:
+                logger.warning(
+                    "restart callback %s raised an error for agent '%s': %s",
+                    getattr(callback, '__name__', repr(callback)), node_name, exc,
+                )
+
+        bus = getattr(self.executor, "bus", None)
+        if bus is not None:
+            try:
+                bus.publish(RESTART_TOPIC, event, source="health_monitor")
+            except Exception as exc:
+                logger.warning("could not publish restart event for '%s': %s", node_name, exc)
+
     def _attempt_restart(self, node_name: str) -> bool:
         """
-        Attempt to restart a failed agent.
+        Reload a failed agent (runs on the supervisor thread).
 
         Args:
             node_name: Name of the agent
@@ -359,21 +797,13 @@ class HealthMonitor:
         Returns:
             True if restart was successful
         """
-        if not self.restart_policy.should_restart(node_name):
-            logger.warning("agent '%s' exceeded restart limit", node_name)
-            return False
-
-        # Calculate delay
-        delay = self.restart_policy.get_restart_delay(node_name)
-        logger.info("waiting %.1fs before restarting '%s'", delay, node_name)
-        time.sleep(delay)
-
+        self._last_restart_error = None
         try:
             # Record restart attempt
             self.restart_policy.record_restart(node_name)
 
             # Try to restart by reloading the agent
-            if hasattr(self.executor, 'hot_reload_manager'):
+            if getattr(self.executor, 'hot_reload_manager', None) is not None:
                 logger.info("attempting to restart '%s'", node_name)
                 result = self.executor.hot_reload_manager.reload_agent(node_name)
 
@@ -383,13 +813,16 @@ class HealthMonitor:
                     return True
                 else:
                     logger.error("failed to restart '%s': %s", node_name, result.get('error'))
+                    self._last_restart_error = str(result.get('error'))
                     return False
             else:
                 logger.warning("hot reload not available, cannot restart '%s'", node_name)
+                self._last_restart_error = "hot reload not available"
                 return False
 
         except Exception as e:
             logger.error("error restarting '%s': %s", node_name, e, exc_info=True)
+            self._last_restart_error = str(e)
             return False
 
     def _trigger_failure_callbacks(self, node_name: str, metrics: HealthMetrics) -> None:
@@ -0,0 +1,399 @@
+"""
+Latency Histograms
+
+Log-bucketed (HDR-style) histograms for latency percentiles.
+
+Values are recorded in integer nanoseconds.  Below 128ns every value has
+its own bucket; above that each power of two is split into 64 linear
+sub-buckets, so any recorded value is reported to within 1/64 (~1.6%)
+while a range of nanoseconds to hours needs only a few thousand buckets.
+Buckets are stored sparsely and two histograms merge by adding counts,
+which is how per-thread and per-window histograms are combined.
+
+:class:`WindowedHistogram` adds a sliding window: a ring of time slices,
+each its own histogram, so percentiles can be read over "the last N
+seconds" as well as since start.
+"""
+
+import math
+from typing import Any, Dict, List, Tuple
+
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_HALF = 1 << (SUB_BUCKET_BITS - 1)  # 64 sub-buckets per power of two
+LINEAR_LIMIT = 1 << SUB_BUCKET_BITS  # values below this get exact buckets
+
+DEFAULT_PERCENTILES = (0.5, 0.9, 0.99, 0.999)
+
+_NS = 1_000_000_000
+_NO_MIN = 1 << 62
+
+
+def bucket_index(value_ns: int) -> int:
+    """Bucket holding ``value_ns``."""
+    if value_ns < LINEAR_LIMIT:
+        return value_ns if value_ns > 0 else 0
+    shift = value_ns.bit_length() - SUB_BUCKET_BITS
+    return (shift << (SUB_BUCKET_BITS - 1)) + (value_ns >> shift)
+
+
+def bucket_bounds(index: int) -> Tuple[int, int]:
+    """Half-open ``[low, high)`` nanosecond range of a bucket."""
+    if index < LINEAR_LIMIT:
+        return index, index + 1
+    shift = index // SUB_BUCKET_HALF - 1
+    mantissa = index - shift * SUB_BUCKET_HALF
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+def percentile_key(q: float) -> str:
+    """Report key for a percentile: 0.5 -> ``"p50"``, 0.999 -> ``"p999"``."""
+    digits = f"{q * 100:g}".replace(".", "")
+    return f"p{digits}"
+
+
+class LatencyHistogram:
+    """
+    Mergeable log-bucketed latency histogram.
+
+    Count, sum, min and max are exact; percentiles are accurate to the
+    bucket resolution (~1.6%).
+    """
+
+    __slots__ = ("counts", "count", "sum_ns", "min_ns", "max_ns")
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum_ns = 0
+        self.min_ns = _NO_MIN
+        self.max_ns = 0
+
+    def record_ns(self, value_ns: int) -> None:
+        """Record one latency in nanoseconds."""
+        if value_ns < LINEAR_LIMIT:
+            if value_ns < 0:
+                value_ns = 0
+            index = value_ns
+        else:
+            shift = value_ns.bit_length() - SUB_BUCKET_BITS
+            index = (shift << (SUB_BUCKET_BITS - 1)) + (value_ns >> shift)
+        counts = self.counts
+        counts[index] = counts.get(index, 0) + 1
+        self.count += 1
+        self.sum_ns += value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+        if value_ns < self.min_ns:
+            self.min_ns = value_ns
+
+    def record(self, seconds: float) -> None:
+        """Record one latency in seconds."""
+        self.record_ns(int(seconds * _NS))
+
+    def record_many(self, values_ns: List[int]) -> None:
+        """Record a batch of latencies in nanoseconds (cheaper per value than :meth:`record_ns`)."""
+        if not values_ns:
+            return
+        low = min(values_ns)
+        if low < 0:
+            values_ns = [v if v > 0 else 0 for v in values_ns]
+            low = 0
+        counts = self.counts
+        get = counts.get
+        for value in values_ns:
+            shift = value.bit_length() - SUB_BUCKET_BITS
+            index = (shift << (SUB_BUCKET_BITS - 1)) + (value >> shift) if shift > 0 else value
+            counts[index] = get(index, 0) + 1
+        self.count += len(values_ns)
+        self.sum_ns += sum(values_ns)
+        high = max(values_ns)
+        if high > self.max_ns:
+            self.max_ns = high
+        if low < self.min_ns:
+            self.min_ns = low
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add ``other``'s observations to this histogram (in place)."""
+        counts = self.counts
+        for index, n in list(other.counts.items()):
+            counts[index] = counts.get(index, 0) + n
+        self.count += other.count
+        self.sum_ns += other.sum_ns
+        if other.max_ns > self.max_ns:
+            self.max_ns = other.max_ns
+        if other.min_ns < self.min_ns:
+            self.min_ns = other.min_ns
+        return self
+
+    def copy(self) -> "LatencyHistogram":
+        """Independent copy."""
+        return LatencyHistogram().merge(self)
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def mean(self) -> float:
+        """Mean latency in seconds."""
+        return self.sum_ns / self.count / _NS if self.count else 0.0
+
+    @property
+    def total(self) -> float:
+        """Sum of all latencies in seconds."""
+        return self.sum_ns / _NS
+
+    @property
+    def min(self) -> float:
+        """Smallest latency in seconds."""
+        return self.min_ns / _NS if self.count else 0.0
+
+    @property
+    def max(self) -> float:
+        """Largest latency in seconds."""
+        return self.max_ns / _NS
+
+    def percentile(self, q: float) -> float:
+        """
+        Latency at quantile ``q`` in seconds.
+
+        Args:
+            q: Quantile between 0 and 1 (e.g. 0.99)
+        """
+        return self.percentile_ns(q) / _NS
+
+    def percentile_ns(self, q: float) -> int:
+        """Latency at quantile ``q`` in nanoseconds."""
+        if not self.count:
+            return 0
+        return self._from_sorted(sorted(self.counts.items()), q)
+
+    def percentiles(self, quantiles=DEFAULT_PERCENTILES) -> Dict[str, float]:
+        """
+        Summary in seconds: count, mean, the given percentiles and max.
+
+        Returns:
+            e.g. ``{"count": 120, "mean": 0.004, "p50": ..., "p999": ..., "max": ...}``
+        """
+        summary: Dict[str, float] = {"count": self.count, "mean": self.mean}
+        if self.count:
+            ordered = sorted(self.counts.items())
+            for q in quantiles:
+                summary[percentile_key(q)] = self._from_sorted(ordered, q) / _NS
+        else:
+            for q in quantiles:
+                summary[percentile_key(q)] = 0.0
+        summary["max"] = self.max
+        return summary
+
+    def _from_sorted(self, ordered: List[Tuple[int, int]], q: float) -> int:
+        # Middle of the bucket holding the rank, clamped to the exact min/max
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, n in ordered:
+            seen += n
+            if seen >= rank:
+                low, high = bucket_bounds(index)
+                return min(max((low + high - 1) // 2, self.min_ns), self.max_ns)
+        return self.max_ns
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form (sparse buckets)."""
+        return {
+            "count": self.count,
+            "sum_ns": self.sum_ns,
+            "min_ns": self.min_ns if self.count else 0,
+            "max_ns": self.max_ns,
+            "buckets": {str(index): n for index, n in sorted(self.counts.items())},
+        }
+
+    @classmethod
+    def from_counts(cls, counts: Dict[int, int]) -> "LatencyHistogram":
+        """
+        Build a histogram from bucket counts alone.
+
+        Used for hot paths that only increment a bucket; sum, min and max
+        are then taken from the buckets, so they are accurate to the
+        bucket resolution rather than exact.
+        """
+        histogram = cls()
+        counts = dict(counts)
+        if not counts:
+            return histogram
+        histogram.counts = counts
+        sum_ns = count = 0
+        for index, n in counts.items():
+            low, high = bucket_bounds(index)
+            sum_ns += n * ((low + high - 1) // 2)
+            count += n
+        histogram.count = count
+        histogram.sum_ns = sum_ns
+        histogram.min_ns = bucket_bounds(min(counts))[0]
+        histogram.max_ns = bucket_bounds(max(counts))[1] - 1
+        return histogram
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        """Rebuild a histogram from :meth:`to_dict` output."""
+        histogram = cls()
+        histogram.counts = {int(index): n for index, n in data.get("buckets", {}).items()}
+        histogram.count = data.get("count", sum(histogram.counts.values()))
+        histogram.sum_ns = data.get("sum_ns", 0)
+        histogram.min_ns = data.get("min_ns", 0) if histogram.count else _NO_MIN
+        histogram.max_ns = data.get("max_ns", 0)
+        return histogram
+
+    def __repr__(self) -> str:
+        return f"LatencyHistogram(count={self.count}, p50={self.percentile(0.5):.6f}s, max={self.max:.6f}s)"
+
+
+class WindowedHistogram:
+    """
+    Latency histogram with a sliding window.
+
+    Observations go into the slice for the current time; the window is the
+    last ``slots`` slices (``window`` seconds).  Slices that fall out of the
+    window are folded into a retired histogram so :meth:`total` still
+    covers everything since start.  Timestamps are caller-supplied
+    nanoseconds from a monotonic clock (``time.perf_counter_ns`` or
+    ``time.monotonic_ns``).
+
+    Recording only appends to a pending buffer, which is bucketed in
+    batches of :attr:`BATCH`; readers include the pending values without
+    modifying them, so a single writer thread needs no lock.
+    """
+
+    BATCH = 256
+
+    __slots__ = ("slot_ns", "slots", "_ring", "_epochs", "_epoch", "_current", "_pending", "retired")
+
+    def __init__(self, window: float = 60.0, slots: int = 6):
+        """
+        Initialize windowed histogram.
+
+        Args:
+            window: Sliding window length in seconds
+            slots: Time slices the window is divided into
+        """
+        self.slots = max(1, slots)
+        self.slot_ns = max(1, int(window * _NS / self.slots))
+        self._ring: List[LatencyHistogram] = [LatencyHistogram() for _ in range(self.slots)]
+        self._epochs: List[int] = [-1] * self.slots
+        self._epoch = -1
+        self._current = self._ring[0]
+        self._pending: List[int] = []  # values for the current slice not yet bucketed
+        self.retired = LatencyHistogram()
+
+    @property
+    def window(self) -> float:
+        """Sliding window length in seconds."""
+        return self.slot_ns * self.slots / _NS
+
+    def record_ns(self, value_ns: int, now_ns: int) -> None:
+        """Record one latency (ns) observed at monotonic time ``now_ns``."""
+        epoch = now_ns // self.slot_ns
+        if epoch != self._epoch:
+            self._advance(epoch)
+        pending = self._pending
+        pending.append(value_ns)
+        if len(pending) >= self.BATCH:
+            self._flush()
+
+    def record(self, seconds: float, now_ns: int) -> None:
+        """Record one latency in seconds observed at monotonic time ``now_ns``."""
+        self.record_ns(int(seconds * _NS), now_ns)
+
+    def _flush(self) -> None:
+        pending, self._pending = self._pending, []
+        self._current.record_many(pending)
+
+    def _advance(self, epoch: int) -> None:
+        if self._pending:
+            self._flush()
+        i = epoch % self.slots
+        if self._epochs[i] != epoch:
+            old = self._ring[i]
+            if old.count:
+                self.retired.merge(old)
+            self._ring[i] = LatencyHistogram()
+            self._epochs[i] = epoch
+        self._epoch = epoch
+        self._current = self._ring[i]
+
+    def _slices(self) -> List[Tuple[int, LatencyHistogram]]:
+        # (epoch, histogram) per slice, the current one including pending values
+        current, pending = self._current, list(self._pending)
+        result = []
+        for slot, epoch in zip(list(self._ring), list(self._epochs)):
+            if slot is current and pending:
+                slot = slot.copy()
+                slot.record_many(pending)
+            result.append((epoch, slot))
+        return result
+
+    def total(self) -> LatencyHistogram:
+        """Everything recorded since start (a new histogram)."""
+        histogram = self.retired.copy()
+        for _, slot in self._slices():
+            histogram.merge(slot)
+        return histogram
+
+    def window_histogram(self, now_ns: int) -> LatencyHistogram:
+        """Observations from the last ``window`` seconds before ``now_ns``."""
+        oldest = now_ns // self.slot_ns - self.slots + 1
+        histogram = LatencyHistogram()
+        for epoch, slot in self._slices():
+            if epoch >= oldest:
+                histogram.merge(slot)
+        return histogram
+
+    def window_slices(self, now_ns: int) -> List[Tuple[int, LatencyHistogram]]:
+        """
+        Slices of the last ``window`` seconds before ``now_ns``, oldest first.
+
+        Returns:
+            List of (slice start in monotonic ns, histogram); empty slices are skipped
+        """
+        oldest = now_ns // self.slot_ns - self.slots + 1
+        slices = [(epoch * self.slot_ns, slot) for epoch, slot in self._slices()
+                  if epoch >= oldest and slot.count]
+        return sorted(slices, key=lambda s: s[0])
+
+    def merge(self, other: "WindowedHistogram") -> "WindowedHistogram":
+        """
+        Add ``other``'s observations, slice by slice (in place).
+
+        Both histograms must use the same slice length.
+        """
+        if other.slot_ns != self.slot_ns or other.slots != self.slots:
+            raise ValueError("Cannot merge windowed histograms with different windows")
+        if self._pending:
+            self._flush()
+        self.retired.merge(other.retired)
+        for epoch, slot in other._slices():
+            if epoch >= 0 and slot.count:
+                self.add_slice(epoch, slot)
+        return self
+
+    def add_slice(self, epoch: int, histogram: LatencyHistogram) -> None:
+        """
+        Add observations made during slice ``epoch`` (``now_ns // slot_ns``).
+
+        Slices older than the window go straight to the retired histogram.
+        """
+        if self._pending:
+            self._flush()
+        i = epoch % self.slots
+        mine = self._epochs[i]
+        if mine == epoch:
+            self._ring[i].merge(histogram)
+        elif mine < epoch:
+            if self._ring[i].count:
+                self.retired.merge(self._ring[i])
+            self._ring[i] = histogram.copy()
+            self._epochs[i] = epoch
+            if epoch > self._epoch:
+                self._epoch = epoch
+                self._current = self._ring[i]
+        else:
+            self.retired.merge(histogram)
@@ -101,6 +101,10 @@ class HotReloadManager:
             if hasattr(self.executor, 'message_bus'):
                 new_node.message_bus = self.executor.message_bus
 
+            # Keep the node's memory (and its open history spill file)
+            if getattr(old_node, 'memory', None) is not None:
+                new_node.memory = old_node.memory
+
             # Restore state if saved
             if saved_state and hasattr(new_node, 'set_state'):
                 try:
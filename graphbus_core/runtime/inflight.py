@@ -0,0 +1,261 @@
+"""
+In-Flight Tracking
+
+Counts method calls and event deliveries currently executing, per node and
+per topic, so the runtime can drain outstanding work before shutting down.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Trackers the current context is running work for, innermost last.  A
+# context variable rather than a thread-local, so coroutines interleaving on
+# one event loop thread each see only their own nesting.
+_entered: contextvars.ContextVar[Tuple["InFlightTracker", ...]] = contextvars.ContextVar(
+    "graphbus_inflight_entered", default=()
+)
+
+
+class InFlightTracker:
+    """
+    Thread-safe in-flight work counters with an idle barrier.
+
+    Two kinds of work are tracked:
+
+    - **active** work, entered with :meth:`track`, keyed by node and/or topic
+    - **pending** work, submitted to a queue or pool but not started yet
+
+    :meth:`wait_idle` blocks until both reach zero.
+
+    Active work is also recorded per thread as a stack of
+    ``(node, handler, topic, started)``, which :meth:`current_calls` and
+    :meth:`running_calls` expose to observers on other threads such as the
+    sampling profiler and the hung-handler watchdog.  Each stack is only
+    written by its own thread.  Coroutine calls are left off the thread
+    stacks, since while one is suspended its loop thread runs other work.
+    They are kept per asyncio task instead and exposed by
+    :meth:`running_tasks`.
+    """
+
+    def __init__(self):
+        """Initialize tracker with all counters at zero."""
+        self._cond = threading.Condition()
+
+        self._active = 0
+        self._pending = 0
+        self._by_node: Dict[str, int] = defaultdict(int)
+        self._by_topic: Dict[str, int] = defaultdict(int)
+        self._local = threading.local()
+        self._calls: Dict[int, List[Tuple[Optional[str], Optional[str], Optional[str], float]]] = {}
+        self._tasks: Dict[Any, Tuple[int, list]] = {}  # task -> (loop thread ident, call stack)
+        self.completed_total = 0
+
+    @contextmanager
+    def track(self, node: Optional[str] = None, topic: Optional[str] = None,
+              handler: Optional[str] = None, coroutine: bool = False) -> Iterator[None]:
+        """
+        Count the enclosed block as in-flight work.
+
+        Args:
+            node: Node executing the work (if any)
+            topic: Topic being delivered (if any)
+            handler: Method or handler name being run (if any)
+            coroutine: The block awaits; list it as the current asyncio
+                task's call rather than the thread's
+        """
+        call = (node, handler, topic, time.monotonic())
+        task = stack = None
+        if coroutine:
+            try:
+                task = asyncio.current_task()
+            except RuntimeError:
+                pass  # no running loop, nothing to attribute it to
+        with self._cond:
+            self._active += 1
+            if node is not None:
+                self._by_node[node] += 1
+            if topic is not None:
+                self._by_topic[topic] += 1
+            if task is not None:
+                entry = self._tasks.get(task)
+                if entry is None:
+                    entry = self._tasks[task] = (threading.get_ident(), [])
+                entry[1].append(call)
+
+        if not coroutine:
+            try:
+                stack = self._local.stack
+            except AttributeError:
+                stack = self._thread_stack()
+            stack.append(call)
+        token = _entered.set(_entered.get() + (self,))
+        try:
+            yield
+        finally:
+            _entered.reset(token)
+            if stack is not None:
+                stack.pop()
+            with self._cond:
+                self._active -= 1
+                self.completed_total += 1
+                if task is not None:
+                    calls = self._tasks[task][1]
+                    calls.pop()
+                    if not calls:
+                        del self._tasks[task]
+                if node is not None:
+                    self._by_node[node] -= 1
+                    if not self._by_node[node]:
+                        del self._by_node[node]
+                if topic is not None:
+                    self._by_topic[topic] -= 1
+                    if not self._by_topic[topic]:
+                        del self._by_topic[topic]
+                if not self._active and not self._pending:
+                    self._cond.notify_all()
+
+    def _thread_stack(self) -> list:
+        """Register a call stack for the calling thread."""
+        stack = self._local.stack = []
+        with self._cond:
+            self._calls[threading.get_ident()] = stack
+        return stack
+
+    def add_pending(self) -> None:
+        """Record a unit of work queued for later execution."""
+        with self._cond:
+            self._pending += 1
+
+    def remove_pending(self) -> None:
+        """Record that a queued unit of work has started (or was cancelled)."""
+        with self._cond:
+            self._pending -= 1
+            if not self._active and not self._pending:
+                self._cond.notify_all()
+
+    @contextmanager
+    def start_pending(self) -> Iterator[None]:
+        """
+        Run a queued unit of work, moving it from pending to active atomically.
+
+        Unlike ``remove_pending()`` followed by running the work, there is no
+        instant at which the work is counted as neither, so :meth:`wait_idle`
+        cannot report idle while it is starting.  Nested work is admitted
+        during a drain (:meth:`is_nested`), but the unit itself is not counted
+        in ``completed_total`` (what it runs is).
+        """
+        with self._cond:
+            self._pending -= 1
+            self._active += 1
+
+        token = _entered.set(_entered.get() + (self,))
+        try:
+            yield
+        finally:
+            _entered.reset(token)
+            with self._cond:
+                self._active -= 1
+                if not self._active and not self._pending:
+                    self._cond.notify_all()
+
+    def is_nested(self) -> bool:
+        """
+        True if the current context is inside tracked or admitted work.
+
+        Nesting follows the context (thread or asyncio task), so a coroutine
+        suspended inside :meth:`track` does not make other coroutines on the
+        same event loop thread look nested.
+        """
+        return self in _entered.get()
+
+    def current_calls(self) -> Dict[int, Tuple[Optional[str], Optional[str], Optional[str]]]:
+        """
+        Innermost tracked call per thread.
+
+        Returns:
+            Dict of thread ident -> ``(node, handler, topic)``
+        """
+        return {ident: call[:3] for ident, call in self._innermost().items()}
+
+    def running_calls(self) -> Dict[int, Tuple[Optional[str], Optional[str], Optional[str], float]]:
+        """
+        Innermost tracked call per thread, with its start time.
+
+        The tuples are the tracker's own entries, so the same call yields
+        the same object on every read until it finishes.
+
+        Returns:
+            Dict of thread ident -> ``(node, handler, topic, started)``,
+            ``started`` in ``time.monotonic()`` seconds
+        """
+        return self._innermost()
+
+    def running_tasks(self) -> Dict[Any, Tuple[int, Tuple[Optional[str], Optional[str], Optional[str], float]]]:
+        """
+        Innermost tracked coroutine call per asyncio task, with its start time.
+
+        Like :meth:`running_calls`, the tuples are the tracker's own entries.
+
+        Returns:
+            Dict of task -> ``(loop thread ident, (node, handler, topic, started))``
+        """
+        with self._cond:
+            return {task: (ident, calls[-1]) for task, (ident, calls) in self._tasks.items()}
+
+    def _innermost(self) -> Dict[int, Tuple[Optional[str], Optional[str], Optional[str], float]]:
+        with self._cond:
+            stacks = list(self._calls.items())
+        calls = {}
+        for ident, stack in stacks:
+            try:
+                calls[ident] = stack[-1]
+            except IndexError:
+                pass  # idle, or finished since the copy
+        return calls
+
+    @property
+    def total(self) -> int:
+        """Active plus pending work."""
+        with self._cond:
+            return self._active + self._pending
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until no work is active or pending.
+
+        Args:
+            timeout: Maximum seconds to wait (None = forever)
+
+        Returns:
+            True if idle, False if the timeout expired first
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._active and not self._pending,
+                timeout=timeout,
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get current in-flight counts.
+
+        Returns:
+            Dict with active/pending totals and per-node/per-topic breakdowns
+        """
+        with self._cond:
+            return {
+                "active": self._active,
+                "pending": self._pending,
+                "completed_total": self.completed_total,
+                "nodes": dict(self._by_node),
+                "topics": dict(self._by_topic),
+            }
+
+    def __repr__(self) -> str:
+        snapshot = self.snapshot()
+        return f"InFlightTracker(active={snapshot['active']}, pending={snapshot['pending']})"
@@ -6,6 +6,7 @@ import json
 from pathlib import Path
 from typing import List, Dict, Tuple
 
+from graphbus_core import codec
 from graphbus_core.model.agent_def import AgentDefinition
 from graphbus_core.model.graph import AgentGraph
 from graphbus_core.model.topic import Topic, Subscription
@@ -18,7 +19,8 @@ class ArtifactLoader:
     Loads build artifacts from .graphbus directory for Runtime Mode.
 
     Responsibilities:
-    - Load and deserialize JSON artifacts
+    - Load and deserialize JSON artifacts (or the binary storage format,
+      detected from the file header)
     - Reconstruct AgentGraph from serialized data
     - Load agent definitions
     - Load topics and subscriptions
@@ -73,8 +75,7 @@ class ArtifactLoader:
             Reconstructed AgentGraph
         """
         graph_path = self.artifacts_dir / "graph.json"
-        with open(graph_path, 'r', encoding='utf-8') as f:
-            raw_data = json.load(f)
+        raw_data = codec.load(graph_path)
 
         # Deserialize using dataclass
         graph_data = GraphData.from_dict(raw_data)
@@ -108,8 +109,7 @@ class ArtifactLoader:
             List of AgentDefinition objects
         """
         agents_path = self.artifacts_dir / "agents.json"
-        with open(agents_path, 'r', encoding='utf-8') as f:
-            agents_data = json.load(f)
+        agents_data = codec.load(agents_path)
 
         agents = []
         for agent_data in agents_data:
@@ -128,8 +128,7 @@ class ArtifactLoader:
         same file independently, meaning two disk reads per load_all() call.
         """
         topics_path = self.artifacts_dir / "topics.json"
-        with open(topics_path, 'r', encoding='utf-8') as f:
-            raw_data = json.load(f)
+        raw_data = codec.load(topics_path)
 
         topics_data = TopicsData.from_dict(raw_data)
         topics = [Topic(topic_name) for topic_name in topics_data.topics]
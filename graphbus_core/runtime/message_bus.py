@@ -3,6 +3,7 @@ Message Bus - Simple pub/sub routing for Runtime Mode
 """
 
 import logging
+import time
 from typing import Dict, List, Callable, Any
 from collections import defaultdict, deque
 
@@ -42,6 +43,20 @@ class MessageBus:
             "errors": 0
         }
 
+        # Optional SnapshotBarrier that holds top-level publishes while a
+        # coordinated checkpoint is being cut (installed by the executor)
+        self.barrier = None
+
+        # Optional Tracer: publishes and deliveries become spans, and events
+        # carry the trace of the handler (or call) that published them
+        self.tracer = None
+
+        # Optional PerformanceProfiler recording per-topic rates and dispatch time
+        self.profiler = None
+
+        # Optional PrometheusMetrics counting publishes and deliveries per topic
+        self.metrics = None
+
     def subscribe(self, topic: str, handler: Callable, subscriber_name: str = "unknown") -> None:
         """
         Subscribe a handler to a topic.
@@ -82,14 +97,35 @@ class MessageBus:
         Returns:
             Created Event object
         """
-        # Create event
-        event = Event(
+        if self.barrier is not None:
+            with self.barrier.admit(topic, payload, source):
+                return self._publish(topic, payload, source)
+        return self._publish(topic, payload, source)
+
+    def _publish(self, topic: str, payload: Dict[str, Any], source: str) -> Event:
+        """Create, record and dispatch an event."""
+        if self.tracer is not None:
+            with self.tracer.span("publish", f"publish {topic}", topic=topic, node=source) as span:
+                event = self._create_event(topic, payload, source)
+                event.trace_id, event.parent_id = span.trace_id, span.span_id
+                span.event_id = event.event_id
+                self._record_and_dispatch(event)
+            return event
+
+        event = self._create_event(topic, payload, source)
+        self._record_and_dispatch(event)
+        return event
+
+    @staticmethod
+    def _create_event(topic: str, payload: Dict[str, Any], source: str) -> Event:
+        return Event(
             event_id=generate_id("event_"),
             topic=topic,  # Event expects string, not Topic object
             src=source,   # Event uses 'src' not 'source'
             payload=payload
         )
 
+    def _record_and_dispatch(self, event: Event) -> None:
         # Track in history
         self._message_history.append(event)
 
@@ -97,9 +133,22 @@ class MessageBus:
         self._stats["messages_published"] += 1
 
         # Dispatch to subscribers
-        self.dispatch_event(event)
-
-        return event
+        profiler, metrics = self.profiler, self.metrics
+        if profiler is None and metrics is None:
+            self.dispatch_event(event)
+            return
+        if metrics is not None:
+            metrics.increment_messages_published(event.topic)
+        start = time.perf_counter()
+        try:
+            self.dispatch_event(event)
+        finally:
+            elapsed = time.perf_counter() - start
+            if profiler is not None:
+                profiler.record_event_publish(event.topic, elapsed,
+                                              len(self._subscriptions.get(event.topic, ())))
+            if metrics is not None:
+                metrics.observe_event_duration(event.topic, elapsed, event.trace_id)
 
     def dispatch_event(self, event: Event) -> None:
         """
@@ -117,16 +166,41 @@ class MessageBus:
 
         logger.debug("dispatching %s to %d subscriber(s)", topic, len(handlers))
 
+        tracer = self.tracer
+        delivered = 0
         for handler, subscriber_name in handlers:
+            if tracer is not None:
+                delivered += self._traced_delivery(tracer, event, handler, subscriber_name)
+                continue
             try:
                 # Call handler synchronously
                 handler(event)
                 self._stats["messages_delivered"] += 1
+                delivered += 1
                 logger.debug("delivered to %s", subscriber_name)
             except Exception as e:
                 self._stats["errors"] += 1
                 logger.error("error in handler %s for topic %s: %s", subscriber_name, topic, e, exc_info=True)
 
+        # One update per event rather than per subscriber
+        if delivered and self.metrics is not None:
+            self.metrics.increment_messages_delivered(topic, delivered)
+
+    def _traced_delivery(self, tracer, event: Event, handler: Callable, subscriber_name: str) -> bool:
+        """Deliver to one subscriber inside a span linked to the event's publisher; True if delivered."""
+        try:
+            with tracer.span("deliver", f"{event.topic} -> {subscriber_name}",
+                             parent=(event.trace_id, event.parent_id),
+                             node=subscriber_name, topic=event.topic, event_id=event.event_id):
+                handler(event)
+            self._stats["messages_delivered"] += 1
+            logger.debug("delivered to %s", subscriber_name)
+            return True
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.error("error in handler %s for topic %s: %s", subscriber_name, event.topic, e, exc_info=True)
+            return False
+
     def get_subscribers(self, topic: str) -> List[str]:
         """
         Get list of subscriber names for a topic.
@@ -2,13 +2,45 @@
 Monitoring and Observability
 
 Provides Prometheus metrics export and OpenTelemetry integration.
+
+Counters and duration histograms are recorded into per-thread
+accumulators (the same scheme as the performance profiler), so updates
+take no shared lock and a scrape never blocks them; a scrape merges the
+accumulators.  The rendered exposition is cached until something changes,
+and the lines of each duration series are kept until that series records
+again, so a scrape with thousands of idle label sets stays cheap.
+Distinct topic and method label values are capped (``max_label_sets``);
+further ones are folded into a single ``__overflow__`` series.
+
+The exposition is available in the Prometheus text format and in
+OpenMetrics, where duration buckets carry exemplars linking to the trace
+of a recent observation.  :class:`MetricsServer` serves either (chosen by
+the scraper's ``Accept`` header), gzip-compressed when asked.
 """
 
-import time
+import gzip
+import json
 import threading
-from typing import Dict, Any, Optional
-from collections import defaultdict, deque
+import time
+from bisect import bisect_left
 from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from graphbus_core.runtime.circuit_breaker import STATE_CLOSED, STATE_VALUES
+from graphbus_core.runtime.histogram import LatencyHistogram, WindowedHistogram
+
+# Default upper bounds (seconds) of the cumulative duration histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Quantiles exported for duration summaries (computed over the sliding window)
+SUMMARY_QUANTILES = (0.5, 0.9, 0.95, 0.99, 0.999)
+
+# Distinct topic / method label values kept before new ones are folded together
+DEFAULT_MAX_LABEL_SETS = 1000
+OVERFLOW_LABEL = "__overflow__"
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
 
 
 @dataclass
@@ -19,207 +51,672 @@ class MetricValue:
     labels: Dict[str, str] = field(default_factory=dict)
 
 
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _method_labels(key: str) -> str:
+    agent, method = key.rsplit('.', 1) if '.' in key else (key, 'unknown')
+    return f'agent="{_escape(agent)}",method="{_escape(method)}"'
+
+
+def _topic_labels(topic: str) -> str:
+    return f'topic="{_escape(topic)}"'
+
+
+def _to_openmetrics(lines: List[str]) -> List[str]:
+    """
+    Adapt Prometheus text lines to OpenMetrics.
+
+    Counter families are named without their ``_total`` suffix (samples
+    keep it) and blank lines are not allowed.
+    """
+    counters = {
+        line.split()[2] for line in lines
+        if line.startswith("# TYPE ") and line.endswith(" counter") and line.split()[2].endswith("_total")
+    }
+    result = []
+    for line in lines:
+        if not line:
+            continue
+        if line.startswith(("# HELP ", "# TYPE ")):
+            marker, kind, name, rest = (line.split(" ", 3) + [""])[:4]
+            if name in counters:
+                line = f"{marker} {kind} {name[:-len('_total')]} {rest}".rstrip()
+        result.append(line)
+    return result
+
+
+class _Duration:
+    """One duration series: exact ``le`` bucket counts plus a sliding window for quantiles."""
+
+    __slots__ = ("bounds", "buckets", "exemplars", "count", "sum", "window")
+
+    def __init__(self, bounds: Tuple[float, ...], window: WindowedHistogram):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)  # per bucket, not cumulative; last is +Inf
+        # Latest traced observation per bucket: (trace_id, seconds, epoch time) or None
+        self.exemplars: List[Optional[tuple]] = [None] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.window = window
+
+    def observe(self, seconds: float, now_ns: int, trace_id: Optional[str] = None) -> None:
+        i = bisect_left(self.bounds, seconds)
+        self.buckets[i] += 1
+        if trace_id is not None:
+            self.exemplars[i] = (trace_id, seconds, time.time())
+        self.count += 1
+        self.sum += seconds
+        self.window.record(seconds, now_ns)
+
+    def merge_into(self, target: "_Duration") -> None:
+        for i, n in enumerate(self.buckets):
+            target.buckets[i] += n
+        _merge_exemplars(target.exemplars, self.exemplars)
+        target.count += self.count
+        target.sum += self.sum
+        target.window.merge(self.window)
+
+
+def _merge_exemplars(target: List[Optional[tuple]], source: List[Optional[tuple]]) -> None:
+    """Keep the newer exemplar of each bucket."""
+    for i, exemplar in enumerate(list(source)):
+        if exemplar is not None and (target[i] is None or exemplar[2] > target[i][2]):
+            target[i] = exemplar
+
+
+class _Shard:
+    """One thread's counters and duration series (only ever written by that thread)."""
+
+    __slots__ = ("published", "delivered", "calls", "errors", "method_durations",
+                 "event_durations", "version")
+
+    def __init__(self):
+        self.published: Dict[str, int] = {}
+        self.delivered: Dict[str, int] = {}
+        self.calls: Dict[str, int] = {}  # "Agent.method" -> count
+        self.errors: Dict[str, int] = {}
+        self.method_durations: Dict[str, _Duration] = {}
+        self.event_durations: Dict[str, _Duration] = {}
+        self.version = 0  # bumped on every update; a scrape compares the sum
+
+    def merge_into(self, target: "_Shard", new_duration) -> None:
+        for name in ("published", "delivered", "calls", "errors"):
+            counts = getattr(target, name)
+            for key, n in list(getattr(self, name).items()):
+                counts[key] = counts.get(key, 0) + n
+        for name in ("method_durations", "event_durations"):
+            series = getattr(target, name)
+            for key, duration in list(getattr(self, name).items()):
+                merged = series.get(key)
+                if merged is None:
+                    merged = series[key] = new_duration()
+                duration.merge_into(merged)
+        target.version += self.version
+
+
+class _DurationTotals:
+    """A duration series summed over shards at scrape time (windows merged only when needed)."""
+
+    __slots__ = ("buckets", "exemplars", "count", "sum", "windows")
+
+    def __init__(self, size: int):
+        self.buckets = [0] * size
+        self.exemplars: List[Optional[tuple]] = [None] * size
+        self.count = 0
+        self.sum = 0.0
+        self.windows: List[WindowedHistogram] = []
+
+    def add(self, duration: _Duration) -> None:
+        # Count from the bucket copy, so +Inf and _count always agree with the buckets
+        buckets = list(duration.buckets)
+        for i, n in enumerate(buckets):
+            self.buckets[i] += n
+        self.count += sum(buckets)
+        self.sum += duration.sum
+        self.windows.append(duration.window)
+        _merge_exemplars(self.exemplars, duration.exemplars)
+
+    def window_histogram(self, now_ns: int) -> LatencyHistogram:
+        histogram = LatencyHistogram()
+        for window in self.windows:
+            histogram.merge(window.window_histogram(now_ns))
+        return histogram
+
+
 class PrometheusMetrics:
     """
     Prometheus metrics exporter for GraphBus runtime.
 
-    Tracks and exports metrics in Prometheus format.
+    Tracks and exports metrics in Prometheus format.  Counter and duration
+    attributes (``messages_published_total``, ``method_duration_seconds``,
+    ...) are merged snapshots of the per-thread accumulators, rebuilt on
+    each access.
     """
 
-    def __init__(self):
-        """Initialize metrics collector"""
-        self._lock = threading.Lock()
+    def __init__(self, window_seconds: float = 60.0, window_slots: int = 6,
+                 buckets: Sequence[float] = DEFAULT_BUCKETS,
+                 max_label_sets: int = DEFAULT_MAX_LABEL_SETS,
+                 summary_quantiles: Sequence[float] = SUMMARY_QUANTILES):
+        """
+        Initialize metrics collector
 
-        # Counter metrics
-        self.messages_published_total = defaultdict(int)
-        self.messages_delivered_total = defaultdict(int)
-        self.method_calls_total = defaultdict(int)
-        self.method_errors_total = defaultdict(int)
+        Args:
+            window_seconds: Sliding window that duration quantiles are computed over
+            window_slots: Time slices the window is divided into
+            buckets: Upper bounds (seconds) of the duration histogram buckets
+            max_label_sets: Distinct topics, and distinct methods, exported
+                before further ones are folded into ``__overflow__``
+            summary_quantiles: Quantiles of the windowed duration summaries
+                (empty to export histograms only)
+        """
+        self._lock = threading.Lock()  # registry, gauges and label admission; never taken per counter update
+        self.window_seconds = window_seconds
+        self.window_slots = window_slots
+        self._slot_ns = max(1, int(window_seconds * 1e9 / max(1, window_slots)))
+        self.buckets: Tuple[float, ...] = tuple(sorted(float(b) for b in buckets))
+        self.max_label_sets = max_label_sets
+        self.summary_quantiles = tuple(summary_quantiles)
+
+        # Counters and duration histograms: per-thread shards, merged on read
+        self._local = threading.local()
+        self._shards: List[tuple] = []  # (thread, _Shard)
+        self._retired = _Shard()  # shards of threads that have exited
+
+        # Cardinality guard: admitted label values (read without the lock)
+        self._topics: Set[str] = set()
+        self._methods: Set[str] = set()
+        self.label_overflow_total: Dict[str, int] = {"topic": 0, "method": 0}
 
         # Gauge metrics
         self.active_agents = 0
-        self.message_queue_depth = defaultdict(int)
+        self.message_queue_depth: Dict[str, int] = {}
         self.agent_health_status = {}  # agent -> status (1=healthy, 0=unhealthy)
+        self._gauge_version = 0
+
+        # Bulkhead and circuit breaker stats and runtime gauges are pulled at scrape time
+        self._bulkheads = None
+        self._circuit_breakers = None
+        self._runtime = None
 
-        # Histogram metrics (bounded deques for O(1) sliding window, max 1000 observations)
-        self.method_duration_seconds: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
-        self.event_processing_duration_seconds: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
+        # Exposition cache per format: (generation, body), and rendered lines per duration series
+        self._render_lock = threading.Lock()
+        self._cached: Dict[bool, tuple] = {}
+        self._series_lines: Dict[tuple, tuple] = {}
 
         # Track start time
         self.start_time = time.time()
 
+    def track_bulkheads(self, registry) -> None:
+        """
+        Export limiter stats from a BulkheadRegistry on every scrape.
+
+        Args:
+            registry: BulkheadRegistry (usually ``executor.bulkheads``)
+        """
+        self._bulkheads = registry
+
+    def track_circuit_breakers(self, registry) -> None:
+        """
+        Export breaker state from a CircuitBreakerRegistry on every scrape.
+
+        Args:
+            registry: CircuitBreakerRegistry (usually ``executor.circuit_breakers``)
+        """
+        self._circuit_breakers = registry
+
+    def track_runtime(self, executor) -> None:
+        """
+        Refresh runtime gauges from an executor on every scrape.
+
+        Active agents are the loaded nodes not reported unhealthy by the
+        health monitor (if any), agent health comes from the same monitor,
+        and the queue depth of a topic is its number of in-flight deliveries.
+
+        Args:
+            executor: RuntimeExecutor (see ``RuntimeExecutor.setup_metrics``)
+        """
+        self._runtime = executor
+
+    def _collect_runtime(self) -> None:
+        executor = self._runtime
+        nodes = list(executor.nodes)
+        monitor = executor.health_monitor
+        unhealthy = set(monitor.get_unhealthy_agents()) if monitor is not None else set()
+        self.set_active_agents(len([name for name in nodes if name not in unhealthy]))
+        if monitor is not None:
+            for name in nodes:
+                self.set_agent_health(name, name not in unhealthy)
+        depths = executor.inflight.snapshot()["topics"]
+        for topic in list(self.message_queue_depth):
+            if topic not in depths:
+                self.set_queue_depth(topic, 0)
+        for topic, depth in depths.items():
+            self.set_queue_depth(topic, depth)
+
+    def _shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def _admit(self, admitted: Set[str], label: str, value: str) -> str:
+        """Admit a new label value, or fold it into the overflow series once the cap is reached."""
+        with self._lock:
+            if value in admitted:
+                return value
+            if len(admitted) < self.max_label_sets:
+                admitted.add(value)
+                return value
+            self.label_overflow_total[label] += 1
+        return OVERFLOW_LABEL if label == "topic" else f"{OVERFLOW_LABEL}.{OVERFLOW_LABEL}"
+
+    def _topic(self, topic: str) -> str:
+        return topic if topic in self._topics else self._admit(self._topics, "topic", topic)
+
+    def _method(self, agent: str, method: str) -> str:
+        key = f"{agent}.{method}"
+        return key if key in self._methods else self._admit(self._methods, "method", key)
+
+    def _new_histogram(self) -> WindowedHistogram:
+        return WindowedHistogram(self.window_seconds, self.window_slots)
+
+    def _new_duration(self) -> _Duration:
+        return _Duration(self.buckets, self._new_histogram())
+
     def increment_messages_published(self, topic: str, count: int = 1) -> None:
         """Increment published message counter"""
-        with self._lock:
-            self.messages_published_total[topic] += count
+        topic = self._topic(topic)
+        shard = self._shard()
+        shard.published[topic] = shard.published.get(topic, 0) + count
+        shard.version += 1
 
     def increment_messages_delivered(self, topic: str, count: int = 1) -> None:
         """Increment delivered message counter"""
-        with self._lock:
-            self.messages_delivered_total[topic] += count
+        topic = self._topic(topic)
+        shard = self._shard()
+        shard.delivered[topic] = shard.delivered.get(topic, 0) + count
+        shard.version += 1
 
     def increment_method_calls(self, agent: str, method: str, count: int = 1) -> None:
         """Increment method call counter"""
-        key = f"{agent}.{method}"
-        with self._lock:
-            self.method_calls_total[key] += count
+        key = self._method(agent, method)
+        shard = self._shard()
+        shard.calls[key] = shard.calls.get(key, 0) + count
+        shard.version += 1
 
     def increment_method_errors(self, agent: str, method: str, count: int = 1) -> None:
         """Increment method error counter"""
-        key = f"{agent}.{method}"
-        with self._lock:
-            self.method_errors_total[key] += count
+        key = self._method(agent, method)
+        shard = self._shard()
+        shard.errors[key] = shard.errors.get(key, 0) + count
+        shard.version += 1
 
     def set_active_agents(self, count: int) -> None:
         """Set number of active agents"""
         with self._lock:
-            self.active_agents = count
+            if self.active_agents != count:
+                self.active_agents = count
+                self._gauge_version += 1
 
     def set_queue_depth(self, topic: str, depth: int) -> None:
         """Set message queue depth for topic"""
+        topic = self._topic(topic)
         with self._lock:
-            self.message_queue_depth[topic] = depth
+            if self.message_queue_depth.get(topic) != depth:
+                self.message_queue_depth[topic] = depth
+                self._gauge_version += 1
 
     def set_agent_health(self, agent: str, healthy: bool) -> None:
         """Set agent health status (1=healthy, 0=unhealthy)"""
+        status = 1 if healthy else 0
         with self._lock:
-            self.agent_health_status[agent] = 1 if healthy else 0
-
-    def observe_method_duration(self, agent: str, method: str, duration: float) -> None:
-        """Observe method execution duration (deque auto-evicts oldest beyond maxlen)"""
-        key = f"{agent}.{method}"
-        with self._lock:
-            self.method_duration_seconds[key].append(duration)
-
-    def observe_event_duration(self, topic: str, duration: float) -> None:
-        """Observe event processing duration (deque auto-evicts oldest beyond maxlen)"""
+            if self.agent_health_status.get(agent) != status:
+                self.agent_health_status[agent] = status
+                self._gauge_version += 1
+
+    def observe_method_duration(self, agent: str, method: str, duration: float,
+                                trace_id: Optional[str] = None) -> None:
+        """Observe method execution duration (``trace_id`` becomes the bucket's OpenMetrics exemplar)"""
+        key = self._method(agent, method)
+        shard = self._shard()
+        series = shard.method_durations.get(key)
+        if series is None:
+            series = shard.method_durations[key] = self._new_duration()
+        series.observe(duration, time.monotonic_ns(), trace_id)
+        shard.version += 1
+
+    def observe_event_duration(self, topic: str, duration: float, trace_id: Optional[str] = None) -> None:
+        """Observe event processing duration (``trace_id`` becomes the bucket's OpenMetrics exemplar)"""
+        topic = self._topic(topic)
+        shard = self._shard()
+        series = shard.event_durations.get(topic)
+        if series is None:
+            series = shard.event_durations[topic] = self._new_duration()
+        series.observe(duration, time.monotonic_ns(), trace_id)
+        shard.version += 1
+
+    def _live_shards(self) -> List[_Shard]:
+        """Shards to read: retired totals first, folding in those of exited threads."""
         with self._lock:
-            self.event_processing_duration_seconds[topic].append(duration)
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    shard.merge_into(self._retired, self._new_duration)
+            self._shards = live
+            return [self._retired] + [shard for _, shard in live]
+
+    def _merged_counts(self, name: str) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for shard in self._live_shards():
+            for key, n in list(getattr(shard, name).items()):
+                totals[key] = totals.get(key, 0) + n
+        return totals
+
+    def _merged_histograms(self, name: str) -> Dict[str, WindowedHistogram]:
+        totals: Dict[str, WindowedHistogram] = {}
+        for shard in self._live_shards():
+            for key, duration in list(getattr(shard, name).items()):
+                histogram = totals.get(key)
+                if histogram is None:
+                    histogram = totals[key] = self._new_histogram()
+                histogram.merge(duration.window)
+        return totals
+
+    @property
+    def messages_published_total(self) -> Dict[str, int]:
+        """Published messages per topic."""
+        return self._merged_counts("published")
+
+    @property
+    def messages_delivered_total(self) -> Dict[str, int]:
+        """Delivered messages per topic."""
+        return self._merged_counts("delivered")
+
+    @property
+    def method_calls_total(self) -> Dict[str, int]:
+        """Method calls per ``"Agent.method"``."""
+        return self._merged_counts("calls")
+
+    @property
+    def method_errors_total(self) -> Dict[str, int]:
+        """Method errors per ``"Agent.method"``."""
+        return self._merged_counts("errors")
+
+    @property
+    def method_duration_seconds(self) -> Dict[str, WindowedHistogram]:
+        """Method duration histograms per ``"Agent.method"``."""
+        return self._merged_histograms("method_durations")
+
+    @property
+    def event_processing_duration_seconds(self) -> Dict[str, WindowedHistogram]:
+        """Event processing duration histograms per topic."""
+        return self._merged_histograms("event_durations")
 
     def generate_prometheus_metrics(self) -> str:
         """
         Generate Prometheus metrics in text format.
 
+        The body is re-rendered only when a metric changed or a window slice
+        expired since the previous scrape; bulkhead stats and uptime are
+        always current.
+
         Returns:
             Metrics in Prometheus exposition format
         """
-        with self._lock:
-            lines = []
-
-            # Add HELP and TYPE for each metric family
-            lines.append("# HELP graphbus_messages_published_total Total number of messages published")
-            lines.append("# TYPE graphbus_messages_published_total counter")
-            for topic, count in self.messages_published_total.items():
-                lines.append(f'graphbus_messages_published_total{{topic="{topic}"}} {count}')
+        return self._exposition(openmetrics=False)
 
-            lines.append("")
-            lines.append("# HELP graphbus_messages_delivered_total Total number of messages delivered")
-            lines.append("# TYPE graphbus_messages_delivered_total counter")
-            for topic, count in self.messages_delivered_total.items():
-                lines.append(f'graphbus_messages_delivered_total{{topic="{topic}"}} {count}')
-
-            lines.append("")
-            lines.append("# HELP graphbus_method_calls_total Total number of method calls")
-            lines.append("# TYPE graphbus_method_calls_total counter")
-            for key, count in self.method_calls_total.items():
-                agent, method = key.rsplit('.', 1) if '.' in key else (key, 'unknown')
-                lines.append(f'graphbus_method_calls_total{{agent="{agent}",method="{method}"}} {count}')
-
-            lines.append("")
-            lines.append("# HELP graphbus_method_errors_total Total number of method errors")
-            lines.append("# TYPE graphbus_method_errors_total counter")
-            for key, count in self.method_errors_total.items():
-                agent, method = key.rsplit('.', 1) if '.' in key else (key, 'unknown')
-                lines.append(f'graphbus_method_errors_total{{agent="{agent}",method="{method}"}} {count}')
-
-            lines.append("")
-            lines.append("# HELP graphbus_active_agents Number of active agents")
-            lines.append("# TYPE graphbus_active_agents gauge")
-            lines.append(f"graphbus_active_agents {self.active_agents}")
+    def generate_openmetrics(self) -> str:
+        """
+        Generate metrics in the OpenMetrics text format.
 
-            lines.append("")
-            lines.append("# HELP graphbus_message_queue_depth Current message queue depth per topic")
-            lines.append("# TYPE graphbus_message_queue_depth gauge")
-            for topic, depth in self.message_queue_depth.items():
-                lines.append(f'graphbus_message_queue_depth{{topic="{topic}"}} {depth}')
+        Same families as :meth:`generate_prometheus_metrics`; duration
+        buckets carry an exemplar with the trace ID of their latest traced
+        observation, and the body ends with ``# EOF``.
 
+        Returns:
+            Metrics in OpenMetrics exposition format
+        """
+        return self._exposition(openmetrics=True)
+
+    def _exposition(self, openmetrics: bool) -> str:
+        if self._runtime is not None:
+            self._collect_runtime()
+
+        with self._render_lock:
+            shards = self._live_shards()
+            now_ns = time.monotonic_ns()
+            generation = (
+                sum(shard.version for shard in shards), len(shards), self._gauge_version,
+                now_ns // self._slot_ns,  # window quantiles change when a slice expires
+            )
+            cached = self._cached.get(openmetrics)
+            if cached is None or cached[0] != generation:
+                cached = self._cached[openmetrics] = (
+                    generation, self._render(shards, generation[-1], now_ns, openmetrics)
+                )
+            lines = [cached[1]]
+
+        if self._bulkheads is not None:
+            lines.extend(self._generate_bulkhead_metrics(self._bulkheads.get_stats()))
+        if self._circuit_breakers is not None:
+            lines.extend(self._generate_circuit_breaker_metrics(self._circuit_breakers.get_stats()))
+
+        # Add process metrics
+        uptime = time.time() - self.start_time
+        lines.append("")
+        lines.append("# HELP graphbus_uptime_seconds Uptime in seconds")
+        lines.append("# TYPE graphbus_uptime_seconds gauge")
+        lines.append(f"graphbus_uptime_seconds {uptime}")
+
+        if openmetrics:
+            lines = lines[:1] + _to_openmetrics(lines[1:]) + ["# EOF"]
+        return "\n".join(lines) + "\n"
+
+    def _render(self, shards: List[_Shard], epoch: int, now_ns: int, openmetrics: bool = False) -> str:
+        """Render every family except bulkheads and uptime."""
+        counts: Dict[str, Dict[str, int]] = {"published": {}, "delivered": {}, "calls": {}, "errors": {}}
+        durations: Dict[str, Dict[str, _DurationTotals]] = {"method_durations": {}, "event_durations": {}}
+        size = len(self.buckets) + 1
+        for shard in shards:
+            for name, totals in counts.items():
+                for key, n in list(getattr(shard, name).items()):
+                    totals[key] = totals.get(key, 0) + n
+            for name, totals in durations.items():
+                for key, duration in list(getattr(shard, name).items()):
+                    series = totals.get(key)
+                    if series is None:
+                        series = totals[key] = _DurationTotals(size)
+                    series.add(duration)
+        with self._lock:
+            active_agents = self.active_agents
+            queue_depth = dict(self.message_queue_depth)
+            health = dict(self.agent_health_status)
+            overflow = dict(self.label_overflow_total)
+
+        lines = []
+
+        # Add HELP and TYPE for each metric family
+        lines.append("# HELP graphbus_messages_published_total Total number of messages published")
+        lines.append("# TYPE graphbus_messages_published_total counter")
+        for topic, count in counts["published"].items():
+            lines.append(f'graphbus_messages_published_total{{{_topic_labels(topic)}}} {count}')
+
+        lines.append("")
+        lines.append("# HELP graphbus_messages_delivered_total Total number of messages delivered")
+        lines.append("# TYPE graphbus_messages_delivered_total counter")
+        for topic, count in counts["delivered"].items():
+            lines.append(f'graphbus_messages_delivered_total{{{_topic_labels(topic)}}} {count}')
+
+        lines.append("")
+        lines.append("# HELP graphbus_method_calls_total Total number of method calls")
+        lines.append("# TYPE graphbus_method_calls_total counter")
+        for key, count in counts["calls"].items():
+            lines.append(f'graphbus_method_calls_total{{{_method_labels(key)}}} {count}')
+
+        lines.append("")
+        lines.append("# HELP graphbus_method_errors_total Total number of method errors")
+        lines.append("# TYPE graphbus_method_errors_total counter")
+        for key, count in counts["errors"].items():
+            lines.append(f'graphbus_method_errors_total{{{_method_labels(key)}}} {count}')
+
+        lines.append("")
+        lines.append("# HELP graphbus_active_agents Number of active agents")
+        lines.append("# TYPE graphbus_active_agents gauge")
+        lines.append(f"graphbus_active_agents {active_agents}")
+
+        lines.append("")
+        lines.append("# HELP graphbus_message_queue_depth Current message queue depth per topic")
+        lines.append("# TYPE graphbus_message_queue_depth gauge")
+        for topic, depth in queue_depth.items():
+            lines.append(f'graphbus_message_queue_depth{{{_topic_labels(topic)}}} {depth}')
+
+        lines.append("")
+        lines.append("# HELP graphbus_agent_health Agent health status (1=healthy, 0=unhealthy)")
+        lines.append("# TYPE graphbus_agent_health gauge")
+        for agent, status in health.items():
+            lines.append(f'graphbus_agent_health{{agent="{_escape(agent)}"}} {status}')
+
+        # Durations are exported twice: as a real cumulative histogram
+        # (``le`` buckets, aggregatable across instances with
+        # histogram_quantile) and as a summary of quantiles over the
+        # sliding window.  The two must be separate families: a family
+        # declared "histogram" that carries quantile= lines is a format
+        # violation that Prometheus parsers reject.
+        for name, labels_of, help_text, family in (
+            ("graphbus_method_duration_seconds", _method_labels, "Method execution duration",
+             "method_durations"),
+            ("graphbus_event_processing_duration_seconds", _topic_labels, "Event processing duration",
+             "event_durations"),
+        ):
+            series_lines = [
+                self._series(name, family, key, labels_of(key), series, epoch, now_ns, openmetrics)
+                for key, series in durations[family].items()
+            ]
             lines.append("")
-            lines.append("# HELP graphbus_agent_health Agent health status (1=healthy, 0=unhealthy)")
-            lines.append("# TYPE graphbus_agent_health gauge")
-            for agent, status in self.agent_health_status.items():
-                lines.append(f'graphbus_agent_health{{agent="{agent}"}} {status}')
-
-            # Duration metrics are exported as Prometheus *summaries*, not histograms.
-            #
-            # Prometheus distinguishes two client-computed distribution types:
-            #   histogram — cumulative bucket counts with le= labels
-            #   summary   — pre-computed quantiles with quantile= labels
-            #
-            # We compute quantiles from the sliding-window deque and emit them with
-            # quantile= labels, which is the summary format.  Declaring the type as
-            # "histogram" while emitting quantile= lines is a format violation:
-            # Prometheus parsers reject or mis-categorise the metric family, making
-            # the duration data invisible in Grafana / alerting rules.
-            lines.append("")
-            lines.append("# HELP graphbus_method_duration_seconds Method execution duration")
-            lines.append("# TYPE graphbus_method_duration_seconds summary")
-            for key, durations in self.method_duration_seconds.items():
-                if durations:
-                    agent, method = key.rsplit('.', 1) if '.' in key else (key, 'unknown')
-                    sorted_durations = sorted(durations)
-                    count = len(sorted_durations)
-                    total = sum(sorted_durations)
-
-                    labels = f'agent="{agent}",method="{method}"'
-                    lines.append(f'graphbus_method_duration_seconds_count{{{labels}}} {count}')
-                    lines.append(f'graphbus_method_duration_seconds_sum{{{labels}}} {total}')
-
-                    # Quantile lines (summary format: quantile= label, no _bucket suffix)
-                    p50_idx = int(count * 0.5)
-                    p95_idx = int(count * 0.95)
-                    p99_idx = int(count * 0.99)
-
-                    p50 = sorted_durations[min(p50_idx, count - 1)]
-                    p95 = sorted_durations[min(p95_idx, count - 1)]
-                    p99 = sorted_durations[min(p99_idx, count - 1)]
-
-                    lines.append(f'graphbus_method_duration_seconds{{quantile="0.5",{labels}}} {p50}')
-                    lines.append(f'graphbus_method_duration_seconds{{quantile="0.95",{labels}}} {p95}')
-                    lines.append(f'graphbus_method_duration_seconds{{quantile="0.99",{labels}}} {p99}')
-
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for histogram_lines, _ in series_lines:
+                lines.extend(histogram_lines)
+            if self.summary_quantiles:
+                lines.append("")
+                lines.append(f"# HELP {name[:-len('_seconds')]}_window_seconds "
+                             f"{help_text} quantiles over the last {self.window_seconds:g}s")
+                lines.append(f"# TYPE {name[:-len('_seconds')]}_window_seconds summary")
+                for _, summary_lines in series_lines:
+                    lines.extend(summary_lines)
+
+        lines.append("")
+        lines.append("# HELP graphbus_metrics_label_overflow_total "
+                     "Updates folded into the __overflow__ series by the label cardinality cap")
+        lines.append("# TYPE graphbus_metrics_label_overflow_total counter")
+        for label, count in overflow.items():
+            lines.append(f'graphbus_metrics_label_overflow_total{{label="{label}"}} {count}')
+
+        # Drop cached lines of series that no longer exist
+        live = {(family, key, openmetrics) for family, totals in durations.items() for key in totals}
+        for stale in [k for k in self._series_lines if k[2] == openmetrics and k not in live]:
+            del self._series_lines[stale]
+
+        if openmetrics:
+            lines = _to_openmetrics(lines)
+        return "\n".join(lines)
+
+    def _series(self, name: str, family: str, key: str, labels: str, series: _DurationTotals,
+                epoch: int, now_ns: int, openmetrics: bool = False) -> Tuple[List[str], List[str]]:
+        """Histogram and summary lines of one series, reused until it records again or its window moves."""
+        cached = self._series_lines.get((family, key, openmetrics))
+        if cached is not None and cached[0] == series.count and \
+                (cached[1] == epoch or not self.summary_quantiles):
+            return cached[2], cached[3]
+        histogram_lines = self._histogram_lines(name, labels, series, openmetrics)
+        summary_lines = self._summary_lines(
+            f"{name[:-len('_seconds')]}_window_seconds", labels, series.window_histogram(now_ns),
+            self.summary_quantiles,
+        ) if self.summary_quantiles else []
+        self._series_lines[(family, key, openmetrics)] = (series.count, epoch, histogram_lines, summary_lines)
+        return histogram_lines, summary_lines
+
+    def _histogram_lines(self, name: str, labels: str, series: _DurationTotals,
+                         exemplars: bool = False) -> List[str]:
+        """Cumulative bucket, sum and count lines for one histogram series."""
+        lines = []
+        cumulative = 0
+        bounds = [repr(bound) for bound in self.buckets] + ["+Inf"]
+        for i, (bound, n) in enumerate(zip(bounds, series.buckets)):
+            cumulative += n
+            line = f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+            exemplar = series.exemplars[i] if exemplars else None
+            if exemplar is not None:
+                trace_id, value, timestamp = exemplar
+                line += f' # {{trace_id="{_escape(trace_id)}"}} {value} {timestamp:.3f}'
+            lines.append(line)
+        lines.append(f'{name}_sum{{{labels}}} {series.sum}')
+        lines.append(f'{name}_count{{{labels}}} {series.count}')
+        return lines
+
+    @staticmethod
+    def _summary_lines(name: str, labels: str, window: LatencyHistogram,
+                       quantiles: Sequence[float]) -> List[str]:
+        """Windowed quantile lines for one summary series."""
+        lines = []
+        for q in quantiles:
+            # No observations in the window: quantiles are undefined
+            value = window.percentile(q) if window.count else float("nan")
+            lines.append(f'{name}{{quantile="{q}",{labels}}} {value}')
+        return lines
+
+    @staticmethod
+    def _generate_bulkhead_metrics(bulkhead_stats: Dict[str, Dict[str, Any]]) -> list:
+        """Render bulkhead limiter stats as gauge and counter families."""
+        families = [
+            ("graphbus_bulkhead_active", "gauge", "Executions currently holding a bulkhead slot", "active"),
+            ("graphbus_bulkhead_waiting", "gauge", "Callers currently queued on a bulkhead", "waiting"),
+            ("graphbus_bulkhead_accepted_total", "counter", "Calls admitted by a bulkhead", "accepted_total"),
+            ("graphbus_bulkhead_rejected_total", "counter", "Calls rejected by a bulkhead", "rejected_total"),
+            ("graphbus_bulkhead_queued_total", "counter", "Calls that had to wait for a bulkhead", "queued_total"),
+        ]
+        lines = []
+        for name, metric_type, help_text, key in families:
             lines.append("")
-            lines.append("# HELP graphbus_event_processing_duration_seconds Event processing duration")
-            lines.append("# TYPE graphbus_event_processing_duration_seconds summary")
-            for topic, durations in self.event_processing_duration_seconds.items():
-                if durations:
-                    sorted_durations = sorted(durations)
-                    count = len(sorted_durations)
-                    total = sum(sorted_durations)
-
-                    labels = f'topic="{topic}"'
-                    lines.append(f'graphbus_event_processing_duration_seconds_count{{{labels}}} {count}')
-                    lines.append(f'graphbus_event_processing_duration_seconds_sum{{{labels}}} {total}')
-
-                    p50_idx = int(count * 0.5)
-                    p95_idx = int(count * 0.95)
-                    p99_idx = int(count * 0.99)
-
-                    p50 = sorted_durations[min(p50_idx, count - 1)]
-                    p95 = sorted_durations[min(p95_idx, count - 1)]
-                    p99 = sorted_durations[min(p99_idx, count - 1)]
-
-                    lines.append(f'graphbus_event_processing_duration_seconds{{quantile="0.5",{labels}}} {p50}')
-                    lines.append(f'graphbus_event_processing_duration_seconds{{quantile="0.95",{labels}}} {p95}')
-                    lines.append(f'graphbus_event_processing_duration_seconds{{quantile="0.99",{labels}}} {p99}')
-
-            # Add process metrics
-            uptime = time.time() - self.start_time
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for scope, stats in bulkhead_stats.items():
+                lines.append(f'{name}{{scope="{scope}"}} {stats[key]}')
+        return lines
+
+    @staticmethod
+    def _generate_circuit_breaker_metrics(breaker_stats: Dict[str, Dict[str, Any]]) -> list:
+        """Render circuit breaker state as gauge and counter families."""
+        families = [
+            ("graphbus_circuit_breaker_failure_rate", "gauge",
+             "Failure rate over the breaker's sliding window", "failure_rate"),
+            ("graphbus_circuit_breaker_rejected_total", "counter",
+             "Calls rejected by an open circuit breaker", "rejected_total"),
+            ("graphbus_circuit_breaker_opened_total", "counter",
+             "Times a circuit breaker opened", "opened_total"),
+        ]
+        lines = [
+            "",
+            "# HELP graphbus_circuit_breaker_state Circuit breaker state (0=closed, 1=half_open, 2=open)",
+            "# TYPE graphbus_circuit_breaker_state gauge",
+        ]
+        for scope, stats in breaker_stats.items():
+            lines.append(f'graphbus_circuit_breaker_state{{scope="{scope}"}} {STATE_VALUES[stats["state"]]}')
+        for name, metric_type, help_text, key in families:
             lines.append("")
-            lines.append("# HELP graphbus_uptime_seconds Uptime in seconds")
-            lines.append("# TYPE graphbus_uptime_seconds gauge")
-            lines.append(f"graphbus_uptime_seconds {uptime}")
-
-            return "\n".join(lines) + "\n"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for scope, stats in breaker_stats.items():
+                lines.append(f'{name}{{scope="{scope}"}} {stats[key]}')
+        return lines
 
     def get_summary(self) -> Dict[str, Any]:
         """
@@ -228,73 +725,160 @@ class PrometheusMetrics:
         Returns:
             Dictionary with metric summaries
         """
-        with self._lock:
-            return {
-                'messages_published': sum(self.messages_published_total.values()),
-                'messages_delivered': sum(self.messages_delivered_total.values()),
-                'method_calls': sum(self.method_calls_total.values()),
-                'method_errors': sum(self.method_errors_total.values()),
-                'active_agents': self.active_agents,
-                'uptime_seconds': time.time() - self.start_time,
-                'topics_tracked': len(self.messages_published_total),
-                'methods_tracked': len(self.method_calls_total)
-            }
+        published = self.messages_published_total
+        calls = self.method_calls_total
+        return {
+            'messages_published': sum(published.values()),
+            'messages_delivered': sum(self.messages_delivered_total.values()),
+            'method_calls': sum(calls.values()),
+            'method_errors': sum(self.method_errors_total.values()),
+            'active_agents': self.active_agents,
+            'uptime_seconds': time.time() - self.start_time,
+            'topics_tracked': len(published),
+            'methods_tracked': len(calls)
+        }
 
 
 class MetricsServer:
     """
     HTTP server for Prometheus metrics endpoint.
 
-    Serves metrics on /metrics endpoint.
+    Endpoints:
+
+    - ``/metrics``: the Prometheus text format, or OpenMetrics (with trace
+      exemplars) when the scraper's ``Accept`` header asks for
+      ``application/openmetrics-text``; gzip-compressed when the scraper
+      accepts gzip
+    - ``/health``: liveness, always ``OK``
+    - ``/healthz``: readiness from the HealthMonitor, 200 when no node is
+      unhealthy or failed and 503 otherwise, with per-node status as JSON
+
+    Every request runs on its own thread, so concurrent scrapers do not
+    queue behind each other.
     """
 
-    def __init__(self, metrics: PrometheusMetrics, port: int = 9090):
+    def __init__(self, metrics: PrometheusMetrics, port: int = 9090, host: str = '0.0.0.0',
+                 health_monitor=None, gzip_min_bytes: int = 1024):
         """
         Initialize metrics server.
 
         Args:
             metrics: PrometheusMetrics instance to serve
             port: HTTP port (default: 9090)
+            host: Interface to bind (default: all)
+            health_monitor: HealthMonitor behind ``/healthz`` (default: the
+                one of the executor passed to ``metrics.track_runtime``)
+            gzip_min_bytes: Smaller bodies are sent uncompressed
         """
         self.metrics = metrics
         self.port = port
+        self.host = host
+        self.health_monitor = health_monitor
+        self.gzip_min_bytes = gzip_min_bytes
         self.server = None
         self._thread = None
 
+    def _monitor(self):
+        if self.health_monitor is not None:
+            return self.health_monitor
+        runtime = self.metrics._runtime
+        return getattr(runtime, "health_monitor", None) if runtime is not None else None
+
+    def health(self) -> Tuple[int, Dict[str, Any]]:
+        """
+        Readiness as served on ``/healthz``.
+
+        Returns:
+            (HTTP status, body) - 503 if any node is unhealthy or failed;
+            breakers that are not closed are listed under ``circuit_breakers``
+        """
+        monitor = self._monitor()
+        if monitor is None:
+            body = {"status": "healthy", "nodes": {}}
+            unhealthy = []
+        else:
+            nodes = {name: m.status.value for name, m in monitor.get_all_metrics().items()}
+            unhealthy = sorted(monitor.get_unhealthy_agents())
+            body = {"status": "unhealthy" if unhealthy else "healthy", "nodes": nodes, "unhealthy": unhealthy}
+        breakers = self.metrics._circuit_breakers
+        if breakers is not None:
+            body["circuit_breakers"] = {
+                scope: stats["state"] for scope, stats in breakers.get_stats().items()
+                if stats["state"] != STATE_CLOSED
+            }
+        return (503 if unhealthy else 200), body
+
+    def render(self, accept: str = '', accept_encoding: str = '') -> Tuple[bytes, Dict[str, str]]:
+        """
+        Body and headers of a ``/metrics`` response.
+
+        Args:
+            accept: The request's ``Accept`` header
+            accept_encoding: The request's ``Accept-Encoding`` header
+
+        Returns:
+            (body, headers)
+        """
+        if 'application/openmetrics-text' in accept:
+            body = self.metrics.generate_openmetrics().encode('utf-8')
+            headers = {'Content-Type': OPENMETRICS_CONTENT_TYPE}
+        else:
+            body = self.metrics.generate_prometheus_metrics().encode('utf-8')
+            headers = {'Content-Type': PROMETHEUS_CONTENT_TYPE}
+        encodings = {token.split(';')[0].strip() for token in accept_encoding.split(',')}
+        if 'gzip' in encodings and len(body) >= self.gzip_min_bytes:
+            # Level 1: the text compresses ~10x anyway, and scrapes are latency-sensitive
+            body = gzip.compress(body, compresslevel=1)
+            headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept, Accept-Encoding'
+        return body, headers
+
     def start(self) -> None:
         """Start metrics server in background thread"""
         try:
-            from http.server import HTTPServer, BaseHTTPRequestHandler
+            from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 
-            metrics = self.metrics
+            server = self
 
             class MetricsHandler(BaseHTTPRequestHandler):
+                protocol_version = 'HTTP/1.1'  # keep-alive between scrapes
+
                 def do_GET(self):
-                    if self.path == '/metrics':
+                    path = self.path.split('?', 1)[0]
+                    if path == '/metrics':
                         # Serve Prometheus metrics
-                        metrics_text = metrics.generate_prometheus_metrics()
-                        self.send_response(200)
-                        self.send_header('Content-Type', 'text/plain; version=0.0.4')
-                        self.end_headers()
-                        self.wfile.write(metrics_text.encode('utf-8'))
-                    elif self.path == '/health':
-                        # Health check endpoint
-                        self.send_response(200)
-                        self.send_header('Content-Type', 'text/plain')
-                        self.end_headers()
-                        self.wfile.write(b'OK')
+                        body, headers = server.render(self.headers.get('Accept', ''),
+                                                      self.headers.get('Accept-Encoding', ''))
+                        self._send(200, body, headers)
+                    elif path == '/health':
+                        # Liveness check endpoint
+                        self._send(200, b'OK', {'Content-Type': 'text/plain'})
+                    elif path == '/healthz':
+                        status, health = server.health()
+                        self._send(status, json.dumps(health).encode('utf-8'),
+                                   {'Content-Type': 'application/json'})
                     else:
-                        self.send_response(404)
-                        self.end_headers()
+                        self._send(404, b'', {})
+
+                def _send(self, status, body, headers):
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
 
                 def log_message(self, format, *args):
                     # Suppress request logs
                     pass
 
-            self.server = HTTPServer(('0.0.0.0', self.port), MetricsHandler)
+            self.server = ThreadingHTTPServer((self.host, self.port), MetricsHandler)
+            self.server.daemon_threads = True
+            self.port = self.server.server_address[1]  # resolved when port 0 was asked for
 
             # Start server in background thread
-            self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+            self._thread = threading.Thread(target=self.server.serve_forever, name="graphbus-metrics",
+                                            daemon=True)
             self._thread.start()
 
             print(f"[MetricsServer] Started on port {self.port}")
@@ -307,4 +891,8 @@ class MetricsServer:
         """Stop metrics server"""
         if self.server:
             self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+            if self._thread is not None:
+                self._thread.join(timeout=5)
             print("[MetricsServer] Stopped")
@@ -2,17 +2,37 @@
 Performance Profiler for GraphBus Runtime
 
 Tracks and analyzes performance metrics for agents and message routing.
+
+The recording path is built to stay on in production: timings come from
+``time.perf_counter_ns`` and every thread records into its own accumulator,
+so ``start_method_call``/``end_method_call`` take no lock.  Ending a call
+only increments a histogram bucket in the thread's current time slice;
+slices are folded into the sliding-window histograms when the thread moves
+on to the next one, and accumulators are merged when results are read.
+Method totals, minimums and maximums are therefore accurate to the bucket
+resolution (~1.6%) rather than exact.  System resources (CPU, memory, threads) are
+sampled by a background thread instead of inside measured calls.
 """
 
 import time
 import threading
 import psutil
 import os
+import weakref
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
 
+from graphbus_core.runtime.histogram import LatencyHistogram, WindowedHistogram, LINEAR_LIMIT, SUB_BUCKET_BITS
+from graphbus_core.runtime.memory_profiler import MemoryProfiler, format_bytes
+from graphbus_core.runtime.sampler import CallContext, StackSampler
+
+RECENT_SAMPLES = 100  # queue depth samples kept per topic
+_NS = 1_000_000_000
+
+_perf_counter_ns = time.perf_counter_ns
+
 
 @dataclass
 class MethodProfile:
@@ -23,7 +43,8 @@ class MethodProfile:
     total_time: float = 0.0
     min_time: float = float('inf')
     max_time: float = 0.0
-    recent_times: deque = field(default_factory=lambda: deque(maxlen=100))
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)  # all calls
+    window: LatencyHistogram = field(default_factory=LatencyHistogram)  # calls in the sliding window
 
     @property
     def avg_time(self) -> float:
@@ -32,8 +53,16 @@ class MethodProfile:
 
     @property
     def recent_avg(self) -> float:
-        """Average of recent executions"""
-        return sum(self.recent_times) / len(self.recent_times) if self.recent_times else 0.0
+        """Average execution time over the sliding window"""
+        return self.window.mean
+
+    def percentile(self, q: float, recent: bool = False) -> float:
+        """Execution time at quantile ``q`` (e.g. 0.99), overall or over the sliding window"""
+        return (self.window if recent else self.histogram).percentile(q)
+
+    def percentiles(self, recent: bool = False) -> Dict[str, float]:
+        """count, mean, p50/p90/p99/p999 and max, overall or over the sliding window"""
+        return (self.window if recent else self.histogram).percentiles()
 
 
 @dataclass
@@ -43,8 +72,9 @@ class EventProfile:
     publish_count: int = 0
     delivery_count: int = 0
     total_routing_time: float = 0.0
-    recent_routing_times: deque = field(default_factory=lambda: deque(maxlen=100))
-    queue_depths: deque = field(default_factory=lambda: deque(maxlen=100))
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)  # all routing times
+    window: LatencyHistogram = field(default_factory=LatencyHistogram)  # routing times in the sliding window
+    queue_depths: deque = field(default_factory=lambda: deque(maxlen=RECENT_SAMPLES))
 
     @property
     def avg_routing_time(self) -> float:
@@ -53,8 +83,12 @@ class EventProfile:
 
     @property
     def recent_avg(self) -> float:
-        """Average of recent routing times"""
-        return sum(self.recent_routing_times) / len(self.recent_routing_times) if self.recent_routing_times else 0.0
+        """Average routing time over the sliding window"""
+        return self.window.mean
+
+    def percentiles(self, recent: bool = False) -> Dict[str, float]:
+        """count, mean, p50/p90/p99/p999 and max, overall or over the sliding window"""
+        return (self.window if recent else self.histogram).percentiles()
 
     @property
     def avg_queue_depth(self) -> float:
@@ -77,6 +111,95 @@ class SystemSnapshot:
     thread_count: int
 
 
+class _ThreadStats:
+    """One thread's accumulators (only ever written by that thread)."""
+
+    __slots__ = ("methods", "events", "new_histogram", "slot_ns", "epoch", "slot_end")
+
+    def __init__(self, new_histogram, slot_ns: int):
+        self.new_histogram = new_histogram
+        # (agent, method) -> [calls started, WindowedHistogram of durations (ns),
+        #                     bucket counts for the current slice]
+        # calls in progress = started - completed
+        self.methods: Dict[tuple, list] = {}
+        # topic -> [publishes, deliveries, WindowedHistogram of routing times, recent queue depths]
+        self.events: Dict[str, list] = {}
+        # Time slice the bucket counts belong to, and when it ends (perf_counter_ns)
+        self.slot_ns = slot_ns
+        self.epoch = -1
+        self.slot_end = 0
+
+    def clear(self) -> None:
+        for rec in list(self.methods.values()):
+            rec[0] = 0
+            rec[1] = self.new_histogram()
+            rec[2] = {}
+        self.events.clear()
+
+    def rotate(self, now_ns: int) -> None:
+        """Fold the bucket counts into the windowed histograms and start the slice at ``now_ns``."""
+        for rec in list(self.methods.values()):
+            counts = rec[2]
+            if counts:
+                rec[1].add_slice(self.epoch, LatencyHistogram.from_counts(counts))
+                rec[2] = {}
+        self.epoch = now_ns // self.slot_ns
+        self.slot_end = (self.epoch + 1) * self.slot_ns
+
+    def merge_into(self, target: "_ThreadStats") -> None:
+        """
+        Add these accumulators to ``target``.
+
+        Queue depth samples from several threads are concatenated in thread
+        order and trimmed, so "recent" depths are approximate across threads.
+        """
+        epoch = self.epoch
+        for key, (started, histogram, counts) in list(self.methods.items()):
+            rec = target.methods.get(key)
+            if rec is None:
+                rec = target.methods[key] = [0, target.new_histogram(), {}]
+            rec[0] += started
+            rec[1].merge(histogram)
+            if counts:
+                rec[1].add_slice(epoch, LatencyHistogram.from_counts(counts))
+        for topic, (publishes, deliveries, histogram, depths) in list(self.events.items()):
+            rec = target.events.get(topic)
+            if rec is None:
+                rec = target.events[topic] = [0, 0, target.new_histogram(), deque(maxlen=RECENT_SAMPLES)]
+            rec[0] += publishes
+            rec[1] += deliveries
+            rec[2].merge(histogram)
+            rec[3].extend(depths)
+
+    def agent_calls(self) -> Dict[str, int]:
+        """Calls started per agent."""
+        agents: Dict[str, int] = {}
+        for (agent_name, _), (started, _, _) in self.methods.items():
+            if started:
+                agents[agent_name] = agents.get(agent_name, 0) + started
+        return agents
+
+    def active(self) -> Dict[tuple, int]:
+        """Calls in progress per (agent, method)."""
+        return {
+            key: started - histogram.total().count - sum(counts.values())
+            for key, (started, histogram, counts) in self.methods.items()
+        }
+
+
+def _sample_system(profiler_ref: "weakref.ref", stop: threading.Event) -> None:
+    """Background sampler loop; exits when stopped or the profiler is gone."""
+    while True:
+        profiler = profiler_ref()
+        if profiler is None:
+            return
+        interval = profiler._snapshot_interval
+        profiler._take_system_snapshot()
+        del profiler
+        if stop.wait(interval):
+            return
+
+
 class PerformanceProfiler:
     """
     Performance profiler for GraphBus runtime.
@@ -87,56 +210,145 @@ class PerformanceProfiler:
     - Message queue depths
     - Agent call patterns
     - Bottleneck identification
+
+    ``method_profiles``, ``event_profiles``, ``agent_call_counts`` and
+    ``active_calls`` are merged snapshots of the per-thread accumulators,
+    rebuilt on each access.
     """
 
-    def __init__(self):
-        """Initialize profiler"""
+    def __init__(self, snapshot_interval: float = 1.0, window_seconds: float = 60.0,
+                 window_slots: int = 6, snapshot_history: int = 1000):
+        """
+        Initialize profiler
+
+        Args:
+            snapshot_interval: Seconds between background system resource samples
+            window_seconds: Sliding window for recent latency percentiles
+            window_slots: Time slices the sliding window is divided into
+            snapshot_history: System resource samples kept
+        """
         self.enabled = False
         self.start_time: Optional[datetime] = None
-        self._lock = threading.Lock()
+        self._lock = threading.Lock()  # registry, enable/disable and reads; never taken per call
+
+        # Per-thread accumulators, merged on read
+        self.window_seconds = window_seconds
+        self.window_slots = window_slots
+        self._local = threading.local()
+        self._threads: List[tuple] = []  # (thread, _ThreadStats)
+        self._slot_ns = self._new_histogram().slot_ns
+        self._retired = _ThreadStats(self._new_histogram, self._slot_ns)  # accumulators of threads that have exited
+
+        # System resource tracking (sampled in the background while enabled)
+        self.system_snapshots: deque = deque(maxlen=snapshot_history)
+        self._process = psutil.Process(os.getpid())
+        self._snapshot_interval = snapshot_interval
+        self._sampler: Optional[threading.Thread] = None
+        self._sampler_stop = threading.Event()
 
-        # Profile data
-        self.method_profiles: Dict[str, MethodProfile] = {}
-        self.event_profiles: Dict[str, EventProfile] = {}
-        self.agent_call_counts: Dict[str, int] = defaultdict(int)
-        self.active_calls: Dict[str, int] = defaultdict(int)  # Current active calls per method
+        # Optional statistical stack sampling (see enable_sampling)
+        self.stack_sampler: Optional[StackSampler] = None
 
-        # System resource tracking
-        self.system_snapshots: deque = deque(maxlen=1000)
-        self._process = psutil.Process(os.getpid())
-        self._last_snapshot_time = 0.0
-        self._snapshot_interval = 1.0  # Take snapshot every second
+        # Optional per-handler allocation profiling (see enable_memory_profiling)
+        self.memory_profiler: Optional[MemoryProfiler] = None
+
+    def enable_sampling(self, context: Optional[CallContext] = None, interval: float = 0.01,
+                        **kwargs) -> StackSampler:
+        """
+        Sample thread stacks while the profiler is enabled.
+
+        Args:
+            context: Active call per thread, usually ``executor.inflight.current_calls``
+            interval: Seconds between samples (lower = more detail, more overhead)
+            **kwargs: Further :class:`StackSampler` options
+
+        Returns:
+            The stack sampler
+        """
+        with self._lock:
+            if self.stack_sampler is not None:
+                self.stack_sampler.stop()
+            self.stack_sampler = StackSampler(context, interval=interval, **kwargs)
+            if self.enabled:
+                self.stack_sampler.start()
+            return self.stack_sampler
+
+    def enable_memory_profiling(self, sample_rate: float = 0.1, **kwargs) -> MemoryProfiler:
+        """
+        Attribute allocations to method calls with tracemalloc snapshot diffs.
+
+        Args:
+            sample_rate: Fraction of calls measured (snapshots are expensive)
+            **kwargs: Further :class:`MemoryProfiler` options
+
+        Returns:
+            The memory profiler
+        """
+        with self._lock:
+            if self.memory_profiler is not None:
+                self.memory_profiler.stop()
+            self.memory_profiler = MemoryProfiler(sample_rate=sample_rate, **kwargs)
+            if self.enabled:
+                self.memory_profiler.start()
+            return self.memory_profiler
 
     def enable(self) -> None:
-        """Enable profiling"""
+        """Enable profiling and start the background samplers"""
         with self._lock:
+            if self.stack_sampler is not None:
+                self.stack_sampler.start()
+            if self.memory_profiler is not None:
+                self.memory_profiler.start()
             self.enabled = True
             self.start_time = datetime.now()
+            if self._sampler is None or not self._sampler.is_alive():
+                self._sampler_stop = threading.Event()
+                self._sampler = threading.Thread(
+                    target=_sample_system,
+                    args=(weakref.ref(self), self._sampler_stop),
+                    name="graphbus-profiler-sampler",
+                    daemon=True,
+                )
+                self._sampler.start()
 
     def disable(self) -> None:
-        """Disable profiling"""
+        """Disable profiling and stop the background samplers"""
         with self._lock:
+            if self.stack_sampler is not None:
+                self.stack_sampler.stop()
+            if self.memory_profiler is not None:
+                self.memory_profiler.stop()
             self.enabled = False
+            self._sampler_stop.set()
+            self._sampler = None
 
     def reset(self) -> None:
         """Reset all profiling data"""
         with self._lock:
-            self.method_profiles.clear()
-            self.event_profiles.clear()
-            self.agent_call_counts.clear()
-            self.active_calls.clear()
+            for _, stats in self._threads:
+                stats.clear()
+            self._retired.clear()
             self.system_snapshots.clear()
-            self._last_snapshot_time = 0.0
+            if self.stack_sampler is not None:
+                self.stack_sampler.clear()
+            if self.memory_profiler is not None:
+                self.memory_profiler.clear()
             self.start_time = datetime.now() if self.enabled else None
 
-    def _take_system_snapshot(self) -> None:
-        """Take a snapshot of system resources"""
-        current_time = time.time()
+    def _new_histogram(self) -> WindowedHistogram:
+        return WindowedHistogram(self.window_seconds, self.window_slots)
 
-        # Only take snapshot if enough time has passed
-        if current_time - self._last_snapshot_time < self._snapshot_interval:
-            return
+    def _thread_stats(self) -> _ThreadStats:
+        """Register an accumulator for the calling thread."""
+        stats = _ThreadStats(self._new_histogram, self._slot_ns)
+        with self._lock:
+            self._threads.append((threading.current_thread(), stats))
+        local = self._local
+        local.stats, local.methods, local.events = stats, stats.methods, stats.events
+        return stats
 
+    def _take_system_snapshot(self) -> None:
+        """Take a snapshot of system resources"""
         try:
             # Get CPU and memory stats
             cpu_percent = self._process.cpu_percent()
@@ -146,7 +358,7 @@ class PerformanceProfiler:
             thread_count = self._process.num_threads()
 
             snapshot = SystemSnapshot(
-                timestamp=current_time,
+                timestamp=time.time(),
                 cpu_percent=cpu_percent,
                 memory_mb=memory_mb,
                 memory_percent=memory_percent,
@@ -154,12 +366,11 @@ class PerformanceProfiler:
             )
 
             self.system_snapshots.append(snapshot)
-            self._last_snapshot_time = current_time
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             # Process may have terminated or we don't have permissions
             pass
 
-    def start_method_call(self, agent_name: str, method_name: str) -> float:
+    def start_method_call(self, agent_name: str, method_name: str) -> int:
         """
         Record start of method call.
 
@@ -168,58 +379,53 @@ class PerformanceProfiler:
             method_name: Method name
 
         Returns:
-            Start timestamp for correlation
+            Start time (``perf_counter_ns``) to pass to end_method_call
         """
-        if not self.enabled:
-            return time.time()
-
-        start_time = time.time()
-
-        with self._lock:
-            full_name = f"{agent_name}.{method_name}"
-            self.active_calls[full_name] += 1
-            self.agent_call_counts[agent_name] += 1
-
-        # Take system snapshot periodically
-        self._take_system_snapshot()
-
-        return start_time
-
-    def end_method_call(self, agent_name: str, method_name: str, start_time: float) -> None:
+        if self.enabled:
+            try:
+                methods = self._local.methods
+            except AttributeError:
+                methods = self._thread_stats().methods
+            rec = methods.get((agent_name, method_name))
+            if rec is None:
+                rec = methods[(agent_name, method_name)] = [0, self._new_histogram(), {}]
+            rec[0] += 1
+            if self.memory_profiler is not None:
+                self.memory_profiler.before_call(agent_name, method_name)
+        return _perf_counter_ns()
+
+    def end_method_call(self, agent_name: str, method_name: str, start_ns: int) -> None:
         """
         Record end of method call.
 
         Args:
             agent_name: Agent name
             method_name: Method name
-            start_time: Start timestamp from start_method_call
+            start_ns: Start time returned by start_method_call
         """
+        end_ns = _perf_counter_ns()
         if not self.enabled:
             return
-
-        end_time = time.time()
-        execution_time = end_time - start_time
-        full_name = f"{agent_name}.{method_name}"
-
-        with self._lock:
-            # Get or create profile
-            if full_name not in self.method_profiles:
-                self.method_profiles[full_name] = MethodProfile(
-                    agent_name=agent_name,
-                    method_name=method_name
-                )
-
-            profile = self.method_profiles[full_name]
-
-            # Update stats
-            profile.call_count += 1
-            profile.total_time += execution_time
-            profile.min_time = min(profile.min_time, execution_time)
-            profile.max_time = max(profile.max_time, execution_time)
-            profile.recent_times.append(execution_time)
-
-            # Update active calls
-            self.active_calls[full_name] -= 1
+        if self.memory_profiler is not None:
+            self.memory_profiler.after_call(agent_name, method_name)
+        try:
+            stats = self._local.stats
+        except AttributeError:
+            stats = self._thread_stats()
+        if end_ns >= stats.slot_end:
+            stats.rotate(end_ns)
+        rec = stats.methods.get((agent_name, method_name))
+        if rec is None:
+            rec = stats.methods[(agent_name, method_name)] = [0, self._new_histogram(), {}]
+        # Inlined bucket_index(): this is the whole per-call cost
+        value = end_ns - start_ns
+        if value < LINEAR_LIMIT:
+            index = value if value > 0 else 0
+        else:
+            shift = value.bit_length() - SUB_BUCKET_BITS
+            index = (shift << (SUB_BUCKET_BITS - 1)) + (value >> shift)
+        counts = rec[2]
+        counts[index] = counts.get(index, 0) + 1
 
     def record_event_publish(self, topic: str, routing_time: float, delivery_count: int, queue_depth: int = 0) -> None:
         """
@@ -234,19 +440,94 @@ class PerformanceProfiler:
         if not self.enabled:
             return
 
+        try:
+            events = self._local.events
+        except AttributeError:
+            events = self._thread_stats().events
+
+        rec = events.get(topic)
+        if rec is None:
+            rec = events[topic] = [0, 0, self._new_histogram(), deque(maxlen=RECENT_SAMPLES)]
+        rec[0] += 1
+        rec[1] += delivery_count
+        rec[2].record(routing_time, _perf_counter_ns())
+        rec[3].append(queue_depth)
+
+    def _merged(self) -> _ThreadStats:
+        """Merge every thread's accumulators, retiring those of exited threads."""
+        merged = _ThreadStats(self._new_histogram, self._slot_ns)
         with self._lock:
-            # Get or create profile
-            if topic not in self.event_profiles:
-                self.event_profiles[topic] = EventProfile(topic=topic)
+            live = []
+            for thread, stats in self._threads:
+                if thread.is_alive():
+                    live.append((thread, stats))
+                else:
+                    stats.merge_into(self._retired)
+            self._threads = live
+            self._retired.merge_into(merged)
+            for _, stats in live:
+                stats.merge_into(merged)
+        return merged
+
+    @property
+    def method_profiles(self) -> Dict[str, MethodProfile]:
+        """Merged method profiles keyed by ``"Agent.method"``."""
+        return self._method_profiles(self._merged())
+
+    @staticmethod
+    def _method_profiles(merged: _ThreadStats) -> Dict[str, MethodProfile]:
+        now = _perf_counter_ns()
+        profiles = {}
+        for (agent_name, method_name), (_, windowed, _) in merged.methods.items():
+            histogram = windowed.total()
+            if not histogram.count:
+                continue  # started but not finished yet
+            profiles[f"{agent_name}.{method_name}"] = MethodProfile(
+                agent_name=agent_name,
+                method_name=method_name,
+                call_count=histogram.count,
+                total_time=histogram.total,
+                min_time=histogram.min,
+                max_time=histogram.max,
+                histogram=histogram,
+                window=windowed.window_histogram(now),
+            )
+        return profiles
+
+    @property
+    def event_profiles(self) -> Dict[str, EventProfile]:
+        """Merged event profiles keyed by topic."""
+        return self._event_profiles(self._merged())
+
+    @staticmethod
+    def _event_profiles(merged: _ThreadStats) -> Dict[str, EventProfile]:
+        now = _perf_counter_ns()
+        profiles = {}
+        for topic, (publishes, deliveries, windowed, depths) in merged.events.items():
+            histogram = windowed.total()
+            profiles[topic] = EventProfile(
+                topic=topic,
+                publish_count=publishes,
+                delivery_count=deliveries,
+                total_routing_time=histogram.total,
+                histogram=histogram,
+                window=windowed.window_histogram(now),
+                queue_depths=depths,
+            )
+        return profiles
 
-            profile = self.event_profiles[topic]
+    @property
+    def agent_call_counts(self) -> Dict[str, int]:
+        """Merged call counts per agent."""
+        return defaultdict(int, self._merged().agent_calls())
 
-            # Update stats
-            profile.publish_count += 1
-            profile.delivery_count += delivery_count
-            profile.total_routing_time += routing_time
-            profile.recent_routing_times.append(routing_time)
-            profile.queue_depths.append(queue_depth)
+    @property
+    def active_calls(self) -> Dict[str, int]:
+        """Merged count of calls currently in progress per ``"Agent.method"``."""
+        return defaultdict(int, {
+            f"{agent_name}.{method_name}": count
+            for (agent_name, method_name), count in self._merged().active().items()
+        })
 
     def get_top_methods_by_time(self, limit: int = 10) -> List[MethodProfile]:
         """
@@ -258,13 +539,12 @@ class PerformanceProfiler:
         Returns:
             List of method profiles sorted by total time
         """
-        with self._lock:
-            sorted_profiles = sorted(
-                self.method_profiles.values(),
-                key=lambda p: p.total_time,
-                reverse=True
-            )
-            return sorted_profiles[:limit]
+        sorted_profiles = sorted(
+            self.method_profiles.values(),
+            key=lambda p: p.total_time,
+            reverse=True
+        )
+        return sorted_profiles[:limit]
 
     def get_top_methods_by_calls(self, limit: int = 10) -> List[MethodProfile]:
         """
@@ -276,13 +556,12 @@ class PerformanceProfiler:
         Returns:
             List of method profiles sorted by call count
         """
-        with self._lock:
-            sorted_profiles = sorted(
-                self.method_profiles.values(),
-                key=lambda p: p.call_count,
-                reverse=True
-            )
-            return sorted_profiles[:limit]
+        sorted_profiles = sorted(
+            self.method_profiles.values(),
+            key=lambda p: p.call_count,
+            reverse=True
+        )
+        return sorted_profiles[:limit]
 
     def get_slowest_methods(self, limit: int = 10) -> List[MethodProfile]:
         """
@@ -294,13 +573,12 @@ class PerformanceProfiler:
         Returns:
             List of method profiles sorted by average time
         """
-        with self._lock:
-            sorted_profiles = sorted(
-                self.method_profiles.values(),
-                key=lambda p: p.avg_time,
-                reverse=True
-            )
-            return sorted_profiles[:limit]
+        sorted_profiles = sorted(
+            self.method_profiles.values(),
+            key=lambda p: p.avg_time,
+            reverse=True
+        )
+        return sorted_profiles[:limit]
 
     def get_busiest_agents(self, limit: int = 10) -> List[tuple]:
         """
@@ -312,13 +590,12 @@ class PerformanceProfiler:
         Returns:
             List of (agent_name, call_count) tuples
         """
-        with self._lock:
-            sorted_agents = sorted(
-                self.agent_call_counts.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )
-            return sorted_agents[:limit]
+        sorted_agents = sorted(
+            self.agent_call_counts.items(),
+            key=lambda x: x[1],
+            reverse=True
+        )
+        return sorted_agents[:limit]
 
     def get_active_calls(self) -> Dict[str, int]:
         """
@@ -327,8 +604,7 @@ class PerformanceProfiler:
         Returns:
             Dictionary of method_name -> active_count
         """
-        with self._lock:
-            return {k: v for k, v in self.active_calls.items() if v > 0}
+        return {k: v for k, v in self.active_calls.items() if v > 0}
 
     def get_event_stats(self) -> List[EventProfile]:
         """
@@ -337,28 +613,73 @@ class PerformanceProfiler:
         Returns:
             List of event profiles
         """
-        with self._lock:
-            return list(self.event_profiles.values())
+        return list(self.event_profiles.values())
 
-    def get_bottlenecks(self, threshold_ms: float = 100.0) -> List[MethodProfile]:
+    def get_bottlenecks(self, threshold_ms: float = 100.0, percentile: float = 0.99) -> List[MethodProfile]:
         """
-        Identify potential bottlenecks.
+        Identify potential bottlenecks by tail latency.
 
         Args:
             threshold_ms: Threshold in milliseconds for considering a method slow
+            percentile: Latency percentile compared against the threshold (default p99)
 
         Returns:
-            List of method profiles that exceed threshold
+            List of method profiles whose percentile exceeds the threshold,
+            slowest first
         """
         threshold_sec = threshold_ms / 1000.0
 
-        with self._lock:
-            bottlenecks = [
-                profile for profile in self.method_profiles.values()
-                if profile.avg_time > threshold_sec or profile.max_time > threshold_sec * 2
-            ]
+        bottlenecks = [
+            profile for profile in self.method_profiles.values()
+            if profile.percentile(percentile) > threshold_sec
+        ]
+
+        return sorted(bottlenecks, key=lambda p: p.percentile(percentile), reverse=True)
+
+    def get_latency_percentiles(self) -> Dict[str, Any]:
+        """
+        Latency percentiles per method and per topic.
+
+        Returns:
+            ``{"window_seconds": ..., "methods": {name: {"all": ..., "window": ...}},
+            "topics": {...}}`` where each leaf is a count/mean/p50/p90/p99/p999/max
+            dict in seconds
+        """
+        merged = self._merged()
+        return {
+            "window_seconds": self.window_seconds,
+            "methods": {
+                name: {"all": profile.percentiles(), "window": profile.percentiles(recent=True)}
+                for name, profile in self._method_profiles(merged).items()
+            },
+            "topics": {
+                topic: {"all": profile.percentiles(), "window": profile.percentiles(recent=True)}
+                for topic, profile in self._event_profiles(merged).items()
+            },
+        }
+
+    def get_timeline(self) -> Dict[str, Any]:
+        """
+        Sliding-window latency slice by slice.
 
-            return sorted(bottlenecks, key=lambda p: p.avg_time, reverse=True)
+        Returns:
+            ``{"slice_seconds": ..., "methods": {name: [(start_ns, histogram), ...]},
+            "topics": {...}}`` with slice starts in ``perf_counter_ns`` time,
+            oldest first; empty slices are left out
+        """
+        merged = self._merged()
+        now = _perf_counter_ns()
+        return {
+            "slice_seconds": self.window_seconds / self.window_slots,
+            "methods": {
+                f"{agent_name}.{method_name}": windowed.window_slices(now)
+                for (agent_name, method_name), (_, windowed, _) in merged.methods.items()
+            },
+            "topics": {
+                topic: windowed.window_slices(now)
+                for topic, (_, _, windowed, _) in merged.events.items()
+            },
+        }
 
     def get_system_stats(self) -> Dict[str, Any]:
         """
@@ -367,37 +688,37 @@ class PerformanceProfiler:
         Returns:
             Dictionary with CPU, memory, and thread statistics
         """
-        with self._lock:
-            if not self.system_snapshots:
-                return {
-                    'cpu_percent_avg': 0.0,
-                    'cpu_percent_max': 0.0,
-                    'memory_mb_avg': 0.0,
-                    'memory_mb_max': 0.0,
-                    'memory_percent_avg': 0.0,
-                    'memory_percent_max': 0.0,
-                    'thread_count_avg': 0,
-                    'thread_count_max': 0,
-                    'snapshots': 0
-                }
-
-            cpu_values = [s.cpu_percent for s in self.system_snapshots]
-            memory_mb_values = [s.memory_mb for s in self.system_snapshots]
-            memory_percent_values = [s.memory_percent for s in self.system_snapshots]
-            thread_values = [s.thread_count for s in self.system_snapshots]
-
+        snapshots = list(self.system_snapshots)
+        if not snapshots:
             return {
-                'cpu_percent_avg': sum(cpu_values) / len(cpu_values),
-                'cpu_percent_max': max(cpu_values),
-                'memory_mb_avg': sum(memory_mb_values) / len(memory_mb_values),
-                'memory_mb_max': max(memory_mb_values),
-                'memory_percent_avg': sum(memory_percent_values) / len(memory_percent_values),
-                'memory_percent_max': max(memory_percent_values),
-                'thread_count_avg': sum(thread_values) / len(thread_values),
-                'thread_count_max': max(thread_values),
-                'snapshots': len(self.system_snapshots)
+                'cpu_percent_avg': 0.0,
+                'cpu_percent_max': 0.0,
+                'memory_mb_avg': 0.0,
+                'memory_mb_max': 0.0,
+                'memory_percent_avg': 0.0,
+                'memory_percent_max': 0.0,
+                'thread_count_avg': 0,
+                'thread_count_max': 0,
+                'snapshots': 0
             }
 
+        cpu_values = [s.cpu_percent for s in snapshots]
+        memory_mb_values = [s.memory_mb for s in snapshots]
+        memory_percent_values = [s.memory_percent for s in snapshots]
+        thread_values = [s.thread_count for s in snapshots]
+
+        return {
+            'cpu_percent_avg': sum(cpu_values) / len(cpu_values),
+            'cpu_percent_max': max(cpu_values),
+            'memory_mb_avg': sum(memory_mb_values) / len(memory_mb_values),
+            'memory_mb_max': max(memory_mb_values),
+            'memory_percent_avg': sum(memory_percent_values) / len(memory_percent_values),
+            'memory_percent_max': max(memory_percent_values),
+            'thread_count_avg': sum(thread_values) / len(thread_values),
+            'thread_count_max': max(thread_values),
+            'snapshots': len(snapshots)
+        }
+
     def get_queue_stats(self) -> Dict[str, Any]:
         """
         Get message queue depth statistics.
@@ -405,16 +726,15 @@ class PerformanceProfiler:
         Returns:
             Dictionary with queue depth statistics per topic
         """
-        with self._lock:
-            queue_stats = {}
-            for topic, profile in self.event_profiles.items():
-                if profile.queue_depths:
-                    queue_stats[topic] = {
-                        'avg_depth': profile.avg_queue_depth,
-                        'max_depth': profile.max_queue_depth,
-                        'current_depth': profile.queue_depths[-1] if profile.queue_depths else 0
-                    }
-            return queue_stats
+        queue_stats = {}
+        for topic, profile in self.event_profiles.items():
+            if profile.queue_depths:
+                queue_stats[topic] = {
+                    'avg_depth': profile.avg_queue_depth,
+                    'max_depth': profile.max_queue_depth,
+                    'current_depth': profile.queue_depths[-1] if profile.queue_depths else 0
+                }
+        return queue_stats
 
     def get_summary(self) -> Dict[str, Any]:
         """
@@ -423,24 +743,28 @@ class PerformanceProfiler:
         Returns:
             Dictionary with summary statistics
         """
-        with self._lock:
-            total_calls = sum(p.call_count for p in self.method_profiles.values())
-            total_time = sum(p.total_time for p in self.method_profiles.values())
-
-            uptime = (datetime.now() - self.start_time).total_seconds() if self.start_time else 0
-
-            return {
-                'enabled': self.enabled,
-                'uptime_seconds': uptime,
-                'total_method_calls': total_calls,
-                'total_execution_time': total_time,
-                'unique_methods': len(self.method_profiles),
-                'unique_agents': len(self.agent_call_counts),
-                'total_events': sum(p.publish_count for p in self.event_profiles.values()),
-                'unique_topics': len(self.event_profiles),
-                'active_calls': sum(self.active_calls.values()),
-                'calls_per_second': total_calls / uptime if uptime > 0 else 0
-            }
+        merged = self._merged()
+        totals = [histogram.total() for _, histogram, _ in merged.methods.values()]
+        total_calls = sum(h.count for h in totals)
+        total_time = sum(h.total for h in totals)
+
+        uptime = (datetime.now() - self.start_time).total_seconds() if self.start_time else 0
+
+        summary = {
+            'enabled': self.enabled,
+            'uptime_seconds': uptime,
+            'total_method_calls': total_calls,
+            'total_execution_time': total_time,
+            'unique_methods': sum(1 for h in totals if h.count),
+            'unique_agents': len(merged.agent_calls()),
+            'total_events': sum(rec[0] for rec in merged.events.values()),
+            'unique_topics': len(merged.events),
+            'active_calls': sum(merged.active().values()),
+            'calls_per_second': total_calls / uptime if uptime > 0 else 0
+        }
+        if self.memory_profiler is not None:
+            summary['memory'] = self.memory_profiler.get_summary()
+        return summary
 
     def generate_report(self) -> str:
         """
@@ -456,6 +780,7 @@ class PerformanceProfiler:
         top_calls = self.get_top_methods_by_calls(5)
         slowest = self.get_slowest_methods(5)
         bottlenecks = self.get_bottlenecks()
+        latency = self.get_latency_percentiles()
 
         lines = []
         lines.append("=" * 60)
@@ -516,12 +841,62 @@ class PerformanceProfiler:
                 )
             lines.append("")
 
+        if latency['methods']:
+            lines.append(f"Method Latency Percentiles (all / last {latency['window_seconds']:.0f}s, ms):")
+            lines.append("-" * 60)
+            ranked = sorted(latency['methods'].items(), key=lambda x: x[1]['all']['p99'], reverse=True)
+            for name, stats in ranked[:10]:
+                lines.append(f"  {name}: {_format_percentiles(stats['all'])}")
+                if stats['window']['count']:
+                    lines.append(f"    recent: {_format_percentiles(stats['window'])}")
+            lines.append("")
+
+        if latency['topics']:
+            lines.append("Event Routing Latency Percentiles (ms):")
+            lines.append("-" * 60)
+            ranked = sorted(latency['topics'].items(), key=lambda x: x[1]['all']['p99'], reverse=True)
+            for topic, stats in ranked[:5]:
+                lines.append(f"  {topic}: {_format_percentiles(stats['all'])}")
+            lines.append("")
+
+        if self.stack_sampler is not None and self.stack_sampler.samples:
+            sampler_stats = self.stack_sampler.stats()
+            lines.append(
+                f"Sampled Time by Handler ({sampler_stats['samples']} samples, "
+                f"{sampler_stats['overhead']*100:.1f}% sampler overhead):"
+            )
+            lines.append("-" * 60)
+            for name, samples in list(self.stack_sampler.attribution().items())[:10]:
+                lines.append(f"  {name}: {samples} samples ({samples / sampler_stats['samples'] * 100:.1f}%)")
+            lines.append("")
+
+        memory = summary.get('memory')
+        if memory and memory['handlers']:
+            lines.append(
+                f"Allocations by Handler ({memory['sampled_calls']} of {memory['calls']} calls sampled, "
+                f"retained / peak growth per call):"
+            )
+            lines.append("-" * 60)
+            for name, stats in list(memory['handlers'].items())[:10]:
+                lines.append(
+                    f"  {name}: {format_bytes(stats['avg_allocated'])} avg retained, "
+                    f"{format_bytes(stats['avg_peak'])} avg peak, "
+                    f"{format_bytes(stats['peak_bytes'])} max peak"
+                )
+            for node, sites in memory['top_sites'].items():
+                if sites:
+                    lines.append(f"  Top call sites for {node}:")
+                    for site in sites[:5]:
+                        lines.append(f"    {site['site']}: {format_bytes(site['bytes'])}")
+            lines.append("")
+
         if bottlenecks:
-            lines.append("⚠ Potential Bottlenecks (>100ms average):")
+            lines.append("⚠ Potential Bottlenecks (>100ms p99):")
             lines.append("-" * 60)
             for profile in bottlenecks:
                 lines.append(
                     f"  {profile.agent_name}.{profile.method_name}: "
+                    f"{profile.percentile(0.99)*1000:.1f}ms p99, "
                     f"{profile.avg_time*1000:.1f}ms avg, "
                     f"{profile.max_time*1000:.1f}ms max"
                 )
@@ -531,24 +906,46 @@ class PerformanceProfiler:
 
         return "\n".join(lines)
 
-    def generate_flame_graph_data(self) -> List[Dict[str, Any]]:
+    def generate_flame_graph_data(self) -> Dict[str, Any]:
         """
-        Generate data for flame graph visualization.
+        Generate flame graph data from sampled stacks.
+
+        Stacks are rooted at the node and handler they were sampled in.
+        Requires :meth:`enable_sampling`; without it the tree is empty.
 
         Returns:
-            List of stack frames with timing data
+            Nested ``{"name", "value", "children"}`` tree (value = samples)
         """
-        with self._lock:
-            flame_data = []
-            for method_name, profile in self.method_profiles.items():
-                flame_data.append({
-                    'name': f"{profile.agent_name}.{profile.method_name}",
-                    'value': profile.total_time,
-                    'count': profile.call_count,
-                    'avg_time': profile.avg_time,
-                    'max_time': profile.max_time
-                })
-            return sorted(flame_data, key=lambda x: x['value'], reverse=True)
+        if self.stack_sampler is None:
+            return {"name": "all", "value": 0, "children": []}
+        return self.stack_sampler.flame_graph()
+
+    def get_collapsed_stacks(self) -> Dict[str, int]:
+        """
+        Sampled stacks in collapsed form (``"Node;Node.handler;frame;..."`` -> samples).
+
+        Returns:
+            Empty dict unless :meth:`enable_sampling` was called
+        """
+        return self.stack_sampler.collapsed() if self.stack_sampler is not None else {}
+
+    def _method_rows(self) -> List[Dict[str, Any]]:
+        """Per-method timing rows for the HTML report, by total time."""
+        rows = []
+        for profile in self.method_profiles.values():
+            percentiles = profile.percentiles()
+            rows.append({
+                'name': f"{profile.agent_name}.{profile.method_name}",
+                'value': profile.total_time,
+                'count': profile.call_count,
+                'avg_time': profile.avg_time,
+                'max_time': profile.max_time,
+                'p50': percentiles['p50'],
+                'p90': percentiles['p90'],
+                'p99': percentiles['p99'],
+                'p999': percentiles['p999'],
+            })
+        return sorted(rows, key=lambda x: x['value'], reverse=True)
 
     def generate_flame_graph_html(self) -> str:
         """
@@ -557,13 +954,15 @@ class PerformanceProfiler:
         Returns:
             HTML string with embedded D3.js flame graph
         """
-        flame_data = self.generate_flame_graph_data()
+        method_rows = self._method_rows()
+        flame_tree = self.generate_flame_graph_data()
         summary = self.get_summary()
         system_stats = self.get_system_stats()
 
         # Convert to JSON for embedding
         import json
-        data_json = json.dumps(flame_data)
+        data_json = json.dumps(method_rows)
+        flame_json = json.dumps(flame_tree)
 
         html = f'''<!DOCTYPE html>
 <html>
@@ -687,6 +1086,11 @@ class PerformanceProfiler:
         </div>
     </div>
 
+    <div class="chart-container">
+        <h3>Flame Graph (sampled stacks by node and handler)</h3>
+        <div id="flame-tree"></div>
+    </div>
+
     <div class="chart-container">
         <h3>Method Execution Time Distribution</h3>
         <div id="flame-graph"></div>
@@ -702,6 +1106,50 @@ class PerformanceProfiler:
     <script src="https://d3js.org/d3.v7.min.js"></script>
     <script>
         const data = {data_json};
+        const flame = {flame_json};
+
+        // Sampled flame graph: widths are sample counts, root at the top
+        if (flame.value > 0) {{
+            const flameWidth = 1100;
+            const rowHeight = 18;
+            const root = d3.partition().size([flameWidth, 1])(
+                d3.hierarchy(flame).sum(d => d.children.length ? 0 : d.value)
+            );
+            const flameSvg = d3.select("#flame-tree")
+                .append("svg")
+                .attr("width", flameWidth)
+                .attr("height", (root.height + 1) * rowHeight);
+            const cell = flameSvg.selectAll("g")
+                .data(root.descendants().filter(d => d.x1 - d.x0 > 0.5))
+                .enter()
+                .append("g")
+                .attr("transform", d => `translate(${{d.x0}},${{d.depth * rowHeight}})`);
+            cell.append("rect")
+                .attr("class", "flame-rect")
+                .attr("width", d => d.x1 - d.x0)
+                .attr("height", rowHeight - 1)
+                .attr("fill", d => d3.interpolateWarm(0.2 + 0.6 * ((d.depth * 37) % 100) / 100))
+                .on("mouseover", function(event, d) {{
+                    d3.select("#tooltip").style("display", "block")
+                        .html(`<strong>${{d.data.name}}</strong><br/>` +
+                              `${{d.value}} samples (${{(100 * d.value / root.value).toFixed(1)}}%)`)
+                        .style("left", (event.pageX + 10) + "px")
+                        .style("top", (event.pageY - 10) + "px");
+                }})
+                .on("mouseout", function() {{
+                    d3.select("#tooltip").style("display", "none");
+                }});
+            cell.append("text")
+                .attr("x", 3)
+                .attr("y", rowHeight - 5)
+                .style("fill", "#1e1e1e")
+                .style("font-size", "10px")
+                .text(d => (d.x1 - d.x0) > 40 ? d.data.name.substring(0, Math.floor((d.x1 - d.x0) / 6)) : "");
+        }} else {{
+            d3.select("#flame-tree").append("p")
+                .style("color", "#858585")
+                .text("No stack samples. Run graphbus profile with --sample to collect them.");
+        }}
 
         // Render horizontal bar chart (simpler than full flame graph)
         const margin = {{top: 20, right: 30, bottom: 40, left: 200}};
@@ -748,6 +1196,8 @@ class PerformanceProfiler:
                         Total: ${{(d.value * 1000).toFixed(2)}}ms<br/>
                         Calls: ${{d.count}}<br/>
                         Avg: ${{(d.avg_time * 1000).toFixed(2)}}ms<br/>
+                        p50 / p90: ${{(d.p50 * 1000).toFixed(2)}} / ${{(d.p90 * 1000).toFixed(2)}}ms<br/>
+                        p99 / p999: ${{(d.p99 * 1000).toFixed(2)}} / ${{(d.p999 * 1000).toFixed(2)}}ms<br/>
                         Max: ${{(d.max_time * 1000).toFixed(2)}}ms
                     `)
                     .style("left", (event.pageX + 10) + "px")
@@ -790,9 +1240,16 @@ class PerformanceProfiler:
                 .text(d.name);
             item.append("div")
                 .attr("class", "method-stats")
-                .html(`${{(d.value * 1000).toFixed(2)}}ms total | ${{d.count}} calls | ${{(d.avg_time * 1000).toFixed(2)}}ms avg`);
+                .html(`${{(d.value * 1000).toFixed(2)}}ms total | ${{d.count}} calls | ${{(d.avg_time * 1000).toFixed(2)}}ms avg | ${{(d.p99 * 1000).toFixed(2)}}ms p99`);
         }});
     </script>
 </body>
 </html>'''
         return html
+
+
+def _format_percentiles(stats: Dict[str, float]) -> str:
+    """One-line ``p50=.. p90=.. p99=.. p999=.. max=..`` in milliseconds."""
+    return " ".join(
+        f"{key}={stats[key]*1000:.2f}" for key in ("p50", "p90", "p99", "p999", "max")
+    ) + f" (n={stats['count']})"
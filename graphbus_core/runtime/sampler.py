@@ -0,0 +1,257 @@
+"""
+Sampling Profiler
+
+Periodically captures the Python stack of every thread and attributes each
+sample to the node and handler the thread is running, as reported by the
+executor's in-flight tracker.  Samples are aggregated as collapsed stacks
+(``Node;Node.handler;frame;frame count``), the input format of
+``flamegraph.pl``, speedscope and most other flame graph tools.
+
+Sampling cost grows with the number of threads and stack depth, not with
+call volume.  It is bounded by the sampling interval, and the sampler
+lengthens its interval on its own if a tick costs more than
+``max_overhead`` of wall time.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+# thread ident -> (node, handler, topic) for threads inside a node call
+CallContext = Callable[[], Dict[int, Tuple[Optional[str], Optional[str], Optional[str]]]]
+
+UNATTRIBUTED = "[unattributed]"
+
+
+class StackSampler:
+    """
+    Statistical stack sampler attributed to nodes and handlers.
+
+    By default only threads that are inside a tracked node call are
+    sampled; pass ``all_threads=True`` to include everything else under
+    ``[unattributed]``.
+    """
+
+    def __init__(self, context: Optional[CallContext] = None, interval: float = 0.01,
+                 max_depth: int = 64, all_threads: bool = False, max_overhead: float = 0.05):
+        """
+        Initialize sampler.
+
+        Args:
+            context: Returns the active call per thread (usually
+                ``executor.inflight.current_calls``); None samples all threads
+                unattributed
+            interval: Seconds between samples
+            max_depth: Frames kept per stack (innermost frames are kept)
+            all_threads: Also sample threads that are not in a node call
+            max_overhead: Fraction of wall time the sampler may spend sampling
+        """
+        self.context = context
+        self.interval = interval
+        self.max_depth = max_depth
+        self.all_threads = all_threads or context is None
+        self.max_overhead = max_overhead
+
+        self._stacks: Counter = Counter()  # tuple of frames -> samples
+        self._labels: Dict[Any, str] = {}  # code object -> frame label
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self.samples = 0
+        self.ticks = 0
+        self.busy_seconds = 0.0
+        self.effective_interval = interval
+        self._started_at: Optional[float] = None
+        self._running_seconds = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        """True while the sampling thread is active."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="graphbus-stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the sampling thread."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._thread = None
+        if self._started_at is not None:
+            self._running_seconds += time.perf_counter() - self._started_at
+            self._started_at = None
+
+    def clear(self) -> None:
+        """Drop all collected samples."""
+        with self._lock:
+            self._stacks.clear()
+            self.samples = 0
+            self.ticks = 0
+            self.busy_seconds = 0.0
+            self._running_seconds = 0.0
+            if self._started_at is not None:
+                self._started_at = time.perf_counter()
+
+    def _run(self) -> None:
+        wait = self.interval
+        while not self._stop.wait(wait):
+            began = time.perf_counter()
+            self.sample_once()
+            cost = time.perf_counter() - began
+            # Keep cost / (cost + wait) <= max_overhead
+            wait = max(self.interval, cost / self.max_overhead - cost) if self.max_overhead > 0 else self.interval
+            self.effective_interval = wait + cost
+
+    def sample_once(self) -> int:
+        """
+        Take one sample of every eligible thread.
+
+        Returns:
+            Number of stacks recorded
+        """
+        began = time.perf_counter()
+        calls = self.context() if self.context is not None else {}
+        frames = sys._current_frames()
+        own = threading.get_ident()
+
+        recorded = []
+        for ident, frame in frames.items():
+            if ident == own:
+                continue
+            call = calls.get(ident)
+            if call is None and not self.all_threads:
+                continue
+            recorded.append(self._collapse(frame, call))
+        del frames
+
+        with self._lock:
+            for stack in recorded:
+                self._stacks[stack] += 1
+            self.samples += len(recorded)
+            self.ticks += 1
+            self.busy_seconds += time.perf_counter() - began
+        return len(recorded)
+
+    def _collapse(self, frame, call) -> Tuple[str, ...]:
+        labels = self._labels
+        handler = call[1] if call is not None else None
+        codes = []
+        while frame is not None:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        codes.reverse()
+
+        # Start at the handler's own frame so runtime plumbing above it is dropped
+        if handler is not None:
+            for i in range(len(codes) - 1, -1, -1):
+                if codes[i].co_name == handler:
+                    codes = codes[i:]
+                    break
+        if len(codes) > self.max_depth:
+            codes = codes[-self.max_depth:]
+
+        stack = []
+        for code in codes:
+            label = labels.get(code)
+            if label is None:
+                label = labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            stack.append(label)
+
+        if call is None:
+            prefix = (UNATTRIBUTED,)
+        else:
+            node, handler, _ = call
+            node = node or UNATTRIBUTED
+            prefix = (node, f"{node}.{handler}") if handler else (node,)
+        return prefix + tuple(stack)
+
+    def collapsed(self) -> Dict[str, int]:
+        """
+        Collapsed stacks.
+
+        Returns:
+            Dict of ``"Node;Node.handler;frame;..."`` -> sample count
+        """
+        with self._lock:
+            return {";".join(stack): count for stack, count in self._stacks.items()}
+
+    def collapsed_text(self) -> str:
+        """Collapsed stacks, one ``stack count`` line each (flamegraph.pl input)."""
+        lines = [f"{stack} {count}" for stack, count in sorted(self.collapsed().items())]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def write_collapsed(self, path: Union[str, Path]) -> Path:
+        """Write :meth:`collapsed_text` to ``path``."""
+        path = Path(path)
+        path.write_text(self.collapsed_text())
+        return path
+
+    def flame_graph(self) -> Dict[str, Any]:
+        """
+        Samples as a nested tree for flame graph rendering.
+
+        Returns:
+            ``{"name": "all", "value": samples, "children": [...]}``
+        """
+        root: Dict[str, Any] = {"name": "all", "value": 0, "children": {}}
+        with self._lock:
+            stacks = list(self._stacks.items())
+        for stack, count in stacks:
+            root["value"] += count
+            node = root
+            for frame in stack:
+                child = node["children"].get(frame)
+                if child is None:
+                    child = node["children"][frame] = {"name": frame, "value": 0, "children": {}}
+                child["value"] += count
+                node = child
+        return _freeze(root)
+
+    def attribution(self) -> Dict[str, int]:
+        """
+        Samples per node handler.
+
+        Returns:
+            Dict of ``"Node.handler"`` (or node / ``[unattributed]``) -> samples,
+            most sampled first
+        """
+        totals: Counter = Counter()
+        with self._lock:
+            for stack, count in self._stacks.items():
+                key = stack[1] if len(stack) > 1 and stack[0] != UNATTRIBUTED and "." in stack[1] else stack[0]
+                totals[key] += count
+        return dict(totals.most_common())
+
+    def stats(self) -> Dict[str, Any]:
+        """Sample counts, intervals and measured overhead."""
+        running = self._running_seconds
+        if self._started_at is not None:
+            running += time.perf_counter() - self._started_at
+        return {
+            "samples": self.samples,
+            "ticks": self.ticks,
+            "interval": self.interval,
+            "effective_interval": self.effective_interval,
+            "busy_seconds": self.busy_seconds,
+            "overhead": self.busy_seconds / running if running > 0 else 0.0,
+            "unique_stacks": len(self._stacks),
+        }
+
+
+def _freeze(node: Dict[str, Any]) -> Dict[str, Any]:
+    children = sorted(node["children"].values(), key=lambda c: c["value"], reverse=True)
+    return {"name": node["name"], "value": node["value"], "children": [_freeze(c) for c in children]}
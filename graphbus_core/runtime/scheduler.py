@@ -0,0 +1,727 @@
+"""
+Event Scheduler - Periodic and cron-style jobs for Runtime Mode
+
+All timers share one hierarchical timing wheel driven by a single thread, so
+thousands of ``@every`` / ``@cron`` jobs cost one thread instead of one each.
+Inserting and cancelling a timer are O(1).  A :class:`VirtualClock` lets tests
+fast-forward time deterministically without sleeping.
+"""
+
+import itertools
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+# Missed-tick policies: what to do when a job is due while the scheduler was
+# busy or stalled for one or more whole periods.
+MISSED_FIRE_ONCE = "fire_once"  # run once, then resume the regular schedule
+MISSED_FIRE_ALL = "fire_all"    # run once per missed period
+MISSED_SKIP = "skip"            # drop late runs, resume at the next period
+MISSED_POLICIES = (MISSED_FIRE_ONCE, MISSED_FIRE_ALL, MISSED_SKIP)
+
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0, "d": 86400.0}
+_DURATION_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h|d)?\s*$")
+
+
+def parse_duration(value: Any) -> float:
+    """
+    Parse a duration such as ``"5s"``, ``"250ms"``, ``"2m"``, ``"1h"`` or ``30``.
+
+    Args:
+        value: Duration string or number of seconds
+
+    Returns:
+        Duration in seconds
+
+    Raises:
+        ValueError: If the value cannot be parsed or is not positive
+    """
+    if isinstance(value, (int, float)):
+        seconds = float(value)
+    else:
+        match = _DURATION_RE.match(str(value))
+        if not match:
+            raise ValueError(f"Invalid duration: {value!r} (expected e.g. '5s', '250ms', '2m')")
+        seconds = float(match.group(1)) * _DURATION_UNITS[match.group(2) or "s"]
+
+    if seconds <= 0:
+        raise ValueError(f"Duration must be positive, got {value!r}")
+    return seconds
+
+
+# ---------------------------------------------------------------------------
+# Clocks
+# ---------------------------------------------------------------------------
+
+class SystemClock:
+    """Real time: monotonic seconds for the wheel, local wall time for cron."""
+
+    is_virtual = False
+
+    def now(self) -> float:
+        """Monotonic time in seconds."""
+        return time.monotonic()
+
+    def wall_time(self) -> datetime:
+        """Current local wall-clock time."""
+        return datetime.now()
+
+
+class VirtualClock:
+    """
+    Manually advanced clock for tests.
+
+    Time only moves when :meth:`advance` is called, which fires every job that
+    falls due along the way, in order, on the calling thread.
+    """
+
+    is_virtual = True
+
+    def __init__(self, start: Optional[datetime] = None):
+        """
+        Initialize virtual clock.
+
+        Args:
+            start: Wall-clock time corresponding to ``now() == 0``
+        """
+        self._now = 0.0
+        self._start_wall = start or datetime(2000, 1, 1)
+        self._schedulers: List["Scheduler"] = []
+        self._lock = threading.RLock()
+
+    def now(self) -> float:
+        """Virtual seconds since the clock was created."""
+        return self._now
+
+    def wall_time(self) -> datetime:
+        """Virtual wall-clock time."""
+        return self._start_wall + timedelta(seconds=self._now)
+
+    def attach(self, scheduler: "Scheduler") -> None:
+        """Drive a scheduler from this clock."""
+        with self._lock:
+            if scheduler not in self._schedulers:
+                self._schedulers.append(scheduler)
+
+    def detach(self, scheduler: "Scheduler") -> None:
+        """Stop driving a scheduler."""
+        with self._lock:
+            if scheduler in self._schedulers:
+                self._schedulers.remove(scheduler)
+
+    def advance(self, seconds: Any) -> None:
+        """
+        Move time forward, firing due jobs at their scheduled instants.
+
+        Args:
+            seconds: Duration (seconds or a string such as ``"5m"``)
+        """
+        target = self._now + parse_duration(seconds)
+        with self._lock:
+            while True:
+                due = [s.next_deadline() for s in self._schedulers]
+                due = [d for d in due if d is not None and d <= target]
+                if not due:
+                    break
+                self._now = max(self._now, min(due))
+                for scheduler in list(self._schedulers):
+                    scheduler.run_pending()
+            self._now = target
+            for scheduler in list(self._schedulers):
+                scheduler.run_pending()
+
+
+# ---------------------------------------------------------------------------
+# Triggers
+# ---------------------------------------------------------------------------
+
+class IntervalTrigger:
+    """Fires every ``interval`` seconds."""
+
+    def __init__(self, interval: Any):
+        self.interval = parse_duration(interval)
+
+    def first_due(self, now: float, clock) -> float:
+        return now + self.interval
+
+    def next_due(self, due: float, now: float, clock) -> tuple[float, int]:
+        """
+        Compute the next due time after a run that was due at ``due``.
+
+        Returns:
+            (next due time, number of whole periods missed)
+        """
+        missed = max(0, int((now - due) // self.interval))
+        return due + (missed + 1) * self.interval, missed
+
+    def __repr__(self) -> str:
+        return f"every {self.interval:g}s"
+
+
+class CronExpression:
+    """
+    Standard five-field cron expression: ``minute hour day month weekday``.
+
+    Supports ``*``, lists (``1,15``), ranges (``1-5``) and steps (``*/5``,
+    ``10-30/10``).  Weekday 0 and 7 are both Sunday.  As in Vixie cron, when
+    both day-of-month and weekday are restricted a time matches if *either*
+    does.
+    """
+
+    _FIELDS = (
+        ("minute", 0, 59),
+        ("hour", 0, 23),
+        ("day", 1, 31),
+        ("month", 1, 12),
+        ("weekday", 0, 7),
+    )
+
+    def __init__(self, expression: str):
+        """
+        Parse a cron expression.
+
+        Raises:
+            ValueError: If the expression is malformed
+        """
+        self.expression = expression
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression must have 5 fields, got {len(parts)}: {expression!r}")
+
+        parsed = [
+            self._parse_field(part, name, low, high)
+            for part, (name, low, high) in zip(parts, self._FIELDS)
+        ]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {0 if d == 7 else d for d in weekdays}
+        self._day_restricted = parts[2] != "*"
+        self._weekday_restricted = parts[4] != "*"
+
+    @staticmethod
+    def _parse_field(part: str, name: str, low: int, high: int) -> Set[int]:
+        values: Set[int] = set()
+        for item in part.split(","):
+            step = 1
+            if "/" in item:
+                item, step_text = item.split("/", 1)
+                if not step_text.isdigit() or int(step_text) < 1:
+                    raise ValueError(f"Invalid step in cron {name} field: {part!r}")
+                step = int(step_text)
+
+            if item == "*":
+                start, end = low, high
+            elif "-" in item:
+                start_text, end_text = item.split("-", 1)
+                if not (start_text.isdigit() and end_text.isdigit()):
+                    raise ValueError(f"Invalid range in cron {name} field: {part!r}")
+                start, end = int(start_text), int(end_text)
+            elif item.isdigit():
+                start = end = int(item)
+                if step != 1:
+                    end = high
+            else:
+                raise ValueError(f"Invalid cron {name} field: {part!r}")
+
+            if start < low or end > high or start > end:
+                raise ValueError(f"Cron {name} field out of range {low}-{high}: {part!r}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, dt: datetime) -> bool:
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.isoweekday() % 7) in self.weekdays
+        if self._day_restricted and self._weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, dt: datetime) -> datetime:
+        """
+        First matching minute strictly after ``dt``.
+
+        Raises:
+            ValueError: If nothing matches within the next eight years
+        """
+        candidate = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 8)
+
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year = candidate.year + (candidate.month == 12)
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
+
+    def __repr__(self) -> str:
+        return f"CronExpression({self.expression!r})"
+
+
+class CronTrigger:
+    """Fires on wall-clock minutes matching a cron expression."""
+
+    def __init__(self, expression: str):
+        self.cron = CronExpression(expression)
+
+    def _due_for(self, wall: datetime, now: float, clock) -> float:
+        delta = (wall - clock.wall_time()).total_seconds()
+        return now + max(0.0, delta)
+
+    def first_due(self, now: float, clock) -> float:
+        return self._due_for(self.cron.next_after(clock.wall_time()), now, clock)
+
+    def next_due(self, due: float, now: float, clock) -> tuple[float, int]:
+        wall_now = clock.wall_time()
+        wall_due = wall_now - timedelta(seconds=max(0.0, now - due))
+
+        missed = 0
+        occurrence = self.cron.next_after(wall_due)
+        while occurrence <= wall_now and missed < 10000:
+            missed += 1
+            occurrence = self.cron.next_after(occurrence)
+        return self._due_for(occurrence, now, clock), missed
+
+    def __repr__(self) -> str:
+        return f"cron {self.cron.expression!r}"
+
+
+# ---------------------------------------------------------------------------
+# Hierarchical timing wheel
+# ---------------------------------------------------------------------------
+
+class _Timer:
+    """A single armed timer in the wheel."""
+
+    __slots__ = ("timer_id", "deadline_tick", "payload", "bucket")
+
+    def __init__(self, timer_id: int, deadline_tick: int, payload: Any):
+        self.timer_id = timer_id
+        self.deadline_tick = deadline_tick
+        self.payload = payload
+        self.bucket: Optional[Dict[int, "_Timer"]] = None
+
+
+class HierarchicalTimingWheel:
+    """
+    Hierarchical hashed timing wheel (Varghese & Lauck).
+
+    Level ``k`` has ``2**slot_bits`` slots, each spanning ``2**(slot_bits*k)``
+    ticks.  A timer is hashed into the coarsest level that can hold its
+    remaining delay, and cascades to finer levels as its deadline approaches.
+    Insert and cancel are O(1); advancing one tick is O(1) amortised plus the
+    timers that expire.  Delays beyond the wheel's range park in the top level
+    and are re-hashed on each rotation.
+
+    Not thread-safe; :class:`Scheduler` serialises access.
+    """
+
+    def __init__(self, slot_bits: int = 6, levels: int = 4, start_tick: int = 0):
+        """
+        Initialize the wheel.
+
+        Args:
+            slot_bits: log2 of slots per level (6 -> 64 slots)
+            levels: Number of levels
+            start_tick: Tick the wheel starts at
+        """
+        self.slot_bits = slot_bits
+        self.slots = 1 << slot_bits
+        self.mask = self.slots - 1
+        self.levels = levels
+        self.range = 1 << (slot_bits * levels)
+        self.current_tick = start_tick
+
+        self._wheel: List[List[Dict[int, _Timer]]] = [
+            [{} for _ in range(self.slots)] for _ in range(levels)
+        ]
+        self._ready: Dict[int, _Timer] = {}
+        self._ids = itertools.count(1)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def insert(self, deadline_tick: int, payload: Any) -> _Timer:
+        """Arm a timer that expires at ``deadline_tick``."""
+        timer = _Timer(next(self._ids), deadline_tick, payload)
+        self._place(timer)
+        self._count += 1
+        return timer
+
+    def cancel(self, timer: _Timer) -> bool:
+        """Disarm a timer. Returns False if it already fired or was cancelled."""
+        if timer.bucket is None:
+            return False
+        timer.bucket.pop(timer.timer_id, None)
+        timer.bucket = None
+        self._count -= 1
+        return True
+
+    def _place(self, timer: _Timer) -> None:
+        delta = timer.deadline_tick - self.current_tick
+        if delta <= 0:
+            bucket = self._ready
+        elif delta >= self.range:
+            # Park in the top-level slot just behind the cursor: it is
+            # cascaded (and re-hashed) after almost a full rotation.
+            top = self.levels - 1
+            index = ((self.current_tick >> (self.slot_bits * top)) - 1) & self.mask
+            bucket = self._wheel[top][index]
+        else:
+            level = 0
+            while delta >= 1 << (self.slot_bits * (level + 1)):
+                level += 1
+            index = (timer.deadline_tick >> (self.slot_bits * level)) & self.mask
+            bucket = self._wheel[level][index]
+        bucket[timer.timer_id] = timer
+        timer.bucket = bucket
+
+    def advance(self, target_tick: int) -> List[_Timer]:
+        """
+        Move the cursor to ``target_tick``.
+
+        Returns:
+            Expired timers, in deadline order
+        """
+        expired: List[_Timer] = self._drain(self._ready)
+        while self.current_tick < target_tick:
+            self.current_tick += 1
+            for level in range(1, self.levels):
+                span_bits = self.slot_bits * level
+                if self.current_tick & ((1 << span_bits) - 1):
+                    break
+                index = (self.current_tick >> span_bits) & self.mask
+                for timer in self._drain(self._wheel[level][index]):
+                    self._place(timer)
+            expired.extend(self._drain(self._wheel[0][self.current_tick & self.mask]))
+            expired.extend(self._drain(self._ready))
+
+        self._count -= len(expired)
+        return expired
+
+    @staticmethod
+    def _drain(bucket: Dict[int, _Timer]) -> List[_Timer]:
+        if not bucket:
+            return []
+        timers = list(bucket.values())
+        bucket.clear()
+        for timer in timers:
+            timer.bucket = None
+        return timers
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ScheduledJob:
+    """A registered periodic job."""
+    job_id: int
+    name: str
+    callback: Callable[[], Any]
+    trigger: Any
+    missed: str = MISSED_FIRE_ONCE
+    jitter: float = 0.0
+    due: float = 0.0  # nominal (un-jittered) due time
+    run_count: int = 0
+    missed_count: int = 0
+    error_count: int = 0
+    last_run: Optional[float] = None
+    _timer: Optional[_Timer] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return {
+            "job_id": self.job_id,
+            "name": self.name,
+            "trigger": repr(self.trigger),
+            "missed_policy": self.missed,
+            "jitter": self.jitter,
+            "next_due": self.due,
+            "run_count": self.run_count,
+            "missed_count": self.missed_count,
+            "error_count": self.error_count,
+            "last_run": self.last_run,
+        }
+
+
+class Scheduler:
+    """
+    Periodic job scheduler backed by one timing wheel and one thread.
+
+    Jobs are run through ``dispatch`` (default: inline on the scheduler
+    thread), so a runtime can hand them to a worker pool and keep the wheel
+    ticking while slow jobs run.
+    """
+
+    def __init__(
+        self,
+        tick: float = 0.1,
+        clock: Any = None,
+        dispatch: Optional[Callable[[Callable[[], None]], None]] = None,
+        slot_bits: int = 6,
+        levels: int = 4,
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            tick: Wheel resolution in seconds
+            clock: SystemClock (default) or VirtualClock
+            dispatch: Callable that runs a job body (default: call inline)
+            slot_bits: log2 of slots per wheel level
+            levels: Number of wheel levels
+        """
+        self.tick = float(tick)
+        self.clock = clock or SystemClock()
+        self._dispatch = dispatch or (lambda run: run())
+        self._origin = self.clock.now()
+        self._wheel = HierarchicalTimingWheel(slot_bits=slot_bits, levels=levels)
+        self._jobs: Dict[int, ScheduledJob] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._rng = random.Random()
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._running = False
+
+    # -- job registration ---------------------------------------------------
+
+    def every(self, interval: Any, callback: Callable[[], Any], name: Optional[str] = None,
+              missed: str = MISSED_FIRE_ONCE, jitter: Any = 0) -> ScheduledJob:
+        """
+        Run ``callback`` every ``interval``.
+
+        Args:
+            interval: Period, e.g. ``"5s"`` or ``0.5``
+            callback: Zero-argument callable
+            name: Job name for stats (default: callback name)
+            missed: Missed-tick policy (fire_once, fire_all, skip)
+            jitter: Max random delay added to each run (seconds or duration)
+
+        Returns:
+            The registered job
+        """
+        return self._add(IntervalTrigger(interval), callback, name, missed, jitter)
+
+    def cron(self, expression: str, callback: Callable[[], Any], name: Optional[str] = None,
+             missed: str = MISSED_FIRE_ONCE, jitter: Any = 0) -> ScheduledJob:
+        """
+        Run ``callback`` on a five-field cron schedule (local wall time).
+
+        Args:
+            expression: Cron expression, e.g. ``"*/5 * * * *"``
+            callback: Zero-argument callable
+            name: Job name for stats (default: callback name)
+            missed: Missed-tick policy (fire_once, fire_all, skip)
+            jitter: Max random delay added to each run (seconds or duration)
+
+        Returns:
+            The registered job
+        """
+        return self._add(CronTrigger(expression), callback, name, missed, jitter)
+
+    def _add(self, trigger, callback, name, missed, jitter) -> ScheduledJob:
+        if missed not in MISSED_POLICIES:
+            raise ValueError(f"Invalid missed-tick policy: {missed}. Must be one of {MISSED_POLICIES}")
+        if not callable(callback):
+            raise ValueError(f"Callback must be callable, got {type(callback)}")
+
+        with self._lock:
+            job = ScheduledJob(
+                job_id=next(self._ids),
+                name=name or getattr(callback, "__name__", "job"),
+                callback=callback,
+                trigger=trigger,
+                missed=missed,
+                jitter=parse_duration(jitter) if jitter else 0.0,
+            )
+            job.due = trigger.first_due(self.clock.now(), self.clock)
+            self._jobs[job.job_id] = job
+            self._arm(job)
+        return job
+
+    def cancel(self, job: Any) -> bool:
+        """
+        Cancel a job (by ScheduledJob or job_id).
+
+        Returns:
+            True if the job existed
+        """
+        job_id = job.job_id if isinstance(job, ScheduledJob) else job
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+            if job is None:
+                return False
+            if job._timer is not None:
+                self._wheel.cancel(job._timer)
+                job._timer = None
+            return True
+
+    def get_jobs(self) -> List[ScheduledJob]:
+        """Get all registered jobs."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    # -- time ----------------------------------------------------------------
+
+    def _to_tick(self, t: float) -> int:
+        # Round up so a timer never fires before its due time.
+        ticks = (t - self._origin) / self.tick
+        whole = int(ticks)
+        return whole if whole >= ticks else whole + 1
+
+    def _arm(self, job: ScheduledJob) -> None:
+        fire_at = job.due
+        if job.jitter:
+            fire_at += self._rng.uniform(0, job.jitter)
+        job._timer = self._wheel.insert(self._to_tick(fire_at), job.job_id)
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest armed fire time (O(jobs); used by VirtualClock)."""
+        with self._lock:
+            ticks = [j._timer.deadline_tick for j in self._jobs.values() if j._timer is not None]
+            if not ticks:
+                return None
+            return self._origin + min(ticks) * self.tick
+
+    def run_pending(self) -> int:
+        """
+        Fire every job that is due at the clock's current time.
+
+        Returns:
+            Number of job runs dispatched
+        """
+        now = self.clock.now()
+        runs: List[tuple[ScheduledJob, int]] = []
+
+        with self._lock:
+            target = int((now - self._origin) / self.tick + 1e-9)
+            for timer in self._wheel.advance(target):
+                job = self._jobs.get(timer.payload)
+                if job is None or job._timer is not timer:
+                    continue
+                job._timer = None
+
+                next_due, missed = job.trigger.next_due(job.due, now, self.clock)
+                job.missed_count += missed
+                if missed and job.missed == MISSED_SKIP:
+                    count = 0
+                elif job.missed == MISSED_FIRE_ALL:
+                    count = missed + 1
+                else:
+                    count = 1
+
+                job.due = next_due
+                self._arm(job)
+                if count:
+                    runs.append((job, count))
+
+        for job, count in runs:
+            for _ in range(count):
+                self._dispatch(self._make_run(job))
+
+        return sum(count for _, count in runs)
+
+    def _make_run(self, job: ScheduledJob) -> Callable[[], None]:
+        def run():
+            job.run_count += 1
+            job.last_run = self.clock.now()
+            try:
+                job.callback()
+            except Exception as e:
+                job.error_count += 1
+                logger.error("scheduled job '%s' failed: %s", job.name, e, exc_info=True)
+        return run
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def start(self) -> None:
+        """Start driving the wheel (a thread, or attach to a VirtualClock)."""
+        if self._running:
+            return
+        self._running = True
+        self._stop_event.clear()
+
+        if getattr(self.clock, "is_virtual", False):
+            self.clock.attach(self)
+            return
+
+        self._thread = threading.Thread(
+            target=self._run_loop, name="graphbus-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the scheduler thread. Registered jobs are kept."""
+        if not self._running:
+            return
+        self._running = False
+
+        if getattr(self.clock, "is_virtual", False):
+            self.clock.detach(self)
+            return
+
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def _run_loop(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.run_pending()
+            except Exception as e:
+                logger.error("scheduler tick failed: %s", e, exc_info=True)
+
+            # Sleep to the next tick boundary rather than a fixed tick so
+            # processing time does not accumulate as drift.
+            elapsed = self.clock.now() - self._origin
+            delay = self.tick - (elapsed % self.tick)
+            self._stop_event.wait(delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get scheduler statistics.
+
+        Returns:
+            Dict with job counts and per-job stats
+        """
+        with self._lock:
+            jobs = [job.to_dict() for job in self._jobs.values()]
+        return {
+            "running": self._running,
+            "tick_seconds": self.tick,
+            "jobs_count": len(jobs),
+            "armed_timers": len(self._wheel),
+            "total_runs": sum(job["run_count"] for job in jobs),
+            "total_missed": sum(job["missed_count"] for job in jobs),
+            "jobs": jobs,
+        }
+
+    def __repr__(self) -> str:
+        return f"Scheduler(jobs={len(self._jobs)}, tick={self.tick}s, running={self._running})"
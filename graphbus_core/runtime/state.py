@@ -5,29 +5,530 @@ Provides persistence for agent state across runtime restarts.
 """
 
 import json
+import logging
 import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, NamedTuple, Optional, Union
 from datetime import datetime, timezone
 
+from graphbus_core import codec
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint(NamedTuple):
+    """A serialized state checkpoint ready to be written."""
+    data: str  # JSON document: {"node_name", "timestamp", "version", "state"}
+    timestamp: str
+    version: str
+    values: Optional[Dict[str, str]] = None  # JSON key -> serialized value (delta mode)
+
+
+class JSONStateBackend:
+    """
+    One JSON file per node in ``state_dir`` (the default layout).
+
+    Files are replaced atomically (write to a temp file, then rename), so a
+    crash mid-write leaves the previous checkpoint intact.  Delta
+    checkpoints are appended to ``<node>.delta.jsonl`` next to the snapshot.
+    With ``compress=True`` snapshots are written in the binary storage
+    format (see :mod:`graphbus_core.codec`); reads detect either format.
+    """
+
+    DELTA_SUFFIX = ".delta.jsonl"
+
+    name = "json"
+
+    def __init__(self, state_dir: Union[str, Path], fsync: bool = True, compress: bool = False):
+        """
+        Initialize JSON backend.
+
+        Args:
+            state_dir: Directory holding ``<node>.json`` files
+            fsync: fsync files before renaming them into place
+            compress: Write snapshots zlib/zstd-compressed behind a magic header
+        """
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+        self.compress = compress
+
+    def relocate(self, state_dir: Union[str, Path]) -> None:
+        """Point the backend at another directory."""
+        self.state_dir = Path(state_dir)
+
+    def path_for(self, node_name: str) -> Path:
+        """Get the path to a state file for a given node."""
+        # Sanitize node name for filesystem
+        safe_name = node_name.replace("/", "_").replace("\\", "_")
+        return self.state_dir / f"{safe_name}.json"
+
+    def delta_path_for(self, node_name: str) -> Path:
+        """Get the path to the delta log for a given node."""
+        return self.path_for(node_name).with_suffix(self.DELTA_SUFFIX)
+
+    def write_many(self, checkpoints: Dict[str, Checkpoint]) -> Dict[str, Exception]:
+        """
+        Write checkpoints, one file each.
+
+        Returns:
+            Dict of node_name -> error for checkpoints that failed
+        """
+        failed = {}
+        for node_name, checkpoint in checkpoints.items():
+            try:
+                self._atomic_write(self.path_for(node_name), checkpoint.data)
+            except OSError as e:
+                failed[node_name] = e
+        return failed
+
+    def _atomic_write(self, path: Path, data: str) -> None:
+        """Write ``data`` to ``path`` via a temp file and rename."""
+        payload = codec.pack_text(data) if self.compress else data.encode("utf-8")
+        fd, tmp_path = tempfile.mkstemp(dir=self.state_dir, prefix=f".{path.stem}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def append_deltas(self, deltas: Dict[str, str]) -> Dict[str, Exception]:
+        """
+        Append one delta record per node to its delta log.
+
+        Returns:
+            Dict of node_name -> error for deltas that failed
+        """
+        failed = {}
+        for node_name, data in deltas.items():
+            try:
+                with open(self.delta_path_for(node_name), "a") as f:
+                    f.write(data + "\n")
+                    if self.fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+            except OSError as e:
+                failed[node_name] = e
+        return failed
+
+    def read_deltas(self, node_name: str) -> List[str]:
+        """Delta records for a node, oldest first."""
+        delta_file = self.delta_path_for(node_name)
+        if not delta_file.exists():
+            return []
+        return delta_file.read_text().splitlines()
+
+    def read_all_deltas(self) -> Dict[str, List[str]]:
+        """Delta records for every node, keyed by stored name."""
+        return {
+            f.name[:-len(self.DELTA_SUFFIX)]: f.read_text().splitlines()
+            for f in self.state_dir.glob(f"*{self.DELTA_SUFFIX}")
+        }
+
+    def clear_deltas(self, node_names: List[str]) -> None:
+        """Drop the delta logs of nodes that were just compacted."""
+        for node_name in node_names:
+            self.delta_path_for(node_name).unlink(missing_ok=True)
+
+    def read(self, node_name: str) -> Optional[bytes]:
+        """Stored checkpoint for a node (JSON or compressed), or None."""
+        state_file = self.path_for(node_name)
+        if not state_file.exists():
+            return None
+        return state_file.read_bytes()
+
+    def read_all(self) -> Dict[str, bytes]:
+        """Stored checkpoints for every node, keyed by stored name."""
+        return {f.stem: f.read_bytes() for f in self.state_dir.glob("*.json")}
+
+    def delete(self, node_name: str) -> bool:
+        """Delete a node's checkpoint. Returns False if none existed."""
+        self.delta_path_for(node_name).unlink(missing_ok=True)
+        state_file = self.path_for(node_name)
+        if state_file.exists():
+            state_file.unlink()
+            return True
+        return False
+
+    def list_nodes(self) -> list[str]:
+        """Names of nodes with a checkpoint."""
+        if not self.state_dir.exists():
+            return []
+        return [
+            f.stem  # filename without .json extension
+            for f in self.state_dir.glob("*.json")
+        ]
+
+    def metadata(self, node_name: str) -> Optional[Dict[str, Any]]:
+        """Checkpoint metadata (parses the file)."""
+        state_file = self.path_for(node_name)
+
+        if not state_file.exists():
+            return None
+
+        try:
+            state_with_meta = json.loads(codec.unpack_text(state_file.read_bytes()))
+
+            return {
+                "node_name": state_with_meta.get("node_name"),
+                "timestamp": state_with_meta.get("timestamp"),
+                "version": state_with_meta.get("version"),
+                "file_size": state_file.stat().st_size
+            }
+        except (ValueError, OSError):
+            return None
+
+    def clear_all(self) -> int:
+        """Delete every checkpoint. Returns how many were deleted."""
+        count = 0
+        if self.state_dir.exists():
+            for state_file in self.state_dir.glob("*.json"):
+                state_file.unlink()
+                count += 1
+            for delta_file in self.state_dir.glob(f"*{self.DELTA_SUFFIX}"):
+                delta_file.unlink()
+        return count
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class SQLiteStateBackend:
+    """
+    All node checkpoints in one SQLite database (``state_dir/state.db``).
+
+    Runs in WAL mode so readers never block the writer.  Each batch of
+    checkpoints is upserted in a single transaction, metadata lives in
+    indexed columns (no document parsing), and :meth:`read_all` restores
+    every node with one query.  Delta checkpoints go to ``node_state_delta``.
+    With ``compress=True`` snapshot documents are stored as compressed BLOBs.
+    """
+
+    name = "sqlite"
+    DB_FILENAME = "state.db"
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS node_state ("
+        " node_name TEXT PRIMARY KEY,"
+        " timestamp TEXT NOT NULL,"
+        " version TEXT NOT NULL,"
+        " size INTEGER NOT NULL,"
+        " data TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS idx_node_state_timestamp ON node_state (timestamp)",
+        "CREATE TABLE IF NOT EXISTS node_state_delta ("
+        " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " node_name TEXT NOT NULL,"
+        " data TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS idx_node_state_delta_node ON node_state_delta (node_name, seq)",
+    )
+
+    def __init__(self, state_dir: Union[str, Path], fsync: bool = True, compress: bool = False):
+        """
+        Initialize SQLite backend.
+
+        Args:
+            state_dir: Directory holding ``state.db``
+            fsync: ``synchronous=FULL`` (durable across power loss) instead
+                of ``NORMAL`` (durable across process crashes)
+            compress: Store snapshots zlib/zstd-compressed behind a magic header
+        """
+        self.fsync = fsync
+        self.compress = compress
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.relocate(state_dir)
+
+    def relocate(self, state_dir: Union[str, Path]) -> None:
+        """Open (creating if needed) the database in another directory."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self.state_dir = Path(state_dir)
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            self.db_path = self.state_dir / self.DB_FILENAME
+
+            # Autocommit mode; transactions are opened explicitly.
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={'FULL' if self.fsync else 'NORMAL'}")
+            for statement in self._SCHEMA:
+                conn.execute(statement)
+            self._conn = conn
+
+    def write_many(self, checkpoints: Dict[str, Checkpoint]) -> Dict[str, Exception]:
+        """
+        Upsert checkpoints in one transaction.
+
+        Returns:
+            Dict of node_name -> error (all of them if the transaction failed)
+        """
+        rows = []
+        for node_name, cp in checkpoints.items():
+            data = codec.pack_text(cp.data) if self.compress else cp.data
+            rows.append((node_name, cp.timestamp, cp.version, len(data), data))
+        return self._transaction(
+            checkpoints,
+            "INSERT INTO node_state (node_name, timestamp, version, size, data) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (node_name) DO UPDATE SET "
+            "timestamp = excluded.timestamp, version = excluded.version, "
+            "size = excluded.size, data = excluded.data",
+            rows,
+        )
+
+    def append_deltas(self, deltas: Dict[str, str]) -> Dict[str, Exception]:
+        """
+        Append delta records in one transaction.
+
+        Returns:
+            Dict of node_name -> error (all of them if the transaction failed)
+        """
+        return self._transaction(
+            deltas,
+            "INSERT INTO node_state_delta (node_name, data) VALUES (?, ?)",
+            list(deltas.items()),
+        )
+
+    def _transaction(self, keys, sql: str, rows: list) -> Dict[str, Exception]:
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.executemany(sql, rows)
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                return {key: e for key in keys}
+        return {}
+
+    def read_deltas(self, node_name: str) -> List[str]:
+        """Delta records for a node, oldest first."""
+        rows = self._query(
+            "SELECT data FROM node_state_delta WHERE node_name = ? ORDER BY seq", (node_name,)
+        )
+        return [row[0] for row in rows]
+
+    def read_all_deltas(self) -> Dict[str, List[str]]:
+        """Delta records for every node, in one query."""
+        deltas: Dict[str, List[str]] = {}
+        for node_name, data in self._query("SELECT node_name, data FROM node_state_delta ORDER BY seq"):
+            deltas.setdefault(node_name, []).append(data)
+        return deltas
+
+    def clear_deltas(self, node_names: List[str]) -> None:
+        """Drop the delta records of nodes that were just compacted."""
+        self._transaction(
+            node_names,
+            "DELETE FROM node_state_delta WHERE node_name = ?",
+            [(node_name,) for node_name in node_names],
+        )
+
+    def _query(self, sql: str, params: tuple = ()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def read(self, node_name: str) -> Optional[Union[str, bytes]]:
+        """Stored checkpoint for a node (JSON text or compressed BLOB), or None."""
+        rows = self._query("SELECT data FROM node_state WHERE node_name = ?", (node_name,))
+        return rows[0][0] if rows else None
+
+    def read_all(self) -> Dict[str, Union[str, bytes]]:
+        """Stored checkpoints for every node, in one query."""
+        return dict(self._query("SELECT node_name, data FROM node_state"))
+
+    def delete(self, node_name: str) -> bool:
+        """Delete a node's checkpoint. Returns False if none existed."""
+        with self._lock:
+            self._conn.execute("DELETE FROM node_state_delta WHERE node_name = ?", (node_name,))
+            cursor = self._conn.execute("DELETE FROM node_state WHERE node_name = ?", (node_name,))
+            return cursor.rowcount > 0
+
+    def list_nodes(self) -> list[str]:
+        """Names of nodes with a checkpoint."""
+        return [row[0] for row in self._query("SELECT node_name FROM node_state ORDER BY node_name")]
+
+    def metadata(self, node_name: str) -> Optional[Dict[str, Any]]:
+        """Checkpoint metadata from indexed columns."""
+        rows = self._query(
+            "SELECT node_name, timestamp, version, size FROM node_state WHERE node_name = ?",
+            (node_name,),
+        )
+        if not rows:
+            return None
+        name, timestamp, version, size = rows[0]
+        return {"node_name": name, "timestamp": timestamp, "version": version, "file_size": size}
+
+    def clear_all(self) -> int:
+        """Delete every checkpoint. Returns how many were deleted."""
+        with self._lock:
+            self._conn.execute("DELETE FROM node_state_delta")
+            return self._conn.execute("DELETE FROM node_state").rowcount
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def _json_key(key: Any) -> str:
+    """Serialize a dict key the way ``json.dumps`` would, as a quoted JSON key."""
+    if isinstance(key, str):
+        return json.dumps(key)
+    if isinstance(key, (int, float, bool)) or key is None:
+        return json.dumps(json.dumps(key))
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def _json_object(members: Dict[str, str]) -> str:
+    """Assemble a JSON object from pre-serialized ``{quoted_key: value}`` members."""
+    return "{" + ",".join(f"{key}:{value}" for key, value in members.items()) + "}"
+
+
+def _apply_deltas(state: Dict[str, Any], base: Any, deltas: List[str]) -> Dict[str, Any]:
+    """
+    Replay delta records written against snapshot ``base`` onto ``state``.
+
+    Records for another base (left over from before a compaction) and a torn
+    final record (crash mid-append) are ignored.
+    """
+    for line in deltas:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if record.get("base") != base:
+            continue
+        state.update(record.get("set", {}))
+        for key in record.get("unset", []):
+            state.pop(key, None)
+    return state
+
+
+STATE_BACKENDS = {
+    JSONStateBackend.name: JSONStateBackend,
+    SQLiteStateBackend.name: SQLiteStateBackend,
+}
+
 
 class StateManager:
     """
     Manages agent state persistence to disk.
 
-    Supports saving and loading agent state as JSON files,
-    enabling agents to preserve their state across restarts.
+    Supports saving and loading agent state as JSON files (the default) or
+    in a single SQLite database (``backend="sqlite"``), enabling agents to
+    preserve their state across restarts.
+
+    Checkpoints are always replaced atomically, so a crash mid-write leaves
+    the previous checkpoint intact.  With ``write_behind=True``,
+    :meth:`save_state` only serializes and queues the state; a background
+    thread writes queued checkpoints every ``flush_interval`` seconds or once
+    ``max_pending`` nodes are dirty.  Repeated saves of the same node between
+    flushes coalesce into one write.  Call :meth:`flush` (or :meth:`close`)
+    to wait for everything queued.
+
+    With ``delta_checkpoints=True``, only top-level keys whose serialized
+    value changed since the last write are appended to a per-node delta log;
+    after ``compact_after_deltas`` records or ``compact_after_bytes`` bytes
+    the node is compacted back into a full snapshot.  Loading replays the
+    snapshot plus its deltas, so checkpoint I/O scales with what changed
+    rather than with the size of the state.
     """
 
-    def __init__(self, state_dir: str = ".graphbus/state"):
+    def __init__(self, state_dir: str = ".graphbus/state",
+                 write_behind: bool = False,
+                 flush_interval: float = 1.0,
+                 max_pending: int = 64,
+                 fsync: bool = True,
+                 backend: Union[str, Any] = "json",
+                 delta_checkpoints: bool = False,
+                 compact_after_deltas: int = 50,
+                 compact_after_bytes: int = 1 << 20,
+                 storage_format: str = "json"):
         """
         Initialize StateManager.
 
         Args:
             state_dir: Directory to store state files (default: .graphbus/state)
+            write_behind: Queue saves and write them from a background thread
+            flush_interval: Max seconds a queued checkpoint waits (write-behind)
+            max_pending: Dirty-node count that triggers an early flush (write-behind)
+            fsync: Make each write durable before it is reported as done
+            backend: ``"json"``, ``"sqlite"``, or a backend instance
+            delta_checkpoints: Append top-level key diffs instead of rewriting
+                the full state on every save
+            compact_after_deltas: Delta records per node before a full snapshot
+            compact_after_bytes: Delta bytes per node before a full snapshot
+            storage_format: ``"json"`` or ``"binary"`` (compressed snapshots);
+                both are readable regardless of this setting
+
+        Raises:
+            ValueError: If the backend name or storage format is unknown
         """
-        self.state_dir = Path(state_dir)
-        self.state_dir.mkdir(parents=True, exist_ok=True)
+        codec.validate_format(storage_format)
+        if isinstance(backend, str):
+            if backend not in STATE_BACKENDS:
+                raise ValueError(
+                    f"Unknown state backend: {backend}. Must be one of {sorted(STATE_BACKENDS)}"
+                )
+            backend = STATE_BACKENDS[backend](
+                state_dir, fsync=fsync, compress=storage_format == "binary"
+            )
+        self.backend = backend
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.fsync = fsync
+        self.delta_checkpoints = delta_checkpoints
+        self.compact_after_deltas = compact_after_deltas
+        self.compact_after_bytes = compact_after_bytes
+
+        # Delta mode: what each node's log currently reconstructs to
+        # (snapshot base id, serialized values, records/bytes since snapshot)
+        self._baselines: Dict[str, Dict[str, Any]] = {}
+
+        # Write-behind queue: node_name -> checkpoint (latest wins).
+        # Sequence numbers make flush() a barrier: it waits until every save
+        # queued before the call has been written.
+        self._pending: Dict[str, Checkpoint] = {}
+        self._writing: Dict[str, Checkpoint] = {}  # batch currently being written
+        self._failed: set = set()
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()  # orders batch writes against clears
+        self._queued_seq = 0
+        self._written_seq = 0
+        self._rounds = 0
+        self._flush_requested = False
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+        self.last_error: Optional[Exception] = None
+        self.stats = {
+            "saves": 0, "writes": 0, "coalesced": 0, "flushes": 0, "errors": 0,
+            "snapshots": 0, "deltas": 0, "delta_bytes": 0,
+        }
+
+    @property
+    def state_dir(self) -> Path:
+        """Directory holding the state files / database."""
+        return self.backend.state_dir
+
+    @state_dir.setter
+    def state_dir(self, value: Union[str, Path]) -> None:
+        self.backend.relocate(value)
 
     def save_state(self, node_name: str, state: Dict[str, Any]) -> None:
         """
@@ -43,8 +544,6 @@ class StateManager:
         if not isinstance(state, dict):
             raise ValueError(f"State must be a dictionary, got {type(state)}")
 
-        state_file = self._get_state_file(node_name)
-
         # Add metadata
         state_with_meta = {
             "node_name": node_name,
@@ -53,12 +552,279 @@ class StateManager:
             "state": state
         }
 
+        # Serialize now, on the caller's thread: it snapshots the state
+        # against later mutation and surfaces serialization errors to the
+        # caller even when the write itself is deferred.  Delta mode
+        # serializes each top-level value separately so writes can be diffed.
         try:
-            with open(state_file, 'w') as f:
-                json.dump(state_with_meta, f, indent=2)
+            if self.delta_checkpoints:
+                values = {
+                    _json_key(key): json.dumps(value, separators=(",", ":"))
+                    for key, value in state.items()
+                }
+                checkpoint = Checkpoint(
+                    self._snapshot_document(node_name, state_with_meta["timestamp"],
+                                            state_with_meta["version"], values),
+                    state_with_meta["timestamp"], state_with_meta["version"], values,
+                )
+            else:
+                data = json.dumps(state_with_meta, separators=(",", ":"))
+                checkpoint = Checkpoint(data, state_with_meta["timestamp"], state_with_meta["version"])
         except (TypeError, ValueError) as e:
             raise ValueError(f"State is not JSON-serializable: {e}")
 
+        if not self.write_behind:
+            with self._io_lock:
+                failed = self._write_batch({node_name: checkpoint})
+            if failed:
+                raise failed[node_name]
+            self.stats["saves"] += 1
+            self.stats["writes"] += 1
+            return
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("StateManager is closed")
+            if node_name in self._pending:
+                self.stats["coalesced"] += 1
+            self._pending[node_name] = checkpoint
+            self._queued_seq += 1
+            self.stats["saves"] += 1
+            if len(self._pending) >= self.max_pending:
+                self._flush_requested = True
+            self._ensure_writer()
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every checkpoint queued before this call is on disk.
+
+        Args:
+            timeout: Maximum seconds to wait (None = forever)
+
+        Returns:
+            True if all queued checkpoints were written, False on timeout or
+            if a write failed (see ``last_error``; failed writes are retried)
+        """
+        with self._cond:
+            target = self._queued_seq
+            if self._written_seq < target or self._pending:
+                # Wait for a write round that starts after this call, so
+                # previously failed checkpoints are retried too.
+                round_at_call = self._rounds
+                self._flush_requested = True
+                self._ensure_writer()
+                self._cond.notify_all()
+                done = self._cond.wait_for(
+                    lambda: self._written_seq >= target and self._rounds > round_at_call,
+                    timeout=timeout,
+                )
+                if not done:
+                    return False
+            return not self._failed
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Flush queued checkpoints, stop the background writer and release
+        the backend.
+
+        Args:
+            timeout: Maximum seconds to wait for the flush
+
+        Returns:
+            True if all queued checkpoints were written
+        """
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            writer = self._writer
+        if writer is not None:
+            writer.join(timeout)
+        with self._io_lock:
+            self.backend.close()
+        return flushed
+
+    def _ensure_writer(self) -> None:
+        """Start the background writer thread (caller holds ``_cond``)."""
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(
+                target=self._writer_loop, name="graphbus-state-writer", daemon=True
+            )
+            self._writer.start()
+
+    def _writer_loop(self) -> None:
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+                while not (self._flush_requested or self._closed):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if not self._pending and self._closed:
+                    self._written_seq = self._queued_seq
+                    self._rounds += 1
+                    self._cond.notify_all()
+                    return
+
+            with self._io_lock:
+                with self._cond:
+                    batch, self._pending = self._pending, {}
+                    self._writing = batch
+                    seq = self._queued_seq
+                    self._flush_requested = False
+
+                failed = self._write_batch(batch) if batch else {}
+                for node_name, error in failed.items():
+                    self.last_error = error
+                    logger.error("Failed to write state checkpoint for %s: %s", node_name, error)
+
+                with self._cond:
+                    self._writing = {}
+                    self.stats["writes"] += len(batch) - len(failed)
+                    self.stats["errors"] += len(failed)
+                    if batch:
+                        self.stats["flushes"] += 1
+                    # Requeue failures unless a newer save superseded them; they
+                    # are retried on the next interval rather than holding up
+                    # the flush barrier.
+                    self._failed = set(failed)
+                    for node_name in failed:
+                        self._pending.setdefault(node_name, batch[node_name])
+                    self._written_seq = seq
+                    self._rounds += 1
+                    self._cond.notify_all()
+                    if self._closed:
+                        return
+
+    @staticmethod
+    def _snapshot_document(node_name: str, timestamp: str, version: str,
+                           values: Dict[str, str], base: Optional[str] = None) -> str:
+        """Assemble a checkpoint document from pre-serialized values."""
+        members = {
+            '"node_name"': json.dumps(node_name),
+            '"timestamp"': json.dumps(timestamp),
+            '"version"': json.dumps(version),
+        }
+        if base is not None:
+            members['"delta_base"'] = json.dumps(base)
+        members['"state"'] = _json_object(values)
+        return _json_object(members)
+
+    def _write_batch(self, batch: Dict[str, Checkpoint]) -> Dict[str, Exception]:
+        """
+        Write a batch of checkpoints (caller holds ``_io_lock``).
+
+        In delta mode each node gets either a delta record or, when it has
+        no baseline yet or its log is due for compaction, a full snapshot.
+
+        Returns:
+            Dict of node_name -> error for checkpoints that failed
+        """
+        if not self.delta_checkpoints:
+            return self.backend.write_many(batch)
+
+        snapshots: Dict[str, Checkpoint] = {}
+        deltas: Dict[str, str] = {}
+        updates: Dict[str, Dict[str, Any]] = {}
+
+        for node_name, cp in batch.items():
+            values = cp.values
+            if values is None:
+                # Queued before delta mode was switched on; write it as is.
+                snapshots[node_name] = cp
+                continue
+
+            baseline = self._baselines.get(node_name)
+            if (baseline is None
+                    or baseline["count"] >= self.compact_after_deltas
+                    or baseline["bytes"] >= self.compact_after_bytes):
+                base = uuid.uuid4().hex
+                snapshots[node_name] = Checkpoint(
+                    self._snapshot_document(node_name, cp.timestamp, cp.version, values, base),
+                    cp.timestamp, cp.version, values,
+                )
+                updates[node_name] = {"base": base, "values": values, "count": 0, "bytes": 0}
+                continue
+
+            old = baseline["values"]
+            changed = {key: value for key, value in values.items() if old.get(key) != value}
+            removed = [key for key in old if key not in values]
+            if not changed and not removed:
+                continue
+
+            record = _json_object({
+                '"base"': json.dumps(baseline["base"]),
+                '"timestamp"': json.dumps(cp.timestamp),
+                '"set"': _json_object(changed),
+                '"unset"': "[" + ",".join(removed) + "]",
+            })
+            deltas[node_name] = record
+            updates[node_name] = {
+                "base": baseline["base"],
+                "values": values,
+                "count": baseline["count"] + 1,
+                "bytes": baseline["bytes"] + len(record),
+            }
+
+        failed: Dict[str, Exception] = {}
+        if snapshots:
+            failed.update(self.backend.write_many(snapshots))
+            compacted = [name for name in snapshots if name not in failed]
+            if compacted:
+                self.backend.clear_deltas(compacted)
+            self.stats["snapshots"] += len(compacted)
+        if deltas:
+            delta_failed = self.backend.append_deltas(deltas)
+            failed.update(delta_failed)
+            written = [name for name in deltas if name not in delta_failed]
+            self.stats["deltas"] += len(written)
+            self.stats["delta_bytes"] += sum(len(deltas[name]) for name in written)
+
+        for node_name, baseline in updates.items():
+            if node_name in failed:
+                # Unknown on-disk state: force a full snapshot next time
+                self._baselines.pop(node_name, None)
+            else:
+                self._baselines[node_name] = baseline
+        return failed
+
+    def _get_pending(self, node_name: str) -> Optional[Checkpoint]:
+        """Queued (not yet written) checkpoint for a node, if any."""
+        if not self.write_behind:
+            return None
+        with self._cond:
+            pending = self._pending.get(node_name)
+            return pending if pending is not None else self._writing.get(node_name)
+
+    def _decode(self, node_name: str, data: Union[str, bytes],
+                deltas: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Extract the state from a checkpoint document, replaying its deltas.
+
+        Args:
+            node_name: Node name (for errors and delta lookup)
+            data: Checkpoint document (JSON text or compressed)
+            deltas: Delta records, or None to read them from the backend
+        """
+        try:
+            state_with_meta = json.loads(codec.unpack_text(data))
+        except ValueError as e:
+            raise ValueError(f"Corrupted state file for {node_name}: {e}")
+
+        # Validate structure
+        if not isinstance(state_with_meta, dict) or 'state' not in state_with_meta:
+            raise ValueError(f"Invalid state file format for {node_name}")
+
+        state = state_with_meta['state']
+        base = state_with_meta.get("delta_base")
+        if base is not None:
+            if deltas is None:
+                deltas = self.backend.read_deltas(node_name)
+            _apply_deltas(state, base, deltas)
+        return state
+
     def load_state(self, node_name: str) -> Dict[str, Any]:
         """
         Load agent state from persistent storage.
@@ -72,23 +838,44 @@ class StateManager:
         Raises:
             ValueError: If state file is corrupted
         """
-        state_file = self._get_state_file(node_name)
+        pending = self._get_pending(node_name)
+        if pending is not None:
+            # Queued checkpoints are full documents; no deltas to replay
+            return self._decode(node_name, pending.data, deltas=[])
 
-        if not state_file.exists():
+        data = self.backend.read(node_name)
+        if data is None:
             return {}
 
-        try:
-            with open(state_file, 'r') as f:
-                state_with_meta = json.load(f)
+        return self._decode(node_name, data)
 
-            # Validate structure
-            if not isinstance(state_with_meta, dict) or 'state' not in state_with_meta:
-                raise ValueError(f"Invalid state file format for {node_name}")
+    def load_all_states(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load every saved state at once (a single query with SQLite).
 
-            return state_with_meta['state']
+        Checkpoints that fail to decode are logged and skipped.
 
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Corrupted state file for {node_name}: {e}")
+        Returns:
+            Dict of node_name -> state dictionary
+        """
+        documents = self.backend.read_all()
+        all_deltas = self.backend.read_all_deltas()
+        with self._cond:
+            queued = {name: cp.data for name, cp in self._writing.items()}
+            queued.update({name: cp.data for name, cp in self._pending.items()})
+        documents.update(queued)
+
+        states = {}
+        for stored_name, data in documents.items():
+            deltas = [] if stored_name in queued else all_deltas.get(stored_name, [])
+            try:
+                state_with_meta = json.loads(codec.unpack_text(data))
+                # JSON file names are sanitized; the document has the real name
+                node_name = state_with_meta.get("node_name") or stored_name
+                states[node_name] = self._decode(node_name, data, deltas)
+            except (ValueError, AttributeError) as e:
+                logger.warning("Skipping state for %s: %s", stored_name, e)
+        return states
 
     def clear_state(self, node_name: str) -> bool:
         """
@@ -100,12 +887,12 @@ class StateManager:
         Returns:
             True if state was cleared, False if no state existed
         """
-        state_file = self._get_state_file(node_name)
+        with self._io_lock:
+            with self._cond:
+                had_pending = self._pending.pop(node_name, None) is not None
+            self._baselines.pop(node_name, None)
 
-        if state_file.exists():
-            state_file.unlink()
-            return True
-        return False
+            return self.backend.delete(node_name) or had_pending
 
     def list_saved_states(self) -> list[str]:
         """
@@ -114,13 +901,11 @@ class StateManager:
         Returns:
             List of agent names that have saved state
         """
-        if not self.state_dir.exists():
-            return []
+        names = self.backend.list_nodes()
 
-        return [
-            f.stem  # filename without .json extension
-            for f in self.state_dir.glob("*.json")
-        ]
+        with self._cond:
+            names.extend(name for name in self._pending if name not in names)
+        return names
 
     def get_state_metadata(self, node_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -132,23 +917,10 @@ class StateManager:
         Returns:
             Metadata dict with timestamp and version, or None if no state exists
         """
-        state_file = self._get_state_file(node_name)
-
-        if not state_file.exists():
-            return None
+        if self._get_pending(node_name) is not None:
+            self.flush()
 
-        try:
-            with open(state_file, 'r') as f:
-                state_with_meta = json.load(f)
-
-            return {
-                "node_name": state_with_meta.get("node_name"),
-                "timestamp": state_with_meta.get("timestamp"),
-                "version": state_with_meta.get("version"),
-                "file_size": state_file.stat().st_size
-            }
-        except (json.JSONDecodeError, OSError):
-            return None
+        return self.backend.metadata(node_name)
 
     def clear_all_states(self) -> int:
         """
@@ -157,18 +929,16 @@ class StateManager:
         Returns:
             Number of state files cleared
         """
-        count = 0
-        if self.state_dir.exists():
-            for state_file in self.state_dir.glob("*.json"):
-                state_file.unlink()
-                count += 1
-        return count
+        with self._io_lock:
+            with self._cond:
+                self._pending.clear()
+            self._baselines.clear()
+
+            return self.backend.clear_all()
 
     def _get_state_file(self, node_name: str) -> Path:
-        """Get the path to a state file for a given node."""
-        # Sanitize node name for filesystem
-        safe_name = node_name.replace("/", "_").replace("\\", "_")
-        return self.state_dir / f"{safe_name}.json"
+        """Get the path to a state file for a given node (JSON layout)."""
+        return JSONStateBackend.path_for(self.backend, node_name)
 
     def export_state(self, node_name: str, output_file: str) -> None:
         """
@@ -210,3 +980,62 @@ class StateManager:
 
         except (json.JSONDecodeError, OSError) as e:
             raise ValueError(f"Failed to import state: {e}")
+
+
+def convert_state_store(state_dir: str, source: str = "json", target: str = "sqlite",
+                        storage_format: str = "json") -> int:
+    """
+    One-shot conversion of every checkpoint in ``state_dir`` between backends.
+
+    Checkpoints are copied with their timestamps preserved (delta logs are
+    replayed into full snapshots) in a single batch; the source is left
+    untouched so the conversion can be verified before the old files are
+    deleted.
+
+    Args:
+        state_dir: State directory
+        source: Backend to read from (``"json"`` or ``"sqlite"``)
+        target: Backend to write to
+        storage_format: ``"json"`` or ``"binary"`` for the converted checkpoints
+
+    Returns:
+        Number of checkpoints converted
+
+    Raises:
+        ValueError: If a backend name or storage format is unknown, source
+            equals target, or a checkpoint cannot be decoded
+    """
+    codec.validate_format(storage_format)
+    if source == target:
+        raise ValueError(f"Source and target backend are both '{source}'")
+    for name in (source, target):
+        if name not in STATE_BACKENDS:
+            raise ValueError(f"Unknown state backend: {name}. Must be one of {sorted(STATE_BACKENDS)}")
+
+    src = STATE_BACKENDS[source](state_dir)
+    dst = STATE_BACKENDS[target](state_dir, compress=storage_format == "binary")
+    try:
+        checkpoints = {}
+        all_deltas = src.read_all_deltas()
+        for stored_name, data in src.read_all().items():
+            try:
+                data = codec.unpack_text(data)
+                document = json.loads(data)
+            except ValueError as e:
+                raise ValueError(f"Corrupted state file for {stored_name}: {e}")
+            node_name = document.get("node_name") or stored_name
+            base = document.pop("delta_base", None)
+            if base is not None:
+                _apply_deltas(document.get("state", {}), base, all_deltas.get(stored_name, []))
+                data = json.dumps(document, separators=(",", ":"))
+            checkpoints[node_name] = Checkpoint(
+                data, document.get("timestamp", ""), document.get("version", "1.0")
+            )
+
+        failed = dst.write_many(checkpoints)
+        if failed:
+            raise next(iter(failed.values()))
+        return len(checkpoints)
+    finally:
+        src.close()
+        dst.close()
@@ -0,0 +1,313 @@
+"""
+Causal Tracing
+
+Links every event and method call to the work that caused it.  The active
+span lives in a context variable, so a handler that publishes (directly or
+through ``GraphBusNode.publish``) or calls another node automatically
+starts a child span in the same trace; events carry ``trace_id`` and
+``parent_id`` so a delivery is linked to its publish even when it is
+dispatched somewhere else.
+
+A trace completes when its last open span ends.  Completed traces feed an
+end-to-end latency histogram per entry point (the topic or ``Node.method``
+that started the trace), a ring of recent traces and a bounded store of the
+slowest ones, which is how a slow hop in a long cascade is found.
+"""
+
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from graphbus_core.runtime.histogram import LatencyHistogram
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "graphbus_current_span", default=None
+)
+
+_span_ids = itertools.count(1)
+_ID_PREFIX = os.urandom(4).hex()
+
+
+def new_trace_id() -> str:
+    """Random 128-bit trace id (32 hex chars, W3C trace-context compatible)."""
+    return os.urandom(16).hex()
+
+
+def new_span_id() -> str:
+    """Unique 64-bit span id (16 hex chars)."""
+    return f"{_ID_PREFIX}{next(_span_ids) & 0xFFFFFFFF:08x}"
+
+
+def current_span() -> Optional["Span"]:
+    """The span active in the current context, if any."""
+    return _current_span.get()
+
+
+@dataclass
+class Span:
+    """One timed unit of work: a publish, a delivery or a method call."""
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    kind: str  # "publish", "deliver" or "call"
+    name: str
+    node: Optional[str] = None
+    handler: Optional[str] = None
+    topic: Optional[str] = None
+    event_id: Optional[str] = None
+    start_time: float = field(default_factory=time.time)  # epoch seconds
+    start_ns: int = field(default_factory=time.perf_counter_ns)
+    duration: Optional[float] = None  # seconds, None while open
+    thread_id: int = field(default_factory=threading.get_ident)
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form."""
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "kind": self.kind,
+            "name": self.name,
+            "node": self.node,
+            "handler": self.handler,
+            "topic": self.topic,
+            "event_id": self.event_id,
+            "start_time": self.start_time,
+            "duration": self.duration,
+            "thread_id": self.thread_id,
+            "error": self.error,
+        }
+
+
+class Trace:
+    """All spans of one causal cascade."""
+
+    __slots__ = ("trace_id", "entry", "start_time", "start_ns", "end_ns", "spans", "open")
+
+    def __init__(self, trace_id: str, entry: str, start_time: float, start_ns: int):
+        self.trace_id = trace_id
+        self.entry = entry  # topic or Node.method that started the trace
+        self.start_time = start_time
+        self.start_ns = start_ns
+        self.end_ns = start_ns
+        self.spans: List[Span] = []
+        self.open = 0
+
+    @property
+    def duration(self) -> float:
+        """End-to-end latency in seconds (first span start to last span end)."""
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def self_times(self) -> Dict[str, float]:
+        """
+        Time spent in each span outside its child spans.
+
+        Returns:
+            Dict of span_id -> seconds
+        """
+        times = {s.span_id: s.duration for s in self.spans if s.duration is not None}
+        for span in self.spans:
+            if span.duration is not None and span.parent_id in times:
+                times[span.parent_id] -= span.duration
+        return {span_id: max(t, 0.0) for span_id, t in times.items()}
+
+    def slowest_span(self) -> Optional[Span]:
+        """Span with the most self time: the slow hop of the cascade."""
+        times = self.self_times()
+        if not times:
+            return None
+        span_id = max(times, key=times.get)
+        return next(s for s in self.spans if s.span_id == span_id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form, spans in start order."""
+        times = self.self_times()
+        return {
+            "trace_id": self.trace_id,
+            "entry": self.entry,
+            "start_time": self.start_time,
+            "duration": self.duration,
+            "span_count": len(self.spans),
+            "spans": [
+                {**s.to_dict(), "self_time": times.get(s.span_id)}
+                for s in sorted(self.spans, key=lambda s: s.start_ns)
+            ],
+        }
+
+
+class Tracer:
+    """
+    Records spans and assembles them into traces.
+
+    Args to :meth:`span` decide the parent: an explicit ``parent`` pair
+    (from an event) wins, otherwise the span in the current context is
+    used, otherwise a new trace is started with the span's topic or name
+    as entry point.
+    """
+
+    def __init__(self, max_slowest: int = 100, max_recent: int = 100,
+                 max_active: int = 10000, max_spans_per_trace: int = 1000):
+        """
+        Initialize tracer.
+
+        Args:
+            max_slowest: Slowest completed traces kept
+            max_recent: Most recent completed traces kept
+            max_active: Incomplete traces tracked before the oldest is dropped
+            max_spans_per_trace: Spans kept per trace (later ones are still timed)
+        """
+        self.max_slowest = max_slowest
+        self.max_active = max_active
+        self.max_spans_per_trace = max_spans_per_trace
+        self._lock = threading.Lock()
+        self._active: "OrderedDict[str, Trace]" = OrderedDict()
+        self._slowest: List[Tuple[float, int, Trace]] = []  # min-heap by duration
+        self._tiebreak = itertools.count()
+        self.recent: deque = deque(maxlen=max_recent)
+        self.latency_by_entry: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.completed = 0
+        self.dropped = 0
+        # Called with each completed trace, outside the lock (e.g. exporters)
+        self.listeners: List[Callable[[Trace], None]] = []
+
+    @contextmanager
+    def span(self, kind: str, name: str, parent: Optional[Tuple[Optional[str], Optional[str]]] = None,
+             **attrs: Any) -> Iterator[Span]:
+        """
+        Time the enclosed block as a span and make it the current span.
+
+        Args:
+            kind: "publish", "deliver" or "call"
+            name: Human-readable span name
+            parent: ``(trace_id, parent_span_id)`` to link to, e.g. from an event
+            **attrs: node, handler, topic, event_id
+        """
+        span = self.start_span(kind, name, parent, **attrs)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span)
+
+    def start_span(self, kind: str, name: str, parent: Optional[Tuple[Optional[str], Optional[str]]] = None,
+                   **attrs: Any) -> Span:
+        """Open a span without making it current (see :meth:`span`)."""
+        trace_id = parent_id = None
+        if parent is not None and parent[0]:
+            trace_id, parent_id = parent
+        else:
+            active = _current_span.get()
+            if active is not None:
+                trace_id, parent_id = active.trace_id, active.span_id
+        if trace_id is None:
+            trace_id = new_trace_id()
+
+        span = Span(trace_id, new_span_id(), parent_id, kind, name, **attrs)
+        with self._lock:
+            trace = self._active.get(trace_id)
+            if trace is None:
+                trace = Trace(trace_id, attrs.get("topic") or name, span.start_time, span.start_ns)
+                self._active[trace_id] = trace
+                if len(self._active) > self.max_active:
+                    self._active.popitem(last=False)
+                    self.dropped += 1
+            trace.open += 1
+            if len(trace.spans) < self.max_spans_per_trace:
+                trace.spans.append(span)
+        return span
+
+    def end_span(self, span: Span) -> None:
+        """Close a span; completes its trace if it was the last open one."""
+        end_ns = time.perf_counter_ns()
+        span.duration = (end_ns - span.start_ns) / 1e9
+        with self._lock:
+            trace = self._active.get(span.trace_id)
+            if trace is None:
+                return  # evicted while open
+            if end_ns > trace.end_ns:
+                trace.end_ns = end_ns
+            trace.open -= 1
+            if trace.open > 0:
+                return
+            del self._active[span.trace_id]
+            self._complete(trace)
+        for listener in self.listeners:
+            listener(trace)
+
+    def _complete(self, trace: Trace) -> None:
+        self.completed += 1
+        self.latency_by_entry[trace.entry].record_ns(trace.end_ns - trace.start_ns)
+        self.recent.append(trace)
+        item = (trace.duration, next(self._tiebreak), trace)
+        if len(self._slowest) < self.max_slowest:
+            heapq.heappush(self._slowest, item)
+        elif self._slowest and item[0] > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, item)
+
+    def slowest_traces(self, limit: Optional[int] = None, entry: Optional[str] = None) -> List[Trace]:
+        """
+        Slowest completed traces, slowest first.
+
+        Args:
+            limit: Maximum traces to return
+            entry: Only traces started by this topic or ``Node.method``
+        """
+        with self._lock:
+            traces = [t for _, _, t in self._slowest if entry is None or t.entry == entry]
+        traces.sort(key=lambda t: t.duration, reverse=True)
+        return traces[:limit] if limit is not None else traces
+
+    def get_trace(self, trace_id: str) -> Optional[Trace]:
+        """Find a trace that is in progress, recent or among the slowest."""
+        with self._lock:
+            if trace_id in self._active:
+                return self._active[trace_id]
+            for trace in itertools.chain(reversed(self.recent), (t for _, _, t in self._slowest)):
+                if trace.trace_id == trace_id:
+                    return trace
+        return None
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        End-to-end trace latency per entry point.
+
+        Returns:
+            Dict of entry -> count/mean/p50/p90/p99/p999/max (seconds)
+        """
+        with self._lock:
+            histograms = {entry: h.copy() for entry, h in self.latency_by_entry.items()}
+        return {entry: h.percentiles() for entry, h in histograms.items()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Trace counters and latency per entry point."""
+        with self._lock:
+            active = len(self._active)
+            stored = len(self._slowest)
+        return {
+            "completed": self.completed,
+            "active": active,
+            "dropped": self.dropped,
+            "slowest_stored": stored,
+            "latency": self.get_latency_stats(),
+        }
+
+    def clear(self) -> None:
+        """Drop all completed traces and latency data (open traces continue)."""
+        with self._lock:
+            self._slowest.clear()
+            self.recent.clear()
+            self.latency_by_entry.clear()
+            self.completed = 0
+            self.dropped = 0
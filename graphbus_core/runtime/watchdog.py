@@ -0,0 +1,272 @@
+"""
+Hung-Handler Watchdog
+
+Detects method calls and event deliveries that run past their deadline.
+
+A background thread checks the start time of every call the executor's
+in-flight tracker reports: the innermost call of each thread, and of each
+asyncio task running an ``async def`` method.  A call running longer than
+the deadline of its method or node is reported once: its stack is
+captured (the stuck thread's with ``sys._current_frames``, or the task's
+chain of awaiting coroutines), the node is flagged in the
+:class:`~graphbus_core.runtime.health.HealthMonitor` until the call returns,
+``on_hung`` callbacks run, and with ``recover`` the health monitor schedules
+a restart of the node, so new calls reach a fresh instance while the stuck
+call is left to finish.
+"""
+
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from graphbus_core.runtime.inflight import InFlightTracker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HungCall:
+    """A call found running past its deadline."""
+    node: Optional[str]
+    handler: Optional[str]
+    topic: Optional[str]
+    thread_id: int
+    thread_name: str
+    deadline: float
+    elapsed: float  # seconds running when detected
+    started_at: float  # epoch seconds
+    stack: List[str] = field(default_factory=list)  # formatted frames, outermost first
+    finished_after: Optional[float] = None  # total seconds, once the call returned
+    task: Optional[str] = None  # asyncio task name, for coroutine calls
+
+    @property
+    def name(self) -> str:
+        """``"Node.handler"``."""
+        return f"{self.node}.{self.handler}" if self.handler else str(self.node)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form."""
+        return {
+            "node": self.node,
+            "handler": self.handler,
+            "topic": self.topic,
+            "thread_id": self.thread_id,
+            "thread_name": self.thread_name,
+            "deadline": self.deadline,
+            "elapsed": self.elapsed,
+            "started_at": self.started_at,
+            "stack": "".join(self.stack),
+            "finished_after": self.finished_after,
+            "task": self.task,
+        }
+
+
+class Watchdog:
+    """
+    Reports calls that exceed a per-node (or per-method) deadline.
+    """
+
+    def __init__(self, inflight: InFlightTracker, health_monitor: Any = None,
+                 deadline: float = 30.0, deadlines: Optional[Dict[str, float]] = None,
+                 interval: float = 1.0, recover: bool = False, history: int = 100):
+        """
+        Initialize watchdog.
+
+        Args:
+            inflight: Tracker whose running calls are checked (``executor.inflight``)
+            health_monitor: HealthMonitor to flag hung nodes in (optional)
+            deadline: Seconds a call may run when no specific deadline applies
+            deadlines: ``"Node"`` or ``"Node.method"`` -> seconds; the method
+                entry wins over the node entry
+            interval: Seconds between checks
+            recover: Schedule a restart of a node when one of its calls hangs
+                (needs a health monitor)
+            history: Hung calls kept in :attr:`reports`
+        """
+        self.inflight = inflight
+        self.health_monitor = health_monitor
+        self.deadline = deadline
+        self.deadlines = dict(deadlines or {})
+        self.interval = interval
+        self.recover = recover
+        self.hung_callbacks: List[Callable[[HungCall], None]] = []
+
+        self.reports: deque = deque(maxlen=history)
+        self._hung: Dict[int, Tuple[tuple, HungCall]] = {}  # id(entry) -> (entry, report)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.checks = 0
+        self.hung_total = 0
+
+    @property
+    def is_running(self) -> bool:
+        """True while the watchdog thread is active."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start checking in a background thread."""
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="graphbus-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the watchdog thread."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def on_hung(self, callback: Callable[[HungCall], None]) -> None:
+        """
+        Register callback for hung calls.
+
+        Args:
+            callback: Function(HungCall) called once per call past its deadline
+        """
+        self.hung_callbacks.append(callback)
+
+    def deadline_for(self, node: Optional[str], handler: Optional[str]) -> float:
+        """Deadline of ``node.handler``: the method entry, else the node entry, else the default."""
+        deadline = self.deadlines.get(f"{node}.{handler}")
+        if deadline is None:
+            deadline = self.deadlines.get(node, self.deadline)
+        return deadline
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.warning("watchdog check failed: %s", e, exc_info=True)
+
+    def check(self) -> List[HungCall]:
+        """
+        Check every running call once.
+
+        Returns:
+            Calls newly found past their deadline
+        """
+        now = time.monotonic()
+        # (thread ident, entry, task or None) per running call
+        running = [(ident, entry, None) for ident, entry in self.inflight.running_calls().items()]
+        running.extend((ident, entry, task) for task, (ident, entry) in self.inflight.running_tasks().items())
+        live = {id(entry) for _, entry, _ in running}
+
+        with self._lock:
+            self.checks += 1
+            finished = [key for key in self._hung if key not in live]
+            done = [self._hung.pop(key)[1] for key in finished]
+
+            overdue = []
+            for ident, entry, task in running:
+                node, handler, topic, started = entry
+                if id(entry) in self._hung:
+                    continue
+                deadline = self.deadline_for(node, handler)
+                if now - started > deadline:
+                    overdue.append((ident, entry, task, deadline))
+
+        for report in done:
+            report.finished_after = time.time() - report.started_at
+            logger.info("hung call %s finished after %.1fs", report.name, report.finished_after)
+            if self.health_monitor is not None and report.node is not None:
+                self.health_monitor.clear_hung(report.node)
+
+        if not overdue:
+            return []
+
+        frames = sys._current_frames()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        found = []
+        for ident, entry, task, deadline in overdue:
+            node, handler, topic, started = entry
+            if task is not None:
+                stack = _task_stack(task)
+            else:
+                frame = frames.get(ident)
+                stack = traceback.format_stack(frame) if frame is not None else []
+            elapsed = now - started
+            report = HungCall(
+                node=node, handler=handler, topic=topic, thread_id=ident,
+                thread_name=names.get(ident, str(ident)), deadline=deadline, elapsed=elapsed,
+                started_at=time.time() - elapsed, stack=stack,
+                task=task.get_name() if task is not None else None,
+            )
+            with self._lock:
+                self._hung[id(entry)] = (entry, report)
+                self.reports.append(report)
+                self.hung_total += 1
+            found.append(report)
+        del frames
+
+        for report in found:
+            self._report(report)
+        return found
+
+    def _report(self, report: HungCall) -> None:
+        reason = f"{report.name} hung for {report.elapsed:.1f}s (deadline {report.deadline:g}s)"
+        where = report.thread_name if report.task is None else f"{report.thread_name} (task {report.task})"
+        logger.warning("%s on thread %s:\n%s", reason, where, "".join(report.stack))
+
+        for callback in self.hung_callbacks:
+            try:
+                callback(report)
+            except Exception as exc:
+                logger.warning(
+                    "hung callback %s raised an error for '%s': %s",
+                    getattr(callback, '__name__', repr(callback)), report.name, exc,
+                )
+
+        monitor = self.health_monitor
+        if monitor is None or report.node is None:
+            return
+        monitor.mark_hung(report.node, reason)
+        if self.recover:
+            monitor.schedule_restart(report.node)
+
+    def hung_calls(self) -> List[HungCall]:
+        """Calls currently past their deadline and still running."""
+        with self._lock:
+            return [report for _, report in self._hung.values()]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get watchdog statistics.
+
+        Returns:
+            Dict with deadlines, counters and the calls currently hung
+        """
+        with self._lock:
+            hung = [report.to_dict() for _, report in self._hung.values()]
+        return {
+            "deadline": self.deadline,
+            "deadlines": dict(self.deadlines),
+            "interval": self.interval,
+            "recover": self.recover,
+            "checks": self.checks,
+            "hung_total": self.hung_total,
+            "hung": hung,
+        }
+
+
+def _task_stack(task: Any) -> List[str]:
+    """Formatted frames of a task's awaiting coroutines, outermost first."""
+    frames = []
+    coro = task.get_coro()
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append((frame, frame.f_lineno))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return traceback.format_list(traceback.StackSummary.extract(frames))
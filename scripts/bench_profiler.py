@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark PerformanceProfiler recording overhead.
+
+Times ``start_method_call`` + ``end_method_call`` pairs against an empty
+loop, single-threaded and from several threads at once, and reports the
+added cost per profiled call.  The cost of an empty call pair and of one
+clock read are printed for reference, since both vary a lot between
+machines.
+
+The profiler is meant to stay on in production, so the target is under a
+microsecond per call.  The budget (``--budget-ns``) applies to both runs:
+the single-threaded overhead, and the contended overhead per call (wall
+time of all threads over all their calls, so the threads taking turns on
+the GIL count against it).  The script exits non-zero if either exceeds it.
+
+Usage:
+    python scripts/bench_profiler.py
+    python scripts/bench_profiler.py --calls 500000 --threads 8
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from graphbus_core.runtime.profiler import PerformanceProfiler  # noqa: E402
+
+METHODS = [("OrderAgent", "place_order"), ("OrderAgent", "cancel"), ("BillingAgent", "charge")]
+
+
+def baseline_loop(calls: int) -> int:
+    """Nanoseconds for the loop without profiling."""
+    methods = METHODS
+    start = time.perf_counter_ns()
+    for i in range(calls):
+        agent, method = methods[i % 3]
+    return time.perf_counter_ns() - start
+
+
+def profiled_loop(profiler: PerformanceProfiler, calls: int) -> int:
+    """Nanoseconds for the loop with a start/end pair per iteration."""
+    methods = METHODS
+    begin, end = profiler.start_method_call, profiler.end_method_call
+    start = time.perf_counter_ns()
+    for i in range(calls):
+        agent, method = methods[i % 3]
+        end(agent, method, begin(agent, method))
+    return time.perf_counter_ns() - start
+
+
+def empty_pair_loop(calls: int) -> int:
+    """Nanoseconds for the loop with a pair of no-op calls (reference)."""
+    methods = METHODS
+
+    def noop(agent, method, start=None):
+        return 0.0
+
+    start = time.perf_counter_ns()
+    for i in range(calls):
+        agent, method = methods[i % 3]
+        noop(agent, method, noop(agent, method))
+    return time.perf_counter_ns() - start
+
+
+def clock_loop(calls: int) -> int:
+    """Nanoseconds for the loop with one perf_counter_ns() read (reference)."""
+    methods = METHODS
+    clock = time.perf_counter_ns
+    start = time.perf_counter_ns()
+    for i in range(calls):
+        agent, method = methods[i % 3]
+        clock()
+    return time.perf_counter_ns() - start
+
+
+def per_call(fn, calls: int, repeat: int) -> float:
+    """Median nanoseconds per iteration over ``repeat`` runs."""
+    return statistics.median(fn(calls) / calls for _ in range(repeat))
+
+
+def threaded(fn, calls: int, threads: int) -> int:
+    """Wall-clock nanoseconds for ``threads`` threads each running ``fn(calls)``."""
+    barrier = threading.Barrier(threads + 1)
+    workers = [threading.Thread(target=lambda: (barrier.wait(), fn(calls))) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter_ns()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter_ns() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=200_000, help="Profiled calls per run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (median is reported)")
+    parser.add_argument("--threads", type=int, default=4, help="Threads for the contended run")
+    parser.add_argument("--budget-ns", type=float, default=1000.0, help="Allowed overhead per call")
+    args = parser.parse_args()
+
+    profiler = PerformanceProfiler()
+    profiler.enable()
+
+    base = per_call(baseline_loop, args.calls, args.repeat)
+    empty = per_call(empty_pair_loop, args.calls, args.repeat) - base
+    clock = per_call(clock_loop, args.calls, args.repeat) - base
+    pair = per_call(lambda n: profiled_loop(profiler, n), args.calls, args.repeat) - base
+
+    total = args.calls * args.threads
+    contended = (threaded(lambda n: profiled_loop(profiler, n), args.calls, args.threads)
+                 - threaded(baseline_loop, args.calls, args.threads)) / total
+
+    profiler.disable()
+    disabled = per_call(lambda n: profiled_loop(profiler, n), args.calls, args.repeat) - base
+
+    summary = profiler.get_summary()
+    print(f"Python {sys.version.split()[0]}, {args.calls:,} calls x {args.repeat} runs\n")
+    print(f"{'start/end pair':<36}{pair:>8.0f} ns/call")
+    print(f"{f'start/end pair, {args.threads} threads':<36}{contended:>8.0f} ns/call")
+    print(f"{'disabled profiler':<36}{disabled:>8.0f} ns/call")
+    print(f"{'reference: empty call pair':<36}{empty:>8.0f} ns")
+    print(f"{'reference: perf_counter_ns()':<36}{clock:>8.0f} ns")
+    print(f"\nRecorded {summary['total_method_calls']:,} calls across {summary['unique_methods']} methods")
+
+    over = [(label, overhead) for label, overhead in (("single-threaded", pair), (f"{args.threads} threads", contended))
+            if overhead > args.budget_ns]
+    if over:
+        print()
+        for label, overhead in over:
+            print(f"FAIL: {label} overhead {overhead:.0f} ns exceeds budget of {args.budget_ns:.0f} ns")
+        sys.exit(1)
+    print(f"\nOK: overhead within {args.budget_ns:.0f} ns budget, single-threaded and contended")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON vs binary storage on a .graphbus directory.
+
+Every JSON document in the directory (artifacts, contracts, coherence
+interactions, agent state) is re-encoded in each storage format and the
+on-disk size and load time compared.  Without ``--artifacts-dir`` a
+realistic directory is generated: agents with source code and method
+schemas, a dependency graph, contracts, 10k coherence interactions and
+per-node state.
+
+Usage:
+    python scripts/bench_storage.py
+    python scripts/bench_storage.py --artifacts-dir examples/hello_graphbus/.graphbus
+    python scripts/bench_storage.py --agents 200 --repeat 20
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from graphbus_core import codec  # noqa: E402
+
+
+def generate_graphbus_dir(root: Path, num_agents: int) -> None:
+    """Write a synthetic but realistically shaped .graphbus directory."""
+    rng = random.Random(42)
+    names = [f"Agent{i:03d}" for i in range(num_agents)]
+    topics = [f"/Domain{i % 12}/Event{i}" for i in range(num_agents * 2)]
+
+    agents = []
+    for name in names:
+        methods = [
+            {
+                "name": f"handle_{j}",
+                "signature": "(self, payload: dict, retries: int = 3) -> dict",
+                "docstring": "Process the payload and publish the result downstream.",
+                "schema": {"input": {"payload": "dict", "retries": "int"}, "output": {"status": "str"}},
+            }
+            for j in range(6)
+        ]
+        source = "\n".join(
+            f"    def handle_{j}(self, payload, retries=3):\n"
+            f"        result = self.process(payload)\n"
+            f"        self.publish('{rng.choice(topics)}', {{'status': 'ok', 'value': result}})\n"
+            f"        return result\n"
+            for j in range(6)
+        )
+        agents.append({
+            "name": name,
+            "module": f"project.agents.{name.lower()}",
+            "class_name": name,
+            "source_file": f"project/agents/{name.lower()}.py",
+            "source_code": f"class {name}(GraphBusNode):\n{source}",
+            "system_prompt": {"text": f"You are {name}.", "role": None, "capabilities": []},
+            "methods": methods,
+            "subscriptions": [{"topic": rng.choice(topics), "handler": "handle_0"}],
+            "dependencies": rng.sample(names, 3),
+            "is_arbiter": False,
+            "metadata": {},
+        })
+
+    graph = {
+        "nodes": [{"name": n, "data": {"node_type": "agent", "module": f"project.agents.{n.lower()}"}} for n in names],
+        "edges": [
+            {"src": n, "dst": d, "data": {"edge_type": "depends_on"}}
+            for n in names for d in rng.sample(names, 3) if d != n
+        ],
+    }
+    topics_doc = {
+        "topics": [{"name": t} for t in topics],
+        "subscriptions": [{"node_name": rng.choice(names), "topic": t, "handler_name": "handle_0"} for t in topics],
+    }
+
+    root.mkdir(parents=True, exist_ok=True)
+    for filename, doc in (("graph.json", graph), ("agents.json", agents), ("topics.json", topics_doc)):
+        (root / filename).write_text(json.dumps(doc, indent=2))
+    (root / "build_summary.json").write_text(json.dumps({"num_agents": num_agents, "agents": names}, indent=2))
+
+    contracts = root / "contracts"
+    contracts.mkdir(exist_ok=True)
+    for agent in agents:
+        contract = {
+            "agent_name": agent["name"], "version": "1.0.0",
+            "methods": {m["name"]: m["schema"] for m in agent["methods"]},
+            "publishes": {}, "subscribes": [s["topic"] for s in agent["subscriptions"]],
+            "description": "", "timestamp": datetime(2024, 1, 1).isoformat(),
+        }
+        (contracts / f"{agent['name']}_1.0.0.json").write_text(json.dumps(contract, indent=2))
+
+    start = datetime(2024, 1, 1)
+    interactions = [
+        {
+            "source": rng.choice(names), "target": rng.choice(names), "topic": rng.choice(topics),
+            "schema_version": rng.choice(["1.0.0", "1.1.0"]),
+            "payload": {"order_id": f"ord-{i}", "amount": round(rng.random() * 100, 2), "status": "ok"},
+            "timestamp": (start + timedelta(seconds=i)).isoformat(),
+            "successful": rng.random() > 0.02, "error": None,
+        }
+        for i in range(10000)
+    ]
+    coherence = root / "coherence"
+    coherence.mkdir(exist_ok=True)
+    (coherence / "interactions.json").write_text(json.dumps(interactions, indent=2))
+
+    state = root / "state"
+    state.mkdir(exist_ok=True)
+    for name in names:
+        doc = {
+            "node_name": name, "timestamp": start.isoformat(), "version": "1.0",
+            "state": {"processed": rng.randint(0, 10**6), "cache": {f"k{j}": rng.random() for j in range(200)}},
+        }
+        (state / f"{name}.json").write_text(json.dumps(doc, separators=(",", ":")))
+
+
+# Files that are always written as JSON, whatever the storage format
+JSON_ONLY = {"build_summary.json", "negotiations.json", "modified_files.json"}
+
+
+def encode(group: str, doc, storage_format: str) -> bytes:
+    """Encode ``doc`` the way GraphBus writes files of this group."""
+    if group == "state/":
+        # StateManager keeps checkpoints as compact JSON and only compresses them
+        text = json.dumps(doc, separators=(",", ":"))
+        return codec.pack_text(text) if storage_format == "binary" else text.encode("utf-8")
+    return codec.dumps(doc, storage_format)
+
+
+def decode(group: str, data: bytes):
+    if group == "state/":
+        return json.loads(codec.unpack_text(data))
+    return codec.loads(data)
+
+
+def time_load(group: str, data: bytes, repeat: int) -> float:
+    """Median seconds to decode ``data``."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decode(group, data)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def bench(root: Path, repeat: int) -> None:
+    groups = {}
+    for path in sorted(root.rglob("*.json")):
+        rel = path.relative_to(root)
+        if rel.name in JSON_ONLY:
+            continue
+        group = rel.parts[0] + "/" if len(rel.parts) > 1 else rel.name
+        groups.setdefault(group, []).append(codec.load(path))
+
+    backend = "msgpack" if codec.msgpack is not None else "compact json"
+    compression = "zstd" if codec.zstandard is not None else "zlib"
+    print(f"Directory: {root}")
+    print(f"Binary format: {backend} + {compression} (state: compact json + {compression})\n")
+    header = f"{'file':<24}{'json size':>12}{'binary size':>13}{'ratio':>8}{'json load':>12}{'binary load':>13}{'speedup':>9}"
+    print(header)
+    print("-" * len(header))
+
+    totals = [0, 0, 0.0, 0.0]
+    for group, docs in groups.items():
+        json_size = binary_size = 0
+        json_time = binary_time = 0.0
+        for doc in docs:
+            plain = encode(group, doc, "json")
+            packed = encode(group, doc, "binary")
+            json_size += len(plain)
+            binary_size += len(packed)
+            json_time += time_load(group, plain, repeat)
+            binary_time += time_load(group, packed, repeat)
+        for i, value in enumerate((json_size, binary_size, json_time, binary_time)):
+            totals[i] += value
+        print(_row(group, json_size, binary_size, json_time, binary_time))
+
+    print("-" * len(header))
+    print(_row("total", *totals))
+
+
+def _row(name, json_size, binary_size, json_time, binary_time) -> str:
+    return (
+        f"{name:<24}{json_size:>12,}{binary_size:>13,}{json_size / max(binary_size, 1):>7.1f}x"
+        f"{json_time * 1000:>10.2f}ms{binary_time * 1000:>11.2f}ms{json_time / max(binary_time, 1e-9):>8.1f}x"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--artifacts-dir", help="Existing .graphbus directory (default: generate one)")
+    parser.add_argument("--agents", type=int, default=100, help="Agents in the generated directory")
+    parser.add_argument("--repeat", type=int, default=10, help="Loads per document (median is reported)")
+    args = parser.parse_args()
+
+    if args.artifacts_dir:
+        bench(Path(args.artifacts_dir), args.repeat)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / ".graphbus"
+        generate_graphbus_dir(root, args.agents)
+        bench(root, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -219,3 +219,31 @@ class TestStateCommandHelp:
 
         assert result.exit_code == 0
         assert "Clear saved state for a specific agent" in result.output
+
+
+class TestStateConvertCommand:
+    """Test state convert command"""
+
+    def test_convert_json_to_sqlite(self, tmp_path):
+        """Test converting JSON state files into a SQLite database"""
+        from graphbus_core.runtime.state import StateManager
+
+        state_dir = tmp_path / "state"
+        StateManager(str(state_dir)).save_state("Agent1", {"counter": 42})
+
+        runner = CliRunner()
+        result = runner.invoke(state, ['convert', '--state-dir', str(state_dir), '--to', 'sqlite'])
+
+        assert result.exit_code == 0
+        assert "Converted 1 state(s)" in result.output
+        manager = StateManager(str(state_dir), backend="sqlite")
+        assert manager.load_state("Agent1") == {"counter": 42}
+
+    def test_convert_same_backend_fails(self, tmp_path):
+        """Test converting to the same backend is rejected"""
+        runner = CliRunner()
+        result = runner.invoke(
+            state, ['convert', '--state-dir', str(tmp_path), '--from', 'json', '--to', 'json']
+        )
+
+        assert result.exit_code == 1
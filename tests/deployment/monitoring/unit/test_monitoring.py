@@ -74,28 +74,151 @@ class TestPrometheusMetrics:
         metrics.observe_method_duration('Agent1', 'method1', 0.5)
         metrics.observe_method_duration('Agent1', 'method1', 0.3)
 
-        durations = metrics.method_duration_seconds['Agent1.method1']
-        assert len(durations) == 2
-        assert 0.5 in durations
-        assert 0.3 in durations
-
-    def test_observe_method_duration_limit(self, metrics):
-        """Test method duration observation limit"""
-        # Add 1001 observations (limit is 1000)
+        durations = metrics.method_duration_seconds['Agent1.method1'].total()
+        assert durations.count == 2
+        assert durations.max == 0.5
+        assert durations.min == 0.3
+
+    def test_observe_method_duration_counts_everything(self, metrics):
+        """Test count and sum cover every observation, not a fixed-size sample"""
         for i in range(1001):
             metrics.observe_method_duration('Agent1', 'method1', 0.1)
 
-        durations = metrics.method_duration_seconds['Agent1.method1']
-        assert len(durations) == 1000  # Should not exceed limit
+        durations = metrics.method_duration_seconds['Agent1.method1'].total()
+        assert durations.count == 1001
+        assert abs(durations.total - 100.1) < 1e-6
+
+    def test_quantiles_cover_sliding_window(self):
+        """Test quantiles are computed over the window while _count stays cumulative"""
+        metrics = PrometheusMetrics(window_seconds=0.05, window_slots=1)
+        metrics.observe_method_duration('Agent1', 'method1', 2.0)
+        time.sleep(0.1)
+        metrics.observe_method_duration('Agent1', 'method1', 0.01)
+
+        output = metrics.generate_prometheus_metrics()
+        labels = 'agent="Agent1",method="method1"'
+        assert f'graphbus_method_duration_seconds_count{{{labels}}} 2' in output
+        line = next(l for l in output.splitlines()
+                    if l.startswith('graphbus_method_duration_window_seconds{quantile="0.99",'))
+        assert abs(float(line.split()[-1]) - 0.01) < 0.001
+
+    def test_cumulative_histogram_buckets(self):
+        """Test durations are exported as a histogram with cumulative le buckets"""
+        metrics = PrometheusMetrics(buckets=(0.1, 1.0))
+        for duration in (0.05, 0.1, 0.5, 2.0):
+            metrics.observe_method_duration('Agent1', 'method1', duration)
+
+        output = metrics.generate_prometheus_metrics()
+        labels = 'agent="Agent1",method="method1"'
+        assert '# TYPE graphbus_method_duration_seconds histogram' in output
+        assert '# TYPE graphbus_method_duration_window_seconds summary' in output
+        assert f'graphbus_method_duration_seconds_bucket{{{labels},le="0.1"}} 2' in output
+        assert f'graphbus_method_duration_seconds_bucket{{{labels},le="1.0"}} 3' in output
+        assert f'graphbus_method_duration_seconds_bucket{{{labels},le="+Inf"}} 4' in output
+        assert f'graphbus_method_duration_seconds_sum{{{labels}}} 2.65' in output
+        # No quantile= lines in the histogram family
+        assert not any(l.startswith('graphbus_method_duration_seconds{') for l in output.splitlines())
+
+    def test_summaries_can_be_disabled(self):
+        """Test summary_quantiles=() exports histograms only"""
+        metrics = PrometheusMetrics(summary_quantiles=())
+        metrics.observe_event_duration('/t', 0.01)
+        output = metrics.generate_prometheus_metrics()
+        assert 'graphbus_event_processing_duration_seconds_count{topic="/t"} 1' in output
+        assert 'quantile=' not in output
+
+    def test_label_cardinality_cap(self):
+        """Test label values beyond max_label_sets are folded into one overflow series"""
+        metrics = PrometheusMetrics(max_label_sets=2)
+        for i in range(5):
+            metrics.increment_messages_published(f'/topic{i}')
+            metrics.observe_method_duration(f'Agent{i}', 'run', 0.01)
+        metrics.increment_messages_published('/topic0')
+
+        assert metrics.messages_published_total == {'/topic0': 2, '/topic1': 1, '__overflow__': 3}
+        output = metrics.generate_prometheus_metrics()
+        assert 'graphbus_messages_published_total{topic="__overflow__"} 3' in output
+        assert 'graphbus_method_duration_seconds_count{agent="__overflow__",method="__overflow__"} 3' in output
+        assert 'graphbus_metrics_label_overflow_total{label="topic"} 3' in output
+        assert 'graphbus_metrics_label_overflow_total{label="method"} 3' in output
+
+    def test_label_values_escaped(self, metrics):
+        """Test quotes and backslashes in label values are escaped"""
+        metrics.increment_messages_published('/say "hi"\\now')
+        output = metrics.generate_prometheus_metrics()
+        assert 'graphbus_messages_published_total{topic="/say \\"hi\\"\\\\now"} 1' in output
+
+    def test_exposition_cached_until_change(self, metrics):
+        """Test an unchanged registry reuses the rendered body"""
+        metrics.observe_method_duration('Agent1', 'method1', 0.1)
+        first = metrics.generate_prometheus_metrics()
+        cached = metrics._cached[False]
+        metrics.generate_prometheus_metrics()
+        assert metrics._cached[False] is cached
+
+        metrics.increment_method_calls('Agent1', 'method1')
+        second = metrics.generate_prometheus_metrics()
+        assert metrics._cached[False] is not cached
+        assert 'graphbus_method_calls_total' in second and 'method="method1"} 1' in second
+        metrics.set_agent_health('Agent1', False)
+        assert 'graphbus_agent_health{agent="Agent1"} 0' in metrics.generate_prometheus_metrics()
+        assert first != second
+
+    def test_exited_threads_are_retired(self, metrics):
+        """Test counts recorded by finished threads survive in the totals"""
+        import threading
+
+        def work():
+            metrics.increment_method_calls('Agent1', 'method1')
+            metrics.observe_method_duration('Agent1', 'method1', 0.2)
+
+        for _ in range(3):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        metrics.generate_prometheus_metrics()
+
+        assert len(metrics._shards) == 0
+        assert metrics.method_calls_total['Agent1.method1'] == 3
+        assert metrics.method_duration_seconds['Agent1.method1'].total().count == 3
+
+    def test_scrape_during_updates(self, metrics):
+        """Test scrapes stay well-formed while other threads record"""
+        import threading
+
+        stop = threading.Event()
+
+        def record():
+            while not stop.is_set():
+                metrics.increment_messages_published('/load')
+                metrics.observe_event_duration('/load', 0.003)
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for t in threads:
+            t.start()
+        try:
+            previous = 0
+            for _ in range(20):
+                output = metrics.generate_prometheus_metrics()
+                count = next((int(l.split()[-1]) for l in output.splitlines()
+                              if l.startswith('graphbus_event_processing_duration_seconds_count')), 0)
+                inf = next((int(l.split()[-1]) for l in output.splitlines()
+                            if 'le="+Inf"' in l), 0)
+                assert count == inf >= previous
+                previous = count
+        finally:
+            stop.set()
+            for t in threads:
+                t.join()
 
     def test_observe_event_duration(self, metrics):
         """Test observing event duration"""
         metrics.observe_event_duration('/test/topic', 0.2)
         metrics.observe_event_duration('/test/topic', 0.4)
 
-        durations = metrics.event_processing_duration_seconds['/test/topic']
-        assert len(durations) == 2
-        assert 0.2 in durations
+        durations = metrics.event_processing_duration_seconds['/test/topic'].total()
+        assert durations.count == 2
+        assert durations.min == 0.2
 
     def test_get_summary(self, metrics):
         """Test getting metrics summary"""
@@ -220,7 +343,6 @@ class TestMetricsServer:
         finally:
             server.stop()
 
-    @pytest.mark.skip(reason="Test hangs - server.stop() doesn't properly shutdown")
     def test_stop_server(self):
         """Test stopping metrics server"""
         metrics = PrometheusMetrics()
@@ -237,6 +359,132 @@ class TestMetricsServer:
             urllib.request.urlopen('http://localhost:9093/metrics')
 
 
+    @pytest.fixture
+    def server(self):
+        """Started server on a free port"""
+        metrics = PrometheusMetrics()
+        for i in range(200):
+            metrics.increment_messages_published(f'/topic/{i}', i)
+        server = MetricsServer(metrics, port=0, host='127.0.0.1')
+        server.start()
+        yield server
+        server.stop()
+
+    def get(self, server, path, **headers):
+        import urllib.request
+        request = urllib.request.Request(f'http://127.0.0.1:{server.port}{path}', headers=headers)
+        return urllib.request.urlopen(request, timeout=5)
+
+    def test_gzip_when_accepted(self, server):
+        """Test bodies are gzip-compressed for scrapers that accept it"""
+        import gzip
+
+        plain = self.get(server, '/metrics').read()
+        response = self.get(server, '/metrics', **{'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        compressed = response.read()
+        assert len(compressed) < len(plain) / 3
+        text = gzip.decompress(compressed).decode()
+        assert 'graphbus_messages_published_total{topic="/topic/199"} 199' in text
+
+    def test_openmetrics_negotiated(self, server):
+        """Test the OpenMetrics format is served when the scraper asks for it"""
+        response = self.get(server, '/metrics', Accept='application/openmetrics-text;version=1.0.0,text/plain;q=0.5')
+        assert response.headers['Content-Type'].startswith('application/openmetrics-text; version=1.0.0')
+        text = response.read().decode()
+        assert text.endswith('# EOF\n')
+        assert self.get(server, '/metrics').headers['Content-Type'].startswith('text/plain; version=0.0.4')
+
+    def test_concurrent_scrapes(self, server):
+        """Test an idle connection does not block other scrapers"""
+        import socket
+
+        with socket.create_connection(('127.0.0.1', server.port)) as idle:
+            idle.sendall(b'GET /metrics HTTP/1.1\r\n')  # never finishes its request
+            assert self.get(server, '/health').read() == b'OK'
+
+    def test_healthz_from_health_monitor(self):
+        """Test /healthz reports 503 with per-node status while a node is unhealthy"""
+        import json
+        import urllib.error
+        from types import SimpleNamespace
+        from graphbus_core.runtime.health import HealthMonitor
+
+        executor = SimpleNamespace(nodes={'Api': object(), 'Worker': object()}, inflight=None)
+        monitor = HealthMonitor(executor, failure_threshold=1)
+        server = MetricsServer(PrometheusMetrics(), port=0, host='127.0.0.1', health_monitor=monitor)
+        server.start()
+        try:
+            health = json.loads(self.get(server, '/healthz').read())
+            assert health == {'status': 'healthy', 'nodes': {'Api': 'healthy', 'Worker': 'healthy'},
+                              'unhealthy': []}
+
+            monitor.record_failure('Worker', ValueError('down'))
+            with pytest.raises(urllib.error.HTTPError) as failure:
+                self.get(server, '/healthz')
+            assert failure.value.code == 503
+            health = json.loads(failure.value.read())
+            assert health['status'] == 'unhealthy'
+            assert health['unhealthy'] == ['Worker']
+        finally:
+            server.stop()
+
+
+class TestOpenMetrics:
+    """Test the OpenMetrics exposition"""
+
+    def test_counter_families_and_eof(self):
+        """Test counter families drop _total, blank lines are gone and the body ends with # EOF"""
+        metrics = PrometheusMetrics()
+        metrics.increment_messages_published('/t', 2)
+        output = metrics.generate_openmetrics()
+
+        assert '# TYPE graphbus_messages_published counter' in output
+        assert '# HELP graphbus_messages_published Total number of messages published' in output
+        assert 'graphbus_messages_published_total{topic="/t"} 2' in output
+        assert '# TYPE graphbus_uptime_seconds gauge' in output
+        assert output.endswith('\n# EOF\n')
+        assert '' not in output.splitlines()
+
+    def test_exemplars_link_traces(self):
+        """Test bucket lines carry the latest traced observation as an exemplar"""
+        metrics = PrometheusMetrics(buckets=(0.1, 1.0))
+        metrics.observe_method_duration('Agent1', 'method1', 0.05, trace_id='trace-a')
+        metrics.observe_method_duration('Agent1', 'method1', 0.07, trace_id='trace-b')
+        metrics.observe_method_duration('Agent1', 'method1', 0.5)
+
+        lines = metrics.generate_openmetrics().splitlines()
+        labels = 'agent="Agent1",method="method1"'
+        first = next(l for l in lines if l.startswith(f'graphbus_method_duration_seconds_bucket{{{labels},le="0.1"}}'))
+        assert first.startswith(f'graphbus_method_duration_seconds_bucket{{{labels},le="0.1"}} 2 # {{trace_id="trace-b"}} 0.07 ')
+        second = next(l for l in lines if f'{labels},le="1.0"' in l)
+        assert '#' not in second
+
+        # The Prometheus text format has no exemplars
+        assert 'trace_id' not in metrics.generate_prometheus_metrics()
+
+    def test_runtime_exemplars(self):
+        """Test traced runtime calls record their trace ID"""
+        from graphbus_core.config import RuntimeConfig
+        from graphbus_core.node_base import GraphBusNode
+        from graphbus_core.runtime.executor import RuntimeExecutor
+
+        class Api(GraphBusNode):
+            def ping(self):
+                return 'pong'
+
+        executor = RuntimeExecutor(RuntimeConfig(enable_tracing=True))
+        executor.nodes = {'Api': Api()}
+        executor.nodes['Api'].name = 'Api'
+        executor._is_running = True
+        metrics = executor.setup_metrics()
+        executor.call_method('Api', 'ping')
+
+        trace_id = executor.tracer.recent[-1].trace_id
+        assert f'trace_id="{trace_id}"' in metrics.generate_openmetrics()
+        executor.stop()
+
+
 class TestMetricsIntegration:
     """Integration tests for metrics"""
 
@@ -289,3 +537,148 @@ class TestMetricsIntegration:
         assert summary['messages_published'] == 30  # 3 topics * 10 messages
         assert summary['topics_tracked'] == 3
         assert summary['methods_tracked'] == 3
+
+
+class TestBulkheadMetrics:
+    """Test bulkhead stats in the Prometheus exposition"""
+
+    def test_bulkhead_families(self):
+        from graphbus_core.runtime.bulkhead import BulkheadRegistry, BulkheadSpec
+
+        registry = BulkheadRegistry()
+        bh = registry.configure("Agent1.method1", BulkheadSpec(max_concurrent=1, policy="fail_fast"))
+        bh.acquire()
+        with pytest.raises(Exception):
+            bh.acquire()
+
+        metrics = PrometheusMetrics()
+        metrics.track_bulkheads(registry)
+        output = metrics.generate_prometheus_metrics()
+
+        assert '# TYPE graphbus_bulkhead_rejected_total counter' in output
+        assert 'graphbus_bulkhead_active{scope="Agent1.method1"} 1' in output
+        assert 'graphbus_bulkhead_rejected_total{scope="Agent1.method1"} 1' in output
+
+
+class TestRuntimeMetrics:
+    """Test metrics fed automatically by the bus, router and executor"""
+
+    @pytest.fixture
+    def executor(self):
+        """Running executor with Api -> Worker and metrics wired in"""
+        from graphbus_core.config import RuntimeConfig
+        from graphbus_core.model.topic import Subscription, Topic
+        from graphbus_core.node_base import GraphBusNode
+        from graphbus_core.runtime.event_router import EventRouter
+        from graphbus_core.runtime.executor import RuntimeExecutor
+        from graphbus_core.runtime.message_bus import MessageBus
+
+        class Api(GraphBusNode):
+            def submit(self, job):
+                self.publish('/jobs', {'job': job})
+
+        class Worker(GraphBusNode):
+            def on_job(self, payload):
+                if payload['job'] < 0:
+                    raise ValueError('bad job')
+
+        executor = RuntimeExecutor(RuntimeConfig())
+        executor.nodes = {'Api': Api(), 'Worker': Worker()}
+        executor.bus = MessageBus()
+        executor.router = EventRouter(executor.bus, executor.nodes, inflight=executor.inflight)
+        for name, node in executor.nodes.items():
+            node.name = name
+            node.bus = executor.bus
+        executor.router.register_subscription(Subscription('Worker', Topic('/jobs'), 'on_job'))
+        executor.setup_metrics()
+        executor._is_running = True
+        yield executor
+        executor.stop()
+
+    def test_runtime_feeds_metrics(self, executor):
+        """Test publishes, deliveries, calls, errors and gauges are recorded without manual calls"""
+        for job in (1, 2, -1):
+            executor.call_method('Api', 'submit', job=job)
+        with pytest.raises(ValueError):
+            executor.call_method('Api', 'missing')
+
+        metrics = executor.metrics
+        assert executor.bus.metrics is metrics and executor.router.metrics is metrics
+        assert metrics.messages_published_total == {'/jobs': 3}
+        assert metrics.messages_delivered_total == {'/jobs': 3}
+        assert metrics.method_calls_total == {'Api.submit': 3, 'Worker.on_job': 3}
+        assert metrics.method_errors_total == {'Worker.on_job': 1}
+        assert metrics.method_duration_seconds['Worker.on_job'].total().count == 3
+        assert metrics.event_processing_duration_seconds['/jobs'].total().count == 3
+
+        output = metrics.generate_prometheus_metrics()
+        assert 'graphbus_active_agents 2' in output
+        assert 'graphbus_method_errors_total{agent="Worker",method="on_job"} 1' in output
+
+    def test_queue_depth_and_health_from_runtime(self, executor):
+        """Test in-flight deliveries and unhealthy nodes show up at scrape time"""
+        from graphbus_core.runtime.health import HealthMonitor
+
+        executor.health_monitor = HealthMonitor(executor, failure_threshold=1)
+        executor.health_monitor.record_failure('Worker', ValueError('down'))
+        metrics = executor.metrics
+
+        with executor.inflight.track(node='Worker', topic='/jobs'):
+            output = metrics.generate_prometheus_metrics()
+        assert 'graphbus_message_queue_depth{topic="/jobs"} 1' in output
+        assert 'graphbus_active_agents 1' in output
+        assert 'graphbus_agent_health{agent="Worker"} 0' in output
+        assert 'graphbus_agent_health{agent="Api"} 1' in output
+
+        assert 'graphbus_message_queue_depth{topic="/jobs"} 0' in metrics.generate_prometheus_metrics()
+
+    def test_scrape_metrics_server_under_load(self, executor):
+        """Test /metrics stays consistent while several threads drive the runtime"""
+        import socket
+        import threading
+        import urllib.request
+
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        server = MetricsServer(executor.metrics, port=port)
+        server.start()
+
+        def value(text, prefix):
+            return next((float(l.split()[-1]) for l in text.splitlines() if l.startswith(prefix)), 0.0)
+
+        stop = threading.Event()
+        per_thread = []
+
+        def drive():
+            n = 0
+            while not stop.is_set():
+                executor.call_method('Api', 'submit', job=n)
+                n += 1
+            per_thread.append(n)
+
+        workers = [threading.Thread(target=drive) for _ in range(4)]
+        for t in workers:
+            t.start()
+        try:
+            previous = 0.0
+            for _ in range(15):
+                body = urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics', timeout=5).read().decode()
+                published = value(body, 'graphbus_messages_published_total{topic="/jobs"}')
+                buckets = value(body, 'graphbus_method_duration_seconds_bucket{agent="Worker",method="on_job",le="+Inf"}')
+                count = value(body, 'graphbus_method_duration_seconds_count{agent="Worker",method="on_job"}')
+                assert published >= previous
+                assert buckets == count
+                previous = published
+        finally:
+            stop.set()
+            for t in workers:
+                t.join()
+            server.stop()
+
+        total = sum(per_thread)
+        assert total > 0
+        assert executor.metrics.messages_published_total['/jobs'] == total
+        assert executor.metrics.method_calls_total['Worker.on_job'] == total
+        assert 'graphbus_messages_published_total{topic="/jobs"} %d' % total in \
+            executor.metrics.generate_prometheus_metrics()
@@ -2,6 +2,7 @@
 Unit tests for CoherenceTracker
 """
 
+import json
 import pytest
 import tempfile
 import shutil
@@ -12,7 +13,7 @@ import networkx as nx
 
 from graphbus_core.runtime.coherence import (
     CoherenceTracker, CoherenceMetrics, CoherenceLevel, DriftWarning,
-    Interaction, CoherenceReport
+    Interaction, CoherenceReport, InteractionLog, payload_hash
 )
 
 
@@ -352,6 +353,27 @@ class TestCoherenceTracker:
 
         assert len(new_tracker.interactions) == 1
 
+    def test_binary_persistence(self, temp_dir, sample_graph):
+        """Test interactions written in the binary storage format load back"""
+        tracker = CoherenceTracker(storage_path=temp_dir, graph=sample_graph, storage_format="binary")
+        for i in range(3):
+            tracker.track_interaction(
+                source="AgentA", target="AgentB", topic="/test/topic",
+                schema_version="1.0.0", payload={"i": i}, successful=True
+            )
+        tracker.save()
+
+        assert (Path(temp_dir) / "interactions.json").read_bytes().startswith(b"GBC1")
+
+        new_tracker = CoherenceTracker(storage_path=temp_dir, graph=sample_graph)
+        assert [i.payload_hash for i in new_tracker.interactions] == [payload_hash({"i": i}) for i in range(3)]
+        assert new_tracker.topic_versions["/test/topic"]["1.0.0"] == 3
+
+    def test_invalid_storage_format(self, temp_dir):
+        """Test unknown storage formats are rejected"""
+        with pytest.raises(ValueError):
+            CoherenceTracker(storage_path=temp_dir, storage_format="xml")
+
     def test_get_coherence_level(self):
         """Test coherence level classification"""
         metrics_high = CoherenceMetrics(
@@ -515,6 +537,94 @@ class TestInteraction:
         assert record.successful is True
 
 
+class TestInteractionLog:
+    """Test the columnar interaction ring"""
+
+    def test_overwrites_oldest_when_full(self):
+        """Test the log keeps the newest interactions in order"""
+        log = InteractionLog(capacity=3)
+        for i in range(5):
+            log.record("AgentA", "AgentB", "/t", f"{i}.0.0", timestamp=1000.0 + i, successful=i != 3,
+                       error="boom" if i == 3 else None)
+
+        assert len(log) == 3 and log.total == 5
+        assert [i.schema_version for i in log] == ["2.0.0", "3.0.0", "4.0.0"]
+        assert log[-1].timestamp == datetime.fromtimestamp(1004.0)
+        assert log[1].error == "boom" and log[1].successful is False
+        assert log.errors() == {1: "boom"}
+
+        versions, successful = log.columns("schema_version", "successful")
+        assert [log.symbols[v] for v in versions] == ["2.0.0", "3.0.0", "4.0.0"]
+        assert list(successful) == [1, 0, 1]
+
+        with pytest.raises(IndexError):
+            log[3]
+
+    def test_append_reduces_payload_to_hash(self):
+        """Test appended Interaction records keep only a payload hash"""
+        log = InteractionLog()
+        log.append(Interaction(source="AgentA", target="AgentB", topic="/t", schema_version="1.0.0",
+                               payload={"b": 2, "a": 1}, timestamp=datetime.now()))
+
+        assert log[0].payload is None
+        assert log[0].payload_hash == payload_hash({"a": 1, "b": 2})
+        assert payload_hash({"a": 1}) != payload_hash({"a": 2})
+
+    def test_round_trip_keeps_newest(self):
+        """Test to_dict/from_dict, shrinking to a smaller capacity"""
+        log = InteractionLog(capacity=4)
+        for i in range(6):
+            log.record(f"Agent{i}", "Sink", "/t", "1.0.0", timestamp=float(i), successful=i != 5,
+                       error="boom" if i == 5 else None)
+
+        restored = InteractionLog.from_dict(log.to_dict(), capacity=2)
+        assert [i.source for i in restored] == ["Agent4", "Agent5"]
+        assert restored[1].error == "boom"
+        assert InteractionLog.from_dict(log.to_dict()) == log
+
+    def test_tracker_journals_then_compacts(self, temp_dir):
+        """Test periodic saves append to the journal until it holds a whole ring"""
+        tracker = CoherenceTracker(storage_path=temp_dir, capacity=250)
+        snapshot = Path(temp_dir) / "interactions.json"
+
+        def track(count):
+            for i in range(count):
+                tracker.track_interaction("AgentA", "AgentB", "/t", "1.0.0", payload={"i": i},
+                                          successful=i != 0, error=None if i else "boom")
+
+        track(CoherenceTracker.SAVE_INTERVAL * 2)
+        assert not snapshot.exists()
+        assert len(tracker.journal_path.read_text().splitlines()) == 2
+
+        reloaded = CoherenceTracker(storage_path=temp_dir, capacity=250)
+        assert reloaded.interactions == tracker.interactions
+        assert reloaded.interactions[0].error == "boom"
+
+        track(CoherenceTracker.SAVE_INTERVAL)
+        assert snapshot.exists() and not tracker.journal_path.exists()
+        assert len(tracker.interactions) == 250
+        assert tracker.topic_versions["/t"]["1.0.0"] == 300
+
+        reloaded = CoherenceTracker(storage_path=temp_dir, capacity=250)
+        assert reloaded.interactions == tracker.interactions
+        assert reloaded.topic_versions["/t"]["1.0.0"] == 250
+
+    def test_loads_list_format(self, temp_dir):
+        """Test interactions.json written as a list of records still loads"""
+        records = [
+            Interaction(source="AgentA", target="AgentB", topic="/t", schema_version=version,
+                        payload={"n": n}, timestamp=datetime(2024, 1, 1, 12, n)).to_dict()
+            for n, version in enumerate(["1.0.0", "1.0.0", "2.0.0"])
+        ]
+        (Path(temp_dir) / "interactions.json").write_text(json.dumps(records))
+
+        tracker = CoherenceTracker(storage_path=temp_dir, capacity=2)
+        assert [i.schema_version for i in tracker.interactions] == ["1.0.0", "2.0.0"]
+        assert tracker.interactions[0].timestamp == datetime(2024, 1, 1, 12, 1)
+        assert tracker.interactions[0].payload_hash == payload_hash({"n": 1})
+        assert dict(tracker.topic_versions["/t"]) == {"1.0.0": 1, "2.0.0": 1}
+
+
 class TestCoherenceReport:
     """Test CoherenceReport dataclass"""
 
@@ -129,6 +129,19 @@ class TestContractManager:
         assert contract is not None
         assert contract.version == "1.0.0"
 
+    def test_binary_contract_persistence(self, temp_dir, sample_schema):
+        """Test contracts written in the binary storage format load back"""
+        manager = ContractManager(storage_path=temp_dir, storage_format="binary")
+        manager.register_contract("OrderProcessor", "1.0.0", sample_schema)
+
+        contract_file = Path(temp_dir) / "OrderProcessor_1.0.0.json"
+        assert contract_file.read_bytes().startswith(b"GBC1")
+
+        new_manager = ContractManager(storage_path=temp_dir)
+        contract = new_manager.get_contract("OrderProcessor", "1.0.0")
+        assert contract is not None
+        assert "process_order" in contract.methods
+
     def test_get_migration_path(self, contract_manager, sample_schema):
         """Test getting migration path between versions"""
         contract_manager.register_contract("Agent", "1.0.0", sample_schema)
@@ -5,10 +5,11 @@ Functional tests for health monitoring workflow
 import pytest
 import types
 import sys
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 
 from graphbus_core.config import RuntimeConfig
 from graphbus_core.runtime.executor import RuntimeExecutor
+from graphbus_core.exceptions import NodeRestartingError
 from graphbus_core.runtime.health import HealthStatus, RestartPolicy
 from graphbus_core.node_base import GraphBusNode
 
@@ -174,8 +175,7 @@ class TestHealthMonitoringWorkflow:
         finally:
             del sys.modules['unreliable_module']
 
-    @patch('time.sleep')
-    def test_auto_restart_workflow(self, mock_sleep, artifacts_dir):
+    def test_auto_restart_workflow(self, artifacts_dir):
         """Test auto-restart on agent failure."""
         unreliable_module = types.ModuleType('unreliable_module')
         unreliable_module.UnreliableAgent = UnreliableAgent
@@ -209,6 +209,11 @@ class TestHealthMonitoringWorkflow:
                 except ValueError:
                     pass
 
+            # Calls fail fast while the supervisor restarts the agent
+            with pytest.raises(NodeRestartingError):
+                executor.call_method("UnreliableAgent", "process", value=5)
+            assert executor.health_monitor.wait_for_restarts(timeout=5)
+
             # Verify restart was attempted
             history = executor.hot_reload_manager.get_reload_history()
             assert len(history) > 0
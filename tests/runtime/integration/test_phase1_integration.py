@@ -14,7 +14,8 @@ from unittest.mock import patch
 
 from graphbus_core.config import RuntimeConfig
 from graphbus_core.runtime.executor import RuntimeExecutor
-from graphbus_core.runtime.health import HealthStatus
+from graphbus_core.exceptions import NodeRestartingError
+from graphbus_core.runtime.health import HealthStatus, RestartPolicy
 from graphbus_core.node_base import GraphBusNode
 
 
@@ -304,6 +305,7 @@ class TestPhase1Integration:
 
             # Enable auto-restart
             executor.health_monitor.enable_auto_restart = True
+            executor.health_monitor.restart_policy = RestartPolicy(initial_delay_seconds=0.1)
 
             # Build up state
             for i in range(5):
@@ -322,8 +324,9 @@ class TestPhase1Integration:
             for _ in range(10):
                 try:
                     executor.call_method("StatefulAgent", "process", value=1)
-                except ValueError:
+                except (ValueError, NodeRestartingError):
                     pass
+            assert executor.health_monitor.wait_for_restarts(timeout=5)
 
             # Check that restart was attempted
             history = executor.hot_reload_manager.get_reload_history()
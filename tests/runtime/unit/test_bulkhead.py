@@ -0,0 +1,307 @@
+"""
+Unit tests for bulkheads (per-node concurrency and rate limits)
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from graphbus_core.config import RuntimeConfig
+from graphbus_core.decorators import bulkhead
+from graphbus_core.exceptions import BulkheadRejectedError
+from graphbus_core.model.topic import Subscription, Topic
+from graphbus_core.node_base import GraphBusNode
+from graphbus_core.runtime.bulkhead import (
+    Bulkhead,
+    BulkheadRegistry,
+    BulkheadSpec,
+    TokenBucket,
+)
+from graphbus_core.runtime.event_router import EventRouter
+from graphbus_core.runtime.health import HealthStatus
+from graphbus_core.runtime.executor import RuntimeExecutor
+from graphbus_core.runtime.message_bus import MessageBus
+
+
+@bulkhead(max_concurrent=2)
+class LimitedNode(GraphBusNode):
+    """Node with a node-level and a method-level bulkhead"""
+
+    @bulkhead(rate=1, burst=1, policy="fail_fast")
+    def rare(self):
+        return "ok"
+
+    @bulkhead(rate=1, burst=1, policy="fail_fast")
+    async def rare_async(self):
+        return "ok"
+
+    def wait(self, event: threading.Event):
+        event.wait(1)
+        return "done"
+
+
+@bulkhead(max_concurrent=1)
+class ChainNode(GraphBusNode):
+    """Single-slot node whose handler publishes to its own other handler"""
+
+    def on_start(self, payload):
+        self.publish("/Chain/Next", payload)
+
+    async def start_async(self, payload):
+        self.publish("/Chain/Next", payload)
+        return "started"
+
+    def on_next(self, payload):
+        self.seen = payload
+
+
+class TestTokenBucket:
+    """Test TokenBucket"""
+
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+
+        assert bucket.try_acquire() == 0.0
+        assert bucket.try_acquire() == 0.0
+        assert bucket.try_acquire() > 0.0
+
+    def test_refill(self):
+        bucket = TokenBucket(rate=100, capacity=1)
+        bucket.try_acquire()
+        time.sleep(0.02)
+        assert bucket.try_acquire() == 0.0
+
+
+class TestBulkhead:
+    """Test Bulkhead"""
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            BulkheadSpec(policy="drop")
+
+    def test_invalid_burst(self):
+        with pytest.raises(ValueError):
+            BulkheadSpec(rate=10, burst=0.5)
+
+    def test_fail_fast_concurrency(self):
+        bh = Bulkhead("Node", BulkheadSpec(max_concurrent=1, policy="fail_fast"))
+
+        with bh:
+            with pytest.raises(BulkheadRejectedError) as exc_info:
+                bh.acquire()
+            assert exc_info.value.scope == "Node"
+
+        stats = bh.get_stats()
+        assert stats["accepted_total"] == 1
+        assert stats["rejected_total"] == 1
+        assert stats["active"] == 0
+
+    def test_queue_waits_for_slot(self):
+        bh = Bulkhead("Node", BulkheadSpec(max_concurrent=1, policy="queue"))
+        order = []
+
+        bh.acquire()
+
+        def worker():
+            with bh:
+                order.append("worker")
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        time.sleep(0.05)
+        assert bh.get_stats()["waiting"] == 1
+
+        order.append("main")
+        bh.release()
+        thread.join(1)
+
+        assert order == ["main", "worker"]
+        assert bh.get_stats()["queued_total"] == 1
+
+    def test_queue_timeout(self):
+        bh = Bulkhead("Node", BulkheadSpec(max_concurrent=1, timeout=0.05))
+        bh.acquire()
+
+        with pytest.raises(BulkheadRejectedError):
+            bh.acquire()
+
+        assert bh.get_stats()["waiting"] == 0
+
+    def test_rate_limit_fail_fast(self):
+        bh = Bulkhead("Node.m", BulkheadSpec(rate=1, burst=1, policy="fail_fast"))
+
+        with bh:
+            pass
+        with pytest.raises(BulkheadRejectedError):
+            bh.acquire()
+
+    def test_rate_limit_queue(self):
+        bh = Bulkhead("Node.m", BulkheadSpec(rate=50, burst=1))
+
+        start = time.monotonic()
+        for _ in range(3):
+            with bh:
+                pass
+
+        assert time.monotonic() - start >= 0.03
+
+
+class TestBulkheadRegistry:
+    """Test BulkheadRegistry"""
+
+    def test_configure_node_from_decorators(self):
+        registry = BulkheadRegistry()
+        registry.configure_node("Limited", LimitedNode())
+
+        assert registry.get("Limited").spec.max_concurrent == 2
+        assert registry.get("Limited.rare").spec.policy == "fail_fast"
+        assert [b.name for b in registry.resolve("Limited", "rare")] == ["Limited", "Limited.rare"]
+        assert [b.name for b in registry.resolve("Limited", "wait")] == ["Limited"]
+
+    def test_guard_releases_on_rejection(self):
+        registry = BulkheadRegistry()
+        registry.configure("N", BulkheadSpec(max_concurrent=1))
+        registry.configure("N.m", BulkheadSpec(rate=1, burst=1, policy="fail_fast"))
+
+        with registry.guard("N", "m"):
+            pass
+        with pytest.raises(BulkheadRejectedError):
+            with registry.guard("N", "m"):
+                pass
+
+        assert registry.get("N").get_stats()["active"] == 0
+
+    def test_nested_guard_reenters_held_scope(self):
+        registry = BulkheadRegistry()
+        node = registry.configure("N", BulkheadSpec(max_concurrent=1, timeout=0.05))
+        method = registry.configure("N.other", BulkheadSpec(max_concurrent=1, policy="fail_fast"))
+
+        with registry.guard("N", "m"):
+            with registry.guard("N", "other"):
+                assert node.active == 1 and method.active == 1
+            assert method.active == 0
+        assert node.get_stats()["accepted_total"] == 1
+        assert node.active == 0
+
+        # Other threads still queue on the slot
+        held = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with registry.guard("N", "m"):
+                held.set()
+                release.wait(1)
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        held.wait(1)
+        with pytest.raises(BulkheadRejectedError):
+            with registry.guard("N", "m"):
+                pass
+        release.set()
+        thread.join(1)
+
+    def test_remove_node(self):
+        registry = BulkheadRegistry()
+        registry.configure("N", BulkheadSpec(max_concurrent=1))
+        registry.configure("N.m", BulkheadSpec(max_concurrent=1))
+        registry.configure("Other", BulkheadSpec(max_concurrent=1))
+
+        registry.remove_node("N")
+
+        assert list(registry.get_stats()) == ["Other"]
+
+
+class TestExecutorBulkheads:
+    """Test bulkhead enforcement in RuntimeExecutor"""
+
+    @pytest.fixture
+    def executor(self):
+        config = RuntimeConfig(bulkheads={"Limited.wait": {"max_concurrent": 1, "policy": "fail_fast"}})
+        executor = RuntimeExecutor(config)
+        executor.nodes = {"Limited": LimitedNode()}
+        executor.setup_bulkheads()
+        executor._is_running = True
+        return executor
+
+    def test_config_overrides_and_stats(self, executor):
+        assert executor.call_method("Limited", "rare") == "ok"
+        with pytest.raises(BulkheadRejectedError):
+            executor.call_method("Limited", "rare")
+
+        stats = executor.get_stats()["bulkheads"]
+        assert stats["Limited.rare"]["rejected_total"] == 1
+        assert stats["Limited.wait"]["max_concurrent"] == 1
+
+    def test_concurrent_call_rejected(self, executor):
+        release = threading.Event()
+        thread = threading.Thread(
+            target=executor.call_method, args=("Limited", "wait"), kwargs={"event": release}
+        )
+        thread.start()
+        time.sleep(0.05)
+
+        with pytest.raises(BulkheadRejectedError):
+            executor.call_method("Limited", "wait", event=release)
+
+        release.set()
+        thread.join(1)
+
+    def test_rejections_do_not_count_against_health(self, executor):
+        executor.setup_health_monitoring()
+
+        assert executor.call_method("Limited", "rare") == "ok"
+        assert asyncio.run(executor.call_method_async("Limited", "rare_async")) == "ok"
+        for _ in range(5):
+            with pytest.raises(BulkheadRejectedError):
+                executor.call_method("Limited", "rare")
+            with pytest.raises(BulkheadRejectedError):
+                asyncio.run(executor.call_method_async("Limited", "rare_async"))
+
+        metrics = executor.health_monitor.get_metrics("Limited")
+        assert metrics.failed_calls == 0
+        assert metrics.status == HealthStatus.HEALTHY
+
+    def test_handler_publishing_to_own_node_does_not_deadlock(self, executor):
+        bus = MessageBus()
+        node = ChainNode()
+        node.name = "Chain"
+        node.bus = bus
+        executor.nodes["Chain"] = node
+        executor.bulkheads.configure_node("Chain", node)
+        router = EventRouter(bus, executor.nodes, bulkheads=executor.bulkheads)
+        router.register_subscription(Subscription("Chain", Topic("/Chain/Start"), "on_start"))
+        router.register_subscription(Subscription("Chain", Topic("/Chain/Next"), "on_next"))
+
+        thread = threading.Thread(target=bus.publish, args=("/Chain/Start", {"n": 1}), daemon=True)
+        thread.start()
+        thread.join(2)
+
+        assert not thread.is_alive()
+        assert node.seen == {"n": 1}
+        assert executor.bulkheads.get("Chain").get_stats()["active"] == 0
+
+    def test_coroutine_publishing_to_own_node_does_not_deadlock(self, executor):
+        bus = MessageBus()
+        node = ChainNode()
+        node.name = "Chain"
+        node.bus = bus
+        executor.nodes["Chain"] = node
+        executor.bulkheads.configure_node("Chain", node)
+        router = EventRouter(bus, executor.nodes, bulkheads=executor.bulkheads)
+        router.register_subscription(Subscription("Chain", Topic("/Chain/Next"), "on_next"))
+        results = []
+
+        def run():
+            results.append(asyncio.run(executor.call_method_async("Chain", "start_async", payload={"n": 2})))
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(2)
+
+        assert not thread.is_alive()
+        assert results == ["started"]
+        assert node.seen == {"n": 2}
+        assert executor.bulkheads.get("Chain").get_stats()["active"] == 0
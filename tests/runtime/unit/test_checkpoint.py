@@ -0,0 +1,308 @@
+"""
+Unit tests for coordinated checkpoints
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from graphbus_core import codec
+from graphbus_core.config import RuntimeConfig
+from graphbus_core.model.topic import Subscription, Topic
+from graphbus_core.node_base import GraphBusNode
+from graphbus_core.runtime.checkpoint import CheckpointStore, SnapshotBarrier
+from graphbus_core.runtime.event_router import EventRouter
+from graphbus_core.runtime.executor import RuntimeExecutor
+from graphbus_core.runtime.message_bus import MessageBus
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate():
+        if time.time() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+class Producer(GraphBusNode):
+    """Counts /Inc events and forwards each one to the consumer"""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        self.release = threading.Event()
+        self.release.set()
+        self.entered = threading.Event()
+
+    def on_inc(self, payload):
+        self.count += 1
+        self.publish("/Forward", {"n": self.count})
+
+    def on_slow(self, payload):
+        self.entered.set()
+        self.release.wait(5)
+        self.count += 1
+        self.publish("/Forward", {"n": self.count})
+
+    def take_checkpoint(self, executor):
+        return executor.checkpoint()
+
+    def get_state(self):
+        return {"count": self.count}
+
+    def set_state(self, state):
+        self.count = state["count"]
+
+
+class Consumer(GraphBusNode):
+    """Counts forwarded events"""
+
+    def __init__(self):
+        super().__init__()
+        self.received = 0
+
+    def on_forward(self, payload):
+        self.received += 1
+
+    def get_state(self):
+        return {"received": self.received}
+
+    def set_state(self, state):
+        self.received = state["received"]
+
+
+@pytest.fixture
+def executor(tmp_path):
+    """Running executor with a producer -> consumer pipeline"""
+    executor = RuntimeExecutor(RuntimeConfig(checkpoint_dir=str(tmp_path / "ckpt"), drain_timeout=1))
+    executor.nodes = {"Producer": Producer(), "Consumer": Consumer()}
+    executor.bus = MessageBus()
+    executor.router = EventRouter(executor.bus, executor.nodes, inflight=executor.inflight)
+    for name, node in executor.nodes.items():
+        node.name = name
+        node.bus = executor.bus
+    for node_name, topic, handler in [
+        ("Producer", "/Inc", "on_inc"),
+        ("Producer", "/Slow", "on_slow"),
+        ("Consumer", "/Forward", "on_forward"),
+    ]:
+        executor.router.register_subscription(Subscription(node_name, Topic(topic), handler))
+    executor._is_running = True
+    yield executor
+    executor.nodes["Producer"].release.set()
+    if executor._is_running:
+        executor.stop()
+
+
+class TestCoordinatedCheckpoint:
+    """Tests for RuntimeExecutor.checkpoint / restore_checkpoint"""
+
+    def test_checkpoint_and_restore(self, executor):
+        for _ in range(3):
+            executor.publish("/Inc", {})
+        summary = executor.checkpoint()
+
+        assert summary["sequence"] == 1
+        assert summary["nodes"] == 2
+        assert summary["pending_events"] == 0
+        assert executor.get_stats()["last_checkpoint"] == summary
+
+        for _ in range(2):
+            executor.publish("/Inc", {})
+        result = executor.restore_checkpoint()
+
+        assert result["sequence"] == 1
+        assert sorted(result["restored"]) == ["Consumer", "Producer"]
+        assert executor.nodes["Producer"].count == 3
+        assert executor.nodes["Consumer"].received == 3
+
+    def test_waits_for_in_flight_cascade(self, executor):
+        producer = executor.nodes["Producer"]
+        producer.release.clear()
+        publisher = threading.Thread(target=executor.publish, args=("/Slow", {}))
+        publisher.start()
+        assert producer.entered.wait(5)
+
+        result = {}
+        checkpointer = threading.Thread(target=lambda: result.update(executor.checkpoint()))
+        checkpointer.start()
+        wait_for(lambda: executor._barrier.is_raised)
+        time.sleep(0.05)
+        assert checkpointer.is_alive()  # still waiting for the slow handler
+
+        producer.release.set()
+        checkpointer.join(5)
+        publisher.join(5)
+
+        document = executor.checkpoint_store.load(result["sequence"])
+        # The slow delivery and the event it forwarded are both inside the cut
+        assert document["nodes"] == {"Producer": {"count": 1}, "Consumer": {"received": 1}}
+
+    def test_held_publish_is_recorded_and_replayed(self, executor):
+        producer = executor.nodes["Producer"]
+        producer.release.clear()
+        threading.Thread(target=executor.publish, args=("/Slow", {})).start()
+        assert producer.entered.wait(5)
+
+        result = {}
+        checkpointer = threading.Thread(target=lambda: result.update(executor.checkpoint()))
+        checkpointer.start()
+        wait_for(lambda: executor._barrier.is_raised)
+
+        late = threading.Thread(target=executor.publish, args=("/Inc", {"late": True}, "client"))
+        late.start()
+        wait_for(lambda: executor._barrier.held_total == 1)
+        assert producer.count == 0  # held, not delivered
+
+        producer.release.set()
+        checkpointer.join(5)
+        late.join(5)
+
+        assert result["pending_events"] == 1
+        document = executor.checkpoint_store.load()
+        assert document["nodes"]["Producer"] == {"count": 1}
+        assert [(e["topic"], e["payload"], e["source"]) for e in document["pending_events"]] == [
+            ("/Inc", {"late": True}, "client")
+        ]
+
+        # After the barrier the held publish went through
+        assert producer.count == 2
+
+        restored = executor.restore_checkpoint()
+        assert restored["replayed"] == 1
+        # State at the cut plus the replayed in-transit event, counted once
+        assert producer.count == 2
+        assert executor.nodes["Consumer"].received == 2
+
+    def test_timeout_releases_barrier(self, executor):
+        producer = executor.nodes["Producer"]
+        producer.release.clear()
+        publisher = threading.Thread(target=executor.publish, args=("/Slow", {}))
+        publisher.start()
+        assert producer.entered.wait(5)
+
+        with pytest.raises(TimeoutError):
+            executor.checkpoint(timeout=0.1)
+
+        assert not executor._barrier.is_raised
+        assert executor.list_checkpoints() == []
+        producer.release.set()
+        publisher.join(5)
+
+    def test_rejected_from_inside_node_method(self, executor):
+        with pytest.raises(RuntimeError, match="inside a handler"):
+            executor.call_method("Producer", "take_checkpoint", executor=executor)
+        assert not executor._barrier.is_raised
+
+    def test_requires_running_executor(self, tmp_path):
+        executor = RuntimeExecutor(RuntimeConfig(checkpoint_dir=str(tmp_path)))
+        with pytest.raises(RuntimeError):
+            executor.checkpoint()
+
+    def test_restore_skips_unknown_nodes(self, executor):
+        executor.checkpoint()
+        del executor.nodes["Consumer"]
+
+        result = executor.restore_checkpoint()
+        assert result["skipped"] == ["Consumer"]
+
+    def test_binary_checkpoints(self, executor):
+        executor.config.storage_format = "binary"
+        executor.publish("/Inc", {})
+        summary = executor.checkpoint()
+
+        with open(summary["path"], "rb") as f:
+            assert f.read(4) == codec.MAGIC
+        executor.nodes["Producer"].count = 99
+        executor.restore_checkpoint()
+        assert executor.nodes["Producer"].count == 1
+
+
+class TestCheckpointStore:
+    """Tests for versioned checkpoint files"""
+
+    def _document(self, sequence):
+        return {"format_version": 1, "checkpoint_id": f"c{sequence}", "sequence": sequence,
+                "nodes": {"A": {"v": sequence}}, "pending_events": []}
+
+    def test_sequences_and_retention(self, tmp_path):
+        store = CheckpointStore(tmp_path, retention=2)
+        for _ in range(4):
+            sequence = store.next_sequence()
+            store.write(sequence, store.encode(self._document(sequence)))
+
+        assert store.sequences() == [3, 4]
+        assert store.load()["nodes"] == {"A": {"v": 4}}
+        assert store.load(3)["checkpoint_id"] == "c3"
+        assert [c["sequence"] for c in store.list_checkpoints()] == [3, 4]
+
+    def test_missing_and_invalid(self, tmp_path):
+        store = CheckpointStore(tmp_path)
+        with pytest.raises(FileNotFoundError):
+            store.load()
+
+        document = self._document(1)
+        document["format_version"] = 99
+        store.write(1, store.encode(document))
+        with pytest.raises(ValueError, match="version"):
+            store.load(1)
+        assert store.list_checkpoints() == []
+
+
+class TestSnapshotBarrier:
+    """Tests for the barrier itself"""
+
+    def test_exempt_callers_pass(self):
+        barrier = SnapshotBarrier(is_exempt=lambda: True)
+        barrier.raise_barrier()
+        with barrier.admit("/t", {}, "src"):
+            pass
+        assert barrier.close_channel() == []
+
+    def test_wait_quiet_waits_for_admitted_work(self):
+        barrier = SnapshotBarrier()
+        inside = threading.Event()
+        release = threading.Event()
+
+        def work():
+            with barrier.admit():
+                inside.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        assert inside.wait(5)
+
+        barrier.raise_barrier()
+        assert barrier.wait_quiet(timeout=0.05) is False
+        release.set()
+        assert barrier.wait_quiet(timeout=5) is True
+        barrier.lower_barrier()
+        thread.join(5)
+
+    def test_admit_async_suspends_while_raised(self):
+        barrier = SnapshotBarrier()
+        barrier.raise_barrier()
+        threading.Timer(0.1, barrier.lower_barrier).start()
+        ticks = []
+
+        async def ticker():
+            while barrier.is_raised:
+                ticks.append(1)
+                await asyncio.sleep(0.01)
+
+        async def admitted():
+            async with barrier.admit_async():
+                assert not barrier.is_raised
+                return barrier.wait_quiet(timeout=0)
+
+        async def run():
+            _, quiet = await asyncio.gather(ticker(), admitted())
+            return quiet
+
+        assert asyncio.run(run()) is False  # counted as active while inside
+        assert ticks  # the loop kept running while the call was held
+        assert barrier.held_total == 1
+        assert barrier.wait_quiet(timeout=0) is True
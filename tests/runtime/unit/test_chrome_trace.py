@@ -0,0 +1,144 @@
+"""
+Unit tests for Chrome trace export
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from graphbus_core.model.topic import Subscription, Topic
+from graphbus_core.node_base import GraphBusNode
+from graphbus_core.runtime.chrome_trace import ChromeTraceRecorder, trace_phase
+from graphbus_core.runtime.event_router import EventRouter
+from graphbus_core.runtime.message_bus import MessageBus
+from graphbus_core.runtime.tracing import Tracer
+
+
+class Producer(GraphBusNode):
+    """Publishes a follow-up event"""
+
+    def on_start(self, payload):
+        self.publish("/Done", payload)
+
+
+class Consumer(GraphBusNode):
+    """Terminal handler"""
+
+    def on_done(self, payload):
+        time.sleep(0.002)
+
+
+@pytest.fixture
+def traced_bus():
+    """Bus with a two-hop cascade, traced and recorded"""
+    tracer = Tracer()
+    recorder = ChromeTraceRecorder()
+    recorder.attach(tracer)
+    bus = MessageBus()
+    bus.tracer = tracer
+    nodes = {"Producer": Producer(), "Consumer": Consumer()}
+    for name, node in nodes.items():
+        node.name = name
+        node.bus = bus
+    router = EventRouter(bus, nodes)
+    router.register_subscription(Subscription("Producer", Topic("/Start"), "on_start"))
+    router.register_subscription(Subscription("Consumer", Topic("/Done"), "on_done"))
+    return bus, tracer, recorder
+
+
+def slices(document):
+    return [e for e in document["traceEvents"] if e["ph"] == "X"]
+
+
+class TestChromeTraceRecorder:
+    """Tests for ChromeTraceRecorder"""
+
+    def test_runtime_spans_become_slices(self, traced_bus):
+        bus, _, recorder = traced_bus
+        bus.publish("/Start", {"n": 1})
+
+        events = slices(recorder.to_dict())
+        assert [(e["cat"], e["args"]["topic"]) for e in events] == [
+            ("publish", "/Start"), ("deliver", "/Start"),
+            ("publish", "/Done"), ("deliver", "/Done"),
+        ]
+        deliver = events[-1]
+        assert deliver["args"]["node"] == "Consumer"
+        assert deliver["args"]["handler"] == "on_done"
+        assert deliver["dur"] >= 2000  # microseconds
+        # Nested slices on one thread: each child starts inside its parent
+        for parent, child in zip(events, events[1:]):
+            assert parent["ts"] <= child["ts"] <= parent["ts"] + parent["dur"]
+
+    def test_phase_records_current_thread(self):
+        recorder = ChromeTraceRecorder()
+        with recorder.phase("proposal round 1", round=1):
+            with recorder.phase("llm.generate", "llm", model="m"):
+                time.sleep(0.001)
+
+        outer, inner = sorted(slices(recorder.to_dict()), key=lambda e: e["ts"])
+        assert outer["name"] == "proposal round 1"
+        assert outer["args"] == {"round": 1}
+        assert inner["cat"] == "llm"
+        assert outer["tid"] == inner["tid"] == threading.get_ident()
+        assert outer["dur"] >= inner["dur"] >= 1000
+
+    def test_phase_records_error(self):
+        recorder = ChromeTraceRecorder()
+        with pytest.raises(ValueError):
+            with recorder.phase("commit round 1"):
+                raise ValueError("conflict")
+        assert slices(recorder.to_dict())[0]["args"]["error"] == "ValueError: conflict"
+
+    def test_cross_thread_child_gets_flow_arrow(self):
+        tracer = Tracer()
+        recorder = ChromeTraceRecorder()
+        recorder.attach(tracer)
+
+        with tracer.span("call", "Api.handle") as parent:
+            def worker():
+                tracer.end_span(tracer.start_span("deliver", "/Job -> Worker",
+                                                  parent=(parent.trace_id, parent.span_id)))
+            thread = threading.Thread(target=worker, name="pool-1")
+            thread.start()
+            thread.join()
+
+        document = recorder.to_dict()
+        start, finish = [e for e in document["traceEvents"] if e["ph"] in ("s", "f")]
+        assert start["id"] == finish["id"]
+        assert start["tid"] == threading.get_ident()
+        assert finish["tid"] == thread.ident
+        names = {e["tid"]: e["args"]["name"] for e in document["traceEvents"] if e["name"] == "thread_name"}
+        assert names[threading.get_ident()] == threading.current_thread().name
+
+    def test_bounded_and_detachable(self, traced_bus):
+        bus, tracer, _ = traced_bus
+        recorder = ChromeTraceRecorder(max_events=3)
+        recorder.attach(tracer)
+        bus.publish("/Start", {})
+        assert len(recorder) == 3
+
+        recorder.detach(tracer)
+        bus.publish("/Start", {})
+        assert len(recorder) == 3
+
+    def test_write_valid_document(self, traced_bus, tmp_path):
+        bus, _, recorder = traced_bus
+        bus.publish("/Start", {})
+
+        path = recorder.write(tmp_path / "run.trace.json")
+        document = json.loads(path.read_text())
+        assert document["displayTimeUnit"] == "ms"
+        assert document["traceEvents"][0]["name"] == "process_name"
+        assert document["otherData"]["events"] == 4
+        assert all({"ph", "pid", "tid"} <= set(e) for e in document["traceEvents"])
+
+    def test_trace_phase_without_recorder_is_noop(self):
+        with trace_phase(None, "analysis"):
+            pass
+        recorder = ChromeTraceRecorder()
+        with trace_phase(recorder, "analysis"):
+            pass
+        assert len(recorder) == 1
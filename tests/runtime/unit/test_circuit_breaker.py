@@ -0,0 +1,233 @@
+"""
+Unit tests for circuit breakers (per-node failure isolation)
+"""
+
+import time
+
+import pytest
+
+from graphbus_core.config import RuntimeConfig
+from graphbus_core.decorators import circuit_breaker
+from graphbus_core.exceptions import BulkheadRejectedError, CircuitOpenError
+from graphbus_core.model.topic import Subscription, Topic
+from graphbus_core.node_base import GraphBusNode
+from graphbus_core.runtime.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitBreakerSpec,
+)
+from graphbus_core.runtime.event_router import EventRouter
+from graphbus_core.runtime.executor import RuntimeExecutor
+from graphbus_core.runtime.message_bus import MessageBus
+from graphbus_core.runtime.monitoring import MetricsServer, PrometheusMetrics
+
+
+class FlakyNode(GraphBusNode):
+    """Node whose calls fail while ``broken`` is set"""
+
+    broken = False
+
+    @circuit_breaker(min_calls=2, failure_rate=0.5, open_seconds=60)
+    def charge(self):
+        if self.broken:
+            raise ValueError("gateway down")
+        return "charged"
+
+    def on_order(self, payload):
+        if self.broken:
+            raise ValueError("gateway down")
+        self.handled = getattr(self, "handled", 0) + 1
+
+
+def breaker(**kwargs):
+    kwargs.setdefault("min_calls", 4)
+    kwargs.setdefault("open_seconds", 0.05)
+    kwargs.setdefault("probe_budget", 2)
+    return CircuitBreaker("Node.method", CircuitBreakerSpec(**kwargs))
+
+
+def fail(b, times=1):
+    for _ in range(times):
+        b.record_failure(b.allow())
+
+
+class TestCircuitBreaker:
+    """Test CircuitBreaker state transitions"""
+
+    def test_invalid_spec(self):
+        with pytest.raises(ValueError):
+            CircuitBreakerSpec(failure_rate=0)
+        with pytest.raises(ValueError):
+            CircuitBreakerSpec(probe_budget=0)
+
+    def test_opens_at_failure_rate_after_min_calls(self):
+        b = breaker()
+        fail(b, 3)
+        assert b.state == "closed"  # below min_calls
+
+        b.record_success(b.allow())
+        assert b.state == "closed"  # only failures are judged
+
+        fail(b)
+        assert b.state == "open"  # 4 of 5 calls failed
+        with pytest.raises(CircuitOpenError) as exc_info:
+            b.allow()
+        assert exc_info.value.scope == "Node.method"
+        assert exc_info.value.retry_after <= 0.05
+        assert b.get_stats()["rejected_total"] == 1
+
+    def test_low_failure_rate_stays_closed(self):
+        b = breaker(failure_rate=0.5)
+        for _ in range(10):
+            b.record_success(b.allow())
+        fail(b, 4)
+        assert b.state == "closed"
+        assert b.get_stats()["failure_rate"] == pytest.approx(4 / 14)
+
+    def test_window_forgets_old_failures(self):
+        b = breaker(window_seconds=0.1, window_buckets=2)
+        fail(b, 3)
+        time.sleep(0.15)
+        fail(b)
+        assert b.state == "closed"
+        assert b.get_stats()["window_failures"] == 1
+
+    def test_half_open_probe_budget_then_close(self):
+        b = breaker()
+        fail(b, 4)
+        time.sleep(0.06)
+
+        probes = [b.allow(), b.allow()]
+        assert probes == [True, True]
+        assert b.state == "half_open"
+        with pytest.raises(CircuitOpenError):
+            b.allow()  # budget spent
+
+        for probe in probes:
+            b.record_success(probe)
+        assert b.state == "closed"
+        assert b.get_stats()["window_calls"] == 0
+
+    def test_failed_probe_reopens(self):
+        b = breaker()
+        fail(b, 4)
+        time.sleep(0.06)
+        fail(b)
+        assert b.state == "open"
+        assert b.get_stats()["opened_total"] == 2
+
+    def test_cancelled_probe_returns_budget(self):
+        b = breaker(probe_budget=1)
+        fail(b, 4)
+        time.sleep(0.06)
+        b.cancel(b.allow())
+        assert b.allow() is True
+
+
+class TestCircuitBreakerRegistry:
+    """Test breaker resolution and guarding"""
+
+    def test_configure_node_from_decorator(self):
+        registry = CircuitBreakerRegistry()
+        registry.configure_node("Flaky", FlakyNode())
+        assert registry.get("Flaky.charge").spec.min_calls == 2
+        assert registry.resolve("Flaky", "on_order") == []
+
+    def test_wildcards_create_breakers_on_use(self):
+        registry = CircuitBreakerRegistry()
+        registry.configure("*", CircuitBreakerSpec())
+        registry.configure("*.*", CircuitBreakerSpec())
+        assert [b.name for b in registry.resolve("A", "run")] == ["A", "A.run"]
+        assert registry.resolve("A", "run")[0] is registry.get("A")
+
+    def test_guard_records_failures_but_not_rejections(self):
+        registry = CircuitBreakerRegistry()
+        b = registry.configure("Node", CircuitBreakerSpec(min_calls=1))
+        with pytest.raises(BulkheadRejectedError):
+            with registry.guard("Node", "m"):
+                raise BulkheadRejectedError("full")
+        assert b.state == "closed" and b.calls_total == 0
+
+        with pytest.raises(ValueError):
+            with registry.guard("Node", "m"):
+                raise ValueError("boom")
+        assert b.state == "open"
+        assert registry.open_scopes() == ["Node"]
+
+    def test_remove_node(self):
+        registry = CircuitBreakerRegistry()
+        registry.configure("A", CircuitBreakerSpec())
+        registry.configure("A.run", CircuitBreakerSpec())
+        registry.configure("B", CircuitBreakerSpec())
+        registry.remove_node("A")
+        assert list(registry.get_stats()) == ["B"]
+
+
+class TestExecutorCircuitBreakers:
+    """Test breakers in front of call_method and event delivery"""
+
+    @pytest.fixture
+    def executor(self):
+        config = RuntimeConfig(circuit_breakers={"Flaky.on_order": {"min_calls": 2, "open_seconds": 60}})
+        executor = RuntimeExecutor(config)
+        executor.nodes = {"Flaky": FlakyNode()}
+        executor.nodes["Flaky"].name = "Flaky"
+        executor.setup_circuit_breakers()
+        executor._is_running = True
+        return executor
+
+    def test_open_breaker_rejects_without_running_method(self, executor):
+        node = executor.nodes["Flaky"]
+        node.broken = True
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                executor.call_method("Flaky", "charge")
+
+        node.broken = False
+        with pytest.raises(CircuitOpenError):
+            executor.call_method("Flaky", "charge")
+        stats = executor.get_stats()["circuit_breakers"]["Flaky.charge"]
+        assert stats["state"] == "open"
+        assert stats["calls_total"] == 2
+
+    def test_health_monitor_ignores_rejections(self, executor):
+        executor.setup_health_monitoring()
+        executor.nodes["Flaky"].broken = True
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                executor.call_method("Flaky", "charge")
+        with pytest.raises(CircuitOpenError):
+            executor.call_method("Flaky", "charge")
+        assert executor.health_monitor.get_metrics("Flaky").total_calls == 2
+
+    def test_event_delivery_skipped_while_open(self, executor):
+        bus = MessageBus()
+        router = EventRouter(bus, executor.nodes, circuit_breakers=executor.circuit_breakers)
+        router.register_subscription(Subscription("Flaky", Topic("/Order"), "on_order"))
+        node = executor.nodes["Flaky"]
+
+        node.broken = True
+        bus.publish("/Order", {})
+        bus.publish("/Order", {})
+        node.broken = False
+        bus.publish("/Order", {})
+
+        assert not hasattr(node, "handled")
+        assert executor.circuit_breakers.get("Flaky.on_order").rejected_total == 1
+
+    def test_state_exported_to_prometheus_and_healthz(self, executor):
+        metrics = executor.setup_metrics(PrometheusMetrics())
+        executor.nodes["Flaky"].broken = True
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                executor.call_method("Flaky", "charge")
+
+        text = metrics.generate_prometheus_metrics()
+        assert '# TYPE graphbus_circuit_breaker_state gauge' in text
+        assert 'graphbus_circuit_breaker_state{scope="Flaky.charge"} 2' in text
+        assert 'graphbus_circuit_breaker_state{scope="Flaky.on_order"} 0' in text
+        assert 'graphbus_circuit_breaker_opened_total{scope="Flaky.charge"} 1' in text
+
+        status, body = MetricsServer(metrics, port=0).health()
+        assert status == 200
+        assert body["circuit_breakers"] == {"Flaky.charge": "open"}
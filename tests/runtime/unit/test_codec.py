@@ -0,0 +1,90 @@
+"""
+Unit tests for the storage codec
+"""
+
+import json
+import zlib
+
+import pytest
+
+from graphbus_core import codec
+
+
+DOCUMENT = {
+    "nodes": [{"name": f"Agent{i}", "data": {"methods": ["a", "b"], "ok": True}} for i in range(50)],
+    "edges": [],
+    "unicode": "héllo ✓",
+    "nothing": None,
+    "ratio": 0.25,
+}
+
+
+class TestStorageCodec:
+    """Tests for dumps/loads and format detection"""
+
+    def test_json_format_is_indented_json(self):
+        data = codec.dumps(DOCUMENT, "json")
+        assert not codec.is_binary(data)
+        assert json.loads(data) == DOCUMENT
+        assert b"\n  " in data
+
+    def test_binary_roundtrip(self):
+        data = codec.dumps(DOCUMENT, "binary")
+        assert data.startswith(codec.MAGIC)
+        assert codec.loads(data) == DOCUMENT
+
+    def test_binary_is_smaller(self):
+        assert len(codec.dumps(DOCUMENT, "binary")) < len(codec.dumps(DOCUMENT, "json")) / 4
+
+    def test_loads_accepts_plain_json(self):
+        assert codec.loads('{"a": 1}') == {"a": 1}
+        assert codec.loads(b'[1, 2]') == [1, 2]
+
+    def test_json_codec_fallback(self, monkeypatch):
+        monkeypatch.setattr(codec, "msgpack", None)
+        data = codec.dumps(DOCUMENT, "binary")
+        assert data[4:5] == codec.CODEC_JSON
+        assert codec.loads(data) == DOCUMENT
+
+    def test_msgpack_data_without_msgpack_is_an_error(self, monkeypatch):
+        if codec.msgpack is None:
+            pytest.skip("msgpack not installed")
+        data = codec.dumps(DOCUMENT, "binary")
+        monkeypatch.setattr(codec, "msgpack", None)
+        with pytest.raises(ValueError, match="msgpack"):
+            codec.loads(data)
+
+    def test_pack_text_roundtrip(self):
+        text = json.dumps(DOCUMENT, separators=(",", ":"))
+        packed = codec.pack_text(text)
+        assert codec.is_binary(packed)
+        assert codec.unpack_text(packed) == text
+        assert codec.unpack_text(text) == text
+        assert codec.unpack_text(text.encode("utf-8")) == text
+
+    def test_unpack_text_of_msgpack(self):
+        data = codec.dumps(DOCUMENT, "binary")
+        assert json.loads(codec.unpack_text(data)) == DOCUMENT
+
+    @pytest.mark.parametrize("data", [
+        codec.MAGIC + b"j",                               # truncated header
+        codec.MAGIC + b"jz" + b"not zlib",                # corrupt payload
+        codec.MAGIC + b"jq" + zlib.compress(b"{}"),       # unknown compression
+        codec.MAGIC + b"?z" + zlib.compress(b"{}"),       # unknown codec
+    ])
+    def test_corrupt_data(self, data):
+        with pytest.raises(ValueError):
+            codec.loads(data)
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            codec.dumps({}, "xml")
+
+    def test_dump_and_load_file(self, tmp_path):
+        path = tmp_path / "doc.json"
+        codec.dump(DOCUMENT, path, "binary")
+        assert codec.load(path) == DOCUMENT
+
+        codec.dump(DOCUMENT, path, "json")
+        assert json.loads(path.read_text()) == DOCUMENT
+        assert list(tmp_path.iterdir()) == [path]
@@ -0,0 +1,153 @@
+"""
+Unit tests for continuous profiling
+"""
+
+import json
+import os
+import signal
+import time
+
+import pytest
+
+from graphbus_core.config import RuntimeConfig
+from graphbus_core.model.topic import Subscription, Topic
+from graphbus_core.node_base import GraphBusNode
+from graphbus_core.runtime.continuous import ContinuousProfiler
+from graphbus_core.runtime.event_router import EventRouter
+from graphbus_core.runtime.executor import RuntimeExecutor
+from graphbus_core.runtime.histogram import WindowedHistogram
+from graphbus_core.runtime.message_bus import MessageBus
+
+
+class Orders(GraphBusNode):
+    """Entry node: publishes a follow-up event"""
+
+    def place(self, order_id):
+        self.publish("/Order", {"order_id": order_id})
+        return order_id
+
+
+class Billing(GraphBusNode):
+    """Handles the follow-up event"""
+
+    def on_order(self, payload):
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def executor(tmp_path):
+    """Running executor with Orders -> Billing and continuous profiling on"""
+    executor = RuntimeExecutor(RuntimeConfig(continuous_profile_minutes=1.0,
+                                             continuous_profile_dir=str(tmp_path)))
+    executor.nodes = {"Orders": Orders(), "Billing": Billing()}
+    executor.bus = MessageBus()
+    executor.router = EventRouter(executor.bus, executor.nodes, inflight=executor.inflight)
+    for name, node in executor.nodes.items():
+        node.name = name
+        node.bus = executor.bus
+    executor.router.register_subscription(Subscription("Billing", Topic("/Order"), "on_order"))
+    executor.setup_continuous_profiling()
+    executor._is_running = True
+    yield executor
+    executor.stop()
+
+
+class TestContinuousProfiler:
+    """Tests for the profiling ring and its dumps"""
+
+    def test_executor_wires_bus_router_and_calls(self, executor):
+        for i in range(5):
+            executor.call_method("Orders", "place", order_id=i)
+
+        assert executor.bus.profiler is executor.profiler
+        assert executor.router.profiler is executor.profiler
+        profiles = executor.profiler.method_profiles
+        assert profiles["Orders.place"].call_count == 5
+        assert profiles["Billing.on_order"].call_count == 5
+        assert executor.profiler.event_profiles["/Order"].publish_count == 5
+        assert "continuous_profiling" in executor.get_stats()
+
+    def test_snapshot_slices_and_rates(self, executor):
+        for i in range(4):
+            executor.call_method("Orders", "place", order_id=i)
+
+        snapshot = executor.continuous_profiler.snapshot()
+        assert snapshot["pid"] == os.getpid()
+        assert snapshot["window_seconds"] == 60.0
+        assert snapshot["slice_seconds"] == 10.0
+        assert sum(s["methods"]["Orders.place"]["rate"] for s in snapshot["slices"]) * 10 == 4
+        latest = snapshot["slices"][-1]
+        assert abs(latest["start"] - time.time()) < 20
+        assert latest["methods"]["Billing.on_order"]["p50"] >= 0.001
+        assert "/Order" in latest["topics"]
+        assert snapshot["summary"]["total_method_calls"] == 8
+        json.dumps(snapshot)
+
+    def test_dump_formats(self, executor, tmp_path):
+        executor.call_method("Orders", "place", order_id=1)
+        continuous = executor.continuous_profiler
+
+        document = json.loads(continuous.dump(tmp_path / "ring.json").read_text())
+        assert document["slices"][0]["methods"]["Orders.place"]["count"] == 1
+
+        trace = json.loads(continuous.dump(tmp_path / "ring.trace.json", format="chrome-trace").read_text())
+        counters = {e["name"]: e for e in trace["traceEvents"] if e["ph"] == "C"}
+        assert counters["Orders.place rate/s"]["args"]["rate"] == pytest.approx(0.1)
+        assert set(counters["/Order latency ms"]["args"]) == {"p50", "p99"}
+        assert all(0 <= e["ts"] for e in counters.values())
+
+        with pytest.raises(ValueError):
+            continuous.dump(format="pprof")
+
+    def test_dump_all_default_names(self, executor, tmp_path):
+        paths = executor.continuous_profiler.dump_all()
+        names = sorted(p.name for p in paths)
+        assert names[0].startswith(f"graphbus-profile-{os.getpid()}-")
+        assert names[0].endswith(".json") and names[1].endswith(".trace.json")
+        assert all(p.parent == tmp_path for p in paths)
+        assert not list(tmp_path.glob("*.tmp"))
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGUSR2"), reason="needs SIGUSR2")
+    def test_signal_dumps_and_stop_restores_handler(self, executor, tmp_path):
+        executor.call_method("Orders", "place", order_id=1)
+        os.kill(os.getpid(), signal.SIGUSR2)
+
+        deadline = time.time() + 5
+        while len(list(tmp_path.glob("graphbus-profile-*"))) < 2 and time.time() < deadline:
+            time.sleep(0.02)
+        assert len(list(tmp_path.glob("graphbus-profile-*.json"))) == 2
+
+        installed = signal.getsignal(signal.SIGUSR2)
+        executor.stop()
+        assert signal.getsignal(signal.SIGUSR2) is not installed
+
+    def test_resource_history_is_bounded(self):
+        continuous = ContinuousProfiler(minutes=1, snapshot_interval=5)
+        assert continuous.profiler.system_snapshots.maxlen == 12
+        assert not continuous.enabled
+        continuous.start()
+        assert continuous.enabled
+        continuous.stop()
+        assert not continuous.enabled
+
+    def test_disabled_by_default(self):
+        executor = RuntimeExecutor(RuntimeConfig())
+        assert executor.continuous_profiler is None
+        assert executor.profiler is None
+
+
+class TestWindowSlices:
+    """Tests for WindowedHistogram.window_slices"""
+
+    def test_slices_oldest_first_and_expire(self):
+        histogram = WindowedHistogram(window=3.0, slots=3)
+        second = 1_000_000_000
+        histogram.record(0.01, now_ns=10 * second)
+        histogram.record(0.02, now_ns=12 * second)
+        histogram.record(0.03, now_ns=12 * second)
+
+        slices = histogram.window_slices(12 * second)
+        assert [start for start, _ in slices] == [10 * second, 12 * second]
+        assert [h.count for _, h in slices] == [1, 2]
+
+        assert [h.count for _, h in histogram.window_slices(13 * second)] == [2]
@@ -2,11 +2,17 @@
 Unit tests for RuntimeExecutor
 """
 
+import asyncio
+import threading
+import time
+
 import pytest
 from pathlib import Path
 
 from graphbus_core.runtime.executor import RuntimeExecutor, run_runtime
+from graphbus_core.runtime.message_bus import MessageBus
 from graphbus_core.config import RuntimeConfig
+from graphbus_core.node_base import GraphBusNode
 
 
 class TestRuntimeExecutor:
@@ -276,3 +282,191 @@ class TestRuntimeExecutor:
         assert len(executor.nodes) >= 3
 
         executor.stop()
+
+
+class SlowNode(GraphBusNode):
+    """Node with a blocking sync method and a native coroutine method"""
+
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def block(self, seconds: float = 0.1):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(seconds)
+        with self._lock:
+            self.active -= 1
+        return threading.current_thread().name
+
+    async def ping(self, value: int = 0):
+        await asyncio.sleep(0)
+        return value + 1
+
+    async def fail(self):
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+
+class TestRuntimeExecutorAsync:
+    """Tests for call_method_async / publish_async"""
+
+    @pytest.fixture
+    def executor(self):
+        config = RuntimeConfig(async_max_workers=8, async_node_concurrency=2)
+        executor = RuntimeExecutor(config)
+        executor.nodes = {"A": SlowNode(), "B": SlowNode()}
+        executor.bus = MessageBus()
+        executor._is_running = True
+        yield executor
+        executor.stop()
+
+    def test_sync_method_offloaded_to_pool(self, executor):
+        thread_name = asyncio.run(executor.call_method_async("A", "block", seconds=0))
+        assert thread_name.startswith("graphbus-runtime")
+
+    def test_coroutine_method_awaited_natively(self, executor):
+        assert asyncio.run(executor.call_method_async("A", "ping", value=41)) == 42
+        assert executor._method_call_history[-1]["success"] is True
+
+    def test_coroutine_method_profiled_and_metered(self, executor):
+        from graphbus_core.runtime.monitoring import PrometheusMetrics
+        from graphbus_core.runtime.profiler import PerformanceProfiler
+
+        metrics = executor.setup_metrics(PrometheusMetrics())
+        executor.profiler = PerformanceProfiler()
+        executor.profiler.enable()
+
+        asyncio.run(executor.call_method_async("A", "ping"))
+        with pytest.raises(ValueError):
+            asyncio.run(executor.call_method_async("A", "fail"))
+        executor.profiler.disable()
+
+        assert executor.profiler.method_profiles["A.ping"].call_count == 1
+        assert metrics.method_calls_total == {"A.ping": 1, "A.fail": 1}
+        assert metrics.method_errors_total == {"A.fail": 1}
+        assert metrics.method_duration_seconds["A.ping"].total().count == 1
+
+    def test_different_nodes_run_concurrently(self, executor):
+        async def run():
+            start = time.perf_counter()
+            await asyncio.gather(
+                executor.call_method_async("A", "block", seconds=0.2),
+                executor.call_method_async("B", "block", seconds=0.2),
+            )
+            return time.perf_counter() - start
+
+        assert asyncio.run(run()) < 0.35
+
+    def test_per_node_concurrency_limit(self, executor):
+        async def run():
+            await asyncio.gather(*[
+                executor.call_method_async("A", "block", seconds=0.05)
+                for _ in range(6)
+            ])
+
+        asyncio.run(run())
+        assert executor.nodes["A"].peak == 2
+
+    def test_unknown_node_raises(self, executor):
+        with pytest.raises(ValueError):
+            asyncio.run(executor.call_method_async("Missing", "block"))
+
+    def test_publish_async(self, executor):
+        received = []
+        executor.bus.subscribe("/Test/Event", lambda event: received.append(event.payload))
+
+        asyncio.run(executor.publish_async("/Test/Event", {"n": 1}))
+
+        assert received == [{"n": 1}]
+
+
+class StatefulNode(GraphBusNode):
+    """Node that blocks until released and persists a counter"""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        self.started = threading.Event()
+
+    def work(self, release: threading.Event):
+        self.started.set()
+        release.wait(2)
+        self.count += 1
+        return self.count
+
+    def get_state(self):
+        return {"count": self.count}
+
+
+class TestRuntimeExecutorDrain:
+    """Tests for graceful drain in stop()"""
+
+    @pytest.fixture
+    def executor(self, tmp_path):
+        from graphbus_core.runtime.state import StateManager
+
+        executor = RuntimeExecutor(RuntimeConfig(drain_timeout=2))
+        executor.nodes = {"S": StatefulNode()}
+        executor.state_manager = StateManager(str(tmp_path / "state"))
+        executor._is_running = True
+        return executor
+
+    def test_stop_waits_for_in_flight_call_then_saves_state(self, executor):
+        release = threading.Event()
+        node = executor.nodes["S"]
+        thread = threading.Thread(target=executor.call_method, args=("S", "work"), kwargs={"release": release})
+        thread.start()
+        node.started.wait(1)
+
+        assert executor.get_stats()["inflight"]["nodes"] == {"S": 1}
+
+        threading.Timer(0.1, release.set).start()
+        report = executor.stop()
+        thread.join(1)
+
+        assert report["drained"] is True
+        assert report["in_flight_at_stop"]["nodes"] == {"S": 1}
+        assert report["completed_during_drain"] == 1
+        assert report["states_saved"] == 1
+        assert executor.state_manager.load_state("S") == {"count": 1}
+        assert not executor._is_running
+
+    def test_new_work_rejected_while_draining(self, executor):
+        release = threading.Event()
+        node = executor.nodes["S"]
+        thread = threading.Thread(target=executor.call_method, args=("S", "work"), kwargs={"release": release})
+        thread.start()
+        node.started.wait(1)
+
+        stopper = threading.Thread(target=executor.stop)
+        stopper.start()
+        time.sleep(0.05)
+
+        with pytest.raises(RuntimeError, match="shutting down"):
+            executor.call_method("S", "work", release=release)
+
+        release.set()
+        stopper.join(2)
+        thread.join(1)
+
+    def test_drain_timeout_reports_abandoned_work(self, executor):
+        release = threading.Event()
+        node = executor.nodes["S"]
+        thread = threading.Thread(target=executor.call_method, args=("S", "work"), kwargs={"release": release})
+        thread.start()
+        node.started.wait(1)
+
+        report = executor.stop(drain_timeout=0.05)
+
+        assert report["drained"] is False
+        assert report["abandoned"]["nodes"] == {"S": 1}
+        release.set()
+        thread.join(1)
+
+    def test_stop_when_not_running(self):
+        executor = RuntimeExecutor(RuntimeConfig())
+        assert executor.stop() == {}
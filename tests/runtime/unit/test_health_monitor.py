@@ -3,15 +3,19 @@ Unit tests for HealthMonitor
 """
 
 import pytest
+import threading
 import time
 from unittest.mock import Mock, patch
 from datetime import datetime, timedelta
 
+from graphbus_core.exceptions import NodeRestartingError
 from graphbus_core.runtime.health import (
+    RESTART_TOPIC,
     HealthMonitor,
     HealthStatus,
     HealthMetrics,
-    RestartPolicy
+    RestartPolicy,
+    RollingWindow
 )
 
 
@@ -67,6 +71,72 @@ class TestHealthMetrics:
         assert metrics_dict["success_rate"] == 0.7
 
 
+class TestRollingWindow:
+    """Test time-bucketed call windows"""
+
+    def test_totals_over_window(self):
+        window = RollingWindow(buckets=60, bucket_seconds=1.0)
+        window.record(now=100.2)
+        window.record(failed=True, now=100.7)
+        window.record(failed=True, now=130.0)
+
+        assert window.totals(now=130.5) == (3, 2)
+        assert window.totals(seconds=10, now=130.5) == (1, 1)
+        assert window.totals(seconds=31, now=130.5) == (3, 2)
+
+    def test_expired_buckets_drop_out(self):
+        window = RollingWindow(buckets=60, bucket_seconds=1.0)
+        window.record(failed=True, now=0.0)
+        window.record(now=30.0)
+
+        assert window.totals(now=60.0) == (1, 0)
+        assert window.totals(now=90.0) == (0, 0)
+        window.record(now=500.0)
+        assert (window.calls, window.failures) == (1, 0)
+
+    def test_memory_is_constant(self):
+        window = RollingWindow(buckets=60, bucket_seconds=1.0)
+        for i in range(10_000):
+            window.record(failed=i % 2 == 0, now=i * 0.37)
+        assert len(window._calls) == 60
+        now = 9_999 * 0.37
+        assert window.totals(now=now) == (sum(window._calls), sum(window._failures))
+        assert window.totals(now=now)[0] in (162, 163)
+
+    def test_concurrent_records_expire_a_bucket_once(self):
+        class SlowList(list):
+            """Bucket list whose reads let other threads run mid-update"""
+
+            def __getitem__(self, index):
+                time.sleep(0.005)
+                return super().__getitem__(index)
+
+        window = RollingWindow(buckets=2, bucket_seconds=1.0)
+        for _ in range(3):
+            window.record(now=0.0)
+        window.record(now=1.0)
+        window._calls = SlowList(window._calls)
+
+        threads = [threading.Thread(target=window.record, kwargs={"now": 2.0}) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert window.calls == sum(window._calls) == 3
+
+    def test_metrics_pick_bucket_resolution(self):
+        metrics = HealthMetrics("TestAgent", HealthStatus.HEALTHY)
+        for _ in range(100):
+            metrics.record_call(failed=False, now=0.0)
+        metrics.record_call(failed=True, now=3000.0)
+        metrics.record_call(failed=True, now=3001.0)
+
+        assert metrics.recent_error_rate(60, now=3001.0) == 1.0
+        assert metrics.recent_error_rate(3600, now=3001.0) == pytest.approx(2 / 102)
+        assert metrics.recent_totals(3600, now=7200.0) == (0, 0)
+
+
 class TestRestartPolicy:
     """Test RestartPolicy"""
 
@@ -236,6 +306,26 @@ class TestHealthMonitor:
         assert metrics.error_rate > 0.5
         assert metrics.status == HealthStatus.DEGRADED
 
+    def test_error_rate_judged_over_recent_window(self, mock_executor):
+        """Test DEGRADED reflects the last window_seconds, not lifetime totals"""
+        monitor = HealthMonitor(mock_executor, failure_threshold=5, window_seconds=10)
+        recovered = []
+        monitor.on_recovery(lambda name, m: recovered.append(name))
+
+        with patch("graphbus_core.runtime.health.time") as clock:
+            clock.monotonic.return_value = 1000.0
+            for _ in range(3):
+                monitor.record_failure("Agent1", Exception("Error"))
+            monitor.record_success("Agent1")
+            assert monitor.metrics["Agent1"].status == HealthStatus.DEGRADED
+
+            clock.monotonic.return_value = 1005.0
+            assert monitor.check_health("Agent1") == HealthStatus.DEGRADED
+            clock.monotonic.return_value = 1010.0
+            assert monitor.check_health("Agent1") == HealthStatus.HEALTHY
+        assert recovered == ["Agent1"]
+        assert monitor.metrics["Agent1"].error_rate == 0.75  # lifetime total unchanged
+
     def test_status_failed_on_consecutive_failures(self, monitor):
         """Test status becomes FAILED after threshold"""
         # Record failures up to threshold
@@ -360,8 +450,7 @@ class TestHealthMonitor:
         # (No way to verify without checking internal state)
         assert monitor.metrics["Agent1"].status == HealthStatus.FAILED
 
-    @patch('time.sleep')
-    def test_auto_restart_enabled(self, mock_sleep, mock_executor):
+    def test_auto_restart_enabled(self, mock_executor):
         """Test auto-restart when enabled"""
         # Setup executor with hot reload
         mock_executor.hot_reload_manager = Mock()
@@ -372,6 +461,7 @@ class TestHealthMonitor:
         monitor = HealthMonitor(
             mock_executor,
             enable_auto_restart=True,
+            restart_policy=RestartPolicy(initial_delay_seconds=0.01),
             failure_threshold=3
         )
 
@@ -379,13 +469,15 @@ class TestHealthMonitor:
         for _ in range(3):
             monitor.record_failure("Agent1", Exception("Error"))
 
-        # Verify reload was attempted
+        # Verify reload was attempted by the supervisor
+        assert monitor.wait_for_restarts(timeout=5)
         mock_executor.hot_reload_manager.reload_agent.assert_called_once_with("Agent1")
+        assert monitor.check_health("Agent1") == HealthStatus.HEALTHY
+        monitor.stop()
 
-    @patch('time.sleep')
-    def test_auto_restart_respects_policy(self, mock_sleep, mock_executor):
+    def test_auto_restart_respects_policy(self, mock_executor):
         """Test auto-restart respects restart policy"""
-        policy = RestartPolicy(max_restarts=2)
+        policy = RestartPolicy(max_restarts=2, initial_delay_seconds=0.01)
         mock_executor.hot_reload_manager = Mock()
         mock_executor.hot_reload_manager.reload_agent.return_value = {
             "success": True
@@ -401,6 +493,7 @@ class TestHealthMonitor:
         # First failure - should restart
         for _ in range(2):
             monitor.record_failure("Agent1", Exception("Error"))
+        assert monitor.wait_for_restarts(timeout=5)
 
         assert mock_executor.hot_reload_manager.reload_agent.call_count == 1
 
@@ -408,6 +501,7 @@ class TestHealthMonitor:
         monitor.reset_metrics("Agent1")
         for _ in range(2):
             monitor.record_failure("Agent1", Exception("Error"))
+        assert monitor.wait_for_restarts(timeout=5)
 
         assert mock_executor.hot_reload_manager.reload_agent.call_count == 2
 
@@ -415,16 +509,18 @@ class TestHealthMonitor:
         monitor.reset_metrics("Agent1")
         for _ in range(2):
             monitor.record_failure("Agent1", Exception("Error"))
+        assert not monitor.is_restarting("Agent1")
 
         # Still only 2 calls
         assert mock_executor.hot_reload_manager.reload_agent.call_count == 2
+        monitor.stop()
+
 
-    @patch('time.sleep')
-    def test_auto_restart_with_backoff(self, mock_sleep, mock_executor):
+    def test_auto_restart_with_backoff(self, mock_executor):
         """Test auto-restart uses exponential backoff"""
         policy = RestartPolicy(
             max_restarts=3,
-            initial_delay_seconds=1.0,
+            initial_delay_seconds=0.01,
             backoff_multiplier=2.0
         )
         mock_executor.hot_reload_manager = Mock()
@@ -438,25 +534,29 @@ class TestHealthMonitor:
             restart_policy=policy,
             failure_threshold=2
         )
+        delays = []
+        monitor.on_restart(lambda e: e["status"] == "scheduled" and delays.append(e["delay_seconds"]))
 
-        # First failure - should delay 1s (no restarts recorded yet, so retry_count=0)
+        # First failure - no restarts recorded yet, so the initial delay
         for _ in range(2):
             monitor.record_failure("Agent1", Exception("Error"))
+        assert monitor.wait_for_restarts(timeout=5)
+        assert delays == [0.01]
 
-        # After first restart is recorded, delay calculation would be 1.0 * 2^(1-1) = 1.0
-        assert mock_sleep.call_count == 1
-        mock_sleep.assert_called_with(1.0)
-
-        # Second failure - should delay 1s (1 restart recorded, so 1.0 * 2^(1-1) = 1.0)
+        # Second failure - 1 restart recorded, so 0.01 * 2^(1-1) = 0.01
         monitor.reset_metrics("Agent1")
         for _ in range(2):
             monitor.record_failure("Agent1", Exception("Error"))
+        assert monitor.wait_for_restarts(timeout=5)
+        assert delays == [0.01, 0.01]
 
-        # After second restart, we have 2 restarts recorded, so next would be 1.0 * 2^(2-1) = 2.0
-        # But the test is checking the call during the restart, which uses the delay before recording
-        assert mock_sleep.call_count == 2
-        # Both calls should be 1.0 based on current implementation
-        assert all(call[0][0] == 1.0 for call in mock_sleep.call_args_list)
+        # Third failure - 2 restarts recorded, so 0.01 * 2^(2-1) = 0.02
+        monitor.reset_metrics("Agent1")
+        for _ in range(2):
+            monitor.record_failure("Agent1", Exception("Error"))
+        assert monitor.wait_for_restarts(timeout=5)
+        assert delays == [0.01, 0.01, 0.02]
+        monitor.stop()
 
     def test_metrics_for_new_agent(self, monitor):
         """Test that recording for new agent creates metrics"""
@@ -478,3 +578,111 @@ class TestHealthMonitor:
 
         # Monitoring should still work
         assert monitor.metrics["Agent1"].status == HealthStatus.FAILED
+
+
+class TestRestartSupervisor:
+    """Test background restarts and call gating while an agent restarts"""
+
+    @pytest.fixture
+    def executor(self):
+        """Mock executor whose reload blocks until released"""
+        executor = Mock()
+        executor.nodes = {"Agent1": Mock()}
+        executor.release = threading.Event()
+        executor.reload_threads = []
+
+        def reload_agent(name):
+            executor.reload_threads.append(threading.current_thread().name)
+            executor.release.wait(5)
+            return {"success": True}
+
+        executor.hot_reload_manager.reload_agent.side_effect = reload_agent
+        return executor
+
+    def make_monitor(self, executor, **policy):
+        policy.setdefault("initial_delay_seconds", 0.01)
+        monitor = HealthMonitor(executor, enable_auto_restart=True,
+                                restart_policy=RestartPolicy(**policy), failure_threshold=2)
+        events = []
+        monitor.on_restart(events.append)
+        return monitor, events
+
+    def fail(self, monitor, node="Agent1"):
+        for _ in range(monitor.failure_threshold):
+            monitor.record_failure(node, Exception("Error"))
+
+    def test_request_thread_never_sleeps(self, executor):
+        monitor, _ = self.make_monitor(executor, initial_delay_seconds=30)
+        with patch("time.sleep") as mock_sleep:
+            start = time.monotonic()
+            self.fail(monitor)
+            assert time.monotonic() - start < 1
+        mock_sleep.assert_not_called()
+        assert monitor.is_restarting("Agent1")
+        assert monitor.get_restarting()["Agent1"]["retry_after"] > 25
+        monitor.stop()
+        assert not monitor.is_restarting("Agent1")
+        executor.hot_reload_manager.reload_agent.assert_not_called()
+
+    def test_reload_runs_on_supervisor(self, executor):
+        monitor, events = self.make_monitor(executor)
+        executor.release.set()
+        self.fail(monitor)
+        assert monitor.wait_for_restarts(timeout=5)
+        assert executor.reload_threads == ["graphbus-restart-supervisor"]
+        assert [e["status"] for e in events] == ["scheduled", "succeeded"]
+        assert events[0]["delay_seconds"] == 0.01
+        executor.bus.publish.assert_any_call(RESTART_TOPIC, events[-1], source="health_monitor")
+        monitor.stop()
+
+    def test_fail_fast_while_restarting(self, executor):
+        monitor, _ = self.make_monitor(executor)
+        self.fail(monitor)
+
+        with pytest.raises(NodeRestartingError) as exc_info:
+            monitor.admit("Agent1")
+        assert exc_info.value.node_name == "Agent1"
+        monitor.admit("Agent2")  # other agents are unaffected
+
+        executor.release.set()
+        assert monitor.wait_for_restarts(timeout=5)
+        monitor.admit("Agent1")
+        monitor.stop()
+
+    def test_buffer_holds_call_until_restarted(self, executor):
+        monitor, _ = self.make_monitor(executor, during_restart="buffer")
+        self.fail(monitor)
+        threading.Timer(0.05, executor.release.set).start()
+
+        start = time.monotonic()
+        monitor.admit("Agent1")
+        assert time.monotonic() - start >= 0.04
+        assert not monitor.is_restarting("Agent1")
+        monitor.stop()
+
+    def test_buffer_times_out(self, executor):
+        monitor, _ = self.make_monitor(executor, during_restart="buffer", buffer_timeout_seconds=0.05)
+        self.fail(monitor)
+        with pytest.raises(NodeRestartingError):
+            monitor.admit("Agent1")
+        executor.release.set()
+        monitor.stop()
+
+    def test_failed_reload_retries_with_backoff(self):
+        executor = Mock()
+        executor.nodes = {"Agent1": Mock()}
+        executor.hot_reload_manager.reload_agent.return_value = {"success": False, "error": "boom"}
+        monitor, events = self.make_monitor(executor, max_restarts=3, backoff_multiplier=2.0)
+
+        self.fail(monitor)
+        assert monitor.wait_for_restarts(timeout=5)
+        assert executor.hot_reload_manager.reload_agent.call_count == 3
+        assert [e["status"] for e in events] == ["scheduled", "failed", "failed", "gave_up"]
+        assert [e["delay_seconds"] for e in events[1:3]] == [0.01, 0.02]
+        assert events[-1]["error"] == "boom"
+        assert monitor.check_health("Agent1") == HealthStatus.FAILED
+        monitor.stop()
+
+    def test_invalid_during_restart_policy(self):
+        with pytest.raises(ValueError):
+            RestartPolicy(during_restart="drop")
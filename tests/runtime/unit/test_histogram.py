@@ -0,0 +1,168 @@
+"""
+Unit tests for log-bucketed latency histograms
+"""
+
+import json
+import random
+
+import pytest
+
+from graphbus_core.runtime.histogram import (
+    LatencyHistogram,
+    WindowedHistogram,
+    bucket_bounds,
+    bucket_index,
+    percentile_key,
+)
+
+SECOND = 1_000_000_000
+
+
+class TestBuckets:
+    """Tests for bucket layout"""
+
+    def test_every_value_falls_in_its_bucket(self):
+        for value in list(range(0, 300)) + [10**k + d for k in range(3, 13) for d in (-1, 0, 1)]:
+            low, high = bucket_bounds(bucket_index(value))
+            assert low <= value < high
+
+    def test_relative_bucket_width(self):
+        for value in (1_000, 123_456, 10**9, 3_600 * SECOND):
+            low, high = bucket_bounds(bucket_index(value))
+            assert (high - low) / low <= 1 / 64
+
+    def test_percentile_keys(self):
+        assert [percentile_key(q) for q in (0.5, 0.9, 0.99, 0.999)] == ["p50", "p90", "p99", "p999"]
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram"""
+
+    def test_percentiles_are_accurate(self):
+        rng = random.Random(7)
+        values = [int(rng.lognormvariate(13, 1.2)) for _ in range(20_000)]
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record_ns(value)
+
+        values.sort()
+        for q in (0.5, 0.9, 0.99, 0.999):
+            exact = values[int(q * len(values)) - 1]
+            assert abs(histogram.percentile_ns(q) - exact) / exact < 0.02
+        assert histogram.max_ns == values[-1]
+        assert histogram.min_ns == values[0]
+        assert histogram.count == len(values)
+
+    def test_empty(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(0.99) == 0.0
+        assert histogram.mean == 0.0
+        assert histogram.min == 0.0
+        assert histogram.percentiles() == {"count": 0, "mean": 0.0, "p50": 0.0, "p90": 0.0,
+                                           "p99": 0.0, "p999": 0.0, "max": 0.0}
+
+    def test_merge_equals_combined(self):
+        a, b, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for value in range(1, 5000, 7):
+            a.record_ns(value * 1000)
+            both.record_ns(value * 1000)
+        for value in range(3, 9000, 11):
+            b.record_ns(value * 997)
+            both.record_ns(value * 997)
+
+        merged = a.copy().merge(b)
+        assert merged.counts == both.counts
+        assert merged.percentiles() == both.percentiles()
+        assert a.count == len(range(1, 5000, 7))  # copy left the original alone
+
+    def test_record_many_matches_record_ns(self):
+        values = [0, 5, 127, 128, 1_000, 65_535, 10**9, -3]
+        one, batch = LatencyHistogram(), LatencyHistogram()
+        for value in values:
+            one.record_ns(value)
+        batch.record_many(values)
+
+        assert batch.counts == one.counts
+        assert (batch.count, batch.sum_ns, batch.min_ns, batch.max_ns) == (one.count, one.sum_ns, one.min_ns, one.max_ns)
+
+    def test_from_counts_within_bucket_resolution(self):
+        values = [3, 1_000, 1_500, 2 * SECOND]
+        exact = LatencyHistogram()
+        for value in values:
+            exact.record_ns(value)
+        histogram = LatencyHistogram.from_counts(exact.counts)
+
+        assert histogram.counts == exact.counts
+        assert histogram.count == exact.count
+        assert histogram.min_ns <= exact.min_ns and histogram.max_ns >= exact.max_ns
+        assert abs(histogram.sum_ns - exact.sum_ns) <= exact.sum_ns / 64
+        assert LatencyHistogram.from_counts({}).count == 0
+
+    def test_dict_round_trip(self):
+        histogram = LatencyHistogram()
+        for seconds in (0.001, 0.002, 0.5):
+            histogram.record(seconds)
+
+        restored = LatencyHistogram.from_dict(json.loads(json.dumps(histogram.to_dict())))
+        assert restored.percentiles() == histogram.percentiles()
+        assert restored.min_ns == histogram.min_ns
+
+
+class TestWindowedHistogram:
+    """Tests for WindowedHistogram"""
+
+    def test_window_expires_old_slices(self):
+        windowed = WindowedHistogram(window=60.0, slots=6)
+        windowed.record(0.1, now_ns=0)
+        windowed.record(0.2, now_ns=30 * SECOND)
+        windowed.record(0.3, now_ns=65 * SECOND)
+
+        assert windowed.window_histogram(65 * SECOND).count == 2
+        assert windowed.window_histogram(200 * SECOND).count == 0
+        total = windowed.total()
+        assert total.count == 3
+        assert total.max == 0.3
+
+    def test_ring_reuse_retires_slices(self):
+        windowed = WindowedHistogram(window=1.0, slots=2)
+        for second in range(10):
+            windowed.record_ns(second + 1, now_ns=second * SECOND)
+
+        assert windowed.total().count == 10
+        assert windowed.window_histogram(9 * SECOND).count == 1
+
+    def test_pending_values_are_visible(self):
+        windowed = WindowedHistogram(window=60.0, slots=6)
+        for i in range(WindowedHistogram.BATCH + 10):
+            windowed.record_ns(1000 + i, now_ns=SECOND)
+
+        assert len(windowed._pending) == 10  # the rest were bucketed
+        assert windowed.total().count == WindowedHistogram.BATCH + 10
+        assert windowed.window_histogram(SECOND).max_ns == 1000 + WindowedHistogram.BATCH + 9
+
+    def test_merge(self):
+        a = WindowedHistogram(window=10.0, slots=10)
+        b = WindowedHistogram(window=10.0, slots=10)
+        a.record(0.1, now_ns=0)
+        b.record(0.2, now_ns=0)
+        b.record(0.3, now_ns=5 * SECOND)
+        a.record(0.4, now_ns=25 * SECOND)
+
+        a.merge(b)
+        assert a.total().count == 4
+        assert a.window_histogram(25 * SECOND).count == 1
+
+    def test_add_slice(self):
+        histogram = WindowedHistogram(window=10.0, slots=10)
+        histogram.record(0.1, now_ns=25 * SECOND)
+        for epoch in (25, 24, 3):
+            slice_ = LatencyHistogram()
+            slice_.record(0.2)
+            histogram.add_slice(epoch, slice_)
+
+        assert histogram.total().count == 4
+        assert histogram.window_histogram(25 * SECOND).count == 3
+
+    def test_merge_rejects_different_windows(self):
+        with pytest.raises(ValueError):
+            WindowedHistogram(window=10.0).merge(WindowedHistogram(window=60.0))
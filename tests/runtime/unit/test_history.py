@@ -0,0 +1,149 @@
+"""
+Unit tests for bounded NodeMemory history
+"""
+
+from graphbus_core.config import RuntimeConfig
+from graphbus_core.model.agent_def import NodeMemory
+from graphbus_core.model.history import HistoryLog
+from graphbus_core.node_base import GraphBusNode
+from graphbus_core.runtime.executor import RuntimeExecutor
+
+
+class TestHistoryLog:
+    """Tests for the resident ring"""
+
+    def test_list_like(self):
+        log = HistoryLog([{"n": 1}, {"n": 2}])
+        log.append({"n": 3})
+
+        assert len(log) == 3
+        assert log[0] == {"n": 1}
+        assert log[-1] == {"n": 3}
+        assert log[1:] == [{"n": 2}, {"n": 3}]
+        assert list(log) == [{"n": 1}, {"n": 2}, {"n": 3}]
+        assert log == [{"n": 1}, {"n": 2}, {"n": 3}]
+
+    def test_bounded_without_spill_drops_oldest(self):
+        log = HistoryLog(max_entries=3)
+        for i in range(10):
+            log.append({"n": i})
+
+        assert [e["n"] for e in log] == [7, 8, 9]
+        stats = log.stats()
+        assert stats["resident_entries"] == 3
+        assert stats["dropped_entries"] == 7
+        assert stats["spilled_entries"] == 0
+
+    def test_unbounded(self):
+        log = HistoryLog(max_entries=None)
+        for i in range(50):
+            log.append({"n": i})
+        assert len(log) == 50
+
+
+class TestHistorySpill:
+    """Tests for spilling evicted entries to disk"""
+
+    def test_spilled_entries_are_queryable(self, tmp_path):
+        log = HistoryLog(max_entries=5, spill_path=tmp_path / "node.jsonl")
+        for i in range(20):
+            log.append({"n": i, "type": "even" if i % 2 == 0 else "odd"})
+
+        assert len(log) == 5
+        assert [e["n"] for e in log.query()] == list(range(20))
+        assert [e["n"] for e in log.query(key="type", value="even")] == list(range(0, 20, 2))
+        assert [e["n"] for e in log.query(limit=3)] == [17, 18, 19]
+
+        stats = log.stats()
+        assert stats["spilled_entries"] == 15
+        assert stats["dropped_entries"] == 0
+        assert stats["spill_file_bytes"] > 0
+
+    def test_query_by_key_presence(self, tmp_path):
+        log = HistoryLog(max_entries=2, spill_path=tmp_path / "node.jsonl")
+        log.extend([{"a": 1}, {"b": 2}, {"a": 3}, {"b": 4}, {"a": 5}])
+
+        assert log.query(key="a") == [{"a": 1}, {"a": 3}, {"a": 5}]
+        assert log.query(key="missing") == []
+
+    def test_query_by_time_range(self, tmp_path):
+        log = HistoryLog(max_entries=2, spill_path=tmp_path / "node.jsonl")
+        for i in range(6):
+            log.append({"n": i})
+        records = log.query(include_timestamps=True)
+        timestamps = [t for t, _ in records]
+        assert timestamps == sorted(timestamps)
+
+        start, end = timestamps[1], timestamps[4]
+        selected = log.query(start=start, end=end)
+        assert selected == [e for t, e in records if start <= t <= end]
+        assert {"n": 1} in selected and {"n": 4} in selected
+
+    def test_reopen_rebuilds_index(self, tmp_path):
+        path = tmp_path / "node.jsonl"
+        log = HistoryLog(max_entries=1, spill_path=path)
+        log.extend([{"k": i} for i in range(4)])
+        log.close()
+
+        reopened = HistoryLog(max_entries=1, spill_path=path)
+        reopened.append({"k": 99})
+        reopened.append({"other": True})
+
+        assert reopened.query(key="k") == [{"k": 0}, {"k": 1}, {"k": 2}, {"k": 99}]
+        assert reopened.stats()["spilled_entries"] == 4
+
+    def test_reopen_ignores_unwritten_index_records(self, tmp_path):
+        path = tmp_path / "node.jsonl"
+        log = HistoryLog(max_entries=1, spill_path=path)
+        log.extend([{"k": i} for i in range(3)])
+        log.close()
+
+        # Simulate a crash after the index was written but before the data
+        data = path.read_bytes()
+        path.write_bytes(data[:-3])
+
+        reopened = HistoryLog(max_entries=1, spill_path=path)
+        assert reopened.query() == [{"k": 0}]
+
+
+class TestNodeMemoryHistory:
+    """Tests for NodeMemory integration"""
+
+    def test_defaults_are_bounded(self):
+        memory = NodeMemory()
+        assert isinstance(memory.history, HistoryLog)
+        assert memory.history.max_entries == 1000
+
+    def test_list_history_is_converted(self, tmp_path):
+        memory = NodeMemory(history=[{"n": 1}, {"n": 2}, {"n": 3}], max_history=2,
+                            history_spill_path=str(tmp_path / "h.jsonl"))
+        assert list(memory.history) == [{"n": 2}, {"n": 3}]
+        assert memory.query_history() == [{"n": 1}, {"n": 2}, {"n": 3}]
+
+    def test_memory_stats(self):
+        memory = NodeMemory(max_history=2)
+        memory.store("k", "v")
+        for i in range(3):
+            memory.add_to_history({"n": i})
+
+        stats = memory.memory_stats()
+        assert stats["state_keys"] == 1
+        assert stats["history"]["resident_entries"] == 2
+        assert stats["history"]["dropped_entries"] == 1
+        assert stats["history"]["resident_bytes"] > 0
+
+    def test_executor_applies_config_and_reports_stats(self, tmp_path):
+        executor = RuntimeExecutor(RuntimeConfig(history_max_entries=3,
+                                                 history_spill_dir=str(tmp_path / "history")))
+        node = GraphBusNode()
+        node.name = "Worker"
+        executor._configure_node_memory(node)
+        executor.nodes = {"Worker": node}
+
+        for i in range(5):
+            node.memory.add_to_history({"n": i})
+
+        stats = executor.get_stats()["memory"]["Worker"]["history"]
+        assert stats["resident_entries"] == 3
+        assert stats["spilled_entries"] == 2
+        assert (tmp_path / "history" / "Worker.jsonl").exists()
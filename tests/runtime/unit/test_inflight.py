@@ -0,0 +1,141 @@
+"""
+Unit tests for InFlightTracker
+"""
+
+import asyncio
+import threading
+import time
+
+from graphbus_core.runtime.inflight import InFlightTracker
+
+
+class TestInFlightTracker:
+    """Test InFlightTracker"""
+
+    def test_track_counts_per_node_and_topic(self):
+        tracker = InFlightTracker()
+
+        with tracker.track(node="A", topic="/t"):
+            snapshot = tracker.snapshot()
+            assert snapshot["active"] == 1
+            assert snapshot["nodes"] == {"A": 1}
+            assert snapshot["topics"] == {"/t": 1}
+            assert tracker.is_nested()
+
+        snapshot = tracker.snapshot()
+        assert snapshot["active"] == 0
+        assert snapshot["nodes"] == {}
+        assert snapshot["completed_total"] == 1
+        assert not tracker.is_nested()
+
+    def test_track_releases_on_exception(self):
+        tracker = InFlightTracker()
+
+        try:
+            with tracker.track(node="A"):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+
+        assert tracker.total == 0
+
+    def test_wait_idle_waits_for_active_and_pending(self):
+        tracker = InFlightTracker()
+        tracker.add_pending()
+        release = threading.Event()
+
+        def worker():
+            tracker.remove_pending()
+            with tracker.track(node="A"):
+                release.wait(1)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+
+        assert not tracker.wait_idle(timeout=0.05)
+        release.set()
+        assert tracker.wait_idle(timeout=1)
+        thread.join(1)
+
+    def test_wait_idle_immediate_when_idle(self):
+        tracker = InFlightTracker()
+        start = time.monotonic()
+        assert tracker.wait_idle(timeout=5)
+        assert time.monotonic() - start < 1
+
+    def test_start_pending_moves_pending_to_active(self):
+        tracker = InFlightTracker()
+        tracker.add_pending()
+
+        with tracker.start_pending():
+            snapshot = tracker.snapshot()
+            assert (snapshot["pending"], snapshot["active"]) == (0, 1)
+            assert tracker.is_nested()
+
+        assert tracker.total == 0
+        assert tracker.snapshot()["completed_total"] == 0
+        assert not tracker.is_nested()
+
+    def test_nesting_is_per_task_on_one_thread(self):
+        tracker = InFlightTracker()
+
+        async def run():
+            inside = asyncio.Event()
+            release = asyncio.Event()
+
+            async def holder():
+                with tracker.track(node="A"):
+                    inside.set()
+                    await release.wait()
+
+            async def other():
+                await inside.wait()
+                nested = tracker.is_nested()
+                release.set()
+                return nested
+
+            _, nested = await asyncio.gather(holder(), other())
+            return nested
+
+        assert asyncio.run(run()) is False
+
+    def test_current_calls_per_thread(self):
+        tracker = InFlightTracker()
+        ident = threading.get_ident()
+
+        with tracker.track(node="A", handler="outer"):
+            with tracker.track(node="B", topic="/t", handler="on_t"):
+                assert tracker.current_calls() == {ident: ("B", "on_t", "/t")}
+            assert tracker.current_calls() == {ident: ("A", "outer", None)}
+
+        assert tracker.current_calls() == {}
+
+    def test_suspended_coroutine_not_attributed_to_thread(self):
+        tracker = InFlightTracker()
+        ident = threading.get_ident()
+
+        async def run():
+            inside = asyncio.Event()
+            release = asyncio.Event()
+
+            async def holder():
+                with tracker.track(node="A", handler="slow", coroutine=True):
+                    inside.set()
+                    await release.wait()
+
+            async def other():
+                await inside.wait()
+                with tracker.track(node="B", handler="fast"):
+                    calls = tracker.current_calls()
+                idle = tracker.current_calls()
+                active = tracker.snapshot()["active"]
+                release.set()
+                return calls, idle, active
+
+            _, result = await asyncio.gather(holder(), other())
+            return result
+
+        calls, idle, active = asyncio.run(run())
+        assert calls == {ident: ("B", "fast", None)}
+        assert idle == {}
+        assert active == 1
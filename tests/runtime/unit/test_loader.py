@@ -7,6 +7,7 @@ import json
 import tempfile
 from pathlib import Path
 
+from graphbus_core import codec
 from graphbus_core.runtime.loader import ArtifactLoader
 from graphbus_core.model.agent_def import AgentDefinition
 from graphbus_core.model.graph import AgentGraph
@@ -134,6 +135,20 @@ class TestArtifactLoader:
             loader.get_agent_by_name("NonExistentAgent")
         assert "not found" in str(exc_info.value)
 
+    def test_load_binary_artifacts(self, temp_artifacts_dir):
+        """Test artifacts re-written in the binary storage format are detected"""
+        for name in ("graph.json", "agents.json", "topics.json"):
+            path = Path(temp_artifacts_dir) / name
+            codec.dump(json.loads(path.read_text()), path, "binary")
+            assert path.read_bytes().startswith(codec.MAGIC)
+
+        loader = ArtifactLoader(temp_artifacts_dir)
+        graph, agents, topics, _ = loader.load_all()
+
+        assert "TestAgent" in graph.graph.nodes
+        assert agents[0].name == "TestAgent"
+        assert topics[0].name == "/test/topic"
+
     def test_validate_artifacts(self, temp_artifacts_dir):
         """Test artifact validation"""
         loader = ArtifactLoader(temp_artifacts_dir)
@@ -0,0 +1,172 @@
+"""
+Tests for the tracemalloc allocation profiler
+"""
+
+import tracemalloc
+
+import pytest
+
+from graphbus_core.runtime.memory_profiler import MemoryProfiler, format_bytes
+from graphbus_core.runtime.profiler import PerformanceProfiler
+
+KEEP = []
+
+
+def allocate_and_keep(kib):
+    """Allocate ``kib`` KiB and keep it alive"""
+    KEEP.append(bytearray(kib * 1024))
+
+
+def allocate_and_drop(kib):
+    """Allocate ``kib`` KiB temporarily"""
+    data = bytearray(kib * 1024)
+    return len(data)
+
+
+@pytest.fixture
+def profiler():
+    """Running memory profiler that samples every call"""
+    profiler = MemoryProfiler(sample_rate=1.0)
+    profiler.start()
+    yield profiler
+    profiler.stop()
+    KEEP.clear()
+
+
+class TestMemoryProfiler:
+    """Test MemoryProfiler"""
+
+    def test_retained_allocation_attributed(self, profiler):
+        """Memory kept after the call counts as allocated, at its call site"""
+        with profiler.track("Cache", "on_fill"):
+            allocate_and_keep(256)
+
+        stats = profiler.handler_stats()[0]
+        assert (stats.node, stats.handler) == ("Cache", "on_fill")
+        assert stats.sampled_calls == 1
+        assert stats.allocated_bytes >= 256 * 1024
+        assert stats.peak_bytes >= 256 * 1024
+
+        site, size = profiler.top_sites("Cache")[0]
+        assert site.endswith(f"test_memory_profiler.py:{allocate_and_keep.__code__.co_firstlineno + 2}")
+        assert size >= 256 * 1024
+
+    def test_transient_allocation_shows_as_peak(self, profiler):
+        """Memory freed before return does not count as retained but raises the peak"""
+        with profiler.track("Parser", "on_blob"):
+            allocate_and_drop(512)
+
+        stats = profiler.handler_stats()[0]
+        assert stats.allocated_bytes < 64 * 1024
+        assert stats.peak_bytes >= 512 * 1024
+
+    def test_handlers_ranked_by_allocation(self, profiler):
+        """Bigger allocators come first and sites are kept per node"""
+        for _ in range(2):
+            with profiler.track("Small", "handle"):
+                allocate_and_keep(8)
+        with profiler.track("Big", "handle"):
+            allocate_and_keep(128)
+
+        ranked = profiler.handler_stats()
+        assert [s.node for s in ranked] == ["Big", "Small"]
+        assert ranked[1].sampled_calls == 2
+        assert ranked[1].avg_allocated >= 8 * 1024
+
+        summary = profiler.get_summary()
+        assert summary["calls"] == 3
+        assert summary["sampled_calls"] == 3
+        assert set(summary["top_sites"]) == {"Big", "Small"}
+        assert summary["handlers"]["Big.handle"]["net_bytes"] >= 120 * 1024
+
+    def test_sample_rate_zero_skips_snapshots(self):
+        """Unsampled calls are counted but not measured"""
+        profiler = MemoryProfiler(sample_rate=0.0)
+        profiler.start()
+        try:
+            for _ in range(5):
+                with profiler.track("Node", "handle"):
+                    allocate_and_keep(4)
+        finally:
+            profiler.stop()
+            KEEP.clear()
+        assert profiler.calls == 5
+        assert profiler.handler_stats() == []
+
+    def test_nested_calls_attributed_separately(self, profiler):
+        """Inner handler allocations count for both the inner and the outer call"""
+        with profiler.track("Outer", "handle"):
+            with profiler.track("Inner", "handle"):
+                allocate_and_keep(64)
+
+        stats = {s.node: s for s in profiler.handler_stats()}
+        assert stats["Inner"].allocated_bytes >= 64 * 1024
+        assert stats["Outer"].allocated_bytes >= 64 * 1024
+
+    def test_include_filter(self):
+        """Only allocations from included files are counted"""
+        profiler = MemoryProfiler(sample_rate=1.0, include=["*/nowhere/*"])
+        profiler.start()
+        try:
+            with profiler.track("Node", "handle"):
+                allocate_and_keep(64)
+        finally:
+            profiler.stop()
+            KEEP.clear()
+        assert profiler.handler_stats()[0].allocated_bytes == 0
+
+    def test_leaves_foreign_tracing_running(self):
+        """stop() only stops tracemalloc if this profiler started it"""
+        tracemalloc.start()
+        try:
+            profiler = MemoryProfiler()
+            profiler.start()
+            profiler.stop()
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+
+    def test_format_bytes(self):
+        """Byte counts are humanized"""
+        assert format_bytes(512) == "512 B"
+        assert format_bytes(1536) == "1.5 KiB"
+        assert format_bytes(3 * 1024 * 1024) == "3.0 MiB"
+
+
+class TestProfilerMemoryIntegration:
+    """Test memory profiling through PerformanceProfiler"""
+
+    def test_summary_and_report_include_memory(self):
+        """Method calls are measured and surface in get_summary and the report"""
+        profiler = PerformanceProfiler()
+        profiler.enable_memory_profiling(sample_rate=1.0)
+        profiler.enable()
+        try:
+            start = profiler.start_method_call("Cache", "fill")
+            allocate_and_keep(64)
+            profiler.end_method_call("Cache", "fill", start)
+
+            summary = profiler.get_summary()
+            assert summary["memory"]["handlers"]["Cache.fill"]["allocated_bytes"] >= 64 * 1024
+            assert "Allocations by Handler" in profiler.generate_report()
+        finally:
+            profiler.disable()
+            KEEP.clear()
+        assert not tracemalloc.is_tracing()
+
+    def test_summary_without_memory_profiling(self):
+        """No memory key unless memory profiling is enabled"""
+        profiler = PerformanceProfiler()
+        assert "memory" not in profiler.get_summary()
+
+    def test_reset_clears_memory_data(self):
+        """reset() drops allocation data"""
+        profiler = PerformanceProfiler()
+        memory = profiler.enable_memory_profiling(sample_rate=1.0)
+        profiler.enable()
+        try:
+            profiler.end_method_call("A", "m", profiler.start_method_call("A", "m"))
+            profiler.reset()
+            assert memory.handler_stats() == []
+        finally:
+            profiler.disable()
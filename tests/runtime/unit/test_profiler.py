@@ -3,6 +3,7 @@ Tests for Performance Profiler
 """
 
 import pytest
+import threading
 import time
 from graphbus_core.runtime.profiler import (
     PerformanceProfiler,
@@ -41,9 +42,23 @@ class TestMethodProfile:
     def test_recent_avg(self):
         """Test recent average calculation"""
         profile = MethodProfile(agent_name="Test", method_name="method")
-        profile.recent_times.extend([0.1, 0.2, 0.3, 0.4])
+        for seconds in [0.1, 0.2, 0.3, 0.4]:
+            profile.window.record(seconds)
 
-        assert profile.recent_avg == 0.25
+        assert abs(profile.recent_avg - 0.25) < 1e-9
+
+    def test_percentiles(self):
+        """Test percentiles come from the histogram"""
+        profile = MethodProfile(agent_name="Test", method_name="method")
+        for ms in range(1, 101):
+            profile.histogram.record(ms / 1000)
+
+        assert abs(profile.percentile(0.5) - 0.050) < 0.001
+        assert abs(profile.percentile(0.99) - 0.099) < 0.002
+        stats = profile.percentiles()
+        assert stats["count"] == 100
+        assert stats["max"] == 0.1
+        assert set(stats) >= {"p50", "p90", "p99", "p999"}
 
 
 class TestEventProfile:
@@ -69,7 +84,8 @@ class TestEventProfile:
     def test_recent_avg(self):
         """Test recent average calculation"""
         profile = EventProfile(topic="/test/topic")
-        profile.recent_routing_times.extend([0.1, 0.2, 0.3])
+        for seconds in [0.1, 0.2, 0.3]:
+            profile.window.record(seconds)
 
         assert abs(profile.recent_avg - 0.2) < 0.001  # Account for floating point precision
 
@@ -109,7 +125,7 @@ class TestPerformanceProfiler:
         profiler.enable()
         profiler.start_method_call("Agent", "method")
         time.sleep(0.01)
-        profiler.end_method_call("Agent", "method", time.time() - 0.01)
+        profiler.end_method_call("Agent", "method", time.perf_counter_ns() - 10_000_000)
 
         assert len(profiler.method_profiles) > 0
 
@@ -124,7 +140,7 @@ class TestPerformanceProfiler:
         start_time = profiler.start_method_call("Agent", "method")
 
         # Should return timestamp but not record anything
-        assert isinstance(start_time, float)
+        assert isinstance(start_time, int)
         assert len(profiler.method_profiles) == 0
 
     def test_start_method_call_enabled(self, profiler):
@@ -133,7 +149,7 @@ class TestPerformanceProfiler:
 
         start_time = profiler.start_method_call("Agent", "method")
 
-        assert isinstance(start_time, float)
+        assert isinstance(start_time, int)
         assert profiler.active_calls["Agent.method"] == 1
         assert profiler.agent_call_counts["Agent"] == 1
 
@@ -150,7 +166,7 @@ class TestPerformanceProfiler:
         assert profile.total_time > 0.01  # At least 10ms
         assert profile.min_time > 0
         assert profile.max_time > 0
-        assert len(profile.recent_times) == 1
+        assert profile.histogram.count == 1
 
     def test_multiple_method_calls(self, profiler):
         """Test multiple calls to same method"""
@@ -164,7 +180,7 @@ class TestPerformanceProfiler:
         profile = profiler.method_profiles["Agent.method"]
         assert profile.call_count == 5
         assert profile.total_time > 0.025  # At least 25ms total
-        assert len(profile.recent_times) == 5
+        assert profile.histogram.count == 5
 
     def test_different_methods(self, profiler):
         """Test profiling different methods"""
@@ -207,7 +223,7 @@ class TestPerformanceProfiler:
         assert profile.publish_count == 1
         assert profile.delivery_count == 3
         assert profile.total_routing_time == 0.05
-        assert len(profile.recent_routing_times) == 1
+        assert profile.histogram.count == 1
 
     def test_multiple_event_publishes(self, profiler):
         """Test multiple event publishes"""
@@ -354,7 +370,7 @@ class TestPerformanceProfiler:
 
         assert len(bottlenecks) == 1
         assert bottlenecks[0].agent_name == "SlowAgent"
-        assert bottlenecks[0].avg_time > 0.1  # Over 100ms
+        assert bottlenecks[0].percentile(0.99) > 0.1  # Over 100ms
 
     def test_get_bottlenecks_custom_threshold(self, profiler):
         """Test bottlenecks with custom threshold"""
@@ -426,8 +442,8 @@ class TestPerformanceProfiler:
         assert "TestAgent.test_method" in report
         assert "SlowAgent.slow_method" in report
 
-    def test_recent_times_limit(self, profiler):
-        """Test recent times buffer is limited to 100 entries"""
+    def test_histogram_keeps_every_call(self, profiler):
+        """Test every call lands in the histogram and the sliding window"""
         profiler.enable()
 
         # Make 150 calls
@@ -437,7 +453,8 @@ class TestPerformanceProfiler:
 
         profile = profiler.method_profiles["Agent.method"]
         assert profile.call_count == 150
-        assert len(profile.recent_times) == 100  # Limited to 100
+        assert profile.histogram.count == 150
+        assert profile.window.count == 150
 
     def test_min_max_time_tracking(self, profiler):
         """Test min and max time tracking"""
@@ -474,3 +491,160 @@ class TestPerformanceProfiler:
         assert len(profiler.method_profiles) == 0
         assert len(profiler.event_profiles) == 0
         assert len(profiler.agent_call_counts) == 0
+
+
+class TestPerThreadAccumulators:
+    """Test lock-free recording and merge-on-read"""
+
+    def test_calls_from_many_threads_are_merged(self):
+        """Test counts recorded on several threads add up"""
+        profiler = PerformanceProfiler()
+        profiler.enable()
+        barrier = threading.Barrier(4)
+
+        def work():
+            barrier.wait()
+            for _ in range(500):
+                profiler.end_method_call("Agent", "method", profiler.start_method_call("Agent", "method"))
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        profile = profiler.method_profiles["Agent.method"]
+        assert profile.call_count == 2000
+        assert profiler.agent_call_counts["Agent"] == 2000
+        assert profiler.get_active_calls() == {}
+        assert profile.histogram.count == 2000
+        assert profiler.get_summary()["total_method_calls"] == 2000
+
+    def test_exited_threads_are_retired(self):
+        """Test data from finished threads survives and the thread is dropped"""
+        profiler = PerformanceProfiler()
+        profiler.enable()
+
+        t = threading.Thread(target=lambda: profiler.end_method_call(
+            "Agent", "method", profiler.start_method_call("Agent", "method")))
+        t.start()
+        t.join()
+
+        assert profiler.method_profiles["Agent.method"].call_count == 1
+        assert all(thread.is_alive() for thread, _ in profiler._threads)
+        assert profiler.method_profiles["Agent.method"].call_count == 1
+
+    def test_call_ending_on_another_thread(self):
+        """Test active calls balance when start and end run on different threads"""
+        profiler = PerformanceProfiler()
+        profiler.enable()
+        start = profiler.start_method_call("Agent", "method")
+
+        t = threading.Thread(target=profiler.end_method_call, args=("Agent", "method", start))
+        t.start()
+        t.join()
+
+        assert profiler.get_active_calls() == {}
+        assert profiler.method_profiles["Agent.method"].call_count == 1
+
+    def test_nanosecond_durations(self):
+        """Test very short calls still get a non-negative duration"""
+        profiler = PerformanceProfiler()
+        profiler.enable()
+        profiler.end_method_call("Agent", "method", profiler.start_method_call("Agent", "method"))
+
+        profile = profiler.method_profiles["Agent.method"]
+        assert 0 <= profile.min_time <= profile.max_time < 0.1
+
+
+class TestSystemSampler:
+    """Test background system resource sampling"""
+
+    def test_sampling_runs_in_background(self):
+        """Test snapshots are taken without any profiled calls"""
+        profiler = PerformanceProfiler(snapshot_interval=0.01)
+        profiler.enable()
+        try:
+            deadline = time.time() + 5
+            while not profiler.system_snapshots and time.time() < deadline:
+                time.sleep(0.01)
+            assert profiler.get_system_stats()["snapshots"] > 0
+        finally:
+            profiler.disable()
+
+    def test_recording_never_samples(self, monkeypatch):
+        """Test the measured path does not touch psutil"""
+        profiler = PerformanceProfiler()
+        profiler.enabled = True
+        monkeypatch.setattr(profiler, "_take_system_snapshot", lambda: pytest.fail("sampled in call path"))
+
+        profiler.end_method_call("Agent", "method", profiler.start_method_call("Agent", "method"))
+        profiler.record_event_publish("/topic", 0.001, 1)
+
+    def test_disable_stops_sampler(self):
+        """Test disabling stops the sampler thread"""
+        profiler = PerformanceProfiler(snapshot_interval=0.01)
+        profiler.enable()
+        sampler = profiler._sampler
+        profiler.disable()
+
+        sampler.join(2)
+        assert not sampler.is_alive()
+
+
+class TestLatencyPercentiles:
+    """Test histogram-backed latency percentiles"""
+
+    def test_bottlenecks_use_tail_latency(self):
+        """Test a method with a slow tail is flagged even if its mean is low"""
+        profiler = PerformanceProfiler()
+        profiler.enabled = True
+        now = time.perf_counter_ns()
+        # 98 fast calls and two 200ms calls: mean ~5ms, p99 ~200ms
+        for _ in range(98):
+            profiler.end_method_call("Agent", "spiky", now)
+        for _ in range(2):
+            profiler.end_method_call("Agent", "spiky", now - 200_000_000)
+
+        profile = profiler.method_profiles["Agent.spiky"]
+        assert profile.avg_time < 0.1
+        assert [p.method_name for p in profiler.get_bottlenecks(threshold_ms=100.0)] == ["spiky"]
+        assert profiler.get_bottlenecks(threshold_ms=100.0, percentile=0.5) == []
+
+    def test_sliding_window_drops_old_calls(self):
+        """Test the window only covers recent calls while totals keep everything"""
+        profiler = PerformanceProfiler(window_seconds=0.05, window_slots=1)
+        profiler.enable()
+        profiler.end_method_call("Agent", "method", profiler.start_method_call("Agent", "method"))
+        time.sleep(0.1)
+        profiler.end_method_call("Agent", "method", profiler.start_method_call("Agent", "method"))
+
+        latency = profiler.get_latency_percentiles()
+        stats = latency["methods"]["Agent.method"]
+        assert stats["all"]["count"] == 2
+        assert stats["window"]["count"] == 1
+        assert latency["window_seconds"] == 0.05
+        profiler.disable()
+
+    def test_topic_percentiles(self):
+        """Test routing latency percentiles per topic"""
+        profiler = PerformanceProfiler()
+        profiler.enabled = True
+        for ms in (1, 2, 3, 50):
+            profiler.record_event_publish("/orders", ms / 1000, 1)
+
+        stats = profiler.get_latency_percentiles()["topics"]["/orders"]["all"]
+        assert stats["count"] == 4
+        assert abs(stats["max"] - 0.05) < 1e-9
+        assert abs(profiler.event_profiles["/orders"].total_routing_time - 0.056) < 1e-6
+
+    def test_report_and_html_include_percentiles(self):
+        """Test percentiles show up in the text report and HTML method list"""
+        profiler = PerformanceProfiler()
+        profiler.enabled = True
+        profiler.end_method_call("Agent", "method", time.perf_counter_ns() - 10_000_000)
+
+        assert "Method Latency Percentiles" in profiler.generate_report()
+        row = profiler._method_rows()[0]
+        assert {"p50", "p90", "p99", "p999"} <= set(row)
+        assert "p99" in profiler.generate_flame_graph_html()
@@ -0,0 +1,157 @@
+"""
+Unit tests for the sampling profiler
+"""
+
+import threading
+import time
+
+from graphbus_core.runtime.inflight import InFlightTracker
+from graphbus_core.runtime.profiler import PerformanceProfiler
+from graphbus_core.runtime.sampler import UNATTRIBUTED, StackSampler
+
+
+def busy_leaf(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def on_order(tracker, started, stop):
+    """Stands in for a node handler running under the executor"""
+    with tracker.track(node="OrderAgent", topic="/orders", handler="on_order"):
+        started.set()
+        while not stop.is_set():
+            busy_leaf(0.001)
+
+
+def run_handler(tracker):
+    started, stop = threading.Event(), threading.Event()
+    thread = threading.Thread(target=on_order, args=(tracker, started, stop))
+    thread.start()
+    assert started.wait(5)
+    return thread, stop
+
+
+class TestStackSampler:
+    """Tests for StackSampler"""
+
+    def test_samples_are_attributed_to_handler(self):
+        tracker = InFlightTracker()
+        sampler = StackSampler(tracker.current_calls)
+        thread, stop = run_handler(tracker)
+        try:
+            for _ in range(5):
+                assert sampler.sample_once() == 1  # only the thread inside a node call
+        finally:
+            stop.set()
+            thread.join(5)
+
+        assert sampler.attribution() == {"OrderAgent.on_order": 5}
+        stacks = sampler.collapsed()
+        assert sum(stacks.values()) == 5
+        for stack in stacks:
+            frames = stack.split(";")
+            # Rooted at node and handler, runtime plumbing above the handler trimmed
+            assert frames[:2] == ["OrderAgent", "OrderAgent.on_order"]
+            assert frames[2].startswith("on_order (test_sampler.py:")
+
+    def test_unattributed_threads(self):
+        stop = threading.Event()
+        thread = threading.Thread(target=stop.wait, args=(5,))
+        thread.start()
+        try:
+            sampler = StackSampler(lambda: {}, all_threads=True)
+            assert sampler.sample_once() >= 1  # never the sampling thread itself
+            assert set(sampler.attribution()) == {UNATTRIBUTED}
+
+            assert StackSampler(lambda: {}).sample_once() == 0
+        finally:
+            stop.set()
+            thread.join(5)
+
+    def test_collapsed_text_and_flame_tree(self, tmp_path):
+        tracker = InFlightTracker()
+        sampler = StackSampler(tracker.current_calls, max_depth=3)
+        thread, stop = run_handler(tracker)
+        try:
+            for _ in range(4):
+                sampler.sample_once()
+        finally:
+            stop.set()
+            thread.join(5)
+
+        path = sampler.write_collapsed(tmp_path / "stacks.folded")
+        lines = path.read_text().splitlines()
+        assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == 4
+        assert all(len(line.rsplit(" ", 1)[0].split(";")) <= 2 + 3 for line in lines)
+
+        tree = sampler.flame_graph()
+        assert tree["value"] == 4
+        assert tree["children"][0]["name"] == "OrderAgent"
+        assert tree["children"][0]["children"][0]["value"] == 4
+
+    def test_background_sampling_reports_overhead(self):
+        tracker = InFlightTracker()
+        sampler = StackSampler(tracker.current_calls, interval=0.002)
+        thread, stop = run_handler(tracker)
+        sampler.start()
+        try:
+            deadline = time.time() + 5
+            while sampler.samples < 5 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            sampler.stop()
+            stop.set()
+            thread.join(5)
+
+        stats = sampler.stats()
+        assert stats["samples"] >= 5
+        assert 0.0 < stats["overhead"] < 1.0
+        assert not sampler.is_running
+
+    def test_overhead_budget_stretches_interval(self):
+        sampler = StackSampler(lambda: {}, interval=0.001, max_overhead=0.01)
+        original = sampler.sample_once
+
+        def slow_sample():
+            busy_leaf(0.005)
+            return original()
+
+        sampler.sample_once = slow_sample
+        sampler.start()
+        time.sleep(0.2)
+        sampler.stop()
+        # 5ms per tick at <=1% overhead means waiting ~0.5s between ticks
+        assert sampler.effective_interval > 0.1
+        assert sampler.ticks <= 2
+
+
+class TestProfilerSampling:
+    """Tests for sampling through PerformanceProfiler"""
+
+    def test_flame_graph_data_from_samples(self):
+        tracker = InFlightTracker()
+        profiler = PerformanceProfiler()
+        sampler = profiler.enable_sampling(tracker.current_calls, interval=0.002)
+        assert profiler.generate_flame_graph_data() == {"name": "all", "value": 0, "children": []}
+
+        thread, stop = run_handler(tracker)
+        profiler.enable()
+        try:
+            deadline = time.time() + 5
+            while sampler.samples < 3 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            profiler.disable()
+            stop.set()
+            thread.join(5)
+
+        assert not sampler.is_running
+        tree = profiler.generate_flame_graph_data()
+        assert tree["value"] >= 3
+        assert any(k.startswith("OrderAgent;OrderAgent.on_order;") for k in profiler.get_collapsed_stacks())
+        assert "Sampled Time by Handler" in profiler.generate_report()
+        assert '"OrderAgent"' in profiler.generate_flame_graph_html()
+
+        profiler.reset()
+        assert profiler.get_collapsed_stacks() == {}
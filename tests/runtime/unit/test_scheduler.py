@@ -0,0 +1,363 @@
+"""
+Unit tests for the timing-wheel Scheduler
+"""
+
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from graphbus_core.config import RuntimeConfig
+from graphbus_core.decorators import cron, every
+from graphbus_core.node_base import GraphBusNode
+from graphbus_core.runtime.executor import RuntimeExecutor
+from graphbus_core.runtime.message_bus import MessageBus
+from graphbus_core.runtime.scheduler import (
+    CronExpression,
+    HierarchicalTimingWheel,
+    Scheduler,
+    VirtualClock,
+    parse_duration,
+)
+
+
+class TestParseDuration:
+    """Tests for duration strings"""
+
+    @pytest.mark.parametrize("value,expected", [
+        ("5s", 5.0),
+        ("250ms", 0.25),
+        ("2m", 120.0),
+        ("1h", 3600.0),
+        ("1d", 86400.0),
+        ("1.5", 1.5),
+        (30, 30.0),
+    ])
+    def test_valid(self, value, expected):
+        assert parse_duration(value) == expected
+
+    @pytest.mark.parametrize("value", ["abc", "5x", "-1s", 0])
+    def test_invalid(self, value):
+        with pytest.raises(ValueError):
+            parse_duration(value)
+
+
+class TestCronExpression:
+    """Tests for cron parsing and next-fire computation"""
+
+    def test_every_five_minutes(self):
+        expr = CronExpression("*/5 * * * *")
+        assert expr.next_after(datetime(2024, 1, 1, 10, 3)) == datetime(2024, 1, 1, 10, 5)
+        assert expr.next_after(datetime(2024, 1, 1, 10, 5)) == datetime(2024, 1, 1, 10, 10)
+
+    def test_rolls_over_day_and_month(self):
+        expr = CronExpression("30 2 1 * *")
+        assert expr.next_after(datetime(2024, 1, 15, 0, 0)) == datetime(2024, 2, 1, 2, 30)
+
+    def test_weekday_range(self):
+        # 2024-01-06 is a Saturday; next weekday 09:00 is Monday the 8th
+        expr = CronExpression("0 9 * * 1-5")
+        assert expr.next_after(datetime(2024, 1, 6, 12, 0)) == datetime(2024, 1, 8, 9, 0)
+
+    def test_sunday_as_seven(self):
+        expr = CronExpression("0 0 * * 7")
+        assert expr.next_after(datetime(2024, 1, 1)) == datetime(2024, 1, 7, 0, 0)
+
+    def test_day_or_weekday_when_both_restricted(self):
+        # 1st of the month OR Friday
+        expr = CronExpression("0 0 1 * 5")
+        assert expr.next_after(datetime(2024, 1, 1, 1, 0)) == datetime(2024, 1, 5, 0, 0)
+
+    def test_lists_and_range_steps(self):
+        expr = CronExpression("0,30 8-12/2 * * *")
+        assert expr.minutes == {0, 30}
+        assert expr.hours == {8, 10, 12}
+
+    @pytest.mark.parametrize("expression", [
+        "* * * *",
+        "60 * * * *",
+        "* 24 * * *",
+        "*/0 * * * *",
+        "a * * * *",
+        "5-1 * * * *",
+    ])
+    def test_invalid(self, expression):
+        with pytest.raises(ValueError):
+            CronExpression(expression)
+
+    def test_never_fires(self):
+        with pytest.raises(ValueError, match="never fires"):
+            CronExpression("0 0 31 2 *").next_after(datetime(2024, 1, 1))
+
+
+class TestHierarchicalTimingWheel:
+    """Tests for the timing wheel itself"""
+
+    def test_fires_at_exact_tick_across_levels(self):
+        wheel = HierarchicalTimingWheel(slot_bits=2, levels=3)  # 4 slots, range 64
+        deadlines = [1, 3, 4, 5, 15, 16, 17, 40, 63]
+        for deadline in deadlines:
+            wheel.insert(deadline, deadline)
+
+        fired = {}
+        for tick in range(1, 70):
+            for timer in wheel.advance(tick):
+                fired[timer.payload] = tick
+
+        assert fired == {d: d for d in deadlines}
+        assert len(wheel) == 0
+
+    def test_beyond_range_is_rehashed(self):
+        wheel = HierarchicalTimingWheel(slot_bits=2, levels=2)  # range 16
+        wheel.insert(100, "late")
+
+        fired_at = None
+        for tick in range(1, 120):
+            if wheel.advance(tick):
+                fired_at = tick
+        assert fired_at == 100
+
+    def test_cancel(self):
+        wheel = HierarchicalTimingWheel()
+        keep = wheel.insert(10, "keep")
+        drop = wheel.insert(10, "drop")
+
+        assert wheel.cancel(drop) is True
+        assert wheel.cancel(drop) is False
+        assert [t.payload for t in wheel.advance(10)] == ["keep"]
+        assert wheel.cancel(keep) is False
+
+    def test_past_deadline_fires_on_next_advance(self):
+        wheel = HierarchicalTimingWheel(start_tick=50)
+        wheel.insert(10, "overdue")
+        assert [t.payload for t in wheel.advance(50)] == ["overdue"]
+
+
+class TestScheduler:
+    """Tests for Scheduler driven by a VirtualClock"""
+
+    @pytest.fixture
+    def clock(self):
+        return VirtualClock(start=datetime(2024, 1, 1, 0, 0, 0))
+
+    @pytest.fixture
+    def scheduler(self, clock):
+        scheduler = Scheduler(tick=0.1, clock=clock)
+        scheduler.start()
+        yield scheduler
+        scheduler.stop()
+
+    def test_every_fires_on_schedule(self, clock, scheduler):
+        times = []
+        scheduler.every("5s", lambda: times.append(clock.now()))
+
+        clock.advance("12s")
+        assert times == [pytest.approx(5.0), pytest.approx(10.0)]
+
+        clock.advance("3s")
+        assert len(times) == 3
+
+    def test_cancel_stops_job(self, clock, scheduler):
+        calls = []
+        job = scheduler.every(1, lambda: calls.append(1))
+        clock.advance(2)
+        assert scheduler.cancel(job) is True
+        clock.advance(5)
+        assert len(calls) == 2
+        assert scheduler.cancel(job) is False
+
+    def test_cron_fires_on_wall_clock_minutes(self, clock, scheduler):
+        fired = []
+        scheduler.cron("*/5 * * * *", lambda: fired.append(clock.wall_time()))
+
+        clock.advance("16m")
+        assert fired == [
+            datetime(2024, 1, 1, 0, 5),
+            datetime(2024, 1, 1, 0, 10),
+            datetime(2024, 1, 1, 0, 15),
+        ]
+
+    def test_jitter_delays_within_bound(self, clock, scheduler):
+        times = []
+        scheduler.every(10, lambda: times.append(clock.now()), jitter=2)
+        clock.advance(100)
+
+        assert len(times) >= 9
+        for i, t in enumerate(times, start=1):
+            assert 10 * i <= t <= 10 * i + 2 + 0.1
+
+    def test_job_errors_are_counted_not_raised(self, clock, scheduler):
+        def boom():
+            raise ValueError("boom")
+
+        job = scheduler.every(1, boom)
+        clock.advance(3)
+        assert job.run_count == 3
+        assert job.error_count == 3
+
+    def test_stats(self, clock, scheduler):
+        scheduler.every(1, lambda: None, name="tick")
+        clock.advance(3)
+
+        stats = scheduler.get_stats()
+        assert stats["jobs_count"] == 1
+        assert stats["armed_timers"] == 1
+        assert stats["total_runs"] == 3
+        assert stats["jobs"][0]["name"] == "tick"
+
+    def test_invalid_policy(self, scheduler):
+        with pytest.raises(ValueError):
+            scheduler.every(1, lambda: None, missed="bogus")
+
+
+class TestMissedTickPolicies:
+    """Missed ticks happen when the wheel is not driven for several periods"""
+
+    def _stalled_run(self, missed):
+        clock = VirtualClock()
+        scheduler = Scheduler(tick=0.1, clock=clock)  # not started: nothing drives it
+        calls = []
+        job = scheduler.every(1, lambda: calls.append(clock.now()), missed=missed)
+
+        clock._now = 4.5  # stall for several periods
+        scheduler.run_pending()
+        return job, calls
+
+    def test_fire_once(self):
+        job, calls = self._stalled_run("fire_once")
+        assert len(calls) == 1
+        assert job.missed_count == 3
+        assert job.due == pytest.approx(5.0)
+
+    def test_fire_all(self):
+        job, calls = self._stalled_run("fire_all")
+        assert len(calls) == 4
+        assert job.due == pytest.approx(5.0)
+
+    def test_skip(self):
+        job, calls = self._stalled_run("skip")
+        assert calls == []
+        assert job.missed_count == 3
+        assert job.due == pytest.approx(5.0)
+
+
+class TestSchedulerRealClock:
+    """Smoke test of the scheduler thread"""
+
+    def test_thread_fires_jobs(self):
+        fired = threading.Event()
+        scheduler = Scheduler(tick=0.01)
+        scheduler.every(0.05, fired.set)
+        scheduler.start()
+        try:
+            assert fired.wait(2.0)
+        finally:
+            scheduler.stop()
+        assert not scheduler.is_running
+
+
+class ScheduledNode(GraphBusNode):
+    """Node with interval and cron jobs"""
+
+    def __init__(self):
+        super().__init__()
+        self.ticks = 0
+
+    @every("1s", publish="/Clock/Tick")
+    def tick(self):
+        self.ticks += 1
+        return {"count": self.ticks}
+
+    @cron("* * * * *")
+    def minutely(self):
+        return None
+
+
+class TestSchedulingDecorators:
+    """Tests for @every / @cron"""
+
+    def test_attach_schedules_without_wrapping(self):
+        specs = ScheduledNode.tick._graphbus_schedules
+        assert specs == [{"every": "1s", "publish": "/Clock/Tick", "missed": "fire_once", "jitter": 0}]
+        assert ScheduledNode.minutely._graphbus_schedules[0]["cron"] == "* * * * *"
+
+    def test_stacking(self):
+        @every("1s")
+        @cron("0 * * * *")
+        def job():
+            pass
+
+        assert len(job._graphbus_schedules) == 2
+
+    def test_validates_eagerly(self):
+        with pytest.raises(ValueError):
+            every("soon")
+        with pytest.raises(ValueError):
+            cron("not a cron")
+        with pytest.raises(ValueError):
+            every("1s", missed="bogus")
+
+
+class TestExecutorScheduling:
+    """Tests for scheduler integration in RuntimeExecutor"""
+
+    @pytest.fixture
+    def executor(self):
+        executor = RuntimeExecutor(RuntimeConfig(drain_timeout=1))
+        executor.nodes = {"Clock": ScheduledNode()}
+        executor.bus = MessageBus()
+        executor._is_running = True
+        yield executor
+        if executor._is_running:
+            executor.stop()
+
+    def test_jobs_call_method_and_publish(self, executor):
+        received = []
+        executor.bus.subscribe("/Clock/Tick", lambda event: received.append(event.payload))
+
+        clock = VirtualClock(start=datetime(2024, 1, 1))
+        executor.setup_scheduler(clock=clock)
+        assert {job.name for job in executor.scheduler.get_jobs()} == {
+            "Clock.tick", "Clock.minutely"
+        }
+
+        clock.advance("3s")
+        assert executor.nodes["Clock"].ticks == 3
+        assert received == [{"count": 1}, {"count": 2}, {"count": 3}]
+        assert executor.get_stats()["scheduler"]["total_runs"] == 3
+
+    def test_stop_stops_scheduler(self, executor):
+        executor.setup_scheduler()
+        assert executor.scheduler.is_running
+
+        executor.stop()
+        assert not executor.scheduler.is_running
+
+    def test_real_clock_jobs_run_on_pool(self, executor):
+        executor.config.scheduler_tick = 0.01
+        executor.setup_scheduler()
+
+        deadline = time.time() + 3
+        while executor.nodes["Clock"].ticks < 1 and time.time() < deadline:
+            time.sleep(0.05)
+        assert executor.nodes["Clock"].ticks >= 1
+
+    def test_job_queued_before_stop_runs_during_drain(self, executor):
+        executor.config.async_max_workers = 1
+        release = threading.Event()
+        # Occupy the only pool worker so the job stays queued until the drain
+        executor._dispatch_scheduled(lambda: release.wait(2))
+        executor._dispatch_scheduled(lambda: executor._run_scheduled("Clock", "tick", None))
+
+        report = {}
+        stopper = threading.Thread(target=lambda: report.update(executor.stop(drain_timeout=2)))
+        stopper.start()
+        deadline = time.time() + 2
+        while not executor._draining and time.time() < deadline:
+            time.sleep(0.005)
+        release.set()
+        stopper.join(3)
+
+        assert report["drained"] is True
+        assert executor.nodes["Clock"].ticks == 1
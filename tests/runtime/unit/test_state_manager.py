@@ -4,9 +4,12 @@ Unit tests for StateManager
 
 import pytest
 import json
+import os
+import sqlite3
+import time
 from pathlib import Path
 
-from graphbus_core.runtime.state import StateManager
+from graphbus_core.runtime.state import StateManager, convert_state_store
 
 
 class TestStateManager:
@@ -286,3 +289,428 @@ class TestStateManager:
         loaded_state = manager.load_state("ComplexAgent")
 
         assert loaded_state == state
+
+    def test_save_is_atomic(self, manager, monkeypatch):
+        """A failed write leaves the previous checkpoint and no temp files"""
+        manager.save_state("TestAgent", {"v": 1})
+
+        def failing_replace(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("graphbus_core.runtime.state.os.replace", failing_replace)
+        with pytest.raises(OSError):
+            manager.save_state("TestAgent", {"v": 2})
+
+        assert manager.load_state("TestAgent") == {"v": 1}
+        assert sorted(p.name for p in manager.state_dir.iterdir()) == ["TestAgent.json"]
+
+
+class TestStateManagerWriteBehind:
+    """Test write-behind checkpointing"""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """Write-behind StateManager with a long interval so only flush() writes"""
+        manager = StateManager(str(tmp_path / "state"), write_behind=True, flush_interval=60)
+        yield manager
+        manager.close(timeout=5)
+
+    def test_save_is_deferred_until_flush(self, manager):
+        manager.save_state("A", {"v": 1})
+        assert not (manager.state_dir / "A.json").exists()
+
+        assert manager.flush(timeout=5) is True
+        with open(manager.state_dir / "A.json") as f:
+            assert json.load(f)["state"] == {"v": 1}
+
+    def test_repeated_saves_coalesce(self, manager):
+        for i in range(10):
+            manager.save_state("A", {"v": i})
+        manager.flush(timeout=5)
+
+        assert manager.load_state("A") == {"v": 9}
+        assert manager.stats["coalesced"] == 9
+        assert manager.stats["writes"] == 1
+
+    def test_reads_see_queued_state(self, manager):
+        manager.save_state("A", {"v": 1})
+
+        assert manager.load_state("A") == {"v": 1}
+        assert "A" in manager.list_saved_states()
+
+    def test_state_is_snapshotted_at_save(self, manager):
+        state = {"items": [1]}
+        manager.save_state("A", state)
+        state["items"].append(2)
+        manager.flush(timeout=5)
+
+        assert manager.load_state("A") == {"items": [1]}
+
+    def test_non_serializable_raises_at_save(self, manager):
+        with pytest.raises(ValueError, match="not JSON-serializable"):
+            manager.save_state("A", {"obj": object()})
+
+    def test_clear_drops_queued_state(self, manager):
+        manager.save_state("A", {"v": 1})
+
+        assert manager.clear_state("A") is True
+        manager.flush(timeout=5)
+        assert manager.load_state("A") == {}
+        assert not (manager.state_dir / "A.json").exists()
+
+    def test_size_threshold_triggers_flush(self, tmp_path):
+        manager = StateManager(str(tmp_path / "state"), write_behind=True,
+                               flush_interval=60, max_pending=3)
+        try:
+            for name in ("A", "B", "C"):
+                manager.save_state(name, {"name": name})
+
+            deadline = time.time() + 5
+            while manager.stats["writes"] < 3 and time.time() < deadline:
+                time.sleep(0.01)
+            assert manager.stats["writes"] == 3
+        finally:
+            manager.close(timeout=5)
+
+    def test_interval_triggers_flush(self, tmp_path):
+        manager = StateManager(str(tmp_path / "state"), write_behind=True, flush_interval=0.05)
+        try:
+            manager.save_state("A", {"v": 1})
+            deadline = time.time() + 5
+            while not (manager.state_dir / "A.json").exists() and time.time() < deadline:
+                time.sleep(0.01)
+            assert (manager.state_dir / "A.json").exists()
+        finally:
+            manager.close(timeout=5)
+
+    def test_close_flushes_and_rejects_new_saves(self, manager):
+        manager.save_state("A", {"v": 1})
+        assert manager.close(timeout=5) is True
+
+        assert (manager.state_dir / "A.json").exists()
+        with pytest.raises(RuntimeError):
+            manager.save_state("A", {"v": 2})
+
+    def test_failed_write_is_reported_and_retried(self, manager, monkeypatch):
+        real_replace = os.replace
+        calls = {"n": 0}
+
+        def flaky_replace(src, dst):
+            calls["n"] += 1
+            if calls["n"] == 1:
+                raise OSError("transient")
+            return real_replace(src, dst)
+
+        monkeypatch.setattr("graphbus_core.runtime.state.os.replace", flaky_replace)
+        manager.save_state("A", {"v": 1})
+
+        assert manager.flush(timeout=5) is False
+        assert isinstance(manager.last_error, OSError)
+
+        assert manager.flush(timeout=5) is True
+        assert (manager.state_dir / "A.json").exists()
+
+
+class TestStateManagerSQLite:
+    """Test the SQLite (WAL) backend"""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """SQLite-backed StateManager"""
+        manager = StateManager(str(tmp_path / "state"), backend="sqlite")
+        yield manager
+        manager.close()
+
+    def test_uses_wal_database(self, manager):
+        manager.save_state("A", {"v": 1})
+
+        assert (manager.state_dir / "state.db").exists()
+        assert not list(manager.state_dir.glob("*.json"))
+        conn = sqlite3.connect(str(manager.state_dir / "state.db"))
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        conn.close()
+
+    def test_round_trip_and_overwrite(self, manager):
+        manager.save_state("Namespace/Agent", {"v": 1})
+        manager.save_state("Namespace/Agent", {"v": 2})
+
+        assert manager.load_state("Namespace/Agent") == {"v": 2}
+        assert manager.list_saved_states() == ["Namespace/Agent"]
+        assert manager.load_state("Missing") == {}
+
+    def test_metadata_from_columns(self, manager):
+        manager.save_state("A", {"v": 1})
+
+        metadata = manager.get_state_metadata("A")
+        assert metadata["node_name"] == "A"
+        assert metadata["version"] == "1.0"
+        assert metadata["timestamp"]
+        assert metadata["file_size"] > 0
+        assert manager.get_state_metadata("Missing") is None
+
+    def test_load_all_states(self, manager):
+        for i in range(50):
+            manager.save_state(f"Node{i}", {"i": i})
+
+        states = manager.load_all_states()
+        assert len(states) == 50
+        assert states["Node7"] == {"i": 7}
+
+    def test_clear(self, manager):
+        manager.save_state("A", {"v": 1})
+        manager.save_state("B", {"v": 2})
+
+        assert manager.clear_state("A") is True
+        assert manager.clear_state("A") is False
+        assert manager.clear_all_states() == 1
+        assert manager.list_saved_states() == []
+
+    def test_write_behind_batch_is_one_transaction(self, tmp_path):
+        manager = StateManager(str(tmp_path / "state"), backend="sqlite",
+                               write_behind=True, flush_interval=60)
+        try:
+            for i in range(20):
+                manager.save_state(f"Node{i}", {"i": i})
+            assert manager.flush(timeout=5) is True
+            assert manager.stats["flushes"] == 1
+            assert manager.stats["writes"] == 20
+        finally:
+            manager.close()
+
+        reopened = StateManager(str(tmp_path / "state"), backend="sqlite")
+        assert len(reopened.load_all_states()) == 20
+        reopened.close()
+
+    def test_unknown_backend(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown state backend"):
+            StateManager(str(tmp_path), backend="redis")
+
+
+class TestConvertStateStore:
+    """Test one-shot conversion between backends"""
+
+    def test_json_to_sqlite_and_back(self, tmp_path):
+        state_dir = str(tmp_path / "state")
+        json_manager = StateManager(state_dir)
+        json_manager.save_state("Namespace/Agent", {"v": 1})
+        json_manager.save_state("B", {"v": 2})
+        timestamp = json_manager.get_state_metadata("B")["timestamp"]
+
+        assert convert_state_store(state_dir, "json", "sqlite") == 2
+
+        sqlite_manager = StateManager(state_dir, backend="sqlite")
+        assert sqlite_manager.load_state("Namespace/Agent") == {"v": 1}
+        assert sqlite_manager.get_state_metadata("B")["timestamp"] == timestamp
+        sqlite_manager.save_state("C", {"v": 3})
+        sqlite_manager.close()
+
+        json_manager.clear_all_states()
+        assert convert_state_store(state_dir, "sqlite", "json") == 3
+        assert StateManager(state_dir).load_state("C") == {"v": 3}
+
+    def test_rejects_same_backend(self, tmp_path):
+        with pytest.raises(ValueError):
+            convert_state_store(str(tmp_path), "json", "json")
+
+
+class TestStateManagerDeltas:
+    """Test incremental delta checkpoints"""
+
+    @pytest.fixture(params=["json", "sqlite"])
+    def make_manager(self, request, tmp_path):
+        """Factory for delta-mode managers on each backend"""
+        managers = []
+
+        def make(**kwargs):
+            kwargs.setdefault("delta_checkpoints", True)
+            manager = StateManager(str(tmp_path / "state"), backend=request.param, **kwargs)
+            managers.append(manager)
+            return manager
+
+        yield make
+        for manager in managers:
+            manager.close()
+
+    def test_first_save_is_snapshot_then_deltas(self, make_manager):
+        manager = make_manager()
+        state = {"cache": {str(i): i for i in range(1000)}, "counter": 0}
+
+        manager.save_state("A", state)
+        assert manager.stats["snapshots"] == 1
+
+        for i in range(1, 4):
+            state["counter"] = i
+            manager.save_state("A", state)
+
+        assert manager.stats["snapshots"] == 1
+        assert manager.stats["deltas"] == 3
+        # Deltas only carry the changed key, not the large cache
+        assert manager.stats["delta_bytes"] < 500
+        assert manager.backend.read_deltas("A")[0].count("cache") == 0
+
+    def test_load_replays_snapshot_and_deltas(self, make_manager):
+        manager = make_manager()
+        manager.save_state("A", {"a": 1, "b": 2, 3: "three"})
+        manager.save_state("A", {"a": 10, "b": 2, 3: "three", "c": [1]})
+        manager.save_state("A", {"a": 10, "c": [1, 2], 3: "three"})
+
+        expected = {"a": 10, "c": [1, 2], "3": "three"}
+        assert manager.load_state("A") == expected
+        assert manager.load_all_states() == {"A": expected}
+
+        # A fresh manager (e.g. after restart) sees the same state
+        assert make_manager(delta_checkpoints=False).load_state("A") == expected
+
+    def test_unchanged_save_writes_nothing(self, make_manager):
+        manager = make_manager()
+        manager.save_state("A", {"a": 1})
+        manager.save_state("A", {"a": 1})
+
+        assert manager.stats["deltas"] == 0
+        assert manager.backend.read_deltas("A") == []
+
+    def test_compacts_after_n_deltas(self, make_manager):
+        manager = make_manager(compact_after_deltas=3)
+        for i in range(8):
+            manager.save_state("A", {"counter": i, "big": "x" * 100})
+
+        # snapshot, 3 deltas, snapshot, 3 deltas
+        assert manager.stats["snapshots"] == 2
+        assert manager.stats["deltas"] == 6
+        assert len(manager.backend.read_deltas("A")) == 3
+        assert manager.load_state("A") == {"counter": 7, "big": "x" * 100}
+
+    def test_compacts_after_m_bytes(self, make_manager):
+        manager = make_manager(compact_after_bytes=200)
+        for i in range(6):
+            manager.save_state("A", {"blob": str(i) * 150})
+
+        assert manager.stats["snapshots"] > 1
+        assert manager.load_state("A") == {"blob": "5" * 150}
+
+    def test_stale_and_torn_deltas_are_ignored(self, make_manager):
+        manager = make_manager()
+        manager.save_state("A", {"a": 1})
+        manager.save_state("A", {"a": 2})
+        manager.backend.append_deltas({"A": '{"base":"old","set":{"a":99},"unset":[]}'})
+        manager.backend.append_deltas({"A": '{"base":'})
+
+        assert manager.load_state("A") == {"a": 2}
+
+    def test_restart_starts_with_snapshot(self, make_manager):
+        first = make_manager()
+        first.save_state("A", {"a": 1})
+        first.save_state("A", {"a": 2})
+
+        second = make_manager()
+        second.save_state("A", {"a": 3})
+        assert second.stats["snapshots"] == 1
+        assert second.backend.read_deltas("A") == []
+        assert second.load_state("A") == {"a": 3}
+
+    def test_write_behind_coalesces_into_one_delta(self, make_manager):
+        manager = make_manager(write_behind=True, flush_interval=60)
+        manager.save_state("A", {"a": 0, "b": 0})
+        manager.flush(timeout=5)
+
+        manager.save_state("A", {"a": 1, "b": 0})
+        manager.save_state("A", {"a": 2, "b": 0})
+        manager.flush(timeout=5)
+
+        assert manager.stats["deltas"] == 1
+        assert manager.load_state("A") == {"a": 2, "b": 0}
+
+    def test_clear_removes_deltas(self, make_manager):
+        manager = make_manager()
+        manager.save_state("A", {"a": 1})
+        manager.save_state("A", {"a": 2})
+
+        assert manager.clear_state("A") is True
+        assert manager.backend.read_deltas("A") == []
+        assert manager.load_state("A") == {}
+
+    def test_convert_materializes_deltas(self, make_manager, tmp_path):
+        manager = make_manager()
+        manager.save_state("A", {"a": 1})
+        manager.save_state("A", {"a": 2})
+        source = manager.backend.name
+        manager.close()
+
+        target = "sqlite" if source == "json" else "json"
+        assert convert_state_store(str(tmp_path / "state"), source, target) == 1
+        converted = StateManager(str(tmp_path / "state"), backend=target)
+        assert converted.load_state("A") == {"a": 2}
+        converted.close()
+
+
+class TestStateManagerBinaryFormat:
+    """Test compressed binary checkpoints"""
+
+    @pytest.fixture(params=["json", "sqlite"])
+    def make_manager(self, request, tmp_path):
+        """Factory for managers on each backend"""
+        managers = []
+
+        def make(**kwargs):
+            manager = StateManager(str(tmp_path / "state"), backend=request.param, **kwargs)
+            managers.append(manager)
+            return manager
+
+        yield make
+        for manager in managers:
+            manager.close()
+
+    def test_roundtrip_and_smaller(self, make_manager):
+        state = {"rows": [{"id": i, "status": "ok", "tags": ["a", "b"]} for i in range(500)]}
+
+        plain = make_manager()
+        plain.save_state("Plain", state)
+        binary = make_manager(storage_format="binary")
+        binary.save_state("Packed", state)
+
+        assert binary.load_state("Packed") == state
+        assert binary.backend.read("Packed")[:4] == b"GBC1"
+        packed_size = binary.get_state_metadata("Packed")["file_size"]
+        assert packed_size < plain.get_state_metadata("Plain")["file_size"] / 5
+
+    def test_formats_are_auto_detected(self, make_manager):
+        plain = make_manager()
+        plain.save_state("A", {"v": 1})
+        binary = make_manager(storage_format="binary")
+        binary.save_state("B", {"v": 2})
+
+        # Either manager reads both formats
+        assert plain.load_all_states() == {"A": {"v": 1}, "B": {"v": 2}}
+        assert binary.load_state("A") == {"v": 1}
+
+    def test_binary_deltas(self, make_manager):
+        manager = make_manager(storage_format="binary", delta_checkpoints=True)
+        manager.save_state("A", {"a": 1, "big": "x" * 1000})
+        manager.save_state("A", {"a": 2, "big": "x" * 1000})
+
+        assert manager.stats["deltas"] == 1
+        assert manager.load_state("A") == {"a": 2, "big": "x" * 1000}
+
+    def test_corrupted_binary_raises(self, tmp_path):
+        manager = StateManager(str(tmp_path), storage_format="binary")
+        manager.save_state("A", {"v": 1})
+        state_file = manager._get_state_file("A")
+        state_file.write_bytes(state_file.read_bytes()[:8] + b"garbage")
+
+        with pytest.raises(ValueError, match="Corrupted"):
+            manager.load_state("A")
+        assert manager.load_all_states() == {}
+
+    def test_invalid_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            StateManager(str(tmp_path), storage_format="xml")
+
+    def test_convert_to_binary(self, tmp_path):
+        state_dir = str(tmp_path / "state")
+        StateManager(state_dir).save_state("A", {"v": 1})
+
+        assert convert_state_store(state_dir, "json", "sqlite", storage_format="binary") == 1
+        manager = StateManager(state_dir, backend="sqlite")
+        assert manager.backend.read("A")[:4] == b"GBC1"
+        assert manager.load_state("A") == {"v": 1}
+        manager.close()
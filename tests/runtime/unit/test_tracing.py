@@ -0,0 +1,213 @@
+"""
+Unit tests for causal tracing
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from graphbus_core.config import RuntimeConfig
+from graphbus_core.model.topic import Subscription, Topic
+from graphbus_core.node_base import GraphBusNode
+from graphbus_core.runtime.event_router import EventRouter
+from graphbus_core.runtime.executor import RuntimeExecutor
+from graphbus_core.runtime.message_bus import MessageBus
+from graphbus_core.runtime.tracing import Tracer, current_span
+
+
+class Gateway(GraphBusNode):
+    """Entry node: forwards orders to the warehouse"""
+
+    def on_order(self, payload):
+        self.publish("/Reserve", payload)
+
+    def place(self, order_id):
+        self.publish("/Order", {"order_id": order_id})
+        return order_id
+
+
+class Warehouse(GraphBusNode):
+    """Middle hop, optionally slow"""
+
+    delay = 0.0
+
+    def on_reserve(self, payload):
+        time.sleep(self.delay)
+        self.publish("/Ship", payload)
+
+
+class Shipping(GraphBusNode):
+    """Last hop: records the trace it ran in"""
+
+    def __init__(self):
+        super().__init__()
+        self.seen = []
+
+    def on_ship(self, payload):
+        self.seen.append(current_span().trace_id)
+
+    def fail(self, payload):
+        raise ValueError("no courier")
+
+
+@pytest.fixture
+def executor():
+    """Running executor with Gateway -> Warehouse -> Shipping and tracing on"""
+    executor = RuntimeExecutor(RuntimeConfig(enable_tracing=True, trace_slowest=3))
+    executor.nodes = {"Gateway": Gateway(), "Warehouse": Warehouse(), "Shipping": Shipping()}
+    executor.bus = MessageBus()
+    executor.bus.tracer = executor.tracer
+    executor.router = EventRouter(executor.bus, executor.nodes, inflight=executor.inflight)
+    for name, node in executor.nodes.items():
+        node.name = name
+        node.bus = executor.bus
+    for node_name, topic, handler in [
+        ("Gateway", "/Order", "on_order"),
+        ("Warehouse", "/Reserve", "on_reserve"),
+        ("Shipping", "/Ship", "on_ship"),
+        ("Shipping", "/Broken", "fail"),
+    ]:
+        executor.router.register_subscription(Subscription(node_name, Topic(topic), handler))
+    executor._is_running = True
+    yield executor
+    executor.stop()
+
+
+class TestTracePropagation:
+    """Tests for trace context flowing through publish, dispatch and calls"""
+
+    def test_cascade_shares_one_trace(self, executor):
+        executor.publish("/Order", {"order_id": 1})
+
+        trace = executor.tracer.recent[-1]
+        assert trace.entry == "/Order"
+        assert executor.nodes["Shipping"].seen == [trace.trace_id]
+
+        spans = {s.span_id: s for s in trace.spans}
+        assert [(s.kind, s.topic) for s in sorted(trace.spans, key=lambda s: s.start_ns)] == [
+            ("publish", "/Order"), ("deliver", "/Order"),
+            ("publish", "/Reserve"), ("deliver", "/Reserve"),
+            ("publish", "/Ship"), ("deliver", "/Ship"),
+        ]
+        # Every span's parent is the one before it in the chain
+        ordered = sorted(trace.spans, key=lambda s: s.start_ns)
+        assert ordered[0].parent_id is None
+        for parent, child in zip(ordered, ordered[1:]):
+            assert child.parent_id == parent.span_id
+            assert spans[child.parent_id] is parent
+
+        deliver = ordered[3]
+        assert (deliver.node, deliver.handler) == ("Warehouse", "on_reserve")
+        assert all(s.duration is not None for s in trace.spans)
+
+    def test_events_carry_trace_ids(self, executor):
+        executor.publish("/Order", {"order_id": 1})
+
+        events = {e.topic: e for e in executor.bus.get_message_history()}
+        assert events["/Order"].parent_id is not None
+        assert events["/Order"].trace_id == events["/Ship"].trace_id
+        assert events["/Reserve"].parent_id != events["/Order"].parent_id
+
+    def test_method_call_starts_trace(self, executor):
+        executor.call_method("Gateway", "place", order_id=7)
+
+        trace = executor.tracer.recent[-1]
+        assert trace.entry == "Gateway.place"
+        root = min(trace.spans, key=lambda s: s.start_ns)
+        assert (root.kind, root.node, root.handler) == ("call", "Gateway", "place")
+        assert len(trace.spans) == 7
+
+    def test_separate_publishes_are_separate_traces(self, executor):
+        executor.publish("/Order", {"order_id": 1})
+        executor.publish("/Order", {"order_id": 2})
+
+        first, second = executor.nodes["Shipping"].seen
+        assert first != second
+        assert executor.tracer.completed == 2
+
+    def test_handler_error_recorded_on_span(self, executor):
+        executor.publish("/Broken", {})
+
+        deliver = next(s for s in executor.tracer.recent[-1].spans if s.kind == "deliver")
+        assert deliver.error == "ValueError: no courier"
+
+    def test_async_call_propagates_into_pool(self, executor):
+        async def run():
+            tracer = executor.tracer
+            with tracer.span("call", "client.request"):
+                await executor.call_method_async("Gateway", "place", order_id=1)
+
+        asyncio.run(run())
+        trace = executor.tracer.recent[-1]
+        assert trace.entry == "client.request"
+        assert {s.kind for s in trace.spans} == {"call", "publish", "deliver"}
+
+    def test_disabled_by_default(self):
+        executor = RuntimeExecutor(RuntimeConfig())
+        assert executor.tracer is None
+        bus = MessageBus()
+        event = bus.publish("/t", {})
+        assert event.trace_id is None
+
+
+class TestTraceLatency:
+    """Tests for per-entry latency and the slowest-trace store"""
+
+    def test_latency_per_entry_topic(self, executor):
+        for i in range(3):
+            executor.publish("/Order", {"order_id": i})
+        executor.publish("/Reserve", {"order_id": 9})
+
+        latency = executor.tracer.get_latency_stats()
+        assert latency["/Order"]["count"] == 3
+        assert latency["/Reserve"]["count"] == 1
+        assert executor.get_stats()["tracing"]["completed"] == 4
+
+    def test_slowest_store_is_bounded_and_finds_slow_hop(self, executor):
+        warehouse = executor.nodes["Warehouse"]
+        for i in range(6):
+            warehouse.delay = 0.03 if i == 4 else 0.0
+            executor.publish("/Order", {"order_id": i})
+
+        slowest = executor.tracer.slowest_traces()
+        assert len(slowest) == 3
+        assert slowest[0].duration >= 0.03
+        assert slowest[0].duration >= slowest[1].duration >= slowest[2].duration
+
+        # Outer spans contain the whole cascade; by self time the slow hop stands out
+        hop = slowest[0].slowest_span()
+        assert hop.name == "/Reserve -> Warehouse"
+        assert slowest[0].self_times()[hop.span_id] >= 0.03
+
+        assert executor.tracer.get_trace(slowest[0].trace_id) is slowest[0]
+        document = slowest[0].to_dict()
+        assert document["span_count"] == 6
+        assert document["spans"][0]["kind"] == "publish"
+
+    def test_concurrent_traces(self):
+        tracer = Tracer()
+
+        def work(i):
+            with tracer.span("publish", f"publish /t{i % 2}", topic=f"/t{i % 2}"):
+                with tracer.span("deliver", "child"):
+                    pass
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert tracer.completed == 20
+        assert tracer.get_stats()["active"] == 0
+        assert sum(s["count"] for s in tracer.get_latency_stats().values()) == 20
+
+    def test_active_traces_are_bounded(self):
+        tracer = Tracer(max_active=2)
+        spans = [tracer.start_span("call", f"c{i}") for i in range(3)]
+        assert tracer.dropped == 1
+        for span in spans:
+            tracer.end_span(span)
+        assert tracer.completed == 2
@@ -0,0 +1,210 @@
+"""
+Unit tests for the hung-handler watchdog
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from graphbus_core.config import RuntimeConfig
+from graphbus_core.model.topic import Subscription, Topic
+from graphbus_core.node_base import GraphBusNode
+from graphbus_core.runtime.event_router import EventRouter
+from graphbus_core.runtime.executor import RuntimeExecutor
+from graphbus_core.runtime.health import HealthMonitor, HealthStatus
+from graphbus_core.runtime.inflight import InFlightTracker
+from graphbus_core.runtime.message_bus import MessageBus
+from graphbus_core.runtime.watchdog import Watchdog
+
+
+class StuckNode(GraphBusNode):
+    """Node whose methods block until released"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def wait_forever(self):
+        self.release.wait(5)
+        return "released"
+
+    async def wait_async(self):
+        while not self.release.is_set():
+            await asyncio.sleep(0.01)
+        return "released"
+
+    def on_job(self, payload):
+        self.release.wait(5)
+
+    def quick(self):
+        return "ok"
+
+
+def run_in_thread(target, *args, **kwargs):
+    thread = threading.Thread(target=target, args=args, kwargs=kwargs, daemon=True)
+    thread.start()
+    return thread
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestWatchdog:
+    """Test deadline checks against an InFlightTracker"""
+
+    def test_reports_overdue_call_once_with_stack(self):
+        inflight = InFlightTracker()
+        release = threading.Event()
+
+        def stuck_handler():
+            with inflight.track(node="Worker", handler="crunch"):
+                release.wait(5)
+
+        thread = run_in_thread(stuck_handler)
+        assert wait_for(lambda: inflight.running_calls())
+        watchdog = Watchdog(inflight, deadline=0.05)
+        assert watchdog.check() == []
+
+        time.sleep(0.06)
+        (report,) = watchdog.check()
+        assert report.name == "Worker.crunch"
+        assert report.thread_id == thread.ident
+        assert report.elapsed > 0.05
+        assert "stuck_handler" in "".join(report.stack)
+        assert watchdog.check() == []  # reported once
+        assert watchdog.hung_calls() == [report]
+
+        release.set()
+        thread.join()
+        watchdog.check()
+        assert watchdog.hung_calls() == []
+        assert report.finished_after >= report.elapsed
+        assert watchdog.get_stats()["hung_total"] == 1
+
+    def test_method_deadline_overrides_node(self):
+        watchdog = Watchdog(InFlightTracker(), deadline=30, deadlines={"A": 5, "A.slow": 60})
+        assert watchdog.deadline_for("A", "slow") == 60
+        assert watchdog.deadline_for("A", "fast") == 5
+        assert watchdog.deadline_for("B", "run") == 30
+
+    def test_flags_health_monitor_until_call_returns(self):
+        inflight = InFlightTracker()
+        executor = Mock()
+        executor.nodes = {"Worker": Mock()}
+        monitor = HealthMonitor(executor)
+        failures = []
+        monitor.on_failure(lambda name, m: failures.append(name))
+        watchdog = Watchdog(inflight, health_monitor=monitor, deadline=0.01)
+        release = threading.Event()
+
+        def stuck():
+            with inflight.track(node="Worker", handler="crunch"):
+                release.wait(5)
+
+        thread = run_in_thread(stuck)
+        time.sleep(0.05)
+        watchdog.check()
+        assert monitor.check_health("Worker") == HealthStatus.UNHEALTHY
+        assert "Worker.crunch hung" in monitor.get_metrics("Worker").last_error
+        assert failures == ["Worker"]
+        assert monitor.get_metrics("Worker").failed_calls == 0
+
+        release.set()
+        thread.join()
+        watchdog.check()
+        assert monitor.check_health("Worker") == HealthStatus.HEALTHY
+
+    def test_recover_schedules_restart(self):
+        inflight = InFlightTracker()
+        monitor = Mock()
+        watchdog = Watchdog(inflight, health_monitor=monitor, deadline=0.01, recover=True)
+        hung = []
+        watchdog.on_hung(hung.append)
+        release = threading.Event()
+
+        def stuck():
+            with inflight.track(node="Worker", handler="crunch"):
+                release.wait(5)
+
+        thread = run_in_thread(stuck)
+        time.sleep(0.05)
+        watchdog.check()
+        release.set()
+        thread.join()
+
+        assert [r.name for r in hung] == ["Worker.crunch"]
+        monitor.mark_hung.assert_called_once()
+        monitor.schedule_restart.assert_called_once_with("Worker")
+
+    def test_background_thread(self):
+        watchdog = Watchdog(InFlightTracker(), interval=0.01)
+        watchdog.start()
+        assert watchdog.is_running
+        assert wait_for(lambda: watchdog.checks >= 2)
+        watchdog.stop()
+        assert not watchdog.is_running
+
+
+class TestExecutorWatchdog:
+    """Test the watchdog over executor calls and deliveries"""
+
+    @pytest.fixture
+    def executor(self):
+        config = RuntimeConfig(watchdog=True, watchdog_deadline=60, watchdog_interval=0.01,
+                               watchdog_deadlines={"Stuck": 0.05})
+        executor = RuntimeExecutor(config)
+        executor.nodes = {"Stuck": StuckNode()}
+        executor.nodes["Stuck"].name = "Stuck"
+        executor.setup_health_monitoring()
+        executor.setup_watchdog()
+        executor._is_running = True
+        yield executor
+        executor.nodes["Stuck"].release.set()
+        executor.stop(drain_timeout=1)
+
+    def test_hung_call_method_marks_node_unhealthy(self, executor):
+        thread = run_in_thread(executor.call_method, "Stuck", "wait_forever")
+        assert wait_for(lambda: executor.watchdog.hung_calls())
+
+        assert executor.health_monitor.check_health("Stuck") == HealthStatus.UNHEALTHY
+        assert executor.call_method("Stuck", "quick") == "ok"
+        stats = executor.get_stats()["watchdog"]
+        assert stats["hung"][0]["handler"] == "wait_forever"
+        assert "wait_forever" in stats["hung"][0]["stack"]
+
+        executor.nodes["Stuck"].release.set()
+        thread.join()
+        assert wait_for(lambda: not executor.watchdog.hung_calls())
+        assert executor.health_monitor.check_health("Stuck") == HealthStatus.HEALTHY
+
+    def test_hung_coroutine_method_reported(self, executor):
+        thread = run_in_thread(asyncio.run, executor.call_method_async("Stuck", "wait_async"))
+        assert wait_for(lambda: executor.watchdog.hung_calls())
+
+        (report,) = executor.watchdog.hung_calls()
+        assert report.name == "Stuck.wait_async"
+        assert report.thread_id == thread.ident
+        assert report.task is not None
+        assert "wait_async" in "".join(report.stack)
+        assert executor.health_monitor.check_health("Stuck") == HealthStatus.UNHEALTHY
+
+        executor.nodes["Stuck"].release.set()
+        thread.join()
+        assert wait_for(lambda: not executor.watchdog.hung_calls())
+
+    def test_hung_event_delivery_reported(self, executor):
+        bus = MessageBus()
+        router = EventRouter(bus, executor.nodes, inflight=executor.inflight)
+        router.register_subscription(Subscription("Stuck", Topic("/Job"), "on_job"))
+
+        run_in_thread(bus.publish, "/Job", {})
+        assert wait_for(lambda: executor.watchdog.hung_calls())
+        (report,) = executor.watchdog.hung_calls()
+        assert (report.node, report.handler, report.topic) == ("Stuck", "on_job", "/Job")